@@ -1,8 +1,19 @@
 """
 Python FreeJay is an open source DJ application.
+
+The application is imported on first use of `make_app`, so that importing a
+freejay subpackage does not import the GUI and audio libraries.
 """
 
 import logging
-from freejay.app import make_app
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+def __getattr__(name: str):
+    """Import `make_app` on first use."""
+    if name == "make_app":
+        from freejay.app import make_app
+
+        return make_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
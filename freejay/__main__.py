@@ -2,7 +2,59 @@
 """
 
 import logging
-from . import make_app
+import argparse
+from .player.state import DEFAULT_FPS
+
+parser = argparse.ArgumentParser(prog="freejay")
+parser.add_argument(
+    "--session", metavar="PATH", help="Record control messages to a session log."
+)
+parser.add_argument(
+    "--keymap", metavar="PATH", help="Keymap config file (TOML or JSON)."
+)
+parser.add_argument(
+    "--serial", metavar="DEVICE", help="Serial hardware controller device."
+)
+parser.add_argument(
+    "--controls",
+    metavar="PATH",
+    help="Hardware controller control map config file (TOML or JSON).",
+)
+parser.add_argument(
+    "--fps",
+    type=float,
+    default=DEFAULT_FPS,
+    help=f"Deck and mixer display frame rate. Defaults to {DEFAULT_FPS:g}.",
+)
+parser.add_argument(
+    "--eager",
+    action="store_true",
+    help="Make the audio players at startup, not once the window is shown.",
+)
+parser.add_argument(
+    "--headless",
+    action="store_true",
+    help="Run the engine without the window, controlled by --input.",
+)
+parser.add_argument(
+    "--input",
+    default="stdin",
+    metavar="SOURCE",
+    help="Headless input: stdin (the default), commands:PATH or replay:PATH.",
+)
+parser.add_argument(
+    "--control",
+    metavar="ADDRESS",
+    help="Control socket to listen on, unix:PATH or tcp:[HOST:]PORT. "
+    "Replaces --input when headless.",
+)
+parser.add_argument(
+    "--speed",
+    type=float,
+    default=1.0,
+    help="Headless replay speed, 1 for real time, 0 for as fast as possible.",
+)
+args = parser.parse_args()
 
 
 # Configure Logging
@@ -18,4 +70,29 @@ stream_handler.setFormatter(formatter)
 logger.addHandler(stream_handler)
 
 # Start Application
-make_app()
+if args.headless:
+    # Does not import Tk.
+    from .headless import make_headless
+
+    make_headless(
+        source=f"control:{args.control}" if args.control else args.input,
+        speed=args.speed,
+        session=args.session,
+        keymap=args.keymap,
+        serial=args.serial,
+        controls=args.controls,
+        fps=args.fps,
+        lazy=not args.eager,
+    )
+else:
+    from . import make_app
+
+    make_app(
+        session=args.session,
+        keymap=args.keymap,
+        serial=args.serial,
+        controls=args.controls,
+        fps=args.fps,
+        lazy=not args.eager,
+        control=args.control,
+    )
@@ -1,9 +1,20 @@
 """Create Application."""
 
+import time
+import typing
 import logging
 from .view import make_view
 from .model import make_model
-from .controller import make_controller
+from .controller import (
+    make_controller,
+    register_hardware_input,
+    register_control_server,
+)
+from .keyboard.keymapper import load_keymap
+from .hardware.mapper import ControlMapper, load_control_map
+from .player.state import DEFAULT_FPS
+from .remote.protocol import parse_address
+from .remote.server import ControlServer
 
 
 logger = logging.getLogger(__name__)
@@ -16,21 +27,131 @@ class App:
     Initialise model, view and controller.
     """
 
-    def __init__(self):
-        """Construct App."""
+    def __init__(
+        self,
+        session: typing.Optional[str] = None,
+        keymap: typing.Optional[str] = None,
+        serial: typing.Optional[str] = None,
+        controls: typing.Optional[str] = None,
+        fps: float = DEFAULT_FPS,
+        lazy: bool = True,
+        control: typing.Optional[str] = None,
+    ):
+        """Construct App.
+
+        Args:
+            session (str, optional): Session log path to record control messages
+                to. Defaults to None (not recorded).
+            keymap (str, optional): Keymap config file path (TOML or JSON).
+                Defaults to None (the default keymap).
+            serial (str, optional): Serial controller device. Defaults to None
+                (no hardware controller).
+            controls (str, optional): Controller control map config file path
+                (TOML or JSON). Defaults to None (the default control map).
+            fps (float, optional): Frame rate deck and mixer state is shown at.
+                Defaults to DEFAULT_FPS.
+            lazy (bool, optional): Show the window first, making the audio
+                players and importing the download backend in the background
+                once it is shown. Defaults to True.
+            control (str, optional): Control socket address, see
+                `remote.protocol.parse_address()`. Defaults to None (no control
+                socket).
+        """
+        self.started = time.perf_counter()
+        self.lazy = lazy
+        # Load the configs first, so an invalid config fails fast.
+        compiled_keymap = None if keymap is None else load_keymap(keymap)
+        control_map = None if controls is None else load_control_map(controls)
         self.view = make_view()
-        self.model = make_model()
-        self.controller = make_controller(model=self.model, view=self.view)
+        self.model = make_model(fps=fps, lazy=lazy)
+        self.controller = make_controller(
+            model=self.model, view=self.view, session=session, keymap=compiled_keymap
+        )
+        if not self.model.recorder.available:
+            # Nothing to record the master mix from.
+            self.view.recorder.frame.grid_remove()
+        self.serial_input = None
+        if serial is not None:
+            from .hardware.serial_input import open_serial_input
+
+            self.serial_input = open_serial_input(serial, ControlMapper(control_map))
+            register_hardware_input(
+                self.controller.view_message_router,
+                self.serial_input.mapper,
+                model=self.model,
+            )
+        self.control = None
+        if control is not None:
+            self.control = ControlServer(parse_address(control))
+            self.control.bind()
+            register_control_server(
+                self.controller.view_message_router,
+                self.controller.model_message_router,
+                self.controller.work_manager.get_queue("model"),
+                self.control,
+            )
 
     def start(self):
         """Start App."""
         self.controller.work_manager.start()
+        self.model.state.start()
+        if self.serial_input is not None:
+            self.serial_input.start()
+        if self.control is not None:
+            self.control.start()
+        self.view.tkroot.after_idle(self.__first_frame)
         self.view.tkroot.mainloop()
+        if self.control is not None:
+            self.control.stop()
+        # Keep the cache's recently used order for the next session.
+        self.model.download.cache.flush()
 
+    def __first_frame(self):
+        logger.info(
+            "Window shown %.0f ms after start",
+            (time.perf_counter() - self.started) * 1000,
+        )
+        if self.lazy:
+            self.model.warm_up()
 
-def make_app():
+
+def make_app(
+    session: typing.Optional[str] = None,
+    keymap: typing.Optional[str] = None,
+    serial: typing.Optional[str] = None,
+    controls: typing.Optional[str] = None,
+    fps: float = DEFAULT_FPS,
+    lazy: bool = True,
+    control: typing.Optional[str] = None,
+):
     """
     Configure and start the application.
+
+    Args:
+        session (str, optional): Session log path to record control messages
+            to. Defaults to None (not recorded).
+        keymap (str, optional): Keymap config file path (TOML or JSON).
+            Defaults to None (the default keymap).
+        serial (str, optional): Serial controller device. Defaults to None
+            (no hardware controller).
+        controls (str, optional): Controller control map config file path
+            (TOML or JSON). Defaults to None (the default control map).
+        fps (float, optional): Frame rate deck and mixer state is shown at.
+            Defaults to DEFAULT_FPS.
+        lazy (bool, optional): Show the window first, making the audio players
+            and importing the download backend in the background once it is
+            shown. Defaults to True.
+        control (str, optional): Control socket address, see
+            `remote.protocol.parse_address()`. Defaults to None (no control
+            socket).
     """
-    app = App()
+    app = App(
+        session=session,
+        keymap=keymap,
+        serial=serial,
+        controls=controls,
+        fps=fps,
+        lazy=lazy,
+        control=control,
+    )
     app.start()
@@ -1,5 +1,6 @@
 """
 Audio download functionality.
 
-Currently supports audio rip from youtube.
+Supports audio rip from youtube, and local files or HTTP URLs for offline use
+(see `backend.LocalBackend`).
 """
@@ -0,0 +1,249 @@
+"""
+Download backends.
+
+A backend resolves a URL to a downloadable stream, downloads the stream to a
+directory and looks up track metadata. `DownloadManager` downloads through a
+backend, so the download source can be swapped. Backends raise `OSError` for
+I/O and network errors, and wrap their own errors in `DownloadError`, so a
+backend's library is only imported by that backend:
+
+- `ytrip.PytubeBackend` downloads audio from YouTube.
+- `LocalBackend` reads local files or plain HTTP URLs, with a configurable
+  latency and bandwidth, to stand in for YouTube offline (tests, benchmarks).
+"""
+
+import os
+import time
+import typing
+import logging
+import dataclasses
+from urllib.parse import urlparse, unquote
+from freejay.audio_download.progress import ProgressCallback
+from freejay.audio_download.resumable import download_resumable
+
+logger = logging.getLogger(__name__)
+
+# Bytes per read when copying a stream.
+CHUNK_SIZE = 65536
+
+
+class DownloadError(Exception):
+    """A backend could not resolve or download a track."""
+
+
+@dataclasses.dataclass
+class Stream:
+    """
+    Resolved download stream.
+
+    Attributes:
+        url (str): Requested URL.
+        filename (str | None): File name to download to, None to let the backend
+            decide.
+        size (int | None): Size in bytes, None if unknown.
+        title (str | None): Track title, None if unknown.
+        handle (typing.Any): Backend specific stream object.
+    """
+
+    url: str
+    filename: typing.Optional[str] = None
+    size: typing.Optional[int] = None
+    title: typing.Optional[str] = None
+    handle: typing.Any = None
+
+
+class Backend(typing.Protocol):
+    """Download Backend Protocol."""
+
+    def resolve(self, url: str) -> Stream:
+        """Resolve a URL to a downloadable stream.
+
+        Args:
+            url (str): Track URL.
+
+        Raises:
+            OSError: If the track cannot be read.
+            DownloadError: If the backend cannot resolve the track.
+
+        Returns:
+            Stream: Stream to download.
+        """
+
+    def download(
+        self,
+        stream: Stream,
+        destination: str,
+        progress: typing.Optional[ProgressCallback] = None,
+    ) -> str:
+        """Download a stream.
+
+        Args:
+            stream (Stream): Stream from `resolve()`.
+            destination (str): Directory to download into.
+            progress (ProgressCallback, optional): Called with (bytes downloaded,
+                total bytes) as the download progresses. Defaults to None.
+
+        Raises:
+            OSError: If the track cannot be read or written.
+            DownloadError: If the backend cannot download the track.
+
+        Returns:
+            str: Downloaded file path.
+        """
+
+    def metadata(self, url: str) -> typing.Dict[str, typing.Any]:
+        """Look up track metadata.
+
+        Args:
+            url (str): Track URL.
+
+        Returns:
+            typing.Dict[str, typing.Any]: Metadata, at least 'title'.
+        """
+
+
+class LocalBackend:
+    """
+    Local download backend.
+
+    Serves local files (paths or file:// URLs, relative paths are resolved against
+    `root`) and plain HTTP URLs. Each request waits `latency` seconds before it
+    starts, and reads are throttled to `bandwidth` bytes per second, to simulate a
+    remote source. HTTP downloads are resumable (see `resumable`).
+    """
+
+    def __init__(
+        self,
+        root: typing.Optional[str] = None,
+        latency: float = 0.0,
+        bandwidth: typing.Optional[float] = None,
+        chunk_size: int = CHUNK_SIZE,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+    ):
+        """Construct LocalBackend.
+
+        Args:
+            root (str, optional): Directory for relative file paths. Defaults to
+                None (the current directory).
+            latency (float, optional): Seconds before each request starts.
+                Defaults to 0.0.
+            bandwidth (float, optional): Maximum read rate in bytes per second.
+                Defaults to None (unlimited).
+            chunk_size (int, optional): Bytes per read. Defaults to CHUNK_SIZE.
+            max_retries (int, optional): HTTP download attempts without progress
+                before giving up, see `resumable.download_resumable()`. Defaults
+                to 5.
+            backoff (float, optional): HTTP retry delay after the first failure,
+                in seconds. Defaults to 0.5.
+        """
+        self.root = root or os.getcwd()
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def resolve(self, url: str) -> Stream:
+        """Resolve a URL to a downloadable stream.
+
+        Args:
+            url (str): File path, file:// URL or HTTP URL.
+
+        Raises:
+            FileNotFoundError: If a local file does not exist.
+
+        Returns:
+            Stream: Stream to download.
+        """
+        parsed = urlparse(url)
+        filename = os.path.basename(unquote(parsed.path)) or "download"
+        if parsed.scheme in ("http", "https"):
+            return Stream(url=url, filename=filename, handle=url)
+        path = self.__local_path(url)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"No such file: {path}")
+        return Stream(
+            url=url,
+            filename=filename,
+            size=os.path.getsize(path),
+            title=os.path.splitext(filename)[0],
+            handle=path,
+        )
+
+    def download(
+        self,
+        stream: Stream,
+        destination: str,
+        progress: typing.Optional[ProgressCallback] = None,
+    ) -> str:
+        """Download a stream, at the configured latency and bandwidth.
+
+        Args:
+            stream (Stream): Stream from `resolve()`.
+            destination (str): Directory to download into.
+            progress (ProgressCallback, optional): Called with (bytes downloaded,
+                total bytes) as the download progresses. Defaults to None.
+
+        Returns:
+            str: Downloaded file path.
+        """
+        time.sleep(self.latency)
+        file_path = os.path.join(destination, stream.filename or "download")
+        progress = self.__throttle(progress)
+        if urlparse(stream.url).scheme in ("http", "https"):
+            return download_resumable(
+                stream.url,
+                file_path,
+                progress=progress,
+                chunk_size=self.chunk_size,
+                max_retries=self.max_retries,
+                backoff=self.backoff,
+            )
+        with open(stream.handle, "rb") as source, open(file_path, "wb") as file:
+            done = 0
+            while chunk := source.read(self.chunk_size):
+                file.write(chunk)
+                done += len(chunk)
+                progress(done, stream.size or done)
+        return file_path
+
+    def metadata(self, url: str) -> typing.Dict[str, typing.Any]:
+        """Look up track metadata.
+
+        Args:
+            url (str): File path, file:// URL or HTTP URL.
+
+        Returns:
+            typing.Dict[str, typing.Any]: 'title' (the file name stem) and
+                'size' (bytes, None if unknown).
+        """
+        stream = self.resolve(url)
+        filename = stream.filename or ""
+        return {"title": os.path.splitext(filename)[0], "size": stream.size}
+
+    def __local_path(self, url: str) -> str:
+        """Get the file path for a path or file:// URL."""
+        parsed = urlparse(url)
+        path = unquote(parsed.path) if parsed.scheme == "file" else url
+        return os.path.join(self.root, path)
+
+    def __throttle(
+        self, progress: typing.Optional[ProgressCallback]
+    ) -> ProgressCallback:
+        """Wrap a progress callback, sleeping to hold reads to the bandwidth."""
+        start = time.perf_counter()
+        first: typing.List[int] = []
+
+        def callback(done: int, total: int):
+            if self.bandwidth:
+                if not first:
+                    # Count the first chunk, but not a resumed download's offset.
+                    first.append(max(0, done - self.chunk_size))
+                delay = start + (done - first[0]) / self.bandwidth - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if progress is not None:
+                progress(done, total)
+
+        return callback
@@ -0,0 +1,261 @@
+"""
+Download cache.
+
+Downloads are stored in a directory per cache key, where the key is the YouTube
+video id parsed from the URL (so different URLs for the same video share an
+entry). Other URLs are keyed by a hash of the URL.
+
+The cache index is kept on disk with the downloads, so the cache persists across
+sessions. When the cache exceeds its size limit, the least recently used entries
+are removed, except for pinned files (e.g. files loaded in a deck).
+
+The index is written when entries are added or evicted. Lookups only reorder the
+index in memory, it is written with the next change or `flush()`.
+"""
+
+import os
+import re
+import json
+import shutil
+import typing
+import hashlib
+import logging
+import threading
+import collections
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
+
+# Default cache size limit in bytes.
+CACHE_MAX_BYTES = 2 * 1024**3
+
+INDEX_FILE = "download_cache.json"
+
+_VIDEO_ID = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_YOUTUBE_HOSTS = ("youtube.com", "www.youtube.com", "m.youtube.com")
+_YOUTUBE_PATHS = ("shorts", "embed", "live", "v")
+
+
+def video_id(url: str) -> typing.Optional[str]:
+    """Parse the video id from a YouTube URL.
+
+    Args:
+        url (str): YouTube URL, e.g. 'https://www.youtube.com/watch?v=<id>' or
+            'https://youtu.be/<id>'.
+
+    Returns:
+        typing.Optional[str]: Video id, None if not a YouTube video URL.
+    """
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    parts = [p for p in parsed.path.split("/") if p]
+    candidate = None
+    if host in _YOUTUBE_HOSTS or host == "music.youtube.com":
+        if parts == ["watch"]:
+            candidate = parse_qs(parsed.query).get("v", [""])[0]
+        elif len(parts) == 2 and parts[0] in _YOUTUBE_PATHS:
+            candidate = parts[1]
+    elif host in ("youtu.be", "www.youtu.be") and len(parts) == 1:
+        candidate = parts[0]
+    if candidate and _VIDEO_ID.match(candidate):
+        return candidate
+    return None
+
+
+def cache_key(url: str) -> str:
+    """Get the cache key for a URL.
+
+    Args:
+        url (str): Download URL.
+
+    Returns:
+        str: 'yt-<video id>' for YouTube URLs, otherwise 'url-<hash of URL>'.
+    """
+    vid = video_id(url)
+    if vid:
+        return f"yt-{vid}"
+    return "url-" + hashlib.sha1(url.strip().encode()).hexdigest()[:16]
+
+
+class DownloadCache:
+    """
+    Download Cache.
+
+    Maps cache keys to downloaded files, evicting the least recently used files
+    when the total size exceeds `max_bytes`.
+
+    Methods are thread safe.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = CACHE_MAX_BYTES):
+        """Construct DownloadCache, loading the index if there is one.
+
+        Args:
+            directory (str): Cache directory.
+            max_bytes (int, optional): Cache size limit in bytes. Defaults to
+                CACHE_MAX_BYTES.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        # Least recently used first.
+        self.__entries: collections.OrderedDict[
+            str, typing.Dict
+        ] = collections.OrderedDict()
+        self.__pins: typing.Counter[str] = collections.Counter()
+        self.__lock = threading.Lock()
+        # Index changed since it was written.
+        self.__dirty = False
+        self.__load()
+
+    def __len__(self) -> int:
+        """Get the number of cached files."""
+        return len(self.__entries)
+
+    @property
+    def size(self) -> int:
+        """Get the total size of the cached files in bytes."""
+        with self.__lock:
+            return sum(entry["size"] for entry in self.__entries.values())
+
+    def path_for(self, key: str) -> str:
+        """Get the directory to download an entry into, creating it.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            str: Directory path.
+        """
+        path = os.path.join(self.directory, key)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def get(self, key: str) -> typing.Optional[str]:
+        """Look up a cached file, marking it as recently used.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            typing.Optional[str]: File path, None if not cached.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            file_path = os.path.join(self.directory, entry["path"])
+            if not os.path.isfile(file_path):
+                logger.warning("Cached file missing, removing: %s", file_path)
+                del self.__entries[key]
+                self.__dirty = True
+                return None
+            self.__entries.move_to_end(key)
+            self.__dirty = True
+            return file_path
+
+    def put(self, key: str, file_path: str, url: str = "") -> str:
+        """Add a downloaded file to the cache, evicting old files if needed.
+
+        Args:
+            key (str): Cache key.
+            file_path (str): Downloaded file path, within the cache directory. The
+                entry size includes any other files in the key directory (e.g.
+                prepared track records and transcoded files).
+            url (str, optional): Download URL, for reference. Defaults to "".
+
+        Returns:
+            str: File path.
+        """
+        with self.__lock:
+            self.__entries[key] = {
+                "path": os.path.relpath(file_path, self.directory),
+                "size": self.__entry_size(key, file_path),
+                "url": url,
+            }
+            self.__entries.move_to_end(key)
+            self.__evict(keep=key)
+            self.__save()
+        return file_path
+
+    def flush(self):
+        """Write the index, if lookups have changed it since it was written."""
+        with self.__lock:
+            if self.__dirty:
+                self.__save()
+
+    def pin(self, file_path: str):
+        """Pin a file, so it is not evicted.
+
+        Pins are counted, a file pinned twice must be unpinned twice.
+
+        Args:
+            file_path (str): File path.
+        """
+        with self.__lock:
+            self.__pins[os.path.abspath(file_path)] += 1
+
+    def unpin(self, file_path: str):
+        """Unpin a file.
+
+        Args:
+            file_path (str): File path.
+        """
+        with self.__lock:
+            path = os.path.abspath(file_path)
+            self.__pins[path] -= 1
+            if self.__pins[path] <= 0:
+                del self.__pins[path]
+
+    def __entry_size(self, key: str, file_path: str) -> int:
+        """Get the size of an entry's key directory, or of the file alone."""
+        key_dir = os.path.join(self.directory, key)
+        if os.path.dirname(os.path.abspath(file_path)) != os.path.abspath(key_dir):
+            return os.path.getsize(file_path)
+        return sum(entry.stat().st_size for entry in os.scandir(key_dir))
+
+    def __pinned(self, key: str, file_path: str) -> bool:
+        """Check if an entry's file, or a file in its key directory, is pinned."""
+        if os.path.abspath(file_path) in self.__pins:
+            return True
+        key_dir = os.path.abspath(os.path.join(self.directory, key)) + os.sep
+        return any(path.startswith(key_dir) for path in self.__pins)
+
+    def __evict(self, keep: str):
+        """Remove least recently used, unpinned entries until within max_bytes."""
+        total = sum(entry["size"] for entry in self.__entries.values())
+        for key in list(self.__entries):
+            if total <= self.max_bytes:
+                break
+            entry = self.__entries[key]
+            file_path = os.path.join(self.directory, entry["path"])
+            if key == keep or self.__pinned(key, file_path):
+                continue
+            logger.info("Evicting cached file: %s", file_path)
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            del self.__entries[key]
+            total -= entry["size"]
+
+    def __load(self):
+        """Load the index, dropping entries whose files are missing."""
+        try:
+            with open(self.index_path, encoding="utf-8") as file:
+                entries = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logger.warning("Could not read cache index %s", self.index_path)
+            return
+        for key, entry in entries.items():
+            if os.path.isfile(os.path.join(self.directory, entry.get("path", ""))):
+                self.__entries[key] = entry
+
+    def __save(self):
+        """Write the index atomically."""
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self.__entries, file)
+        os.replace(temp_path, self.index_path)
+        self.__dirty = False
@@ -0,0 +1,251 @@
+"""
+Track crate.
+
+A crate is a queue of upcoming tracks. The crate prefetches the next few tracks
+through the download manager in the background, so that loading the next track
+into a deck is instant.
+
+Prefetching is low priority: only a few tracks are prefetched ahead, one at a
+time, and only while no other downloads are running. It is paused while a deck
+is loading a track (see `Crate.paused()`).
+"""
+
+import typing
+import logging
+import threading
+import contextlib
+import collections
+import dataclasses
+from concurrent import futures
+from freejay.messages import produce_consume as prodcon
+from freejay.messages import messages as mes
+from freejay.audio_download.ytrip import DownloadManager
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+FETCHING = "fetching"
+READY = "ready"
+FAILED = "failed"
+
+
+@dataclasses.dataclass
+class CrateEntry:
+    """
+    Crate Entry.
+
+    Attributes:
+        url (str): Track URL.
+        state (str): QUEUED, FETCHING, READY or FAILED.
+        file_path (str | None): Prepared file path, once READY.
+    """
+
+    url: str
+    state: str = QUEUED
+    file_path: typing.Optional[str] = None
+
+
+class Crate(prodcon.Producer):
+    """
+    Track Crate.
+
+    Add tracks with `add()`, take the next ready track with `next_ready()`, or
+    look at it with `peek_ready()` and take it once used with `take()`. Tracks
+    that fail to prefetch stay in the crate, marked FAILED, until they are
+    dropped with `drop_failed()`. A message is sent whenever the crate changes,
+    with the number of ready, waiting and failed tracks.
+
+    Methods are thread safe.
+    """
+
+    def __init__(
+        self,
+        download_manager: DownloadManager,
+        source: mes.Source,
+        component: mes.Component,
+        prefetch: int = 2,
+        max_concurrent: int = 1,
+    ):
+        """Construct Crate.
+
+        Args:
+            download_manager (DownloadManager): Download manager to prefetch with.
+            source (mes.Source): Message source.
+            component (mes.Component): Message component.
+            prefetch (int, optional): Number of tracks to keep ready (or
+                fetching) ahead. Defaults to 2.
+            max_concurrent (int, optional): Maximum concurrent prefetches.
+                Defaults to 1.
+        """
+        self.download_manager = download_manager
+        self.source = source
+        self.component = component
+        self.prefetch = prefetch
+        self.max_concurrent = max_concurrent
+        self.__entries: typing.Deque[CrateEntry] = collections.deque()
+        self.__pauses = 0
+        self.__lock = threading.RLock()
+
+    @property
+    def entries(self) -> typing.List[CrateEntry]:
+        """Get a copy of the crate entries, in order."""
+        with self.__lock:
+            return [dataclasses.replace(entry) for entry in self.__entries]
+
+    def add(self, url: str):
+        """Add a track to the end of the crate.
+
+        Args:
+            url (str): Track URL.
+        """
+        with self.__lock:
+            self.__entries.append(CrateEntry(url=url))
+        self.fill()
+        self.__notify()
+
+    def next_ready(self) -> typing.Optional[str]:
+        """Take the first ready track from the crate.
+
+        Returns:
+            typing.Optional[str]: Prepared file path, None if no track is ready.
+        """
+        with self.__lock:
+            file_path = self.peek_ready()
+            if file_path is not None:
+                self.take(file_path)
+        return file_path
+
+    def peek_ready(self) -> typing.Optional[str]:
+        """Get the first ready track, leaving it in the crate (see `take()`).
+
+        Returns:
+            typing.Optional[str]: Prepared file path, None if no track is ready.
+        """
+        with self.__lock:
+            entry = next((e for e in self.__entries if e.state == READY), None)
+            return None if entry is None else entry.file_path
+
+    def take(self, file_path: str) -> bool:
+        """Remove a ready track from the crate, e.g. once it has been loaded.
+
+        Args:
+            file_path (str): Prepared file path.
+
+        Returns:
+            bool: Whether the track was in the crate.
+        """
+        with self.__lock:
+            entry = next(
+                (
+                    e
+                    for e in self.__entries
+                    if e.state == READY and e.file_path == file_path
+                ),
+                None,
+            )
+            if entry is None:
+                return False
+            self.__entries.remove(entry)
+        self.fill()
+        self.__notify()
+        return True
+
+    def drop_failed(self):
+        """Remove the tracks that failed to prefetch from the crate."""
+        with self.__lock:
+            failed = [e for e in self.__entries if e.state == FAILED]
+            for entry in failed:
+                self.__entries.remove(entry)
+        if failed:
+            logger.info("Dropped %d failed tracks from the crate", len(failed))
+            self.__notify()
+
+    def pause(self):
+        """Pause prefetching. Pauses are counted, see `resume()`."""
+        with self.__lock:
+            self.__pauses += 1
+            self.download_manager.prefetch_running.clear()
+
+    def resume(self):
+        """Resume prefetching, once every pause has been resumed."""
+        with self.__lock:
+            self.__pauses = max(0, self.__pauses - 1)
+            if self.__pauses:
+                return
+            self.download_manager.prefetch_running.set()
+        self.fill()
+
+    @contextlib.contextmanager
+    def paused(self) -> typing.Iterator[None]:
+        """Pause prefetching for the duration of a `with` block."""
+        self.pause()
+        try:
+            yield
+        finally:
+            self.resume()
+
+    def fill(self):
+        """Start prefetching the next tracks, if there is capacity.
+
+        Called as tracks are added, taken and finish prefetching. Call it when
+        other downloads finish, to continue prefetching.
+        """
+        start = []
+        with self.__lock:
+            if self.__pauses:
+                return
+            ahead = sum(e.state in (FETCHING, READY) for e in self.__entries)
+            active = sum(e.state == FETCHING for e in self.__entries)
+            fetching = {e.url for e in self.__entries if e.state == FETCHING}
+            if any(url not in fetching for url in self.download_manager.in_flight):
+                # Other downloads take priority.
+                return
+            for entry in self.__entries:
+                if ahead >= self.prefetch or active >= self.max_concurrent:
+                    break
+                if entry.state == QUEUED:
+                    entry.state = FETCHING
+                    ahead += 1
+                    active += 1
+                    start.append(entry)
+
+        # Cached tracks complete (and call back) immediately, start them unlocked.
+        for entry in start:
+            logger.info("Prefetching %s", entry.url)
+            future = self.download_manager.download(entry.url, prefetch=True)
+            future.add_done_callback(lambda f, entry=entry: self.__fetched(entry, f))
+
+    def __fetched(self, entry: CrateEntry, future: futures.Future):
+        """Mark a prefetched entry as ready (or failed), and continue."""
+        file_path = None
+        if not future.cancelled():
+            # Raising here would leave the entry fetching, and stop prefetching.
+            exception = future.exception()
+            if exception is None:
+                file_path = future.result()
+            else:
+                logger.error("Prefetching %s failed: %r", entry.url, exception)
+        with self.__lock:
+            entry.file_path = file_path
+            entry.state = READY if file_path else FAILED
+        self.fill()
+        self.__notify()
+
+    def __notify(self):
+        """Send a message with the crate state."""
+        with self.__lock:
+            counts = collections.Counter(e.state for e in self.__entries)
+        self.send_message(
+            mes.Message(
+                sender=mes.Sender(source=self.source, trigger=mes.Trigger.DATA_OUTPUT),
+                content=mes.Data(
+                    component=self.component,
+                    element=mes.Element.CRATE,
+                    data={
+                        "ready": counts[READY],
+                        "waiting": counts[QUEUED] + counts[FETCHING],
+                        "failed": counts[FAILED],
+                    },
+                ),
+            )
+        )
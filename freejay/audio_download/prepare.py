@@ -0,0 +1,472 @@
+"""
+Post-download track preparation.
+
+Downloaded files are prepared in a process pool before they are offered to the
+decks. Preparation is a pipeline of stages:
+
+    probe -> decode -> loudness
+                    -> transcode (optional)
+                    -> analysis
+
+Decoded audio streams through the stages in chunks, in a single pass, so no
+intermediate files are written. The result is a PreparedTrack record, cached on
+disk next to the track, so a track is only prepared once.
+
+Decoding uses ffmpeg if it is installed. Without ffmpeg, only WAV files can be
+decoded, other files are probed for their size only.
+"""
+
+import os
+import json
+import time
+import math
+import wave
+import array
+import shutil
+import typing
+import logging
+import operator
+import subprocess
+import dataclasses
+from concurrent import futures
+
+logger = logging.getLogger(__name__)
+
+RECORD_SUFFIX = ".prepared.json"
+RECORD_VERSION = 1
+
+# Decoded PCM format, 16 bit stereo.
+RATE = 44100
+CHANNELS = 2
+SAMPLE_WIDTH = 2
+
+# Frames per decoded chunk.
+CHUNK_FRAMES = 65536
+
+# Number of points in the waveform overview.
+OVERVIEW_POINTS = 1000
+
+# Full scale for 16 bit samples.
+_FULL_SCALE = 32768
+
+
+class DecodeError(ValueError):
+    """Audio could not be decoded."""
+
+
+@dataclasses.dataclass
+class PreparedTrack:
+    """
+    Prepared Track record.
+
+    Attributes:
+        source (str): Downloaded file path.
+        path (str): File to load into a deck, the transcoded file if there is one,
+            otherwise the source.
+        source_size (int): Source size in bytes, used to check the record is
+            current.
+        source_mtime (float): Source modification time, used to check the record is
+            current.
+        duration (float | None): Duration in seconds, None if unknown.
+        rate (int | None): Decoded sample rate.
+        channels (int | None): Decoded channel count.
+        loudness (float | None): RMS level in dBFS.
+        peak (float | None): Peak level in dBFS.
+        overview (typing.List[float]): Waveform overview, peak level (0 to 1) of
+            OVERVIEW_POINTS equal sections of the track.
+        timings (typing.Dict[str, float]): Seconds spent in each stage.
+    """
+
+    source: str
+    path: str
+    source_size: int
+    source_mtime: float
+    duration: typing.Optional[float] = None
+    rate: typing.Optional[int] = None
+    channels: typing.Optional[int] = None
+    loudness: typing.Optional[float] = None
+    peak: typing.Optional[float] = None
+    overview: typing.List[float] = dataclasses.field(default_factory=list)
+    timings: typing.Dict[str, float] = dataclasses.field(default_factory=dict)
+
+
+def record_path(source: str) -> str:
+    """Get the path of the prepared track record for a file.
+
+    Args:
+        source (str): Downloaded file path.
+
+    Returns:
+        str: Record path.
+    """
+    return source + RECORD_SUFFIX
+
+
+def load_record(source: str) -> typing.Optional[PreparedTrack]:
+    """Load the cached prepared track record for a file.
+
+    Args:
+        source (str): Downloaded file path.
+
+    Returns:
+        typing.Optional[PreparedTrack]: Record, None if there is no current
+            record (missing, out of date or unreadable).
+    """
+    try:
+        with open(record_path(source), encoding="utf-8") as file:
+            data = json.load(file)
+        if data.pop("version", None) != RECORD_VERSION:
+            return None
+        record = PreparedTrack(**data)
+        stat = os.stat(source)
+    except (OSError, ValueError, TypeError):
+        return None
+    if (
+        record.source_size != stat.st_size
+        or record.source_mtime != stat.st_mtime
+        or not os.path.isfile(record.path)
+    ):
+        return None
+    return record
+
+
+def save_record(record: PreparedTrack):
+    """Save a prepared track record next to its source.
+
+    Args:
+        record (PreparedTrack): Record to save.
+    """
+    data = dataclasses.asdict(record)
+    data["version"] = RECORD_VERSION
+    temp_path = record_path(record.source) + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    os.replace(temp_path, record_path(record.source))
+
+
+def _is_wav(path: str) -> bool:
+    with open(path, "rb") as file:
+        header = file.read(12)
+    return header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+
+
+def probe(path: str) -> typing.Dict[str, typing.Any]:
+    """Probe a file for its format and duration.
+
+    Args:
+        path (str): File path.
+
+    Returns:
+        typing.Dict[str, typing.Any]: 'decoder' ('wav', 'ffmpeg' or None if the
+            file cannot be decoded) and 'duration' (seconds or None).
+    """
+    if _is_wav(path):
+        with wave.open(path, "rb") as wav:
+            return {
+                "decoder": "wav",
+                "duration": wav.getnframes() / wav.getframerate(),
+            }
+    if shutil.which("ffmpeg") is None:
+        return {"decoder": None, "duration": None}
+    duration = None
+    if shutil.which("ffprobe") is not None:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "csv=p=0",
+                path,
+            ],
+            capture_output=True,
+            text=True,
+        )
+        try:
+            duration = float(result.stdout.strip())
+        except ValueError:
+            pass
+    return {"decoder": "ffmpeg", "duration": duration}
+
+
+def decode(path: str, decoder: str) -> typing.Iterator[bytes]:
+    """Decode a file to 16 bit PCM, in chunks.
+
+    WAV files are decoded in their own sample rate and channel count, which must
+    be 16 bit. Other files are decoded by ffmpeg to RATE and CHANNELS.
+
+    Args:
+        path (str): File path.
+        decoder (str): 'wav' or 'ffmpeg', see `probe()`.
+
+    Raises:
+        ValueError: If a WAV file is not 16 bit.
+        DecodeError: If ffmpeg fails, e.g. on a corrupt file, once its output
+            has been read.
+
+    Yields:
+        bytes: Interleaved PCM frames.
+    """
+    if decoder == "wav":
+        with wave.open(path, "rb") as wav:
+            if wav.getsampwidth() != SAMPLE_WIDTH:
+                raise ValueError("Only 16 bit WAV files are supported.")
+            while chunk := wav.readframes(CHUNK_FRAMES):
+                yield chunk
+        return
+
+    command = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-i",
+        path,
+        "-f",
+        "s16le",
+        "-ac",
+        str(CHANNELS),
+        "-ar",
+        str(RATE),
+        "pipe:1",
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE)
+    assert process.stdout is not None
+    try:
+        while chunk := process.stdout.read(CHUNK_FRAMES * CHANNELS * SAMPLE_WIDTH):
+            yield chunk
+    finally:
+        process.stdout.close()
+        process.wait()
+    # Only checked once all output is read, closing early stops ffmpeg.
+    if process.returncode:
+        raise DecodeError(f"ffmpeg failed ({process.returncode}) to decode {path}")
+
+
+def _wav_format(path: str, decoder: str) -> typing.Tuple[int, int]:
+    """Get the (rate, channels) of decoded audio."""
+    if decoder == "wav":
+        with wave.open(path, "rb") as wav:
+            return wav.getframerate(), wav.getnchannels()
+    return RATE, CHANNELS
+
+
+def _db(level: float) -> float:
+    return 20 * math.log10(level) if level > 0 else -math.inf
+
+
+class _Loudness:
+    """Loudness stage, accumulates RMS and peak level."""
+
+    def __init__(self):
+        self.sum_squares = 0
+        self.peak = 0
+        self.samples = 0
+
+    def feed(self, samples: array.array):
+        if samples:
+            self.sum_squares += sum(map(operator.mul, samples, samples))
+            self.peak = max(self.peak, max(samples), -min(samples))
+            self.samples += len(samples)
+
+    def result(self) -> typing.Tuple[typing.Optional[float], typing.Optional[float]]:
+        if not self.samples:
+            return None, None
+        rms = math.sqrt(self.sum_squares / self.samples) / _FULL_SCALE
+        return round(_db(rms), 2), round(_db(self.peak / _FULL_SCALE), 2)
+
+
+class _Analysis:
+    """Analysis stage, builds a waveform overview of peak levels."""
+
+    def __init__(self, total_frames: typing.Optional[int], channels: int):
+        # Sections end on whole frames, spread evenly over the probed duration.
+        self.total = max(1, total_frames or 0)
+        self.channels = channels
+        self.peaks: typing.List[int] = []
+        self.current = 0
+        self.position = 0
+        self.point = 0
+        self.boundary = self.__boundary()
+
+    def __boundary(self) -> float:
+        """Get the sample position where the next non-empty section ends.
+
+        Sections are empty when there are fewer frames than overview points, or
+        the duration is unknown, and are skipped.
+        """
+        while True:
+            self.point += 1
+            if self.point >= OVERVIEW_POINTS:
+                # The last section takes any frames beyond the probed duration.
+                return math.inf
+            boundary = max(1, self.point * self.total // OVERVIEW_POINTS)
+            if boundary * self.channels > self.position:
+                return boundary * self.channels
+
+    def feed(self, samples: array.array):
+        i = 0
+        n = len(samples)
+        while i < n:
+            take = int(min(self.boundary - self.position, n - i))
+            section = samples[i : i + take]
+            self.current = max(self.current, max(section), -min(section))
+            self.position += take
+            i += take
+            if self.position == self.boundary:
+                self.peaks.append(self.current)
+                self.current = 0
+                self.boundary = self.__boundary()
+
+    def result(self) -> typing.List[float]:
+        peaks = self.peaks + ([self.current] if self.position else [])
+        return [round(p / _FULL_SCALE, 4) for p in peaks]
+
+
+def _close_transcode(
+    writer: typing.Optional[wave.Wave_write], path: str, complete: bool
+):
+    """Close a transcode, removing it if incomplete."""
+    if writer is None:
+        return
+    writer.close()
+    if not complete:
+        os.remove(path)
+
+
+def prepare_track(source: str, transcode: bool = False) -> PreparedTrack:
+    """Prepare a track, or load its cached record.
+
+    Intended to run in a worker process, see `Preparer`.
+
+    Args:
+        source (str): Downloaded file path.
+        transcode (bool, optional): Transcode to WAV for fast seeking. Defaults to
+            False.
+
+    Returns:
+        PreparedTrack: Prepared track record.
+    """
+    cached = load_record(source)
+    if cached is not None:
+        return cached
+
+    stat = os.stat(source)
+    record = PreparedTrack(
+        source=source,
+        path=source,
+        source_size=stat.st_size,
+        source_mtime=stat.st_mtime,
+    )
+    timings = record.timings
+    start = time.perf_counter()
+    info = probe(source)
+    timings["probe"] = time.perf_counter() - start
+    decoder = info["decoder"]
+    if decoder is None:
+        logger.warning("Cannot decode %s, install ffmpeg to prepare tracks.", source)
+        save_record(record)
+        return record
+
+    rate, channels = _wav_format(source, decoder)
+    record.rate = rate
+    record.channels = channels
+    total_frames = None
+    if info["duration"]:
+        total_frames = round(info["duration"] * rate)
+
+    loudness = _Loudness()
+    analysis = _Analysis(total_frames, channels)
+    writer = None
+    if transcode and decoder != "wav":
+        record.path = os.path.splitext(source)[0] + ".wav"
+        writer = wave.open(record.path, "wb")
+        writer.setnchannels(channels)
+        writer.setsampwidth(SAMPLE_WIDTH)
+        writer.setframerate(rate)
+
+    for stage in ("decode", "loudness", "transcode", "analysis"):
+        timings[stage] = 0.0
+    frames = 0
+    complete = False
+    try:
+        chunks = decode(source, decoder)
+        while True:
+            t0 = time.perf_counter()
+            chunk = next(chunks, None)
+            if chunk is None:
+                timings["decode"] += time.perf_counter() - t0
+                break
+            samples = array.array("h")
+            samples.frombytes(chunk[: len(chunk) - len(chunk) % SAMPLE_WIDTH])
+            t1 = time.perf_counter()
+            loudness.feed(samples)
+            t2 = time.perf_counter()
+            if writer is not None:
+                writer.writeframesraw(chunk)
+            t3 = time.perf_counter()
+            analysis.feed(samples)
+            t4 = time.perf_counter()
+            timings["decode"] += t1 - t0
+            timings["loudness"] += t2 - t1
+            timings["transcode"] += t3 - t2
+            timings["analysis"] += t4 - t3
+            frames += len(samples) // channels
+        complete = True
+    finally:
+        _close_transcode(writer, record.path, complete)
+
+    record.duration = frames / rate
+    record.loudness, record.peak = loudness.result()
+    record.overview = analysis.result()
+    timings["total"] = time.perf_counter() - start
+    save_record(record)
+    logger.info(
+        "Prepared %s in %.2fs (%s)",
+        source,
+        timings["total"],
+        ", ".join(f"{k} {v:.2f}s" for k, v in timings.items() if k != "total"),
+    )
+    return record
+
+
+class Preparer:
+    """
+    Track Preparer.
+
+    Prepares tracks on a process pool, so that decoding and analysis do not
+    compete with the audio and UI threads for the interpreter.
+    """
+
+    def __init__(self, max_workers: int = 2, transcode: bool = False):
+        """Construct Preparer.
+
+        Args:
+            max_workers (int, optional): Number of worker processes. Defaults
+                to 2.
+            transcode (bool, optional): Transcode tracks to WAV for fast
+                seeking. Defaults to False.
+        """
+        self.transcode = transcode
+        self.__executor = futures.ProcessPoolExecutor(max_workers=max_workers)
+
+    def prepare(self, source: str) -> futures.Future:
+        """Prepare a track.
+
+        Args:
+            source (str): Downloaded file path.
+
+        Returns:
+            futures.Future: Future resolving to a PreparedTrack.
+        """
+        return self.__executor.submit(prepare_track, source, self.transcode)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the process pool.
+
+        Args:
+            wait (bool, optional): Wait for running preparations to finish.
+                Defaults to True.
+        """
+        self.__executor.shutdown(wait=wait, cancel_futures=True)
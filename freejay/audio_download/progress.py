@@ -0,0 +1,123 @@
+"""
+Download progress reporting.
+
+Downloaders report progress for every chunk received, which for a fast download
+can be thousands of times a second. ProgressReporter turns these into progress
+updates (bytes, rate and ETA), and a ProgressThrottle shared by the reporters
+holds the updates from all downloads to a fixed maximum rate.
+"""
+
+import time
+import typing
+import threading
+
+# Signature of a downloader progress callback, (bytes downloaded, total bytes).
+ProgressCallback = typing.Callable[[int, int], None]
+
+
+class ProgressThrottle:
+    """
+    Progress update rate limit, shared by the reporters of parallel downloads.
+
+    Thread safe, downloads report progress from their own threads.
+    """
+
+    def __init__(
+        self,
+        max_rate: float = 10.0,
+        clock: typing.Callable[[], float] = time.perf_counter,
+    ):
+        """Construct ProgressThrottle.
+
+        Args:
+            max_rate (float, optional): Maximum updates per second. Defaults
+                to 10.0.
+            clock (typing.Callable[[], float], optional): Time source. Defaults to
+                `time.perf_counter`.
+        """
+        self.interval = 1 / max_rate
+        self.clock = clock
+        self.__lock = threading.Lock()
+        self.__last_sent: typing.Optional[float] = None
+
+    def allow(self, force: bool = False) -> bool:
+        """Check whether an update may be sent now, counting it if so.
+
+        Args:
+            force (bool, optional): Send the update regardless of the rate, it
+                still counts towards the rate. Defaults to False.
+
+        Returns:
+            bool: Whether to send the update.
+        """
+        with self.__lock:
+            now = self.clock()
+            if (
+                not force
+                and self.__last_sent is not None
+                and now - self.__last_sent < self.interval
+            ):
+                return False
+            self.__last_sent = now
+            return True
+
+
+class ProgressReporter:
+    """
+    Throttled download progress reporter.
+
+    Call the reporter with (bytes downloaded, total bytes) as data arrives.
+    Updates are sent at most at the throttle's rate, plus the first and the
+    final (complete) update of each download. The rate is measured from the
+    first report, so a resumed download's offset is not counted as received.
+    """
+
+    def __init__(
+        self,
+        send: typing.Callable[[typing.Dict[str, typing.Any]], None],
+        max_rate: float = 10.0,
+        clock: typing.Callable[[], float] = time.perf_counter,
+        throttle: typing.Optional[ProgressThrottle] = None,
+    ):
+        """Construct ProgressReporter.
+
+        Args:
+            send (typing.Callable[[typing.Dict[str, typing.Any]], None]): Function
+                to send a progress update, called with a dictionary of 'bytes',
+                'total', 'rate' (bytes per second, 0.0 until measured) and 'eta'
+                (seconds, None if unknown).
+            max_rate (float, optional): Maximum updates per second, if no
+                `throttle` is given. Defaults to 10.0.
+            clock (typing.Callable[[], float], optional): Time source. Defaults to
+                `time.perf_counter`.
+            throttle (ProgressThrottle, optional): Throttle shared with other
+                reporters. Defaults to None (a throttle for this reporter).
+        """
+        self.send = send
+        self.clock = clock
+        self.throttle = throttle or ProgressThrottle(max_rate=max_rate, clock=clock)
+        # Time and bytes of the first report, the baseline for the rate.
+        self.__first: typing.Optional[typing.Tuple[float, int]] = None
+
+    def __call__(self, done: int, total: int):
+        """Report progress.
+
+        Args:
+            done (int): Bytes downloaded.
+            total (int): Total bytes, 0 if unknown.
+        """
+        now = self.clock()
+        first = self.__first is None
+        if self.__first is None:
+            self.__first = (now, done)
+        complete = total > 0 and done >= total
+        if not self.throttle.allow(force=first or complete):
+            return
+
+        start, offset = self.__first
+        elapsed = now - start
+        rate = (done - offset) / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if total > 0 and rate > 0:
+            eta = max(0, total - done) / rate
+        self.send({"bytes": done, "total": total, "rate": rate, "eta": eta})
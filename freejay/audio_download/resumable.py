@@ -0,0 +1,244 @@
+"""
+Resumable HTTP downloads.
+
+Downloads are written in chunks to a `.part` file next to the destination. When
+the connection fails, the download is retried with jittered exponential backoff,
+resuming from the end of the `.part` file with an HTTP range request. The file is
+only moved to its destination once its size has been checked against the size
+reported by the server.
+
+The `.part` file is kept if the download finally fails, with the server's
+validator (ETag or Last-Modified) in a `.part.json` file beside it, so the next
+attempt resumes where this one stopped. The validator is sent as `If-Range`, so
+a resource that changed in the meantime is downloaded from the start.
+"""
+
+import os
+import json
+import time
+import random
+import typing
+import logging
+import http.client
+import urllib.error
+import urllib.request
+from freejay.audio_download.progress import ProgressCallback
+
+logger = logging.getLogger(__name__)
+
+PART_SUFFIX = ".part"
+CHUNK_SIZE = 65536
+
+# HTTP status codes worth retrying, other HTTP errors are raised.
+RETRY_STATUS = (408, 429, 500, 502, 503, 504)
+
+
+class IntegrityError(OSError):
+    """Downloaded file does not match the size reported by the server."""
+
+
+def backoff_delay(
+    attempt: int, base: float, cap: float, rand: typing.Callable[[], float]
+) -> float:
+    """Get the delay before a retry, exponential backoff with full jitter.
+
+    Args:
+        attempt (int): Number of consecutive failures, from 1.
+        base (float): Delay after the first failure, in seconds.
+        cap (float): Maximum delay, in seconds.
+        rand (typing.Callable[[], float]): Random number in [0, 1).
+
+    Returns:
+        float: Delay in seconds.
+    """
+    return rand() * min(cap, base * 2 ** (attempt - 1))
+
+
+def _read_meta(meta_path: str) -> typing.Dict[str, typing.Any]:
+    try:
+        with open(meta_path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_meta(meta_path: str, meta: typing.Dict[str, typing.Any]):
+    with open(meta_path, "w", encoding="utf-8") as file:
+        json.dump(meta, file)
+
+
+def _remove(file_path: str):
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+def _total_size(
+    response: http.client.HTTPResponse, offset: int
+) -> typing.Optional[int]:
+    """Get the full resource size from a (partial) response."""
+    content_range = response.headers.get("Content-Range")
+    if content_range and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        if total.isdigit():
+            return int(total)
+    length = response.headers.get("Content-Length")
+    if length is not None and length.isdigit():
+        return offset + int(length)
+    return None
+
+
+def _size(file_path: str) -> int:
+    return os.path.getsize(file_path) if os.path.exists(file_path) else 0
+
+
+def _request(
+    url: str,
+    offset: int,
+    meta: typing.Dict[str, typing.Any],
+    headers: typing.Optional[typing.Dict[str, str]],
+) -> urllib.request.Request:
+    """Make a request for the rest of a download, from `offset`."""
+    request = urllib.request.Request(url, headers=headers or {})
+    if offset:
+        request.add_header("Range", f"bytes={offset}-")
+        if meta.get("validator"):
+            request.add_header("If-Range", meta["validator"])
+    return request
+
+
+def _check_size(part_path: str, total: typing.Optional[int], url: str):
+    """Check a finished download, removing it if the size is wrong."""
+    size = os.path.getsize(part_path)
+    if total is not None and size != total:
+        _remove(part_path)
+        _remove(part_path + ".json")
+        raise IntegrityError(f"Downloaded {size} of {total} bytes: {url}")
+
+
+def _fetch(
+    request: urllib.request.Request,
+    part_path: str,
+    offset: int,
+    chunk_size: int,
+    timeout: float,
+    progress: typing.Optional[ProgressCallback],
+) -> typing.Dict[str, typing.Any]:
+    """Download from `offset` into the part file, returning the part metadata.
+
+    The metadata (validator and total size) is written to disk before the
+    download starts, so a failed download can be resumed.
+    """
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        if response.status != 206:
+            # Range ignored, or the resource changed: start again.
+            offset = 0
+        total = _total_size(response, offset)
+        validator = response.headers.get("ETag") or response.headers.get(
+            "Last-Modified"
+        )
+        meta = {"validator": validator, "total": total}
+        _write_meta(part_path + ".json", meta)
+        done = offset
+        with open(part_path, "r+b" if offset else "wb") as file:
+            file.seek(offset)
+            file.truncate()
+            while chunk := response.read(chunk_size):
+                file.write(chunk)
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, total or done)
+        if total is not None and done < total:
+            raise http.client.IncompleteRead(b"", total - done)
+    return meta
+
+
+def download_resumable(
+    url: str,
+    file_path: str,
+    progress: typing.Optional[ProgressCallback] = None,
+    chunk_size: int = CHUNK_SIZE,
+    max_retries: int = 5,
+    backoff: float = 0.5,
+    max_backoff: float = 8.0,
+    timeout: float = 30.0,
+    headers: typing.Optional[typing.Dict[str, str]] = None,
+    rand: typing.Callable[[], float] = random.random,
+) -> str:
+    """Download a URL to a file, resuming after connection failures.
+
+    Args:
+        url (str): HTTP URL.
+        file_path (str): Destination file path.
+        progress (ProgressCallback, optional): Called with (bytes downloaded,
+            total bytes) as the download progresses. Defaults to None.
+        chunk_size (int, optional): Bytes per read. Defaults to CHUNK_SIZE.
+        max_retries (int, optional): Maximum consecutive failed attempts without
+            progress before giving up. Defaults to 5.
+        backoff (float, optional): Delay after the first failure in seconds,
+            doubled after each consecutive failure. Defaults to 0.5.
+        max_backoff (float, optional): Maximum delay in seconds. Defaults to 8.0.
+        timeout (float, optional): Socket timeout in seconds. Defaults to 30.0.
+        headers (typing.Dict[str, str], optional): Extra request headers.
+            Defaults to None.
+        rand (typing.Callable[[], float], optional): Random number source for
+            the backoff jitter. Defaults to random.random.
+
+    Raises:
+        urllib.error.HTTPError: If the server responds with an error that is not
+            worth retrying (e.g. 404).
+        IntegrityError: If the downloaded size does not match the server's.
+        OSError: If the download fails after `max_retries` attempts.
+
+    Returns:
+        str: Destination file path.
+    """
+    part_path = file_path + PART_SUFFIX
+    meta_path = part_path + ".json"
+    meta = _read_meta(meta_path) if os.path.exists(part_path) else {}
+    # Furthest position reached, attempts only count as progress beyond it.
+    best = _size(part_path)
+    failures = 0
+    while True:
+        offset = _size(part_path)
+        request = _request(url, offset, meta, headers)
+        try:
+            meta = _fetch(request, part_path, offset, chunk_size, timeout, progress)
+            break
+        except urllib.error.HTTPError as exc:
+            if exc.code == 416 and meta.get("total") == offset:
+                # Already complete.
+                break
+            if exc.code == 416:
+                _remove(part_path)
+            elif exc.code not in RETRY_STATUS:
+                raise
+            error: Exception = exc
+        except (OSError, http.client.HTTPException) as exc:
+            error = exc
+
+        meta = _read_meta(meta_path)
+        reached = _size(part_path)
+        if reached > best:
+            best = reached
+            failures = 0
+        else:
+            failures += 1
+            if failures >= max_retries:
+                logger.error("Download failed after %d attempts: %s", failures, url)
+                raise OSError(f"Download failed: {url}") from error
+        delay = backoff_delay(max(1, failures), backoff, max_backoff, rand)
+        logger.warning(
+            "Download interrupted at %d bytes (%s), retrying in %.2fs: %s",
+            reached,
+            error,
+            delay,
+            url,
+        )
+        time.sleep(delay)
+
+    _check_size(part_path, meta.get("total"), url)
+    os.replace(part_path, file_path)
+    _remove(meta_path)
+    return file_path
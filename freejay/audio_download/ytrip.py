@@ -1,17 +1,29 @@
 """
 Rip audio files from youtube.
+
+pytube is imported on first use, it is slow to import and not needed until
+something is downloaded.
 """
 
 import os
+import wave
 import logging
 import typing
-import queue
 import threading
+import contextlib
+from concurrent import futures
 from tempfile import gettempdir
 from urllib.error import HTTPError
-from pytube import YouTube
-from pytube.exceptions import VideoUnavailable, RegexMatchError
 from freejay.messages import produce_consume as prodcon
+from freejay.audio_download.cache import DownloadCache, cache_key
+from freejay.audio_download.backend import Backend, DownloadError, Stream
+from freejay.audio_download.progress import (
+    ProgressCallback,
+    ProgressReporter,
+    ProgressThrottle,
+)
+from freejay.audio_download.resumable import download_resumable
+from freejay.audio_download.prepare import Preparer, PreparedTrack, load_record
 import freejay.messages.messages as mes
 
 logger = logging.getLogger(__name__)
@@ -33,6 +45,8 @@ def _check_video_available(filepath: str, video_link: str):
     Raises:
         VideoUnavailable: If downloaded file has name stem == 'Video Not Available'
     """
+    from pytube.exceptions import VideoUnavailable
+
     basename = os.path.basename(filepath)
     stem = os.path.splitext(basename)[0]
 
@@ -40,13 +54,114 @@ def _check_video_available(filepath: str, video_link: str):
         raise VideoUnavailable(video_id=video_link)
 
 
-def yt_rip(video_link: str, destination: str | None = None) -> str:
+@contextlib.contextmanager
+def _pytube_errors(url: str) -> typing.Iterator[None]:
+    """Raise pytube errors as DownloadError, see `backend.DownloadError`."""
+    from pytube.exceptions import PytubeError, VideoUnavailable, RegexMatchError
+
+    try:
+        yield
+    except VideoUnavailable as exc:
+        raise DownloadError(f"Video unavailable, check the link '{url}'") from exc
+    except RegexMatchError as exc:
+        raise DownloadError(f"Not recognised as a valid link: '{url}'") from exc
+    except PytubeError as exc:
+        raise DownloadError(f"YouTube download failed for '{url}': {exc}") from exc
+
+
+class PytubeBackend:
+    """
+    Download backend for YouTube audio, using pytube.
+
+    pytube errors are raised as `backend.DownloadError`, with the pytube error
+    as the cause.
+    """
+
+    def resolve(self, url: str) -> Stream:
+        """Resolve a YouTube URL to its audio stream.
+
+        Args:
+            url (str): YouTube URL.
+
+        Raises:
+            DownloadError: If the video or its audio stream is not found.
+
+        Returns:
+            Stream: Audio only stream.
+        """
+        from pytube import YouTube
+
+        with _pytube_errors(url):
+            audio = YouTube(url).streams.get_audio_only()
+        if audio is None:
+            raise DownloadError(f"No audio stream for '{url}'")
+        return Stream(url=url, filename=audio.default_filename, handle=audio)
+
+    def download(
+        self,
+        stream: Stream,
+        destination: str,
+        progress: typing.Optional[ProgressCallback] = None,
+    ) -> str:
+        """Download an audio stream.
+
+        Args:
+            stream (Stream): Stream from `resolve()`.
+            destination (str): Directory to download into.
+            progress (ProgressCallback, optional): Called with (bytes downloaded,
+                total bytes) as the download progresses. Defaults to None.
+
+        The download is resumed after connection failures, see
+        `resumable.download_resumable()`.
+
+        Raises:
+            DownloadError: If pytube silently failed to find the video.
+
+        Returns:
+            str: Downloaded file path.
+        """
+        filepath = os.path.join(destination, stream.handle.default_filename)
+        with _pytube_errors(stream.url):
+            _check_video_available(filepath=filepath, video_link=stream.url)
+        return download_resumable(stream.handle.url, filepath, progress=progress)
+
+    def metadata(self, url: str) -> typing.Dict[str, typing.Any]:
+        """Look up video metadata.
+
+        Args:
+            url (str): YouTube URL.
+
+        Returns:
+            typing.Dict[str, typing.Any]: 'title', 'author' and 'length' (seconds).
+        """
+        from pytube import YouTube
+
+        with _pytube_errors(url):
+            video = YouTube(url)
+            return {
+                "title": video.title,
+                "author": video.author,
+                "length": video.length,
+            }
+
+
+def yt_rip(
+    video_link: str,
+    destination: str | None = None,
+    progress: typing.Optional[ProgressCallback] = None,
+) -> str:
     """Rip audio from YouTube.
 
     Args:
         video_link (str): YouTube URL
         destination (str | None, optional): Target directory for download. If
             None (the default), will use `tempfile.gettempdir()`.
+        progress (ProgressCallback, optional): Called with (bytes downloaded,
+            total bytes) as the download progresses. Defaults to None.
+
+    Raises:
+        HTTPError: If the download fails.
+        DownloadError: If the video cannot be found or downloaded.
 
     Returns:
         str: Filepath to downloaded audio file.
@@ -55,35 +170,48 @@ def yt_rip(video_link: str, destination: str | None = None) -> str:
         destination = gettempdir()
     try:
         logger.info("Downloading audio from %s", video_link)
-        video = YouTube(video_link)
-        audio = video.streams.get_audio_only()
-        filepath = audio.download(output_path=destination)
-        _check_video_available(filepath=filepath, video_link=video_link)
+        backend = PytubeBackend()
+        stream = backend.resolve(video_link)
+        filepath = backend.download(stream, destination, progress=progress)
         logger.info("Download Completed!")
         return filepath
 
     except HTTPError:
         logger.error("HTTP Error for video_link '%s'", video_link, exc_info=True)
         raise
-    except VideoUnavailable:
-        logger.error(
-            "Video unavailable, check the link for '%s'", video_link, exc_info=True
-        )
-        raise
-    except RegexMatchError:
-        logger.error(
-            "Not recognised as a valid link: '%s'",
-            video_link,
-            exc_info=True,
-        )
+    except DownloadError as exc:
+        logger.error("%s", exc, exc_info=True)
         raise
 
 
+def _remove(file_path: str):
+    """Remove a file, if it exists."""
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
 class DownloadManager(prodcon.Producer):
     """
     Download Manager.
 
-    Download audio from YouTube, removing old downloads.
+    Download audio into a download cache (see `cache.DownloadCache`), through a
+    download backend (see `backend.Backend`), from YouTube by default. Requesting
+    a track that is already cached is served from disk.
+
+    Downloads run concurrently on a bounded thread pool. Requesting a video that
+    is already downloading returns the in-flight download rather than starting
+    another. A message is sent as each download completes, so results arrive in
+    completion order.
+
+    If a preparer is given (see `prepare.Preparer`), each download is prepared
+    before its success message is sent, and `current` is set to the prepared
+    file, so loading it into a deck needs no further work.
+
+    Prefetch downloads (e.g. for a `crate.Crate`) do not change `current`, and
+    their messages have the data key 'prefetch' set. They run only while
+    `prefetch_running` is set, and wait between chunks while it is clear.
     """
 
     def __init__(
@@ -91,12 +219,27 @@ class DownloadManager(prodcon.Producer):
         source: mes.Source,
         component: mes.Component,
         destination: typing.Optional[str] = None,
+        max_workers: int = 4,
+        backend: typing.Optional[Backend] = None,
+        cache: typing.Optional[DownloadCache] = None,
+        progress_rate: float = 10.0,
+        preparer: typing.Optional[Preparer] = None,
     ):
         """Construct Download Manager.
 
         Args:
             destination (str, optional): Download directory. If None (the default),
             then a temporary directory is used.
+            max_workers (int, optional): Maximum concurrent downloads. Defaults
+                to 4.
+            backend (Backend, optional): Download backend. Defaults to None (a
+                PytubeBackend).
+            cache (DownloadCache, optional): Download cache. Defaults to None (a
+                cache in the download directory).
+            progress_rate (float, optional): Maximum progress messages per second,
+                across all downloads. Defaults to 10.0.
+            preparer (Preparer, optional): Track preparer. Defaults to None (the
+                downloaded file is used as is).
         """
         if not destination:
             destination = gettempdir()
@@ -108,66 +251,231 @@ class DownloadManager(prodcon.Producer):
         self.destination = destination
         self.source = source
         self.component = component
-        self.downloads: queue.Queue[str] = queue.Queue(3)
+        self.backend: Backend = backend or PytubeBackend()
+        self.cache = cache or DownloadCache(directory=destination)
+        self.__progress_throttle = ProgressThrottle(max_rate=progress_rate)
+        self.preparer = preparer
         self.current: typing.Optional[str] = None
+        self.prefetch_running = threading.Event()
+        self.prefetch_running.set()
+        self.__executor = futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="download"
+        )
+        # In-flight downloads by cache key, (url, future).
+        self.__in_flight: typing.Dict[str, typing.Tuple[str, futures.Future]] = dict()
+        self.__cancelled: typing.Set[str] = set()
+        # Keys of in-flight downloads only requested as prefetches.
+        self.__prefetch: typing.Set[str] = set()
         self.__lock = threading.Lock()
 
-    def download(self, url: str):
-        """Download a track from YouTube.
+    def download(self, url: str, prefetch: bool = False) -> futures.Future:
+        """Download a track.
 
         Args:
-            url (str): YouTube URL.
+            url (str): Track URL, e.g. a YouTube URL.
+            prefetch (bool, optional): Download in the background, without
+                changing `current`. Defaults to False.
+
+        Returns:
+            futures.Future: Download future, resolving to the downloaded file
+                path or None if the download failed or was cancelled.
         """
-        t = threading.Thread(target=self.__download_helper, args=(url,))
-        t.start()
+        key = cache_key(url)
+        file_path = self.cache.get(key)
+        if file_path is not None:
+            logger.info("Serving %s from cache", url)
+            record = load_record(file_path) if self.preparer else None
+            if record is not None:
+                file_path = record.path
+            self.__success(url, file_path, True, record, prefetch=prefetch)
+            future: futures.Future = futures.Future()
+            future.set_result(file_path)
+            return future
 
-    def __download_helper(self, url: str):
         with self.__lock:
+            if key in self.__in_flight:
+                logger.info("Already downloading %s", url)
+                if not prefetch:
+                    # Wanted now, no longer just a prefetch.
+                    self.__prefetch.discard(key)
+                return self.__in_flight[key][1]
+            self.__cancelled.discard(key)
+            if prefetch:
+                self.__prefetch.add(key)
+            future = self.__executor.submit(self.__download_helper, url, key)
+            self.__in_flight[key] = (url, future)
+        future.add_done_callback(lambda f: self.__done(url, key, f))
+        return future
+
+    def cancel(self, url: str) -> bool:
+        """Cancel a download.
+
+        A queued download is not started. A running download cannot be
+        interrupted, but its file is discarded when it completes.
 
-            try:
-                file_path = yt_rip(video_link=url, destination=self.destination)
-                self.current = file_path
-                # Remove old tracks
-                self.__cleanup(file_path)
-
-                # Send message with file path of downloaded file.
-                self.send_message(
-                    self.make_message(
-                        trigger=mes.Trigger.DATA_OUTPUT,
-                        element=mes.Element.DOWNLOAD,
-                        data={"status": "success", "file_path": self.current},
-                    )
-                )
+        Args:
+            url (str): URL of the download to cancel.
 
-            except (HTTPError, VideoUnavailable, RegexMatchError) as exc:
-                # Send message with file path of downloaded file.
-                self.send_message(
-                    self.make_message(
-                        trigger=mes.Trigger.EXCEPTION,
-                        element=mes.Element.DOWNLOAD,
-                        data={"status": "failed", "exception": exc},
-                    )
-                )
+        Returns:
+            bool: True if the download was in-flight.
+        """
+        key = cache_key(url)
+        with self.__lock:
+            if key not in self.__in_flight:
+                return False
+            future = self.__in_flight[key][1]
+            self.__cancelled.add(key)
+        if not future.cancel():
+            logger.info("Download in progress, will discard %s", url)
+        return True
+
+    @property
+    def in_flight(self) -> typing.List[str]:
+        """Get the URLs currently queued or downloading."""
+        with self.__lock:
+            return [url for url, _ in self.__in_flight.values()]
 
-    def __cleanup(self, file_path: str):
-        """Cleanup old files.
+    @property
+    def progress_rate(self) -> float:
+        """Maximum progress messages per second, across all downloads."""
+        return 1 / self.__progress_throttle.interval
 
-        Tries to add the latest file to the downloads queue. If the queue
-        is full, pop items from the queue and delete corresponding file
-        until file can be added.
+    @progress_rate.setter
+    def progress_rate(self, rate: float):
+        self.__progress_throttle = ProgressThrottle(max_rate=rate)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the download pool, cancelling queued downloads, and flush the cache.
 
         Args:
-            file_path (str): File path of downloaded track.
+            wait (bool, optional): Wait for running downloads to finish.
+                Defaults to True.
         """
+        self.__executor.shutdown(wait=wait, cancel_futures=True)
+        self.cache.flush()
+
+    def __done(self, url: str, key: str, future: futures.Future):
+        with self.__lock:
+            self.__in_flight.pop(key, None)
+            self.__prefetch.discard(key)
+            cancelled = key in self.__cancelled
+            self.__cancelled.discard(key)
+        if cancelled and (future.cancelled() or future.result() is None):
+            self.send_message(
+                self.make_message(
+                    trigger=mes.Trigger.DATA_OUTPUT,
+                    element=mes.Element.DOWNLOAD,
+                    data={"status": "cancelled", "url": url},
+                )
+            )
+
+    def __download_helper(self, url: str, key: str) -> typing.Optional[str]:
+        reporter = ProgressReporter(
+            send=lambda data: self.__progress(url, key, data),
+            throttle=self.__progress_throttle,
+        )
+
+        def progress(done: int, total: int):
+            if key in self.__prefetch:
+                self.prefetch_running.wait()
+            reporter(done, total)
+
         try:
-            self.downloads.put(file_path, block=False)
-        except queue.Full:
-            old_file = self.downloads.get()
-            try:
-                os.remove(old_file)
-            except FileNotFoundError:
-                pass
-            self.__cleanup(file_path)
+            if key in self.__prefetch:
+                self.prefetch_running.wait()
+            stream = self.backend.resolve(url)
+            file_path = self.backend.download(
+                stream, self.cache.path_for(key), progress=progress
+            )
+        except (OSError, DownloadError) as exc:
+            logger.error("Download failed for '%s': %s", url, exc)
+            self.__failed(url, key, exc)
+            return None
+        except Exception as exc:
+            # A backend bug, still report the failure.
+            logger.exception("Download failed for '%s'", url)
+            self.__failed(url, key, exc)
+            return None
+
+        with self.__lock:
+            cancelled = key in self.__cancelled
+        if cancelled:
+            _remove(file_path)
+            return None
+
+        record = self.__prepare(file_path)
+
+        # Add to the cache, removing old tracks if the cache is full.
+        self.cache.put(key, file_path, url=url)
+        if record is not None:
+            file_path = record.path
+        self.__success(url, file_path, False, record, key in self.__prefetch)
+        return file_path
+
+    def __failed(self, url: str, key: str, exc: Exception):
+        """Send a message with the exception a download failed with."""
+        data = {"status": "failed", "url": url, "exception": exc}
+        if key in self.__prefetch:
+            data["prefetch"] = True
+        self.send_message(
+            self.make_message(
+                trigger=mes.Trigger.EXCEPTION,
+                element=mes.Element.DOWNLOAD,
+                data=data,
+            )
+        )
+
+    def __prepare(self, file_path: str) -> typing.Optional[PreparedTrack]:
+        """Prepare a downloaded file, if there is a preparer."""
+        if self.preparer is None:
+            return None
+        try:
+            return self.preparer.prepare(file_path).result()
+        except (OSError, ValueError, EOFError, wave.Error, futures.BrokenExecutor):
+            logger.exception("Could not prepare %s", file_path)
+            return None
+
+    def __progress(self, url: str, key: str, data: typing.Dict[str, typing.Any]):
+        """Send a progress message."""
+        data.update({"status": "progress", "url": url})
+        if key in self.__prefetch:
+            data["prefetch"] = True
+        self.send_message(
+            self.make_message(
+                trigger=mes.Trigger.DATA_OUTPUT,
+                element=mes.Element.DOWNLOAD,
+                data=data,
+            )
+        )
+
+    def __success(
+        self,
+        url: str,
+        file_path: str,
+        cached: bool,
+        record: typing.Optional[PreparedTrack] = None,
+        prefetch: bool = False,
+    ):
+        """Set the current file and send a message with its file path."""
+        data = {
+            "status": "success",
+            "url": url,
+            "file_path": file_path,
+            "cached": cached,
+        }
+        if record is not None:
+            data["track"] = record
+        if prefetch:
+            data["prefetch"] = True
+        else:
+            self.current = file_path
+        self.send_message(
+            self.make_message(
+                trigger=mes.Trigger.DATA_OUTPUT,
+                element=mes.Element.DOWNLOAD,
+                data=data,
+            )
+        )
 
     def make_message(
         self, trigger: mes.Trigger, element: mes.Element, data: dict
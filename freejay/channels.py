@@ -0,0 +1,35 @@
+"""
+Mixer Channel Layout.
+
+Describes the channels (decks) of the application. The model, view and controller
+are generated from this list, so adding a channel here adds a deck, a mixer channel
+strip and the message wiring between them.
+"""
+
+import typing
+import dataclasses
+from freejay.messages import messages as mes
+
+
+@dataclasses.dataclass(frozen=True)
+class ChannelSpec:
+    """Channel specification.
+
+    Attributes:
+        component (mes.Component): Message component for the channel.
+        name (str): Display name.
+        assign (str): Default crossfader assignment ('A', 'B' or 'THRU').
+    """
+
+    component: mes.Component
+    name: str
+    assign: str
+
+
+CHANNELS: typing.Tuple[ChannelSpec, ...] = (
+    ChannelSpec(component=mes.Component.LEFT_DECK, name="1", assign="A"),
+    ChannelSpec(component=mes.Component.RIGHT_DECK, name="2", assign="B"),
+    ChannelSpec(component=mes.Component.DECK_3, name="3", assign="A"),
+    ChannelSpec(component=mes.Component.DECK_4, name="4", assign="B"),
+    ChannelSpec(component=mes.Component.SAMPLER, name="S", assign="THRU"),
+)
@@ -0,0 +1,6 @@
+"""
+Timing services.
+
+Holds the timer wheel used to schedule callbacks on a single thread, and the
+master clock used to quantise deck actions to the beat.
+"""
@@ -0,0 +1,138 @@
+"""
+Master Clock.
+
+The master clock provides monotonic high resolution time and the beat phase of a
+reference deck. The quantised scheduler uses it to fire deck actions (play, cue
+jump, loop) on the next beat or bar, using a shared timer wheel.
+"""
+
+import math
+import time
+import typing
+import logging
+from freejay.player.djplayer import DJPlayer
+from freejay.clock.timerwheel import TimerWheel, Timer
+
+logger = logging.getLogger(__name__)
+
+# Number of beats per quantise division.
+QUANTISE_BEATS = {"beat": 1, "bar": 4}
+
+
+class MasterClock:
+    """
+    Master Clock.
+
+    Beat phase is taken from a reference deck with a beat grid (see
+    `DJPlayer.bpm` and `DJPlayer.beat_offset`). Deck time is sampled once per
+    call and projected onto the clock using the deck's tempo.
+
+    Attributes:
+        reference (DJPlayer | None): Reference deck.
+    """
+
+    def __init__(self, reference: typing.Optional[DJPlayer] = None):
+        """Construct MasterClock.
+
+        Args:
+            reference (DJPlayer, optional): Reference deck. Defaults to None.
+        """
+        self.reference = reference
+
+    @staticmethod
+    def now() -> float:
+        """Get the current clock time in seconds (monotonic, high resolution)."""
+        return time.perf_counter()
+
+    @property
+    def tempo(self) -> typing.Optional[float]:
+        """Get the playing tempo in beats per minute, None if there is no tempo.
+
+        There is no tempo if there is no reference deck, it is not playing or it
+        has no beat grid.
+        """
+        deck = self.reference
+        if deck is None or deck.bpm is None or not deck.playing:
+            return None
+        return deck.bpm * deck.speed
+
+    def beat(self) -> typing.Optional[typing.Tuple[float, float]]:
+        """Get the reference deck beat position.
+
+        Returns:
+            typing.Optional[typing.Tuple[float, float]]: (clock time, beat position)
+                or None if there is no tempo. Beat position counts beats since the
+                first beat of the track, the fractional part is the beat phase.
+        """
+        deck = self.reference
+        if deck is None or deck.bpm is None or not deck.playing:
+            return None
+        t = self.now()
+        return (t, (deck.time_pos - deck.beat_offset) * deck.bpm / 60)
+
+    def next_boundary(self, beats: int = 1) -> typing.Optional[float]:
+        """Get the clock time of the next beat (or bar) boundary.
+
+        Args:
+            beats (int, optional): Beats per boundary, e.g. 1 for the next beat
+                or 4 for the next bar. Defaults to 1.
+
+        Returns:
+            typing.Optional[float]: Clock time of the boundary, None if there is
+                no tempo.
+        """
+        tempo = self.tempo
+        position = self.beat()
+        if tempo is None or position is None:
+            return None
+        t, beat = position
+        target = (math.floor(beat / beats) + 1) * beats
+        return t + (target - beat) * 60 / tempo
+
+
+class QuantisedScheduler:
+    """
+    Quantised Scheduler.
+
+    Schedule actions on the next beat or bar of the master clock. If the master
+    clock has no tempo, the action is called immediately.
+    """
+
+    def __init__(self, clock: MasterClock, wheel: TimerWheel):
+        """Construct QuantisedScheduler.
+
+        Args:
+            clock (MasterClock): Master clock.
+            wheel (TimerWheel): Timer wheel used to fire actions.
+        """
+        self.clock = clock
+        self.wheel = wheel
+
+    def schedule(
+        self, action: typing.Callable, quantise: typing.Optional[str] = "beat", *args
+    ) -> typing.Optional[Timer]:
+        """Schedule an action.
+
+        Args:
+            action (typing.Callable): Function to call.
+            quantise (str, optional): 'beat' or 'bar', or None to call the action
+                now. Defaults to 'beat'.
+            *args: Positional arguments for the action.
+
+        Returns:
+            typing.Optional[Timer]: Timer handle (`Timer.deadline` is the target
+                beat time), or None if the action was called immediately.
+        """
+        target = None
+        if quantise is not None:
+            try:
+                beats = QUANTISE_BEATS[quantise]
+            except KeyError:
+                logger.warning("Unknown quantise value %r.", quantise)
+            else:
+                target = self.clock.next_boundary(beats)
+
+        if target is None:
+            action(*args)
+            return None
+        return self.wheel.schedule(target, action, *args)
@@ -0,0 +1,205 @@
+"""
+Timer Wheel.
+
+A hashed timer wheel runs any number of timers on a single thread. Scheduling and
+cancelling a timer are O(1), so timers can be cheaply rescheduled (e.g. for key
+debouncing) without starting a thread per timer.
+"""
+
+import math
+import time
+import typing
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class Timer:
+    """
+    Timer handle.
+
+    Returned by `TimerWheel.schedule()`, pass to `TimerWheel.cancel()` to
+    cancel the timer.
+
+    Attributes:
+        deadline (float): Time (`time.perf_counter()`) the timer is due.
+        callback (typing.Callable): Function to call when the timer is due.
+        args (tuple): Positional arguments for the callback.
+        tick (int): Wheel tick the timer is due on.
+        cancelled (bool): Has the timer been cancelled.
+        fired (float | None): Time the callback was called, None if not fired.
+    """
+
+    __slots__ = ("deadline", "callback", "args", "tick", "cancelled", "fired")
+
+    def __init__(
+        self, deadline: float, callback: typing.Callable, args: tuple, tick: int
+    ):
+        """Construct Timer.
+
+        Args:
+            deadline (float): Time (`time.perf_counter()`) the timer is due.
+            callback (typing.Callable): Function to call when the timer is due.
+            args (tuple): Positional arguments for the callback.
+            tick (int): Wheel tick the timer is due on.
+        """
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.tick = tick
+        self.cancelled = False
+        self.fired: typing.Optional[float] = None
+
+
+class TimerWheel:
+    """
+    Hashed Timer Wheel.
+
+    Time is divided into ticks, and each timer is placed in the wheel slot for the
+    tick it is due on. A single daemon thread advances the wheel once per tick and
+    calls the due callbacks, so a timer fires at most one tick (plus scheduling
+    jitter) after its deadline. The thread sleeps while no timers are pending.
+
+    Callbacks are called on the wheel thread and should return quickly.
+    Exceptions raised by a callback are logged.
+
+    The thread is started on the first call to `schedule()`.
+    """
+
+    def __init__(self, tick: float = 0.001, slots: int = 512):
+        """Construct TimerWheel.
+
+        Args:
+            tick (float, optional): Tick duration in seconds. Defaults to 0.001.
+            slots (int, optional): Number of wheel slots. Defaults to 512.
+        """
+        self.tick = tick
+        self.slots: typing.List[typing.Dict[int, Timer]] = [
+            dict() for _ in range(slots)
+        ]
+        self.__origin = time.perf_counter()
+        self.__current_tick = 0
+        self.__pending = 0
+        self.__condition = threading.Condition()
+        self.__thread: typing.Optional[threading.Thread] = None
+        self.running = False
+
+    def __len__(self) -> int:
+        """Get the number of pending timers."""
+        return self.__pending
+
+    def start(self):
+        """Start the wheel thread."""
+        with self.__condition:
+            if self.running:
+                return
+            self.running = True
+            self.__current_tick = int(self.__tick_at(time.perf_counter()))
+            self.__thread = threading.Thread(
+                target=self.__run, name="timer-wheel", daemon=True
+            )
+            self.__thread.start()
+
+    def stop(self):
+        """Stop the wheel thread. Pending timers are not called."""
+        with self.__condition:
+            self.running = False
+            self.__condition.notify()
+
+    def schedule(self, deadline: float, callback: typing.Callable, *args) -> Timer:
+        """Schedule a callback.
+
+        Args:
+            deadline (float): Time (`time.perf_counter()`) to call the callback.
+            callback (typing.Callable): Function to call.
+            *args: Positional arguments for the callback.
+
+        Returns:
+            Timer: Timer handle.
+        """
+        if not self.running:
+            self.start()
+
+        with self.__condition:
+            tick = max(self.__current_tick + 1, math.ceil(self.__tick_at(deadline)))
+            timer = Timer(deadline=deadline, callback=callback, args=args, tick=tick)
+            self.slots[tick % len(self.slots)][id(timer)] = timer
+            self.__pending += 1
+            if self.__pending == 1:
+                self.__condition.notify()
+        return timer
+
+    def schedule_after(self, delay: float, callback: typing.Callable, *args) -> Timer:
+        """Schedule a callback after a delay.
+
+        Args:
+            delay (float): Delay in seconds.
+            callback (typing.Callable): Function to call.
+            *args: Positional arguments for the callback.
+
+        Returns:
+            Timer: Timer handle.
+        """
+        return self.schedule(time.perf_counter() + delay, callback, *args)
+
+    def cancel(self, timer: Timer) -> bool:
+        """Cancel a timer.
+
+        Args:
+            timer (Timer): Timer handle.
+
+        Returns:
+            bool: True if the timer was pending and has been cancelled.
+        """
+        with self.__condition:
+            slot = self.slots[timer.tick % len(self.slots)]
+            if slot.pop(id(timer), None) is None:
+                return False
+            timer.cancelled = True
+            self.__pending -= 1
+            return True
+
+    def __tick_at(self, t: float) -> float:
+        return (t - self.__origin) / self.tick
+
+    def __run(self):
+        """Advance the wheel, calling due timers, until stopped."""
+        while True:
+            with self.__condition:
+                while self.running and not self.__pending:
+                    self.__condition.wait()
+                if not self.running:
+                    return
+                now_tick = int(self.__tick_at(time.perf_counter()))
+                due = self.__advance(now_tick)
+
+            now = time.perf_counter()
+            for timer in due:
+                timer.fired = now
+                try:
+                    timer.callback(*timer.args)
+                except Exception:
+                    logger.exception("Timer callback raised an exception.")
+
+            # Sleep until the start of the next tick.
+            next_tick = self.__origin + (now_tick + 1) * self.tick
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    def __advance(self, now_tick: int) -> typing.List[Timer]:
+        """Advance the wheel to `now_tick`, removing and returning due timers."""
+        due: typing.List[Timer] = []
+        n_slots = len(self.slots)
+        # Catch up on missed ticks, visiting each slot at most once.
+        first = max(self.__current_tick + 1, now_tick - n_slots + 1)
+        for tick in range(first, now_tick + 1):
+            slot = self.slots[tick % n_slots]
+            if slot:
+                for key in [k for k, t in slot.items() if t.tick <= now_tick]:
+                    due.append(slot.pop(key))
+        self.__current_tick = max(self.__current_tick, now_tick)
+        self.__pending -= len(due)
+        due.sort(key=lambda t: t.deadline)
+        return due
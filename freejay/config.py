@@ -0,0 +1,65 @@
+"""
+Config File Loading.
+
+Keymaps (see `freejay.keyboard.keymapper`) and control maps (see
+`freejay.hardware.mapper`) are loaded from TOML or JSON config files, and name
+message components and elements by their enum member names. The config is
+validated by the caller, collecting every problem before raising.
+"""
+
+import os
+import json
+import typing
+import tomllib
+
+
+def load_config(file_path: str, error: typing.Type[Exception], what: str) -> typing.Any:
+    """Load a TOML or JSON config file.
+
+    Args:
+        file_path (str): Config file path, ".toml" or ".json".
+        error (typing.Type[Exception]): Exception raised for an invalid file,
+            e.g. `KeymapError`.
+        what (str): Config name for error messages, e.g. "keymap".
+
+    Raises:
+        OSError: If the file cannot be read.
+        error: If the file is not TOML or JSON, or cannot be parsed.
+
+    Returns:
+        typing.Any: Parsed config.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    try:
+        if extension == ".toml":
+            with open(file_path, "rb") as file:
+                return tomllib.load(file)
+        if extension == ".json":
+            with open(file_path, encoding="utf-8") as file:
+                return json.load(file)
+    except (tomllib.TOMLDecodeError, json.JSONDecodeError) as exc:
+        raise error(f"Cannot parse {what} {file_path}: {exc}") from exc
+    raise error(f"{what.capitalize()} must be a .toml or .json file: {file_path}")
+
+
+def parse_enum(
+    enum: typing.Type[typing.Any],
+    value: typing.Any,
+    where: str,
+    errors: typing.List[str],
+) -> typing.Any:
+    """Look up an enum member by case insensitive name, appending any error.
+
+    Args:
+        enum (typing.Type[typing.Any]): Enum, e.g. `mes.Component`.
+        value (typing.Any): Member name from the config.
+        where (str): Config location for the error message.
+        errors (typing.List[str]): Errors to append to.
+
+    Returns:
+        typing.Any: Enum member, None if the name is unknown.
+    """
+    if isinstance(value, str) and value.upper() in enum.__members__:
+        return enum[value.upper()]
+    errors.append(f"{where}: unknown {enum.__name__.lower()} {value!r}")
+    return None
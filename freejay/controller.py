@@ -1,18 +1,27 @@
 """Application Controller."""
 
+import typing
 import logging
 from freejay.messages import messages as mes
 from freejay.message_dispatcher import worker
 from freejay.messages import router
 from freejay.keyboard import debounce
 from freejay.message_dispatcher.handler import Handler
-from freejay.keyboard.keymapper import KeyMapper, keybindings
+from freejay.keyboard.keymapper import KeyMapper, Keymap
+from freejay.hardware.mapper import ControlMapper
 from freejay.controller_cb import player_cb
 from freejay.controller_cb import download_cb
 from freejay.controller_cb import mixer_cb
-from .view import View
+from freejay.controller_cb import recorder_cb
+from freejay.controller_cb import state_cb
+from freejay.session import log as session_log
+from freejay.remote.server import ControlServer
 from .model import Model
 
+if typing.TYPE_CHECKING:
+    # Imports Tk, which a headless controller does not need.
+    from .view import View
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,26 +33,25 @@ def register_model_callbacks(handler: Handler, model: Model):
         handler (Handler): Message Handler
         model (Model): Model
     """
-    player_cb.register_player_cb(
-        handler=handler,
-        player=model.left_deck,
-        download_manager=model.download,
-        component=mes.Component.LEFT_DECK,
-    )
-    player_cb.register_player_cb(
-        handler=handler,
-        player=model.right_deck,
-        download_manager=model.download,
-        component=mes.Component.RIGHT_DECK,
-    )
+    for component, deck in model.decks.items():
+        player_cb.register_player_cb(
+            handler=handler,
+            player=deck,
+            download_manager=model.download,
+            component=component,
+            scheduler=model.scheduler,
+            crate=model.crate,
+            ramp=model.hold,
+        )
     mixer_cb.register_mixer_cb(handler=handler, mixer=model.mixer)
 
     download_cb.register_download_model_cb(
-        handler=handler, download_manager=model.download
+        handler=handler, download_manager=model.download, crate=model.crate
     )
+    recorder_cb.register_recorder_model_cb(handler=handler, recorder=model.recorder)
 
 
-def register_view_callbacks(handler: Handler, view: View):
+def register_view_callbacks(handler: Handler, view: "View"):
     """
     Register view callbacks.
 
@@ -52,28 +60,31 @@ def register_view_callbacks(handler: Handler, view: View):
         view (View): View
     """
     download_cb.register_download_view_cb(handler=handler, download_view=view.download)
+    recorder_cb.register_recorder_view_cb(handler=handler, recorder_view=view.recorder)
+    state_cb.register_state_view_cb(
+        handler=handler, deck_views=view.decks, mixer_view=view.mixer
+    )
 
 
-def register_view_message_routes(
+def register_input_message_routes(
     message_router: router.MessageRouter,
     model_queue: worker.QueueListener,
     debouncer: debounce.MessageDebouncer,
     keymapper: KeyMapper,
-    view: View,
 ):
     """
-    Register 'View' Message Routes.
+    Register 'Input' Message Routes.
 
     Application components communicate via messages and are connected
     using the 'Producer' and 'Consumer' protocols. This function registers
-    those produce/consume relationships for messages coming from the app View.
+    those produce/consume relationships for input messages (key, button and
+    data messages), wherever they come from.
 
     Args:
         message_router (router.MessageRouter): Message router
         model_queue (worker.QueueListener): Message queue
         debouncer (debounce.MessageDebouncer): Message debouncer
         keymapper (KeyMapper): Keybindings mapper
-        view (View): View
     """
     # Register route for sending messages to the model_queue.
     message_router.register_route(
@@ -92,11 +103,110 @@ def register_view_message_routes(
 
     # Debouncer sends messages to keymapper
     keymapper.listen(debouncer)
-    # Tkroot and Keymapper send messages to message router
+    # Keymapper sends messages to message router
     message_router.listen(keymapper)
+
+
+def register_hardware_input(
+    message_router: router.MessageRouter,
+    control_mapper: ControlMapper,
+    model: typing.Optional[Model] = None,
+):
+    """
+    Register a hardware controller as an input.
+
+    Mapped controller messages are routed like any other input message, e.g. by
+    `register_input_message_routes`. If a model is given, relative deck jog
+    controls drive the deck jog wheels directly, bypassing the model queue.
+
+    Args:
+        message_router (router.MessageRouter): Message router
+        control_mapper (ControlMapper): Controller input mapper
+        model (Model, optional): Model. Defaults to None.
+    """
+    message_router.listen(control_mapper)
+    if model is not None:
+        for component, jog_wheel in model.jogs.items():
+            control_mapper.register_direct(component, mes.Element.JOG, jog_wheel.move)
+
+
+def register_control_server(
+    input_router: router.MessageRouter,
+    model_router: router.MessageRouter,
+    model_queue: worker.QueueListener,
+    server: ControlServer,
+):
+    """
+    Register a control socket server as an input, and as a state subscriber.
+
+    The server's messages are routed like any other input message, e.g. by
+    `register_input_message_routes`. Deck and mixer state messages from the
+    model are tapped before routing and sent to the server's subscribers. The
+    server pauses reading commands while the model queue is long.
+
+    Args:
+        input_router (router.MessageRouter): Input message router
+        model_router (router.MessageRouter): Model message router
+        model_queue (worker.QueueListener): Model message queue
+        server (ControlServer): Control socket server
+    """
+    input_router.listen(server)
+    model_router.register_tap(
+        consumer=server,
+        condition=lambda m: m.type == mes.Type.DATA
+        and m.content.element == mes.Element.STATE,
+    )
+    server.backlog = model_queue.qsize
+
+
+def register_view_message_routes(
+    message_router: router.MessageRouter,
+    model_queue: worker.QueueListener,
+    debouncer: debounce.MessageDebouncer,
+    keymapper: KeyMapper,
+    view: "View",
+):
+    """
+    Register 'View' Message Routes.
+
+    Application components communicate via messages and are connected
+    using the 'Producer' and 'Consumer' protocols. This function registers
+    those produce/consume relationships for messages coming from the app View.
+
+    Args:
+        message_router (router.MessageRouter): Message router
+        model_queue (worker.QueueListener): Message queue
+        debouncer (debounce.MessageDebouncer): Message debouncer
+        keymapper (KeyMapper): Keybindings mapper
+        view (View): View
+    """
+    register_input_message_routes(
+        message_router=message_router,
+        model_queue=model_queue,
+        debouncer=debouncer,
+        keymapper=keymapper,
+    )
+    # Tkroot sends messages to message router
     message_router.listen(view.tkroot)
 
 
+def register_session_log(message_router: router.MessageRouter, file_path: str):
+    """
+    Record the control messages passing through a router to a session log.
+
+    Only Button and Data messages are recorded, key messages are recorded
+    after they have been mapped, so that replaying the log does not repeat them.
+
+    Args:
+        message_router (router.MessageRouter): Message router
+        file_path (str): Session log path.
+    """
+    message_router.register_tap(
+        consumer=session_log.SessionLog(file_path),
+        condition=lambda m: m.type in (mes.Type.BUTTON, mes.Type.DATA),
+    )
+
+
 def register_model_message_routes(
     message_router: router.MessageRouter,
     view_queue: worker.QueueListener,
@@ -120,8 +230,12 @@ def register_model_message_routes(
         consumer=view_queue,
     )
 
-    # Message router listens to the Download manager.
+    # Message router listens to the Download manager, Crate, Recorder and the
+    # deck and mixer state pump.
     message_router.listen(model.download)
+    message_router.listen(model.crate)
+    message_router.listen(model.recorder)
+    message_router.listen(model.state)
 
 
 def make_workmanager() -> worker.WorkManager:
@@ -150,13 +264,18 @@ class Controller:
     def __init__(self):
         """Construct Controller."""
         self.debouncer = debounce.MessageDebouncer()
-        self.keymapper = KeyMapper(keybindings)
+        self.keymapper = KeyMapper()
         self.model_message_router = router.MessageRouter()
         self.view_message_router = router.MessageRouter()
         self.work_manager = make_workmanager()
 
 
-def make_controller(model: Model, view: View) -> Controller:
+def make_controller(
+    model: Model,
+    view: "View",
+    session: typing.Optional[str] = None,
+    keymap: typing.Optional[Keymap] = None,
+) -> Controller:
     """Construct and Configure the Controller.
 
     Creates the controller and configures messages routing and dispatching.
@@ -164,11 +283,19 @@ def make_controller(model: Model, view: View) -> Controller:
     Args:
         model (Model): Model
         view (View): View
+        session (str, optional): Session log path to record control messages
+            to. Defaults to None (not recorded).
+        keymap (Keymap, optional): Keymap. Defaults to None (the default
+            keymap).
 
     Returns:
         Controller: Controller
     """
     controller = Controller()
+    if keymap is not None:
+        controller.keymapper.set_keymap(keymap)
+    if session:
+        register_session_log(controller.view_message_router, session)
 
     register_model_callbacks(
         handler=controller.work_manager.get_handler("model"),
@@ -194,3 +321,50 @@ def make_controller(model: Model, view: View) -> Controller:
     )
 
     return controller
+
+
+def make_headless_controller(
+    model: Model,
+    session: typing.Optional[str] = None,
+    keymap: typing.Optional[Keymap] = None,
+) -> Controller:
+    """Construct and Configure a Controller without a View.
+
+    Input messages are sent to `Controller.view_message_router`, e.g. by a
+    session replay. Messages from the model are dropped.
+
+    Args:
+        model (Model): Model
+        session (str, optional): Session log path to record control messages
+            to. Defaults to None (not recorded).
+        keymap (Keymap, optional): Keymap. Defaults to None (the default
+            keymap).
+
+    Returns:
+        Controller: Controller
+    """
+    controller = Controller()
+    if keymap is not None:
+        controller.keymapper.set_keymap(keymap)
+    if session:
+        register_session_log(controller.view_message_router, session)
+
+    register_model_callbacks(
+        handler=controller.work_manager.get_handler("model"),
+        model=model,
+    )
+
+    # No routes, model messages are dropped.
+    controller.model_message_router.listen(model.download)
+    controller.model_message_router.listen(model.crate)
+    controller.model_message_router.listen(model.recorder)
+    controller.model_message_router.listen(model.state)
+
+    register_input_message_routes(
+        message_router=controller.view_message_router,
+        model_queue=controller.work_manager.get_queue("model"),
+        debouncer=controller.debouncer,
+        keymapper=controller.keymapper,
+    )
+
+    return controller
@@ -5,16 +5,22 @@ Callback functions are registered with the message handler. The handler
 will check the content of incoming messages and call the appropriate callback.
 
 In the case of the downloader, the view can send a message containing a YouTube
-URL to rip. The model will send a message containing the file path of the downloaded
-file.
+URL to rip (or to cancel, with the data key 'cancel' set, or to add to the crate,
+with the data key 'queue' set). A crate button press drops the tracks that failed
+to prefetch from the crate. The model will send a message containing the file
+path of the downloaded file, and crate messages as the crate changes.
 """
 
 import typing
 import logging
 from freejay.audio_download import ytrip
+from freejay.audio_download.crate import Crate
 from freejay.message_dispatcher import handler
+from freejay.controller_cb import factories
 from freejay.messages import messages as mes
-from freejay.tk import tk_download
+
+if typing.TYPE_CHECKING:
+    from freejay.tk import tk_download
 
 
 logger = logging.getLogger(__name__)
@@ -22,11 +28,13 @@ logger = logging.getLogger(__name__)
 
 def make_download_model_callback(
     download_manager: ytrip.DownloadManager,
+    crate: typing.Optional[Crate] = None,
 ) -> typing.Callable[[mes.Message[mes.Button]], None]:
     """Make callback function for download model.
 
     Args:
         download_manager (DownloadManager): Download manager.
+        crate (Crate, optional): Track crate. Defaults to None.
 
     Returns:
         typing.Callable[[mes.Message[mes.Button]], None]: Callback function.
@@ -34,30 +42,49 @@ def make_download_model_callback(
 
     def callback(msg: mes.Message[mes.Button]):
         url = msg.content.data.get("url")
-        if isinstance(url, str):
-            download_manager.download(url=url)
+        if not isinstance(url, str):
+            return
+        if msg.content.data.get("cancel"):
+            download_manager.cancel(url=url)
+        elif msg.content.data.get("queue") and crate is not None:
+            crate.add(url=url)
+        else:
+            download = download_manager.download(url=url)
+            if crate is not None:
+                # Crate prefetching waits for other downloads.
+                fill = crate.fill
+                download.add_done_callback(lambda _: fill())
 
     return callback
 
 
 def register_download_model_cb(
-    handler: handler.Handler, download_manager: ytrip.DownloadManager
+    handler: handler.Handler,
+    download_manager: ytrip.DownloadManager,
+    crate: typing.Optional[Crate] = None,
 ):
     """Register download model callbacks.
 
     Args:
         handler (Handler): Message handler.
         download_manager (DownloadManager): Download manager.
+        crate (Crate, optional): Track crate. Defaults to None.
     """
     handler.register_handler(
-        callback=make_download_model_callback(download_manager),
+        callback=make_download_model_callback(download_manager, crate),
         component=mes.Component.DOWNLOAD,
         element=mes.Element.DOWNLOAD,
     )
+    if crate is not None:
+        handler.register_handler(
+            callback=factories.make_button_cb(crate.drop_failed),
+            component=mes.Component.DOWNLOAD,
+            element=mes.Element.CRATE,
+        )
 
 
 def make_download_view_callback(
-    download_view: tk_download.TkDownload,
+    download_view: "tk_download.TkDownload",
 ):
     """Make callback function for download view.
 
@@ -69,6 +96,9 @@ def make_download_view_callback(
     """
 
     def callback(message: mes.Message[mes.Data]):
+        if message.content.data.get("prefetch"):
+            # Crate prefetches are shown by the crate status.
+            return
         if message.content.data["status"] == "success":
             file_path = message.content.data["file_path"]
             download_view.file_path = file_path
@@ -77,13 +107,17 @@ def make_download_view_callback(
             download_view.label_var.set(
                 "An error occurred. Please check the URL and try again."
             )
+        elif message.content.data["status"] == "progress":
+            download_view.show_progress(**message.content.data)
+        elif message.content.data["status"] == "cancelled":
+            download_view.label_var.set("Download cancelled.")
 
     return callback
 
 
 def register_download_view_cb(
     handler: handler.Handler,
-    download_view: tk_download.TkDownload,
+    download_view: "tk_download.TkDownload",
 ):
     """Register download view callbacks.
 
@@ -91,8 +125,17 @@ def register_download_view_cb(
         handler (Handler): Message handler.
         download_view (TkDownload): Download view.
     """
+    # View callbacks are run on the Tk main loop.
+    dispatcher = download_view.tkroot.dispatcher
     handler.register_handler(
-        callback=make_download_view_callback(download_view),
+        callback=dispatcher.wrap(make_download_view_callback(download_view)),
         component=mes.Component.DOWNLOAD,
         element=mes.Element.DOWNLOAD,
     )
+    handler.register_handler(
+        callback=dispatcher.wrap(
+            lambda message: download_view.show_crate(**message.content.data)
+        ),
+        component=mes.Component.DOWNLOAD,
+        element=mes.Element.CRATE,
+    )
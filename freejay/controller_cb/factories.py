@@ -2,10 +2,10 @@
 Functions to generate callback functions for the message handler.
 """
 
+import copy
 import typing
 from freejay.messages import messages as mes
-
-# from freejay import djplayer
+from freejay.clock.master import QuantisedScheduler
 
 
 def make_button_cb(
@@ -77,3 +77,43 @@ def make_data_cb(
         cb(**message.content.data)
 
     return callback
+
+
+def make_quantised_cb(
+    cb: typing.Callable[[mes.Message[mes.Button]], None],
+    scheduler: QuantisedScheduler,
+) -> typing.Callable[[mes.Message[mes.Button]], None]:
+    """Make Quantised Button callback.
+
+    Helper function to wrap a Button callback so that presses can be quantised
+    to the master clock. If the message 'content.data' dictionary has a 'quantise'
+    key ('beat' or 'bar'), the key is removed and the callback is scheduled for the
+    next beat or bar. Otherwise the callback is called immediately.
+
+    Args:
+        cb (typing.Callable[[mes.Message[mes.Button]], None]): Button callback.
+        scheduler (QuantisedScheduler): Quantised scheduler.
+
+    Returns:
+        typing.Callable[[mes.Message[mes.Button]], None]: Callback function.
+    """
+
+    def callback(message: mes.Message[mes.Button]) -> None:
+        """Quantised Button callback function.
+
+        Args:
+            message (mes.Message[mes.Button]): Message with Button content.
+        """
+        quantise = message.content.data.get("quantise")
+        if quantise is None or message.content.press_release != mes.PressRelease.PRESS:
+            cb(message)
+            return
+
+        # Copy the message without the 'quantise' key for the callback.
+        content = copy.copy(message.content)
+        content.data = {k: v for k, v in content.data.items() if k != "quantise"}
+        scheduled = copy.copy(message)
+        scheduled.content = content
+        scheduler.schedule(cb, quantise, scheduled)
+
+    return callback
@@ -3,7 +3,16 @@
 import typing
 from freejay.message_dispatcher import handler
 from freejay.messages import messages as mes
-from freejay.player.mixer import Mixer
+from freejay.player.mixer import Mixer, Channel
+from freejay.player.eq import ChannelEQ
+
+# Channel EQ attribute set by each EQ message element.
+_eq_elements = {
+    mes.Element.EQ_LOW: "low",
+    mes.Element.EQ_MID: "mid",
+    mes.Element.EQ_HIGH: "high",
+    mes.Element.FILTER: "filter",
+}
 
 
 def make_crossfader_callback(
@@ -12,8 +21,8 @@ def make_crossfader_callback(
     """Make a crossfader callback.
 
     Returned function is a closure that has access to the mixer instance. If called
-    on a message, the mixers crossfader position is set to the value in the recieved
-    message.
+    on a message, the mixers crossfader position (and curve, if given) is set to the
+    values in the recieved message.
 
     Args:
         mixer (Mixer): mixer Model to call.
@@ -28,16 +37,93 @@ def make_crossfader_callback(
         Args:
             message (mes.Message[mes.Data]): Message with crossfader position.
         """
+        if "curve" in message.content.data:
+            mixer.crossfader.curve = message.content.data["curve"]
         mixer.crossfader.position = message.content.data["position"]
 
     return callback
 
 
+def make_eq_callback(
+    eq: ChannelEQ, attribute: str
+) -> typing.Callable[[mes.Message[mes.Data]], None]:
+    """Make a channel EQ callback.
+
+    Returned function is a closure that has access to the channel EQ. If called
+    on a message, the EQ attribute (e.g. 'low' or 'filter') is set to the value
+    in the recieved message.
+
+    Args:
+        eq (ChannelEQ): channel EQ model.
+        attribute (str): EQ attribute to set ('low', 'mid', 'high' or 'filter').
+
+    Returns:
+        typing.Callable[[mes.Message[mes.Data]], None]: Callback function.
+    """
+
+    def callback(message: mes.Message[mes.Data]):
+        """Channel EQ callback.
+
+        Args:
+            message (mes.Message[mes.Data]): Message with EQ value.
+        """
+        setattr(eq, attribute, message.content.data["value"])
+
+    return callback
+
+
+def make_channel_fader_callback(
+    channel: Channel,
+) -> typing.Callable[[mes.Message[mes.Data]], None]:
+    """Make a channel fader callback.
+
+    Args:
+        channel (Channel): mixer channel.
+
+    Returns:
+        typing.Callable[[mes.Message[mes.Data]], None]: Callback function.
+    """
+
+    def callback(message: mes.Message[mes.Data]):
+        """Channel fader callback.
+
+        Args:
+            message (mes.Message[mes.Data]): Message with fader value.
+        """
+        channel.fader = message.content.data["value"]
+
+    return callback
+
+
+def make_assign_callback(
+    channel: Channel,
+) -> typing.Callable[[mes.Message[mes.Data]], None]:
+    """Make a crossfader assignment callback.
+
+    Args:
+        channel (Channel): mixer channel.
+
+    Returns:
+        typing.Callable[[mes.Message[mes.Data]], None]: Callback function.
+    """
+
+    def callback(message: mes.Message[mes.Data]):
+        """Crossfader assignment callback.
+
+        Args:
+            message (mes.Message[mes.Data]): Message with assignment
+                ('A', 'B' or 'THRU').
+        """
+        channel.assign = message.content.data["assign"]
+
+    return callback
+
+
 def register_mixer_cb(
     handler: handler.Handler,
     mixer: Mixer,
 ):
-    """Register the crossfader callback with a message handler.
+    """Register the crossfader and channel callbacks with a message handler.
 
     Args:
         handler (handler.Handler): message handler.
@@ -48,3 +134,21 @@ def register_mixer_cb(
         component=mes.Component.MIXER,
         element=mes.Element.CROSSFADER,
     )
+
+    for component, channel in mixer.channels.items():
+        handler.register_handler(
+            callback=make_channel_fader_callback(channel),
+            component=component,
+            element=mes.Element.CHANNEL_FADER,
+        )
+        handler.register_handler(
+            callback=make_assign_callback(channel),
+            component=component,
+            element=mes.Element.XF_ASSIGN,
+        )
+        for element, attribute in _eq_elements.items():
+            handler.register_handler(
+                callback=make_eq_callback(channel.eq, attribute),
+                component=component,
+                element=element,
+            )
@@ -8,15 +8,24 @@ changing the state of the audio player as required.
 
 import typing
 import logging
+import contextlib
 from freejay.player import djplayer
 from freejay.controller_cb import factories
 from freejay.message_dispatcher import handler
 from freejay.messages import messages as mes
 from freejay.audio_download.ytrip import DownloadManager
+from freejay.audio_download.crate import Crate
+from freejay.clock.master import QuantisedScheduler
+from freejay.player.hold import HoldRamp
 
 
 logger = logging.getLogger(__name__)
 
+# Jogs per second when a jog button is first held, ramping up while held.
+JOG_HOLD_RATE = 4.0
+# Maximum pitch nudge while a nudge button is held.
+NUDGE_HOLD_MAX = 0.5
+
 
 def make_cue_callback(
     player: djplayer.DJPlayer,
@@ -67,57 +76,190 @@ def make_stop_callback(
 
 def make_nudge_callback(
     player: djplayer.DJPlayer,
+    ramp: typing.Optional[HoldRamp] = None,
 ) -> typing.Callable[[mes.Message[mes.Button]], None]:
     """Make a 'nudge' callback.
 
+    With a hold ramp, the nudge grows while the button is held, up to
+    NUDGE_HOLD_MAX.
+
     Args:
         player (djplayer.DJPlayer): Player to 'nudge' on callback.
+        ramp (HoldRamp, optional): Press-and-hold ramp. Defaults to None (no
+            acceleration).
 
     Returns:
         typing.Callable[[mes.Message[mes.Button]], None]: Callback function
     """
-    callback = factories.make_button_cb(
-        press_cb=player.nudge_press, release_cb=player.nudge_release
-    )
-    return callback
+    if ramp is None:
+        return factories.make_button_cb(
+            press_cb=player.nudge_press, release_cb=player.nudge_release
+        )
+    hold_ramp = ramp
+    key = (player, mes.Element.NUDGE)
+
+    def press(value: float = 0.15):
+        player.nudge_press(value)
+        limit = max(abs(value), NUDGE_HOLD_MAX)
+        hold_ramp.press(
+            key,
+            lambda factor, elapsed: player.nudge_press(
+                max(-limit, min(limit, value * factor))
+            ),
+        )
+
+    def release():
+        hold_ramp.release(key)
+        player.nudge_release()
+
+    return factories.make_button_cb(press_cb=press, release_cb=release)
 
 
 def make_jog_callback(
     player: djplayer.DJPlayer,
+    ramp: typing.Optional[HoldRamp] = None,
 ) -> typing.Callable[[mes.Message[mes.Button]], None]:
     """Make a 'jog' callback.
 
+    A press jogs once. With a hold ramp, holding the button keeps jogging by
+    JOG_HOLD_RATE jogs per second to begin with, faster the longer it is held.
+
     Args:
         player (djplayer.DJPlayer): Player to 'jog' on callback.
+        ramp (HoldRamp, optional): Press-and-hold ramp. Defaults to None (a
+            single jog per press).
+
+    Returns:
+        typing.Callable[[mes.Message[mes.Button]], None]: Callback function
+    """
+    if ramp is None:
+        return factories.make_button_cb(press_cb=player.jog)
+    hold_ramp = ramp
+    key = (player, mes.Element.JOG)
+
+    def press(value: float = 10.0):
+        player.jog(value)
+        hold_ramp.press(
+            key,
+            lambda factor, elapsed: player.jog(
+                value * JOG_HOLD_RATE * factor * elapsed
+            ),
+        )
+
+    def release():
+        hold_ramp.release(key)
+
+    return factories.make_button_cb(press_cb=press, release_cb=release)
+
+
+def make_cue_jump_callback(
+    player: djplayer.DJPlayer,
+) -> typing.Callable[[mes.Message[mes.Button]], None]:
+    """Make a 'cue jump' callback.
+
+    Args:
+        player (djplayer.DJPlayer): Player to jump to the cue point on callback.
+
+    Returns:
+        typing.Callable[[mes.Message[mes.Button]], None]: Callback function
+    """
+    callback = factories.make_button_cb(press_cb=player.cue_jump)
+    return callback
+
+
+def make_loop_callback(
+    player: djplayer.DJPlayer,
+) -> typing.Callable[[mes.Message[mes.Button]], None]:
+    """Make a 'loop' callback.
+
+    Args:
+        player (djplayer.DJPlayer): Player to start/stop looping on callback.
 
     Returns:
         typing.Callable[[mes.Message[mes.Button]], None]: Callback function
     """
-    callback = factories.make_button_cb(press_cb=player.jog)
+    callback = factories.make_button_cb(press_cb=player.loop_toggle)
+    return callback
+
+
+def make_bpm_callback(
+    player: djplayer.DJPlayer,
+) -> typing.Callable[[mes.Message[mes.Data]], None]:
+    """Make bpm callback, setting the player beat grid.
+
+    Message data holds the tempo under 'value' and optionally the time of the
+    first beat under 'offset'.
+
+    Args:
+        player (djplayer.DJPlayer): player
+
+    Returns:
+        typing.Callable[[mes.Message[mes.Data]], None]: Callback function
+    """
+
+    def callback(message: mes.Message[mes.Data]) -> None:
+        bpm = message.content.data["value"]
+        player.bpm = float(bpm) if bpm else None
+        player.beat_offset = float(message.content.data.get("offset", 0.0))
+
     return callback
 
 
+def make_master_callback(
+    player: djplayer.DJPlayer, scheduler: QuantisedScheduler
+) -> typing.Callable[[mes.Message[mes.Button]], None]:
+    """Make master callback, setting the player as the master clock reference.
+
+    Args:
+        player (djplayer.DJPlayer): player
+        scheduler (QuantisedScheduler): Quantised scheduler.
+
+    Returns:
+        typing.Callable[[mes.Message[mes.Button]], None]: Callback function
+    """
+    return factories.make_button_cb(
+        press_cb=lambda: setattr(scheduler.clock, "reference", player)
+    )
+
+
 def make_load_callback(
-    player: djplayer.DJPlayer, download_manager: DownloadManager
+    player: djplayer.DJPlayer,
+    download_manager: DownloadManager,
+    crate: typing.Optional[Crate] = None,
 ) -> typing.Callable[[mes.Message[mes.Button]], None]:
     """Make load callback.
 
+    Loads the next ready track from the crate, if there is one, otherwise the
+    most recently downloaded track. A crate track stays in the crate until the
+    player has loaded it. Crate prefetching is paused while loading.
+
     Args:
         player (DJPlayer): player
         download_manager (DownloadManager): Download manager.
+        crate (Crate, optional): Track crate. Defaults to None.
 
     Returns:
         typing.Callable[[mes.Message[mes.Button]], None]: Callback function
     """
 
     def callback(message: mes.Message[mes.Button]) -> None:
-        file_path = download_manager.current
-        if (
-            file_path
-            and file_path != ""
-            and message.content.press_release == mes.PressRelease.PRESS
-        ):
-            player.load(filename=file_path)
+        if message.content.press_release != mes.PressRelease.PRESS:
+            return
+        with crate.paused() if crate is not None else contextlib.nullcontext():
+            queued = crate.peek_ready() if crate is not None else None
+            file_path = queued or download_manager.current
+            if not file_path:
+                return
+            previous = player.filename
+            # The player refuses to load while playing, keep the track queued.
+            loaded = player.load(filename=file_path)
+            if crate is not None and queued and loaded:
+                crate.take(queued)
+        # Keep loaded files in the download cache.
+        if loaded and previous != file_path:
+            download_manager.cache.pin(file_path)
+            if previous:
+                download_manager.cache.unpin(previous)
 
     return callback
 
@@ -148,44 +290,85 @@ def register_player_cb(
     player: djplayer.DJPlayer,
     download_manager: DownloadManager,
     component: mes.Component,
+    scheduler: typing.Optional[QuantisedScheduler] = None,
+    crate: typing.Optional[Crate] = None,
+    ramp: typing.Optional[HoldRamp] = None,
 ):
     """Register player callbacks.
 
+    If a scheduler is provided, play, cue jump and loop presses can be quantised
+    to the master clock (see `factories.make_quantised_cb`). If a hold ramp is
+    provided, holding jog and nudge buttons accelerates them.
+
     Args:
         handler (handler.Handler): Message handler
         player (djplayer.DJPlayer): Player
         download_manager(DownloadManager): Download manager
         component (mes.Component): Component (e.g. LEFT_DECK, RIGHT_DECK)
+        scheduler (QuantisedScheduler, optional): Quantised scheduler.
+            Defaults to None.
+        crate (Crate, optional): Track crate to load from. Defaults to None.
+        ramp (HoldRamp, optional): Press-and-hold ramp for jog and nudge.
+            Defaults to None.
     """
+
+    def quantised(
+        callback: typing.Callable[[mes.Message[mes.Button]], None]
+    ) -> typing.Callable[[mes.Message[mes.Button]], None]:
+        if scheduler is None:
+            return callback
+        return factories.make_quantised_cb(callback, scheduler)
+
     handler.register_handler(
         callback=make_cue_callback(player),
         component=component,
         element=mes.Element.CUE,
     )
     handler.register_handler(
-        callback=make_play_callback(player),
+        callback=quantised(make_play_callback(player)),
         component=component,
         element=mes.Element.PLAY_PAUSE,
     )
+    handler.register_handler(
+        callback=quantised(make_cue_jump_callback(player)),
+        component=component,
+        element=mes.Element.CUE_JUMP,
+    )
+    handler.register_handler(
+        callback=quantised(make_loop_callback(player)),
+        component=component,
+        element=mes.Element.LOOP,
+    )
+    handler.register_handler(
+        callback=make_bpm_callback(player),
+        component=component,
+        element=mes.Element.BPM,
+    )
+    if scheduler is not None:
+        handler.register_handler(
+            callback=make_master_callback(player, scheduler),
+            component=component,
+            element=mes.Element.MASTER,
+        )
     handler.register_handler(
         callback=make_stop_callback(player),
         component=component,
         element=mes.Element.STOP,
     )
     handler.register_handler(
-        callback=make_nudge_callback(player),
+        callback=make_nudge_callback(player, ramp),
         component=component,
         element=mes.Element.NUDGE,
     )
 
     handler.register_handler(
-        callback=make_jog_callback(player),
+        callback=make_jog_callback(player, ramp),
         component=component,
         element=mes.Element.JOG,
     )
 
     handler.register_handler(
-        callback=make_load_callback(player, download_manager),
+        callback=make_load_callback(player, download_manager, crate),
         component=component,
         element=mes.Element.LOAD,
     )
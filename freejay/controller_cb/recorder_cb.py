@@ -0,0 +1,66 @@
+"""
+Recorder callback functions.
+
+Callback functions are registered with the message handler. The handler
+will check the content of incoming messages and call the appropriate callback.
+
+The view sends a RECORD button message to start or stop recording. The model
+sends a message when recording starts and stops, reporting the recording
+statistics.
+"""
+
+import typing
+from freejay.message_dispatcher import handler
+from freejay.messages import messages as mes
+from freejay.recorder.recorder import Recorder
+from freejay.controller_cb import factories
+
+if typing.TYPE_CHECKING:
+    from freejay.tk import tk_recorder
+
+
+def register_recorder_model_cb(handler: handler.Handler, recorder: Recorder):
+    """Register recorder model callbacks.
+
+    Args:
+        handler (Handler): Message handler.
+        recorder (Recorder): Master mix recorder.
+    """
+    handler.register_handler(
+        callback=factories.make_button_cb(recorder.toggle),
+        component=recorder.component,
+        element=mes.Element.RECORD,
+    )
+
+
+def make_recorder_view_callback(
+    recorder_view: "tk_recorder.TkRecorder",
+) -> typing.Callable[[mes.Message[mes.Data]], None]:
+    """Make callback function for recorder view.
+
+    Args:
+        recorder_view (TkRecorder): Recorder view.
+
+    Returns:
+        typing.Callable[[mes.Message[mes.Data]], None]: Callback function, run on
+            the Tk main loop.
+    """
+    return recorder_view.tkroot.dispatcher.wrap(
+        factories.make_data_cb(recorder_view.update_status)
+    )
+
+
+def register_recorder_view_cb(
+    handler: handler.Handler, recorder_view: "tk_recorder.TkRecorder"
+):
+    """Register recorder view callbacks.
+
+    Args:
+        handler (Handler): Message handler.
+        recorder_view (TkRecorder): Recorder view.
+    """
+    handler.register_handler(
+        callback=make_recorder_view_callback(recorder_view),
+        component=recorder_view.component,
+        element=mes.Element.RECORD,
+    )
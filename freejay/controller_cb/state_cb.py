@@ -0,0 +1,47 @@
+"""
+Deck and mixer state callback functions.
+
+Callback functions are registered with the message handler. The handler
+will check the content of incoming messages and call the appropriate callback.
+
+The model's state pump sends a STATE message holding the changed fields of a
+deck or the mixer, see `freejay.player.state`. Each field is passed to the view
+as a keyword argument. View updates are run on the Tk main loop.
+"""
+
+import typing
+from freejay.message_dispatcher import handler
+from freejay.messages import messages as mes
+from freejay.controller_cb import factories
+
+if typing.TYPE_CHECKING:
+    from freejay.tk import tk_player
+    from freejay.tk import tk_mixer
+
+
+def register_state_view_cb(
+    handler: handler.Handler,
+    deck_views: typing.Dict[mes.Component, "tk_player.TkDeck"],
+    mixer_view: "tk_mixer.TkCrossfader",
+):
+    """Register deck and mixer state view callbacks.
+
+    Args:
+        handler (Handler): Message handler.
+        deck_views (typing.Dict[mes.Component, TkDeck]): Deck views.
+        mixer_view (TkCrossfader): Crossfader view.
+    """
+    dispatcher = mixer_view.tkroot.dispatcher
+    for component, deck_view in deck_views.items():
+        handler.register_handler(
+            callback=dispatcher.wrap(
+                factories.make_data_cb(deck_view.status.update_state)
+            ),
+            component=component,
+            element=mes.Element.STATE,
+        )
+    handler.register_handler(
+        callback=dispatcher.wrap(factories.make_data_cb(mixer_view.update_state)),
+        component=mixer_view.component,
+        element=mes.Element.STATE,
+    )
@@ -0,0 +1,6 @@
+"""
+Hardware controller input.
+
+Controller frames read from a serial device (see `serial_input.SerialInput`),
+mapped into Button and Data messages by a control map (see `mapper`).
+"""
@@ -0,0 +1,109 @@
+"""
+Controller frames.
+
+Controllers send MIDI style channel messages over serial, as most DIY (e.g.
+Arduino) and class compliant controllers do. A frame is a status byte, with
+the frame kind in the high nibble and the channel in the low nibble, followed
+by one or two 7 bit data bytes:
+
+    0x90 0x24 0x7F    note on, channel 0, note 36, velocity 127 (press)
+    0x80 0x24 0x00    note off (release), as is a note on with velocity 0
+    0xB0 0x07 0x40    control change, channel 0, control 7, value 64
+
+Running status (data bytes repeating the previous status) is supported, and
+system messages (e.g. clock ticks and sysex) are skipped.
+"""
+
+import typing
+
+NOTE = "note"
+CC = "cc"
+
+# Data bytes following each channel message status, by high nibble.
+_LENGTHS = {0x8: 2, 0x9: 2, 0xA: 2, 0xB: 2, 0xC: 1, 0xD: 1, 0xE: 2}
+
+
+class Frame(typing.NamedTuple):
+    """
+    Decoded controller frame.
+
+    Attributes:
+        kind (str): NOTE or CC.
+        channel (int): Channel, 0-15.
+        number (int): Note or control number, 0-127.
+        value (int): Velocity (0 for a release) or control value, 0-127.
+    """
+
+    kind: str
+    channel: int
+    number: int
+    value: int
+
+
+class FrameDecoder:
+    """
+    Decode a controller byte stream into frames.
+
+    Bytes are decoded in bulk, as read. A frame split across reads is completed
+    by the next `feed()`.
+    """
+
+    def __init__(self):
+        """Construct FrameDecoder."""
+        self.__status = 0
+        self.__data: typing.List[int] = []
+
+    def feed(
+        self, data: typing.Union[bytes, bytearray, memoryview]
+    ) -> typing.List[Frame]:
+        """Decode bytes read from the controller.
+
+        Args:
+            data (typing.Union[bytes, bytearray, memoryview]): Bytes read.
+
+        Returns:
+            typing.List[Frame]: Note and control change frames completed by the
+                data, in order. Other channel messages are dropped.
+        """
+        frames: typing.List[Frame] = []
+        status = self.__status
+        pending = self.__data
+        for byte in data:
+            if byte < 0x80:
+                if not status:
+                    # Sysex payload, or data without a status.
+                    continue
+                pending.append(byte)
+                if len(pending) < _LENGTHS[status >> 4]:
+                    continue
+                kind = status & 0xF0
+                if kind == 0x90:
+                    frames.append(Frame(NOTE, status & 0x0F, pending[0], pending[1]))
+                elif kind == 0x80:
+                    frames.append(Frame(NOTE, status & 0x0F, pending[0], 0))
+                elif kind == 0xB0:
+                    frames.append(Frame(CC, status & 0x0F, pending[0], pending[1]))
+                pending.clear()
+            elif byte < 0xF0:
+                status = byte
+                pending.clear()
+            elif byte < 0xF8:
+                # System common messages and sysex cancel running status.
+                status = 0
+                pending.clear()
+            # System real time bytes (0xF8-0xFF) may appear anywhere, skip them.
+        self.__status = status
+        return frames
+
+
+def encode(frame: Frame) -> bytes:
+    """Encode a frame, e.g. to record or replay controller input.
+
+    Args:
+        frame (Frame): Frame.
+
+    Returns:
+        bytes: Frame bytes, with a full status byte.
+    """
+    status = (0x90 if frame.kind == NOTE else 0xB0) | frame.channel
+    return bytes((status, frame.number, frame.value))
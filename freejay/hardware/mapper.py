@@ -0,0 +1,454 @@
+"""
+Control mapper, mapping controller frames into Button and Data messages.
+
+Like keybindings (see `freejay.keyboard.keymapper`), control bindings are loaded
+from a TOML or JSON config file (see `load_control_map()`), keyed by frame kind,
+channel and number, for example:
+
+    [controls]
+    "note:0:36" = { name = "cue-left", component = "LEFT_DECK", element = "CUE" }
+    "cc:0:7" = { component = "MIXER", element = "CROSSFADER", field = "position" }
+    "cc:0:16" = { component = "LEFT_DECK", element = "JOG", mode = "relative",
+                  scale = 0.05 }
+
+A binding has a mode:
+
+- "button" (the default for notes): Button press and release messages, with
+  optional `data`. A frame value of 0 is a release.
+- "absolute" (the default for control changes): Data messages, with the value
+  0-127 scaled onto `range` (default [0.0, 1.0]) under `field` (default
+  "value"), e.g. for faders and knobs.
+- "relative": A Button press and release, with the signed change (7 bit two's
+  complement, 1 is +1 and 127 is -1) times `scale` under `field`, e.g. for jog
+  wheels.
+
+Faders and jog wheels send hundreds of frames per second, more than the model
+needs. Frames are mapped in batches (see `ControlMapper.map()`): within a batch,
+absolute controls send only their last value and relative controls send the sum
+of their changes. Buttons are never coalesced.
+"""
+
+import typing
+import logging
+from freejay.config import load_config, parse_enum
+from freejay.messages import messages as mes
+from freejay.messages import produce_consume as prodcon
+from freejay.hardware.frames import Frame, NOTE, CC
+
+logger = logging.getLogger(__name__)
+
+BUTTON = "button"
+ABSOLUTE = "absolute"
+RELATIVE = "relative"
+
+# Control key, (frame kind, channel, number).
+Control = typing.Tuple[str, int, int]
+
+DEFAULT_CONTROL_MAP: typing.Dict[str, typing.Any] = {
+    "controls": {
+        "note:0:36": {"name": "cue-left", "component": "LEFT_DECK", "element": "CUE"},
+        "note:0:37": {
+            "name": "play_pause-left",
+            "component": "LEFT_DECK",
+            "element": "PLAY_PAUSE",
+        },
+        "note:1:36": {
+            "name": "cue-right",
+            "component": "RIGHT_DECK",
+            "element": "CUE",
+        },
+        "note:1:37": {
+            "name": "play_pause-right",
+            "component": "RIGHT_DECK",
+            "element": "PLAY_PAUSE",
+        },
+        "cc:0:7": {
+            "name": "fader-left",
+            "component": "LEFT_DECK",
+            "element": "CHANNEL_FADER",
+        },
+        "cc:1:7": {
+            "name": "fader-right",
+            "component": "RIGHT_DECK",
+            "element": "CHANNEL_FADER",
+        },
+        "cc:0:16": {
+            "name": "jog-left",
+            "component": "LEFT_DECK",
+            "element": "JOG",
+            "mode": RELATIVE,
+            "scale": 0.05,
+        },
+        "cc:1:16": {
+            "name": "jog-right",
+            "component": "RIGHT_DECK",
+            "element": "JOG",
+            "mode": RELATIVE,
+            "scale": 0.05,
+        },
+        "cc:15:8": {
+            "name": "crossfader",
+            "component": "MIXER",
+            "element": "CROSSFADER",
+            "field": "position",
+        },
+    }
+}
+
+_BINDING_FIELDS = {
+    "name",
+    "component",
+    "element",
+    "mode",
+    "data",
+    "field",
+    "range",
+    "scale",
+}
+_MODES = {NOTE: BUTTON, CC: ABSOLUTE}
+
+
+class ControlMapError(ValueError):
+    """Invalid control map config."""
+
+
+class ControlBinding:
+    """
+    Compiled control binding.
+
+    Attributes:
+        control (Control): Control key.
+        name (str): Binding name.
+        mode (str): BUTTON, ABSOLUTE or RELATIVE.
+        component (mes.Component): Message component.
+        element (mes.Element): Message element.
+        data (dict): Button message data.
+        field (str): Data field for absolute and relative values.
+        low (float): Absolute value for 0.
+        high (float): Absolute value for 127.
+        scale (float): Relative value per step.
+    """
+
+    __slots__ = (
+        "control",
+        "name",
+        "mode",
+        "component",
+        "element",
+        "data",
+        "field",
+        "low",
+        "high",
+        "scale",
+    )
+
+    def __init__(
+        self,
+        control: Control,
+        name: str,
+        mode: str,
+        component: mes.Component,
+        element: mes.Element,
+        data: typing.Optional[dict] = None,
+        field: str = "value",
+        low: float = 0.0,
+        high: float = 1.0,
+        scale: float = 1.0,
+    ):
+        """Construct ControlBinding.
+
+        Args:
+            control (Control): Control key.
+            name (str): Binding name.
+            mode (str): BUTTON, ABSOLUTE or RELATIVE.
+            component (mes.Component): Message component.
+            element (mes.Element): Message element.
+            data (dict, optional): Button message data. Defaults to None.
+            field (str, optional): Data field for absolute and relative values.
+                Defaults to "value".
+            low (float, optional): Absolute value for 0. Defaults to 0.0.
+            high (float, optional): Absolute value for 127. Defaults to 1.0.
+            scale (float, optional): Relative value per step. Defaults to 1.0.
+        """
+        self.control = control
+        self.name = name
+        self.mode = mode
+        self.component = component
+        self.element = element
+        self.data = data or {}
+        self.field = field
+        self.low = low
+        self.high = high
+        self.scale = scale
+
+    def messages(self, value: int) -> typing.List[mes.Message]:
+        """Make the messages for a control value.
+
+        Args:
+            value (int): Frame value, or the summed change for a relative
+                control.
+
+        Returns:
+            typing.List[mes.Message]: Messages to send.
+        """
+        if self.mode == ABSOLUTE:
+            return [
+                mes.Message(
+                    sender=mes.Sender(mes.Source.HARDWARE, mes.Trigger.SLIDER),
+                    content=mes.Data(
+                        self.component,
+                        self.element,
+                        {self.field: self.low + (self.high - self.low) * value / 127},
+                    ),
+                )
+            ]
+        sender = mes.Sender(mes.Source.HARDWARE, mes.Trigger.BUTTON)
+        if self.mode == RELATIVE:
+            data = {self.field: value * self.scale}
+            return [
+                mes.Message(
+                    sender=sender,
+                    content=mes.Button(
+                        mes.PressRelease.PRESS, self.component, self.element, data
+                    ),
+                ),
+                mes.Message(
+                    sender=sender,
+                    content=mes.Button(
+                        mes.PressRelease.RELEASE, self.component, self.element, {}
+                    ),
+                ),
+            ]
+        press_release = mes.PressRelease.PRESS if value else mes.PressRelease.RELEASE
+        return [
+            mes.Message(
+                sender=sender,
+                content=mes.Button(
+                    press_release, self.component, self.element, self.data.copy()
+                ),
+            )
+        ]
+
+
+def _parse_control(key: str) -> typing.Optional[Control]:
+    """Parse a "kind:channel:number" control key, None if invalid."""
+    parts = key.split(":")
+    if len(parts) != 3 or parts[0] not in _MODES:
+        return None
+    try:
+        channel, number = int(parts[1]), int(parts[2])
+    except ValueError:
+        return None
+    if not (0 <= channel < 16 and 0 <= number < 128):
+        return None
+    return parts[0], channel, number
+
+
+def _compile_binding(
+    key: str, config: typing.Any, errors: typing.List[str]
+) -> typing.Optional[ControlBinding]:
+    """Validate and compile a binding, appending any errors."""
+    where = f"controls.{key}"
+    control = _parse_control(key)
+    if control is None:
+        errors.append(f"{where}: control must be 'note|cc:<channel>:<number>'")
+        return None
+    if not isinstance(config, dict):
+        errors.append(f"{where}: binding must be a table")
+        return None
+    unknown = set(config) - _BINDING_FIELDS
+    if unknown:
+        errors.append(f"{where}: unknown fields {sorted(unknown)}")
+    if "component" not in config or "element" not in config:
+        errors.append(f"{where}: binding needs a component and an element")
+        return None
+    mode = config.get("mode", _MODES[control[0]])
+    if mode not in (BUTTON, ABSOLUTE, RELATIVE):
+        errors.append(f"{where}: unknown mode {mode!r}")
+    data = config.get("data", {})
+    if not isinstance(data, dict):
+        errors.append(f"{where}: data must be a table")
+    value_range = config.get("range", [0.0, 1.0])
+    scale = config.get("scale", 1.0)
+    if not (
+        isinstance(value_range, list)
+        and len(value_range) == 2
+        and all(isinstance(v, (int, float)) for v in [*value_range, scale])
+    ):
+        errors.append(f"{where}: range must be [low, high] and scale a number")
+    component = parse_enum(mes.Component, config["component"], where, errors)
+    element = parse_enum(mes.Element, config["element"], where, errors)
+    if errors:
+        return None
+    return ControlBinding(
+        control=control,
+        name=config.get("name", key),
+        mode=mode,
+        component=component,
+        element=element,
+        data=dict(data),
+        field=str(config.get("field", "value")),
+        low=float(value_range[0]),
+        high=float(value_range[1]),
+        scale=float(scale),
+    )
+
+
+class ControlMap:
+    """
+    Compiled control map.
+
+    Attributes:
+        bindings (typing.Dict[Control, ControlBinding]): Bindings by control.
+    """
+
+    def __init__(self, bindings: typing.Dict[Control, ControlBinding]):
+        """Construct ControlMap.
+
+        Args:
+            bindings (typing.Dict[Control, ControlBinding]): Bindings by control.
+        """
+        self.bindings = bindings
+
+    @classmethod
+    def from_config(cls, config: typing.Any) -> "ControlMap":
+        """Validate and compile a control map config.
+
+        Args:
+            config (typing.Any): Control map config, see module docstring.
+
+        Raises:
+            ControlMapError: If the config is invalid, listing every problem.
+
+        Returns:
+            ControlMap: Compiled control map.
+        """
+        controls = config.get("controls") if isinstance(config, dict) else None
+        if not isinstance(controls, dict):
+            raise ControlMapError("control map needs a table of controls")
+        errors: typing.List[str] = []
+        bindings: typing.Dict[Control, ControlBinding] = {}
+        for key, binding_config in controls.items():
+            binding_errors: typing.List[str] = []
+            binding = _compile_binding(str(key), binding_config, binding_errors)
+            errors.extend(binding_errors)
+            if binding is not None:
+                bindings[binding.control] = binding
+        if errors:
+            raise ControlMapError("Invalid control map:\n" + "\n".join(errors))
+        return cls(bindings)
+
+
+def load_control_map(file_path: str) -> ControlMap:
+    """Load a control map from a TOML or JSON config file.
+
+    Args:
+        file_path (str): Config file path, ".toml" or ".json".
+
+    Raises:
+        OSError: If the file cannot be read.
+        ControlMapError: If the file cannot be parsed, or the config is invalid.
+
+    Returns:
+        ControlMap: Compiled control map.
+    """
+    config = load_config(file_path, ControlMapError, "control map")
+    return ControlMap.from_config(config)
+
+
+class ControlMapper(prodcon.Producer):
+    """
+    Map controller frames using control bindings.
+
+    Frames are mapped in batches, coalescing absolute and relative controls, and
+    the resulting messages are sent to the consumer. Relative controls can
+    instead be sent straight to a callback (see `register_direct()`).
+    """
+
+    def __init__(self, control_map: typing.Optional[ControlMap] = None):
+        """Construct ControlMapper.
+
+        Args:
+            control_map (ControlMap, optional): Control map. Defaults to None
+                (DEFAULT_CONTROL_MAP).
+        """
+        self.control_map = (
+            ControlMap.from_config(DEFAULT_CONTROL_MAP)
+            if control_map is None
+            else control_map
+        )
+        self.direct: typing.Dict[
+            typing.Tuple[mes.Component, mes.Element], typing.Callable[[float], None]
+        ] = {}
+
+    def register_direct(
+        self,
+        component: mes.Component,
+        element: mes.Element,
+        callback: typing.Callable[[float], None],
+    ):
+        """Send relative control changes straight to a callback.
+
+        Bypasses the message path for latency sensitive controls, e.g. a jog
+        wheel driving `freejay.player.scratch.JogWheel.move()`. The callback is
+        called on the mapping thread, with the scaled change.
+
+        Args:
+            component (mes.Component): Binding component.
+            element (mes.Element): Binding element.
+            callback (typing.Callable[[float], None]): Called with each batch's
+                scaled change.
+        """
+        self.direct[(component, element)] = callback
+
+    def map(self, frames: typing.Iterable[Frame]) -> int:
+        """Map a batch of frames, e.g. every frame decoded from a read.
+
+        Coalesced controls send their messages at the position of their first
+        frame in the batch.
+
+        Args:
+            frames (typing.Iterable[Frame]): Frames, in order.
+
+        Returns:
+            int: Number of messages sent.
+        """
+        bindings = self.control_map.bindings
+        batch: typing.List[typing.List[typing.Any]] = []
+        coalesced: typing.Dict[Control, typing.List[typing.Any]] = {}
+        for frame in frames:
+            binding = bindings.get(frame[:3])
+            if binding is None:
+                logger.debug("No control binding registered for %r", frame)
+                continue
+            if binding.mode == BUTTON:
+                batch.append([binding, frame.value])
+                continue
+            value = frame.value
+            if binding.mode == RELATIVE and value >= 64:
+                value -= 128
+            entry = coalesced.get(binding.control)
+            if entry is None:
+                entry = coalesced[binding.control] = [binding, value]
+                batch.append(entry)
+            elif binding.mode == RELATIVE:
+                entry[1] += value
+            else:
+                entry[1] = value
+        return self.__send(batch)
+
+    def __send(self, batch: typing.List[typing.List[typing.Any]]) -> int:
+        """Send a mapped batch, returning the number of messages sent."""
+        sent = 0
+        for binding, value in batch:
+            if binding.mode == RELATIVE:
+                if not value:
+                    continue
+                callback = self.direct.get((binding.component, binding.element))
+                if callback is not None:
+                    callback(value * binding.scale)
+                    continue
+            for message in binding.messages(value):
+                self.send_message(message)
+                sent += 1
+        return sent
@@ -0,0 +1,146 @@
+"""
+Serial controller input.
+
+A dedicated reader thread blocks on the serial device, reads everything waiting
+in one call, decodes it in bulk and maps the frames as a batch (see
+`mapper.ControlMapper.map()`). While frames keep arriving the thread reads at
+most once per `interval`, so a busy fader or jog wheel is coalesced into one
+message per batch, whilst the first frame after a pause is sent immediately.
+"""
+
+import time
+import typing
+import logging
+import threading
+import dataclasses
+import serial
+from freejay.hardware.frames import FrameDecoder
+from freejay.hardware.mapper import ControlMapper
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class InputStats:
+    """Serial input statistics."""
+
+    bytes_read: int = 0
+    frames: int = 0
+    batches: int = 0
+    messages: int = 0
+
+
+class SerialInput:
+    """
+    Read controller frames from a serial port on a reader thread.
+
+    The SerialInput owns the port, `stop()` closes it.
+    """
+
+    def __init__(
+        self,
+        port: serial.SerialBase,
+        mapper: ControlMapper,
+        interval: float = 0.002,
+        chunk_size: int = 4096,
+    ):
+        """Construct SerialInput.
+
+        Args:
+            port (serial.SerialBase): Open serial port, with a read timeout so
+                the reader can stop.
+            mapper (ControlMapper): Control mapper, sending the messages.
+            interval (float, optional): Minimum seconds between batches.
+                Defaults to 0.002.
+            chunk_size (int, optional): Maximum bytes per read. Defaults to 4096.
+        """
+        self.port = port
+        self.mapper = mapper
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.stats = InputStats()
+        self.__stopping = threading.Event()
+        self.__reader: typing.Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Get whether the reader thread is running."""
+        return self.__reader is not None and self.__reader.is_alive()
+
+    def start(self):
+        """Start reading."""
+        if self.running:
+            return
+        self.__stopping.clear()
+        self.__reader = threading.Thread(
+            target=self.__read_loop, name="serial-input", daemon=True
+        )
+        self.__reader.start()
+        logger.info("Reading controller input from %s", self.port.name)
+
+    def stop(self):
+        """Stop reading and close the port."""
+        self.__stopping.set()
+        if hasattr(self.port, "cancel_read"):
+            self.port.cancel_read()
+        if self.__reader is not None:
+            self.__reader.join()
+            self.__reader = None
+        self.port.close()
+
+    def __read(self) -> bytes:
+        """Block for input, then read everything waiting."""
+        data = self.port.read(1)
+        if data:
+            waiting = self.port.in_waiting
+            if waiting:
+                data += self.port.read(min(waiting, self.chunk_size))
+        return data
+
+    def __read_loop(self):
+        """Read, decode and map frames until stopped."""
+        decoder = FrameDecoder()
+        stats = self.stats
+        while not self.__stopping.is_set():
+            start = time.perf_counter()
+            try:
+                data = self.__read()
+            except (serial.SerialException, OSError):
+                logger.exception("Controller read failed.")
+                break
+            if not data:
+                continue
+            frames = decoder.feed(data)
+            stats.bytes_read += len(data)
+            if frames:
+                stats.frames += len(frames)
+                stats.batches += 1
+                try:
+                    stats.messages += self.mapper.map(frames)
+                except Exception:
+                    logger.exception("Mapping controller frames failed.")
+            # Let frames accumulate into the next batch.
+            self.__stopping.wait(self.interval - (time.perf_counter() - start))
+
+
+def open_serial_input(
+    device: str,
+    mapper: typing.Optional[ControlMapper] = None,
+    baudrate: int = 115200,
+) -> SerialInput:
+    """Open a serial controller.
+
+    Args:
+        device (str): Serial device, e.g. "/dev/ttyACM0", or a pyserial URL.
+        mapper (ControlMapper, optional): Control mapper. Defaults to None (the
+            default control map).
+        baudrate (int, optional): Baud rate. Defaults to 115200.
+
+    Raises:
+        serial.SerialException: If the device cannot be opened.
+
+    Returns:
+        SerialInput: Serial input, not yet started.
+    """
+    port = serial.serial_for_url(device, baudrate=baudrate, timeout=0.1)
+    return SerialInput(port, mapper or ControlMapper())
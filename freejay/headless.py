@@ -0,0 +1,242 @@
+"""
+Headless engine.
+
+Runs the model and a headless controller (see
+`controller.make_headless_controller()`) without the view, driven by an input
+source, e.g. to run the engine on a machine without a display or to benchmark
+it. Nothing here imports Tk:
+
+    python -m freejay --headless --input replay:session.log --speed 0
+    python -m freejay --headless < commands.txt
+    python -m freejay --headless --control unix:/tmp/freejay.sock
+
+Inputs are producers sending control messages to the controller's input router,
+with `start()`, `stop()` and `join()` methods and a `running` property, see
+`open_input()`. The engine stops when its input ends.
+"""
+
+import sys
+import typing
+import logging
+from .model import make_model
+from .controller import (
+    make_headless_controller,
+    register_hardware_input,
+    register_control_server,
+)
+from .keyboard.keymapper import load_keymap
+from .hardware.mapper import ControlMapper, load_control_map
+from .messages import produce_consume as prodcon
+from .player.state import DEFAULT_FPS
+from .session.commands import CommandInput
+from .session.replay import ReplayInput
+from .remote.protocol import parse_address
+from .remote.server import ControlServer
+
+logger = logging.getLogger(__name__)
+
+
+class Input(prodcon.Producer, typing.Protocol):
+    """Headless engine input protocol."""
+
+    @property
+    def running(self) -> bool:
+        """Get whether the input is running."""
+        ...
+
+    def start(self):
+        """Start sending messages."""
+        ...
+
+    def stop(self):
+        """Stop sending messages."""
+        ...
+
+    def join(self, timeout: typing.Optional[float] = None):
+        """Wait for the input to end.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to None (until
+                it ends).
+        """
+        ...
+
+
+def open_input(spec: str, speed: float = 1.0) -> Input:
+    """Open an input source.
+
+    Args:
+        spec (str): Input, one of "stdin" (or "-") for commands read from stdin,
+            "commands:PATH" for a command file (see `session.commands`),
+            "replay:PATH" for a session log, or "control:ADDRESS" for a control
+            socket (see `remote.protocol.parse_address()`), bound here.
+        speed (float, optional): Replay speed, 1 for real time or 0 for as fast
+            as possible. Defaults to 1.0.
+
+    Raises:
+        ValueError: If the input is not recognised.
+        OSError: If a command file cannot be opened, or a control socket
+            bound.
+
+    Returns:
+        Input: Input, not yet started.
+    """
+    kind, _, path = spec.partition(":")
+    if spec in ("stdin", "-"):
+        return CommandInput(sys.stdin)
+    if kind == "commands" and path:
+        return CommandInput(open(path, encoding="utf-8"), name=path)
+    if kind == "replay" and path:
+        return ReplayInput(path, speed=speed)
+    if kind == "control" and path:
+        server = ControlServer(parse_address(path))
+        server.bind()
+        return server
+    raise ValueError(f"Unknown input: {spec!r}")
+
+
+class Headless:
+    """
+    Headless Engine.
+
+    Initialise model and headless controller, driven by an input.
+    """
+
+    def __init__(
+        self,
+        source: Input,
+        session: typing.Optional[str] = None,
+        keymap: typing.Optional[str] = None,
+        serial: typing.Optional[str] = None,
+        controls: typing.Optional[str] = None,
+        fps: float = DEFAULT_FPS,
+        lazy: bool = True,
+    ):
+        """Construct Headless.
+
+        Args:
+            source (Input): Input, e.g. from `open_input()`.
+            session (str, optional): Session log path to record control messages
+                to. Defaults to None (not recorded).
+            keymap (str, optional): Keymap config file path (TOML or JSON).
+                Defaults to None (the default keymap).
+            serial (str, optional): Serial controller device. Defaults to None
+                (no hardware controller).
+            controls (str, optional): Controller control map config file path
+                (TOML or JSON). Defaults to None (the default control map).
+            fps (float, optional): Frame rate deck and mixer state is published
+                at. Defaults to DEFAULT_FPS.
+            lazy (bool, optional): Make the audio players and import the
+                download backend in the background once started. Defaults to
+                True.
+        """
+        self.source = source
+        self.lazy = lazy
+        compiled_keymap = None if keymap is None else load_keymap(keymap)
+        control_map = None if controls is None else load_control_map(controls)
+        self.model = make_model(fps=fps, lazy=lazy)
+        self.controller = make_headless_controller(
+            model=self.model, session=session, keymap=compiled_keymap
+        )
+        # Control socket subscribers are sent the deck and mixer state.
+        self.publish_state = isinstance(source, ControlServer)
+        if isinstance(source, ControlServer):
+            register_control_server(
+                self.controller.view_message_router,
+                self.controller.model_message_router,
+                self.controller.work_manager.get_queue("model"),
+                source,
+            )
+        else:
+            self.controller.view_message_router.listen(source)
+        self.serial_input = None
+        if serial is not None:
+            from .hardware.serial_input import open_serial_input
+
+            self.serial_input = open_serial_input(serial, ControlMapper(control_map))
+            register_hardware_input(
+                self.controller.view_message_router,
+                self.serial_input.mapper,
+                model=self.model,
+            )
+
+    def start(self):
+        """Start the engine and its input."""
+        self.controller.work_manager.start()
+        if self.publish_state:
+            self.model.state.start()
+        if self.serial_input is not None:
+            self.serial_input.start()
+        if self.lazy:
+            self.model.warm_up()
+        self.source.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the input, then the engine once the model has handled its messages.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait for the model.
+                Defaults to 5.0.
+        """
+        self.source.stop()
+        if self.serial_input is not None:
+            self.serial_input.stop()
+        self.model.state.stop()
+        work_manager = self.controller.work_manager
+        if not work_manager.join("model", timeout):
+            logger.warning("Stopping before the model handled every message.")
+        work_manager.stop()
+        self.model.download.cache.flush()
+
+    def run(self):
+        """Run until the input ends or the process is interrupted."""
+        self.start()
+        try:
+            while self.source.running:
+                self.source.join(0.5)
+        except KeyboardInterrupt:
+            logger.info("Interrupted.")
+        finally:
+            self.stop()
+
+
+def make_headless(
+    source: str = "stdin",
+    speed: float = 1.0,
+    session: typing.Optional[str] = None,
+    keymap: typing.Optional[str] = None,
+    serial: typing.Optional[str] = None,
+    controls: typing.Optional[str] = None,
+    fps: float = DEFAULT_FPS,
+    lazy: bool = True,
+):
+    """
+    Configure and run the headless engine until its input ends.
+
+    Args:
+        source (str, optional): Input, see `open_input()`. Defaults to "stdin".
+        speed (float, optional): Replay speed, 1 for real time or 0 for as fast
+            as possible. Defaults to 1.0.
+        session (str, optional): Session log path to record control messages
+            to. Defaults to None (not recorded).
+        keymap (str, optional): Keymap config file path (TOML or JSON).
+            Defaults to None (the default keymap).
+        serial (str, optional): Serial controller device. Defaults to None
+            (no hardware controller).
+        controls (str, optional): Controller control map config file path
+            (TOML or JSON). Defaults to None (the default control map).
+        fps (float, optional): Frame rate deck and mixer state is published
+            at. Defaults to DEFAULT_FPS.
+        lazy (bool, optional): Make the audio players and import the download
+            backend in the background once started. Defaults to True.
+    """
+    engine = Headless(
+        open_input(source, speed=speed),
+        session=session,
+        keymap=keymap,
+        serial=serial,
+        controls=controls,
+        fps=fps,
+        lazy=lazy,
+    )
+    engine.run()
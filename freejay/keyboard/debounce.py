@@ -1,8 +1,15 @@
-"""Functionality for Keyboard Debouncing."""
+"""
+Functionality for Keyboard Debouncing.
+
+Release timers run on a timer wheel (see `freejay.clock.timerwheel`), so any
+number of keys held with auto-repeat share a single timer thread. Rescheduling a
+release timer on each auto-repeat event is O(1).
+"""
 
 import typing
+import threading
 import collections
-from threading import Timer
+from freejay.clock.timerwheel import TimerWheel, Timer
 from freejay.messages import produce_consume as prodcon
 from freejay.messages import messages as mes
 
@@ -19,6 +26,7 @@ class Debouncer(object):
         pressed_cb: typing.Callable[[typing.Any], None],
         released_cb: typing.Callable[[typing.Any], None],
         released_timeout: float = 0.05,
+        wheel: typing.Optional[TimerWheel] = None,
     ):
         """Construct debouncer object.
 
@@ -29,44 +37,67 @@ class Debouncer(object):
                 'release' event.
             released_timeout (float, optional): How long to wait for new event before
                 key release is accepted as true. Defaults to 0.05.
+            wheel (TimerWheel, optional): Timer wheel to run the release timer
+                on. Defaults to None (a new wheel).
         """
         self.key_pressed = False
-        self.key_released_timer = None
+        self.key_released_timer: typing.Optional[Timer] = None
         self.released_timeout = released_timeout
         self.pressed_cb = pressed_cb
         self.released_cb = released_cb
+        self.wheel = TimerWheel() if wheel is None else wheel
+        # Incremented as the release timer is cancelled, so a timer that fires
+        # as it is cancelled is ignored.
+        self.__generation = 0
+        self.__lock = threading.Lock()
 
-    def _key_released_timer_cb(self, event):
+    def _key_released_timer_cb(self, event, generation: int):
         """
         Call key release callback on timer expiry.
 
         Called when the timer expires for a key up event,
         signifying that a key press has actually ended.
         """
-        self.key_pressed = False
+        with self.__lock:
+            if generation != self.__generation:
+                return
+            self.key_released_timer = None
+            self.key_pressed = False
         self.released_cb(event)
 
-    def pressed(self, event):
-        """Key pressed callback."""
-        # If timer set by up is active, cancel it, because the press is still
-        # active.
-        if self.key_released_timer:
-            self.key_released_timer.cancel()
+    def __cancel_timer(self):
+        """Cancel the release timer, if any. Call with the lock held."""
+        self.__generation += 1
+        if self.key_released_timer is not None:
+            self.wheel.cancel(self.key_released_timer)
             self.key_released_timer = None
 
-        # If the key is not currently pressed, mark it so and call the callback.
-        if not self.key_pressed:
+    def pressed(self, event):
+        """Key pressed callback."""
+        with self.__lock:
+            # If timer set by up is active, cancel it, because the press is still
+            # active.
+            self.__cancel_timer()
+
+            # If the key is not currently pressed, mark it so and call the
+            # callback.
+            if self.key_pressed:
+                return
             self.key_pressed = True
-            self.pressed_cb(event)
+        self.pressed_cb(event)
 
     def released(self, event):
         """Key released callback."""
         # Set a timer. If it is allowed to expire (not reset by another down
         # event), then we know the key has been released for good.
-        self.key_released_timer = Timer(
-            self.released_timeout, self._key_released_timer_cb, [event]
-        )
-        self.key_released_timer.start()
+        with self.__lock:
+            self.__cancel_timer()
+            self.key_released_timer = self.wheel.schedule_after(
+                self.released_timeout,
+                self._key_released_timer_cb,
+                event,
+                self.__generation,
+            )
 
 
 class KeyBoardDebouncer:
@@ -77,6 +108,8 @@ class KeyBoardDebouncer:
         getkey: typing.Callable[[typing.Any], str],
         pressed_cb: typing.Callable[[typing.Any], None],
         released_cb: typing.Callable[[typing.Any], None],
+        released_timeout: float = 0.05,
+        wheel: typing.Optional[TimerWheel] = None,
     ):
         """Construct KeyBoardDebouncer.
 
@@ -87,7 +120,12 @@ class KeyBoardDebouncer:
                 'press' event.
             released_cb (typing.Callable[[typing.Any], None]): Callback for debounced
                 'release' event.
+            released_timeout (float, optional): How long to wait for new event before
+                key release is accepted as true. Defaults to 0.05.
+            wheel (TimerWheel, optional): Timer wheel shared by the release timers
+                of all keys. Defaults to None (a new wheel).
         """
+        self.wheel = TimerWheel() if wheel is None else wheel
         # Create a default dictionary that adds a Debouncer object
         # for each key.
         self.debouncer: typing.Dict[typing.Any, Debouncer]
@@ -95,6 +133,8 @@ class KeyBoardDebouncer:
             lambda: Debouncer(
                 pressed_cb=pressed_cb,
                 released_cb=released_cb,
+                released_timeout=released_timeout,
+                wheel=self.wheel,
             )
         )
 
@@ -122,12 +162,18 @@ class MessageDebouncer(prodcon.Producer, prodcon.Consumer):
     On debounced press/release, the message is dispatched.
     """
 
-    def __init__(self):
-        """Construct MessageDebouncer."""
+    def __init__(self, wheel: typing.Optional[TimerWheel] = None):
+        """Construct MessageDebouncer.
+
+        Args:
+            wheel (TimerWheel, optional): Timer wheel for the release timers.
+                Defaults to None (a new wheel).
+        """
         self.debouncer = KeyBoardDebouncer(
             getkey=lambda m: m.content.sym,
             pressed_cb=self.send_message,
             released_cb=self.send_message,
+            wheel=wheel,
         )
 
     def on_message_recieved(self, message: mes.Message[mes.Key]):
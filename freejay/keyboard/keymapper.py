@@ -1,59 +1,273 @@
 """
 Keymapper implements keybindings, mapping key event messages into action messages.
+
+Keybindings are grouped into profiles, switchable at runtime. A keymap is loaded
+from a TOML or JSON config file (see `load_keymap()`), for example:
+
+    profile = "left"
+
+    [profiles.left]
+    q = { name = "cue-left", component = "LEFT_DECK", element = "CUE" }
+    e = { component = "LEFT_DECK", element = "NUDGE", data = { value = -0.1 } }
+    2 = { profile = "right" }
+
+    [profiles.right]
+    q = { name = "cue-right", component = "RIGHT_DECK", element = "CUE" }
+    1 = { profile = "left" }
+
+`profile` is the initial profile. A binding either sends a Button message for a
+component and element (with optional data), or switches to another profile when
+its key is pressed.
+
+The config is validated and compiled up front: each binding holds a prebuilt
+message factory, so mapping a key is a dict lookup and a call.
 """
 
+import typing
 import logging
+from freejay.config import load_config, parse_enum
 from freejay.messages import messages as mes
 from freejay.messages import produce_consume as prodcon
 
 logger = logging.getLogger(__name__)
 
-# TODO: Better way of storing this
-keybindings = {
-    "q": {
-        "name": "cue-left",
-        "content_type": mes.Button,
-        "content": {
-            "component": mes.Component.LEFT_DECK,
-            "element": mes.Element.CUE,
+DEFAULT_KEYMAP: typing.Dict[str, typing.Any] = {
+    "profile": "left",
+    "profiles": {
+        "left": {
+            "q": {"name": "cue-left", "component": "LEFT_DECK", "element": "CUE"},
+            "w": {
+                "name": "play_pause-left",
+                "component": "LEFT_DECK",
+                "element": "PLAY_PAUSE",
+            },
+            "e": {
+                "name": "nudge-slow-left",
+                "component": "LEFT_DECK",
+                "element": "NUDGE",
+                "data": {"value": -0.1},
+            },
+            "r": {
+                "name": "nudge-fast-left",
+                "component": "LEFT_DECK",
+                "element": "NUDGE",
+                "data": {"value": 0.1},
+            },
+            "p": {"name": "stop-left", "component": "LEFT_DECK", "element": "STOP"},
+            "2": {"name": "profile-right", "profile": "right"},
         },
-    },
-    "w": {
-        "name": "play_pause-left",
-        "content_type": mes.Button,
-        "content": {
-            "component": mes.Component.LEFT_DECK,
-            "element": mes.Element.PLAY_PAUSE,
-        },
-    },
-    "e": {
-        "name": "nudge-slow-left",
-        "content_type": mes.Button,
-        "content": {
-            "component": mes.Component.LEFT_DECK,
-            "element": mes.Element.NUDGE,
-            "data": {"value": -0.1},
-        },
-    },
-    "r": {
-        "name": "nudge-fast-left",
-        "content_type": mes.Button,
-        "content": {
-            "component": mes.Component.LEFT_DECK,
-            "element": mes.Element.NUDGE,
-            "data": {"value": 0.1},
-        },
-    },
-    "p": {
-        "name": "stop-left",
-        "content_type": mes.Button,
-        "content": {
-            "component": mes.Component.LEFT_DECK,
-            "element": mes.Element.STOP,
+        "right": {
+            "q": {"name": "cue-right", "component": "RIGHT_DECK", "element": "CUE"},
+            "w": {
+                "name": "play_pause-right",
+                "component": "RIGHT_DECK",
+                "element": "PLAY_PAUSE",
+            },
+            "e": {
+                "name": "nudge-slow-right",
+                "component": "RIGHT_DECK",
+                "element": "NUDGE",
+                "data": {"value": -0.1},
+            },
+            "r": {
+                "name": "nudge-fast-right",
+                "component": "RIGHT_DECK",
+                "element": "NUDGE",
+                "data": {"value": 0.1},
+            },
+            "p": {"name": "stop-right", "component": "RIGHT_DECK", "element": "STOP"},
+            "1": {"name": "profile-left", "profile": "left"},
         },
     },
 }
 
+_BINDING_FIELDS = {"name", "component", "element", "data", "profile"}
+
+
+class KeymapError(ValueError):
+    """Invalid keymap config."""
+
+
+# Builds the message for a key press or release, given the key message trigger.
+MessageFactory = typing.Callable[[mes.PressRelease, mes.Trigger], mes.Message]
+
+
+def message_factory(
+    component: mes.Component, element: mes.Element, data: dict
+) -> MessageFactory:
+    """Make a factory for a binding's Button messages.
+
+    Args:
+        component (mes.Component): Message component.
+        element (mes.Element): Message element.
+        data (dict): Message data, copied into each message.
+
+    Returns:
+        MessageFactory: Message factory.
+    """
+
+    def message(
+        press_release: mes.PressRelease, trigger: mes.Trigger
+    ) -> mes.Message[mes.Button]:
+        return mes.Message(
+            sender=mes.Sender(mes.Source.KEY_MAPPER, trigger),
+            content=mes.Button(press_release, component, element, data.copy()),
+        )
+
+    return message
+
+
+class Binding:
+    """
+    Compiled Keybinding.
+
+    Attributes:
+        key (str): Key symbol.
+        name (str): Binding name.
+        message (MessageFactory | None): Message factory, None for a profile
+            switch.
+        profile (str | None): Profile to switch to, None for a message binding.
+    """
+
+    __slots__ = ("key", "name", "message", "profile")
+
+    def __init__(
+        self,
+        key: str,
+        name: str,
+        message: typing.Optional[MessageFactory] = None,
+        profile: typing.Optional[str] = None,
+    ):
+        """Construct Binding.
+
+        Args:
+            key (str): Key symbol.
+            name (str): Binding name.
+            message (MessageFactory, optional): Message factory. Defaults to None.
+            profile (str, optional): Profile to switch to. Defaults to None.
+        """
+        self.key = key
+        self.name = name
+        self.message = message
+        self.profile = profile
+
+
+def _compile_binding(
+    key: str,
+    config: typing.Any,
+    profiles: typing.Collection[str],
+    where: str,
+    errors: typing.List[str],
+) -> typing.Optional[Binding]:
+    """Validate and compile a binding, appending any errors."""
+    if not isinstance(config, dict):
+        errors.append(f"{where}: binding must be a table")
+        return None
+    unknown = set(config) - _BINDING_FIELDS
+    if unknown:
+        errors.append(f"{where}: unknown fields {sorted(unknown)}")
+    name = config.get("name", key)
+    if "profile" in config:
+        if not isinstance(config["profile"], str) or config["profile"] not in profiles:
+            errors.append(f"{where}: unknown profile {config['profile']!r}")
+        if {"component", "element", "data"} & set(config):
+            errors.append(f"{where}: profile switch takes no message fields")
+        return Binding(key=key, name=name, profile=config["profile"])
+    if "component" not in config or "element" not in config:
+        errors.append(f"{where}: binding needs a component and an element")
+        return None
+    data = config.get("data", {})
+    if not isinstance(data, dict):
+        errors.append(f"{where}: data must be a table")
+    component = parse_enum(mes.Component, config["component"], where, errors)
+    element = parse_enum(mes.Element, config["element"], where, errors)
+    if component is None or element is None or not isinstance(data, dict):
+        return None
+    return Binding(
+        key=key, name=name, message=message_factory(component, element, dict(data))
+    )
+
+
+class Keymap:
+    """
+    Compiled Keymap.
+
+    Attributes:
+        profiles (typing.Dict[str, typing.Dict[str, Binding]]): Bindings by key
+            symbol, per profile.
+        profile (str): Initial profile.
+    """
+
+    def __init__(
+        self, profiles: typing.Dict[str, typing.Dict[str, Binding]], profile: str
+    ):
+        """Construct Keymap.
+
+        Args:
+            profiles (typing.Dict[str, typing.Dict[str, Binding]]): Bindings by
+                key symbol, per profile.
+            profile (str): Initial profile.
+        """
+        self.profiles = profiles
+        self.profile = profile
+
+    @classmethod
+    def from_config(cls, config: typing.Any) -> "Keymap":
+        """Validate and compile a keymap config.
+
+        Args:
+            config (typing.Any): Keymap config, see module docstring.
+
+        Raises:
+            KeymapError: If the config is invalid, listing every problem.
+
+        Returns:
+            Keymap: Compiled keymap.
+        """
+        errors: typing.List[str] = []
+        profiles_config = config.get("profiles") if isinstance(config, dict) else None
+        if not isinstance(profiles_config, dict) or not profiles_config:
+            raise KeymapError("keymap needs a table of profiles")
+        profiles: typing.Dict[str, typing.Dict[str, Binding]] = {}
+        for profile, bindings in profiles_config.items():
+            if not isinstance(bindings, dict):
+                errors.append(f"profiles.{profile}: must be a table of bindings")
+                continue
+            profiles[profile] = {}
+            for key, binding_config in bindings.items():
+                binding = _compile_binding(
+                    str(key),
+                    binding_config,
+                    profiles_config,
+                    f"profiles.{profile}.{key}",
+                    errors,
+                )
+                if binding is not None:
+                    profiles[profile][str(key)] = binding
+        profile = config.get("profile", next(iter(profiles_config)))
+        if profile not in profiles_config:
+            errors.append(f"profile: unknown profile {profile!r}")
+        if errors:
+            raise KeymapError("Invalid keymap:\n" + "\n".join(errors))
+        return cls(profiles=profiles, profile=profile)
+
+
+def load_keymap(file_path: str) -> Keymap:
+    """Load a keymap from a TOML or JSON config file.
+
+    Args:
+        file_path (str): Config file path, ".toml" or ".json".
+
+    Raises:
+        OSError: If the file cannot be read.
+        KeymapError: If the file cannot be parsed, or the config is invalid.
+
+    Returns:
+        Keymap: Compiled keymap.
+    """
+    config = load_config(file_path, KeymapError, "keymap")
+    return Keymap.from_config(config)
+
 
 class KeyMapper(prodcon.Consumer, prodcon.Producer):
     """
@@ -64,13 +278,56 @@ class KeyMapper(prodcon.Consumer, prodcon.Producer):
     messages that can be sent to another consumer.
     """
 
-    def __init__(self, keybindings: dict):
+    def __init__(
+        self,
+        keymap: typing.Optional[Keymap] = None,
+        profile: typing.Optional[str] = None,
+    ):
         """Construct KeyMapper.
 
         Args:
-            keybindings (dict): keybindings
+            keymap (Keymap, optional): Keymap. Defaults to None (DEFAULT_KEYMAP).
+            profile (str, optional): Initial profile. Defaults to None (the
+                keymap's initial profile).
+        """
+        self.profile = ""
+        self.bindings: typing.Dict[str, Binding] = {}
+        self.set_keymap(
+            Keymap.from_config(DEFAULT_KEYMAP) if keymap is None else keymap, profile
+        )
+
+    def set_keymap(self, keymap: Keymap, profile: typing.Optional[str] = None):
+        """Replace the keymap, e.g. after reloading its config file.
+
+        Args:
+            keymap (Keymap): Keymap.
+            profile (str, optional): Profile to switch to. Defaults to None (the
+                keymap's initial profile).
+
+        Raises:
+            KeymapError: If the keymap has no such profile.
+        """
+        profile = profile or keymap.profile
+        if profile not in keymap.profiles:
+            raise KeymapError(f"Unknown keymap profile {profile!r}")
+        self.keymap = keymap
+        self.set_profile(profile)
+
+    def set_profile(self, profile: str):
+        """Switch the active profile.
+
+        Args:
+            profile (str): Profile name.
+
+        Raises:
+            KeymapError: If the keymap has no such profile.
         """
-        self.keybindings = keybindings
+        if profile not in self.keymap.profiles:
+            raise KeymapError(f"Unknown keymap profile {profile!r}")
+        # Swap the bindings in one assignment, safe while mapping on another thread.
+        self.bindings = self.keymap.profiles[profile]
+        self.profile = profile
+        logger.info("Keymap profile %r", profile)
 
     def map(self, message: mes.Message):
         """Map key message using keybindings.
@@ -81,25 +338,18 @@ class KeyMapper(prodcon.Consumer, prodcon.Producer):
         Raises:
             TypeError: Message with type != 'Key'.
         """
-        if isinstance(message.content, mes.Key):
-            try:
-                keybinding = self.keybindings[message.content.sym]
-                sender = message.sender
-                sender.source = mes.Source.KEY_MAPPER
-                newmessage = mes.Message(
-                    sender=sender,
-                    content=keybinding["content_type"](
-                        press_release=message.content.press_release,
-                        **keybinding["content"],
-                    ),
-                )
-
-                self.send_message(newmessage)
-            except KeyError as e:
-                logger.info(f"No keybinding registered for {e}")
-
-        else:
+        content = message.content
+        if not isinstance(content, mes.Key):
             raise TypeError("KeyMapper only handles Messages with content type 'Key'.")
+        binding = self.bindings.get(content.sym)
+        if binding is None:
+            logger.info("No keybinding registered for %r", content.sym)
+        elif binding.message is not None:
+            self.send_message(
+                binding.message(content.press_release, message.sender.trigger)
+            )
+        elif binding.profile and content.press_release == mes.PressRelease.PRESS:
+            self.set_profile(binding.profile)
 
     def on_message_recieved(self, message: mes.Message):
         """Call `map` method.
@@ -0,0 +1,6 @@
+"""
+Local music library.
+
+Audio files in local directories, indexed with their tags for search (see
+`index.Library`).
+"""
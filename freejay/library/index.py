@@ -0,0 +1,455 @@
+"""
+Music library index.
+
+Audio files in the library directories are indexed in an SQLite database, with
+an FTS5 full-text index of their titles, artists, albums and file names for
+search-as-you-type.
+
+Each file is keyed by its path, inode, modification time and size. A rescan
+walks the directories in parallel, reads the tags of new and changed files only
+(also in parallel), recognises moved files by their inode, and removes files
+that are gone, all in one transaction. Run as a module to scan or search:
+
+    python -m freejay.library.index library.db --scan ~/Music
+    python -m freejay.library.index library.db --search "holi merc"
+"""
+
+import os
+import re
+import time
+import typing
+import logging
+import sqlite3
+import argparse
+import threading
+import dataclasses
+from concurrent import futures
+from freejay.library import tags as tags_
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE tracks (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    inode INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    format TEXT NOT NULL,
+    duration REAL,
+    title TEXT NOT NULL,
+    artist TEXT NOT NULL,
+    album TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE tracks_fts USING fts5(
+    title, artist, album, name,
+    content='tracks', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='1 2 3'
+);
+-- Search rank, bm25 weighted by column: title, artist, album, file name.
+INSERT INTO tracks_fts (tracks_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 2.0, 1.0)');
+CREATE TRIGGER tracks_ai AFTER INSERT ON tracks BEGIN
+    INSERT INTO tracks_fts (rowid, title, artist, album, name)
+    VALUES (new.id, new.title, new.artist, new.album, new.name);
+END;
+CREATE TRIGGER tracks_ad AFTER DELETE ON tracks BEGIN
+    INSERT INTO tracks_fts (tracks_fts, rowid, title, artist, album, name)
+    VALUES ('delete', old.id, old.title, old.artist, old.album, old.name);
+END;
+CREATE TRIGGER tracks_au AFTER UPDATE ON tracks BEGIN
+    INSERT INTO tracks_fts (tracks_fts, rowid, title, artist, album, name)
+    VALUES ('delete', old.id, old.title, old.artist, old.album, old.name);
+    INSERT INTO tracks_fts (rowid, title, artist, album, name)
+    VALUES (new.id, new.title, new.artist, new.album, new.name);
+END;
+"""
+
+# Matches ranked per one-letter search. Ranking costs about 2 microseconds per
+# match, and a single letter matches most of a large library, so these rank the
+# first matches only. Longer queries rank every match.
+RANK_WINDOW = 1000
+
+_COLUMNS = "path, format, duration, title, artist, album"
+
+# (inode, mtime in nanoseconds, size)
+FileKey = typing.Tuple[int, int, int]
+
+
+@dataclasses.dataclass(frozen=True)
+class Track:
+    """
+    Library Track.
+
+    Attributes:
+        path (str): File path.
+        format (str): Format, the lower case file extension without the dot.
+        duration (float | None): Duration in seconds, None if unknown.
+        title (str): Title.
+        artist (str): Artist.
+        album (str): Album.
+    """
+
+    path: str
+    format: str
+    duration: typing.Optional[float]
+    title: str
+    artist: str
+    album: str
+
+
+@dataclasses.dataclass
+class ScanStats:
+    """
+    Scan Statistics.
+
+    Attributes:
+        files (int): Audio files found.
+        added (int): New files indexed.
+        updated (int): Changed files re-indexed.
+        moved (int): Moved files, re-indexed without reading their tags.
+        removed (int): Missing files removed from the index.
+        failed (int): Files that could not be read.
+        seconds (float): Scan duration in seconds.
+    """
+
+    files: int = 0
+    added: int = 0
+    updated: int = 0
+    moved: int = 0
+    removed: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def unchanged(self) -> int:
+        """Get the number of files that were already up to date."""
+        return self.files - self.added - self.updated - self.moved - self.failed
+
+
+def match_query(query: str) -> typing.Optional[str]:
+    """Make an FTS5 query matching every word of a query as a prefix.
+
+    Args:
+        query (str): Search text, as typed.
+
+    Returns:
+        typing.Optional[str]: FTS5 query, None if the text has no words.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _walk(directory: str) -> typing.Tuple[typing.Dict[str, FileKey], typing.List[str]]:
+    """List the audio files and subdirectories of a directory."""
+    files = {}
+    directories = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                elif tags_.is_audio(entry.name) and entry.is_file():
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    except OSError as exc:
+        logger.warning("Cannot scan %s: %s", directory, exc)
+    return files, directories
+
+
+def _read(path: str) -> typing.Optional[tags_.Tags]:
+    try:
+        return tags_.read_tags(path)
+    except OSError as exc:
+        logger.warning("Cannot read %s: %s", path, exc)
+    except Exception:
+        # One malformed file must not abort the scan.
+        logger.exception("Cannot read tags of %s", path)
+    return None
+
+
+class Library:
+    """
+    Music Library.
+
+    Methods are thread safe, searches wait for a running scan to commit.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        directories: typing.Sequence[str] = (),
+        workers: int = 4,
+    ):
+        """Construct Library, creating the database if needed.
+
+        Args:
+            db_path (str): SQLite database path, or ":memory:".
+            directories (typing.Sequence[str], optional): Library directories.
+                Defaults to ().
+            workers (int, optional): Threads to scan with. Defaults to 4.
+        """
+        self.directories = [os.path.abspath(d) for d in directories]
+        self.workers = workers
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(db_path, check_same_thread=False)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute("PRAGMA synchronous=NORMAL")
+        if self.__db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.__create()
+
+    def __create(self):
+        with self.__db:
+            for (name,) in self.__db.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' "
+                "AND name IN ('tracks', 'tracks_fts')"
+            ).fetchall():
+                self.__db.execute(f"DROP TABLE {name}")
+            self.__db.executescript(SCHEMA)
+            self.__db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def __len__(self) -> int:
+        """Get the number of tracks in the library."""
+        with self.__lock:
+            return self.__db.execute("SELECT count(*) FROM tracks").fetchone()[0]
+
+    def close(self):
+        """Close the database."""
+        with self.__lock:
+            self.__db.close()
+
+    def get(self, path: str) -> typing.Optional[Track]:
+        """Get a track by path.
+
+        Args:
+            path (str): File path.
+
+        Returns:
+            typing.Optional[Track]: Track, None if it is not in the library.
+        """
+        with self.__lock:
+            row = self.__db.execute(
+                f"SELECT {_COLUMNS} FROM tracks WHERE path = ?", (path,)
+            ).fetchone()
+        return None if row is None else Track(*row)
+
+    def search(self, query: str, limit: int = 50) -> typing.List[Track]:
+        """Search the library, matching each word as a prefix.
+
+        Suitable for search-as-you-type: "holi merc" matches "HoliznaCC0 -
+        Mercury". Results are ranked, title matches first. Every match is
+        ranked, except for one-letter queries (the first letter typed), which
+        rank the first RANK_WINDOW matches.
+
+        Args:
+            query (str): Search text.
+            limit (int, optional): Maximum number of results. Defaults to 50.
+
+        Returns:
+            typing.List[Track]: Matching tracks, best first.
+        """
+        match = match_query(query)
+        if match is None:
+            return []
+        if max(len(word) for word in re.findall(r"\w+", query)) > 1:
+            # FTS5 sorts by the configured rank, keeping the best `limit` only.
+            found = "ORDER BY rank LIMIT ?"
+            window = limit
+        else:
+            found = "LIMIT ?"
+            window = RANK_WINDOW
+        with self.__lock:
+            rows = self.__db.execute(
+                f"SELECT {_COLUMNS} FROM tracks JOIN ("
+                f"SELECT rowid, rank FROM tracks_fts WHERE tracks_fts MATCH ? {found}"
+                ") AS found ON tracks.id = found.rowid ORDER BY found.rank LIMIT ?",
+                (match, window, limit),
+            ).fetchall()
+        return [Track(*row) for row in rows]
+
+    def scan(
+        self, directories: typing.Optional[typing.Sequence[str]] = None
+    ) -> ScanStats:
+        """Scan directories, indexing new and changed files.
+
+        Args:
+            directories (typing.Sequence[str], optional): Directories to scan.
+                Defaults to None (the library directories).
+
+        Returns:
+            ScanStats: Scan statistics.
+        """
+        start = time.perf_counter()
+        roots = (
+            self.directories
+            if directories is None
+            else [os.path.abspath(d) for d in directories]
+        )
+        stats = ScanStats()
+        with futures.ThreadPoolExecutor(self.workers) as pool:
+            found = self.__walk(pool, roots)
+            stats.files = len(found)
+            with self.__lock:
+                known = self.__known(roots)
+            removed = {path: key for path, key in known.items() if path not in found}
+            changed = [path for path, key in found.items() if known.get(path) != key]
+            moves = _moves(changed, found, known, removed)
+            read = [path for path in changed if path not in moves]
+            tags = dict(zip(read, pool.map(_read, read, chunksize=16)))
+
+        with self.__lock, self.__db:
+            for path, old_path in moves.items():
+                self.__db.execute(
+                    "UPDATE tracks SET path = ?, name = ? WHERE path = ?",
+                    (path, _name(path), old_path),
+                )
+                removed.pop(old_path)
+            stats.moved = len(moves)
+            self.__db.executemany(
+                "DELETE FROM tracks WHERE path = ?", ((p,) for p in removed)
+            )
+            stats.removed = len(removed)
+            rows = []
+            for path, track_tags in tags.items():
+                if track_tags is None:
+                    stats.failed += 1
+                    continue
+                if path in known:
+                    stats.updated += 1
+                else:
+                    stats.added += 1
+                rows.append(_row(path, found[path], track_tags))
+            self.__upsert(rows)
+        stats.seconds = time.perf_counter() - start
+        logger.info("Scanned library: %s", stats)
+        return stats
+
+    def add(self, tracks: typing.Iterable[typing.Tuple[Track, FileKey]]):
+        """Add tracks to the index directly, without reading their files.
+
+        Args:
+            tracks (typing.Iterable[typing.Tuple[Track, FileKey]]): (track,
+                (inode, mtime in nanoseconds, size)) pairs.
+        """
+        rows = [_row(track.path, key, track) for track, key in tracks]
+        with self.__lock, self.__db:
+            self.__upsert(rows)
+
+    def optimize(self):
+        """Merge the full-text index segments, for the fastest searches."""
+        with self.__lock, self.__db:
+            self.__db.execute("INSERT INTO tracks_fts (tracks_fts) VALUES ('optimize')")
+
+    def __upsert(self, rows: typing.List[typing.Tuple[typing.Any, ...]]):
+        self.__db.executemany(
+            "INSERT INTO tracks "
+            "(path, inode, mtime, size, format, duration, title, artist, album, name) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET "
+            "inode = excluded.inode, mtime = excluded.mtime, size = excluded.size, "
+            "format = excluded.format, duration = excluded.duration, "
+            "title = excluded.title, artist = excluded.artist, "
+            "album = excluded.album, name = excluded.name",
+            rows,
+        )
+
+    def __walk(
+        self, pool: futures.Executor, roots: typing.Sequence[str]
+    ) -> typing.Dict[str, FileKey]:
+        """Walk directory trees in parallel, listing their audio files."""
+        found: typing.Dict[str, FileKey] = {}
+        pending = {pool.submit(_walk, root) for root in roots}
+        while pending:
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                files, subdirectories = future.result()
+                found.update(files)
+                pending.update(pool.submit(_walk, d) for d in subdirectories)
+        return found
+
+    def __known(self, roots: typing.Sequence[str]) -> typing.Dict[str, FileKey]:
+        """Get the indexed files under the root directories."""
+        known = {}
+        for root in roots:
+            prefix = os.path.join(root, "")
+            # Path range instead of LIKE, to use the path index.
+            for path, inode, mtime, size in self.__db.execute(
+                "SELECT path, inode, mtime, size FROM tracks "
+                "WHERE path >= ? AND path < ?",
+                (prefix, prefix[:-1] + chr(ord(os.sep) + 1)),
+            ):
+                known[path] = (inode, mtime, size)
+        return known
+
+
+def _name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _row(
+    path: str, key: FileKey, track: typing.Union[Track, tags_.Tags]
+) -> typing.Tuple[typing.Any, ...]:
+    return (
+        path,
+        *key,
+        track.format,
+        track.duration,
+        track.title,
+        track.artist,
+        track.album,
+        _name(path),
+    )
+
+
+def _moves(
+    changed: typing.List[str],
+    found: typing.Dict[str, FileKey],
+    known: typing.Dict[str, FileKey],
+    removed: typing.Dict[str, FileKey],
+) -> typing.Dict[str, str]:
+    """Match new files to removed files with the same key, as moves."""
+    by_key = {key: path for path, key in removed.items()}
+    moves = {}
+    for path in changed:
+        if path not in known and found[path] in by_key:
+            moves[path] = by_key.pop(found[path])
+    return moves
+
+
+def main(argv: typing.Optional[typing.List[str]] = None):
+    """Scan directories into a library, and/or search it.
+
+    Args:
+        argv (typing.List[str], optional): Command line arguments. Defaults to
+            None (`sys.argv`).
+    """
+    parser = argparse.ArgumentParser(description="Scan or search a music library.")
+    parser.add_argument("db", help="Library database path.")
+    parser.add_argument(
+        "--scan", nargs="+", default=[], metavar="DIR", help="Directories to scan."
+    )
+    parser.add_argument("--search", help="Search text.")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum results.")
+    args = parser.parse_args(argv)
+
+    library = Library(args.db)
+    if args.scan:
+        stats = library.scan(args.scan)
+        print(f"{stats}, unchanged={stats.unchanged}")
+    if args.search is not None:
+        start = time.perf_counter()
+        tracks = library.search(args.search, limit=args.limit)
+        elapsed = time.perf_counter() - start
+        for track in tracks:
+            print(f"{track.artist} - {track.title} ({track.format}): {track.path}")
+        print(f"{len(tracks)} results in {elapsed * 1000:.2f} ms")
+    library.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,312 @@
+"""
+Audio file tags.
+
+A small pure Python tag reader, reading only the file headers: duration, format
+and title, artist and album where present. Supports MP3 (ID3v2 tags, Xing or
+constant bitrate duration), FLAC (Vorbis comments) and WAV (RIFF INFO tags).
+Other audio files get a format from their extension and no duration.
+
+Files without a title tag are titled after their file name, split into artist
+and title when named "Artist - Title".
+"""
+
+import os
+import wave
+import struct
+import typing
+import dataclasses
+
+AUDIO_EXTENSIONS = (
+    ".mp3",
+    ".flac",
+    ".wav",
+    ".ogg",
+    ".opus",
+    ".m4a",
+    ".mp4",
+    ".aac",
+    ".webm",
+)
+
+# Bytes read from the start of a file, enough for the tags of most files.
+HEADER_SIZE = 65536
+
+# MPEG audio bitrates (kbit/s) by (version 1?, layer) and index.
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# MPEG sample rates by version bits (2.5, reserved, 2, 1).
+_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+
+_ID3_FRAMES = {
+    "TIT2": "title",
+    "TT2": "title",
+    "TPE1": "artist",
+    "TP1": "artist",
+    "TALB": "album",
+    "TAL": "album",
+    "TLEN": "length",
+    "TLE": "length",
+}
+_ID3_ENCODINGS = ("latin-1", "utf-16", "utf-16-be", "utf-8")
+_VORBIS_FIELDS = {"TITLE": "title", "ARTIST": "artist", "ALBUM": "album"}
+_RIFF_FIELDS = {b"INAM": "title", b"IART": "artist", b"IPRD": "album"}
+
+
+@dataclasses.dataclass
+class Tags:
+    """
+    Audio File Tags.
+
+    Attributes:
+        format (str): Format, the lower case file extension without the dot.
+        duration (float | None): Duration in seconds, None if unknown.
+        title (str): Title.
+        artist (str): Artist.
+        album (str): Album.
+    """
+
+    format: str
+    duration: typing.Optional[float] = None
+    title: str = ""
+    artist: str = ""
+    album: str = ""
+
+
+def is_audio(file_path: str) -> bool:
+    """Check if a file is an audio file, by its extension.
+
+    Args:
+        file_path (str): File path.
+
+    Returns:
+        bool: True if the file is an audio file.
+    """
+    return os.path.splitext(file_path)[1].lower() in AUDIO_EXTENSIONS
+
+
+def read_tags(file_path: str) -> Tags:
+    """Read the tags of an audio file.
+
+    Unreadable or malformed headers leave the fields they would fill empty.
+
+    Args:
+        file_path (str): Audio file path.
+
+    Raises:
+        OSError: If the file cannot be read.
+
+    Returns:
+        Tags: File tags.
+    """
+    tags = Tags(format=os.path.splitext(file_path)[1].lower().lstrip("."))
+    with open(file_path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+        size = os.fstat(file.fileno()).st_size
+    fields: typing.Dict[str, typing.Any] = {}
+    try:
+        if header.startswith(b"ID3") or tags.format == "mp3":
+            fields = _read_mp3(header, size)
+        elif header.startswith(b"fLaC"):
+            fields = _read_flac(header)
+        elif header.startswith(b"RIFF") and header[8:12] == b"WAVE":
+            fields = _read_wav(file_path, header)
+    except (struct.error, IndexError, ValueError, EOFError, wave.Error, RuntimeError):
+        # wave raises RuntimeError on a truncated chunk.
+        pass
+    for name, value in fields.items():
+        setattr(tags, name, value)
+    if not tags.title:
+        _title_from_name(tags, file_path)
+    return tags
+
+
+def _title_from_name(tags: Tags, file_path: str):
+    """Title a track after its file name, "Artist - Title" or "Title"."""
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    artist, separator, title = name.partition(" - ")
+    if separator and not tags.artist:
+        tags.artist, tags.title = artist.strip(), title.strip()
+    else:
+        tags.title = name
+
+
+def _syncsafe(data: bytes) -> int:
+    return data[0] << 21 | data[1] << 14 | data[2] << 7 | data[3]
+
+
+def _id3_text(data: bytes) -> str:
+    encoding = _ID3_ENCODINGS[data[0]] if data and data[0] < 4 else "latin-1"
+    return data[1:].decode(encoding, errors="replace").split("\x00")[0].strip()
+
+
+def _read_id3(header: bytes) -> typing.Tuple[typing.Dict[str, str], int]:
+    """Read ID3v2 text frames, returning the fields and the tag size."""
+    if not header.startswith(b"ID3"):
+        return {}, 0
+    version = header[3]
+    end = 10 + _syncsafe(header[6:10])
+    id_size, size_size = (3, 3) if version == 2 else (4, 4)
+    position = 10
+    fields = {}
+    while position + id_size + size_size < min(end, len(header)):
+        frame_id = header[position : position + id_size].decode("latin-1")
+        if not frame_id.strip("\x00"):
+            break  # Padding.
+        size_bytes = header[position + id_size : position + id_size + size_size]
+        if version == 4:
+            frame_size = _syncsafe(size_bytes)
+        else:
+            frame_size = int.from_bytes(size_bytes, "big")
+        position += id_size + size_size + (0 if version == 2 else 2)
+        if frame_id in _ID3_FRAMES:
+            fields[_ID3_FRAMES[frame_id]] = _id3_text(
+                header[position : position + frame_size]
+            )
+        position += frame_size
+    return fields, end
+
+
+def _read_mp3(header: bytes, size: int) -> typing.Dict[str, typing.Any]:
+    """Read MP3 tags, and the duration from the first frame."""
+    fields: typing.Dict[str, typing.Any] = {}
+    id3, start = _read_id3(header)
+    length = id3.pop("length", "")
+    fields.update(id3)
+    duration = _mpeg_duration(header, start, size)
+    if duration is None and length.isdigit():
+        duration = int(length) / 1000
+    if duration is not None:
+        fields["duration"] = duration
+    return fields
+
+
+def _mpeg_duration(header: bytes, start: int, size: int) -> typing.Optional[float]:
+    """Get the duration from the first MPEG audio frame after `start`."""
+    position = header.find(b"\xff", start)
+    while 0 <= position < len(header) - 4:
+        if header[position + 1] & 0xE0 == 0xE0:
+            frame = _mpeg_frame(header[position : position + 4])
+            if frame is not None:
+                break
+        position = header.find(b"\xff", position + 1)
+    else:
+        return None
+    version_1, samples, rate, bitrate, side_info = frame
+    xing = position + 4 + side_info
+    if header[xing : xing + 4] in (b"Xing", b"Info"):
+        flags = int.from_bytes(header[xing + 4 : xing + 8], "big")
+        if flags & 1:
+            frames = int.from_bytes(header[xing + 8 : xing + 12], "big")
+            return frames * samples / rate
+    # Constant bitrate.
+    return (size - position) * 8 / (bitrate * 1000)
+
+
+def _mpeg_frame(data: bytes) -> typing.Optional[typing.Tuple[bool, int, int, int, int]]:
+    """Parse an MPEG audio frame header.
+
+    Returns:
+        (version 1?, samples per frame, sample rate, bitrate in kbit/s, side
+        information size), None if the header is invalid.
+    """
+    version = data[1] >> 3 & 3
+    layer = 4 - (data[1] >> 1 & 3)
+    bitrate_index = data[2] >> 4
+    rate_index = data[2] >> 2 & 3
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    version_1 = version == 3
+    bitrate = _BITRATES[(version_1, layer)][bitrate_index]
+    rate = _SAMPLE_RATES[version][rate_index]
+    if layer == 1:
+        samples = 384
+    elif layer == 3 and not version_1:
+        samples = 576
+    else:
+        samples = 1152
+    mono = data[3] >> 6 == 3
+    if version_1:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+    return version_1, samples, rate, bitrate, side_info
+
+
+def _read_flac(header: bytes) -> typing.Dict[str, typing.Any]:
+    """Read the FLAC stream info and Vorbis comment blocks."""
+    fields: typing.Dict[str, typing.Any] = {}
+    position = 4
+    last = False
+    while not last and position + 4 <= len(header):
+        last = bool(header[position] & 0x80)
+        block_type = header[position] & 0x7F
+        length = int.from_bytes(header[position + 1 : position + 4], "big")
+        block = header[position + 4 : position + 4 + length]
+        if block_type == 0:
+            info = int.from_bytes(block[10:18], "big")
+            rate = info >> 44
+            samples = info & 0xFFFFFFFFF
+            if rate and samples:
+                fields["duration"] = samples / rate
+        elif block_type == 4:
+            fields.update(_vorbis_comments(block))
+        position += 4 + length
+    return fields
+
+
+def _vorbis_comments(block: bytes) -> typing.Dict[str, str]:
+    fields = {}
+    vendor_length = struct.unpack_from("<I", block)[0]
+    position = 4 + vendor_length
+    (count,) = struct.unpack_from("<I", block, position)
+    position += 4
+    for _ in range(count):
+        (length,) = struct.unpack_from("<I", block, position)
+        comment = block[position + 4 : position + 4 + length].decode(
+            "utf-8", errors="replace"
+        )
+        position += 4 + length
+        key, _, value = comment.partition("=")
+        if key.upper() in _VORBIS_FIELDS:
+            fields[_VORBIS_FIELDS[key.upper()]] = value.strip()
+    return fields
+
+
+def _read_wav(file_path: str, header: bytes) -> typing.Dict[str, typing.Any]:
+    """Read the WAV duration and RIFF INFO tags."""
+    fields: typing.Dict[str, typing.Any] = {}
+    position = 12
+    while position + 8 <= len(header):
+        chunk_id = header[position : position + 4]
+        (length,) = struct.unpack_from("<I", header, position + 4)
+        if chunk_id == b"LIST" and header[position + 8 : position + 12] == b"INFO":
+            fields.update(_riff_info(header[position + 12 : position + 8 + length]))
+        position += 8 + length + length % 2
+    with wave.open(file_path, "rb") as wav:
+        fields["duration"] = wav.getnframes() / wav.getframerate()
+    return fields
+
+
+def _riff_info(data: bytes) -> typing.Dict[str, str]:
+    fields = {}
+    position = 0
+    while position + 8 <= len(data):
+        chunk_id = data[position : position + 4]
+        (length,) = struct.unpack_from("<I", data, position + 4)
+        if chunk_id in _RIFF_FIELDS:
+            value = data[position + 8 : position + 8 + length]
+            fields[_RIFF_FIELDS[chunk_id]] = (
+                value.decode("utf-8", errors="replace").rstrip("\x00").strip()
+            )
+        position += 8 + length + length % 2
+    return fields
@@ -4,10 +4,13 @@ Worker pulls messages from the queue and passes to the message handler.
 
 import queue
 import typing
+import logging
 import threading
 from freejay.messages import messages as mes
 from freejay.messages import produce_consume as prodcon
 
+logger = logging.getLogger(__name__)
+
 
 class WorkCycle:
     """Poll a queue for messages and pass them to a handler."""
@@ -28,15 +31,24 @@ class WorkCycle:
         self.running = False
 
     def start(self):
-        """Start the workcycle."""
+        """Start the workcycle.
+
+        Exceptions raised by the handler are logged, so that one bad message does
+        not stop the workcycle. Each message is marked done once handled, see
+        `WorkManager.join()`.
+        """
         self.running = True
         while True and self.running:
             try:
                 message = self.q.get(timeout=0.1)
-                self.handler(message)
-
             except queue.Empty:
-                pass
+                continue
+            try:
+                self.handler(message)
+            except Exception:
+                logger.exception("Failed to handle message: %s", message)
+            finally:
+                self.q.task_done()
 
 
 class Worker:
@@ -97,6 +109,24 @@ class WorkManager:
         for name, worker in self.workers.items():
             worker.stop()
 
+    def join(self, worker_name: str, timeout: typing.Optional[float] = None) -> bool:
+        """Wait until every item put in a worker queue has been handled.
+
+        Unlike waiting for the queue to be empty, this includes the item a
+        worker is handling, so the last message has been applied on return.
+
+        Args:
+            worker_name (str): Name of worker.
+            timeout (float, optional): Maximum seconds to wait. Defaults to None
+                (no limit).
+
+        Returns:
+            bool: Whether every item was handled, False on timeout.
+        """
+        q = self.workers[worker_name].workcycle.q
+        with q.all_tasks_done:
+            return q.all_tasks_done.wait_for(lambda: not q.unfinished_tasks, timeout)
+
     def put(self, item: typing.Any, worker_name: str):
         """Put an item in a worker queue.
 
@@ -112,7 +142,9 @@ class WorkManager:
         Args:
             worker_name (str): Name of worker.
         """
-        self.workers[worker_name].workcycle.q.get()
+        q = self.workers[worker_name].workcycle.q
+        q.get()
+        q.task_done()
 
     def get_queue(self, worker_name: str) -> queue.Queue:
         """Get a worker queue.
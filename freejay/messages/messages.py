@@ -21,6 +21,10 @@ class Component(Enum):
     LEFT_DECK = auto()
     RIGHT_DECK = auto()
     DOWNLOAD = auto()
+    DECK_3 = auto()
+    DECK_4 = auto()
+    SAMPLER = auto()
+    RECORDER = auto()
 
 
 class Element(Enum):
@@ -35,6 +39,19 @@ class Element(Enum):
     DOWNLOAD = auto()
     CROSSFADER = auto()
     SPEED = auto()
+    EQ_LOW = auto()
+    EQ_MID = auto()
+    EQ_HIGH = auto()
+    FILTER = auto()
+    CHANNEL_FADER = auto()
+    XF_ASSIGN = auto()
+    CUE_JUMP = auto()
+    LOOP = auto()
+    BPM = auto()
+    MASTER = auto()
+    RECORD = auto()
+    CRATE = auto()
+    STATE = auto()
 
 
 class Source(Enum):
@@ -47,6 +64,10 @@ class Source(Enum):
     DOWNLOAD_MODEL = auto()
     KEY_MAPPER = auto()
     MIXER = auto()
+    RECORDER_VIEW = auto()
+    RECORDER_MODEL = auto()
+    HARDWARE = auto()
+    COMMAND = auto()
 
 
 class Trigger(Enum):
@@ -23,12 +23,17 @@ class MessageRouter(prodcon.Consumer):
     as a callback function accepting a message as input and returning a boolean.
     The consumer is a target object implementing the 'Consumer' protocol.
 
+    Taps are added using the `register_tap()` method. A tap receives every
+    message meeting its condition before the message is routed, e.g. to record
+    a session.
+
     Note: message will be routed using the first matching condition only.
     """
 
     def __init__(self):
         """Construct a MessageRouter object."""
         self.routes = []
+        self.taps = []
 
     def register_route(self, condition: RouteCondition, consumer: prodcon.Consumer):
         """Register a new route.
@@ -40,6 +45,21 @@ class MessageRouter(prodcon.Consumer):
         """
         self.routes.append({"condition": condition, "consumer": consumer})
 
+    def register_tap(
+        self,
+        consumer: prodcon.Consumer,
+        condition: typing.Optional[RouteCondition] = None,
+    ):
+        """Register a tap.
+
+        Args:
+            consumer (prodcon.Consumer): Consumer to send messages to.
+            condition (RouteCondition, optional): Callback accepting a message and
+                returning a boolean. If true, message is sent to the tap. Defaults
+                to None (all messages).
+        """
+        self.taps.append({"condition": condition, "consumer": consumer})
+
     def on_message_recieved(self, message: messages.Message):
         """Check route conditions and send to target consumer.
 
@@ -47,6 +67,9 @@ class MessageRouter(prodcon.Consumer):
             message (messages.Message): Message to route
         """
         logger.debug(f"Routing message: {message}")
+        for tap in self.taps:
+            if tap["condition"] is None or tap["condition"](message):
+                tap["consumer"](message)
         for route in self.routes:
             if route["condition"](message):
                 return route["consumer"](message)
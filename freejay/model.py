@@ -1,13 +1,25 @@
 """Application Model."""
 
 import logging
-import mpv
 import typing
+import importlib
+import threading
 from freejay.player.djplayer import DJPlayer
-from freejay.player.player import PlayerMpv
+from freejay.player.player import IPlayer, make_player_mpv
+from freejay.player.deferred import DeferredPlayer
 from freejay.audio_download.ytrip import DownloadManager
+from freejay.audio_download.prepare import Preparer
+from freejay.audio_download.crate import Crate
 from freejay.messages import messages as mes
-from freejay.player.mixer import Mixer
+from freejay.player.mixer import Mixer, Assign
+from freejay.channels import CHANNELS
+from freejay.clock.master import MasterClock, QuantisedScheduler
+from freejay.clock.timerwheel import TimerWheel
+from freejay.player.hold import HoldRamp
+from freejay.player.scratch import JogWheel
+from freejay.player.state import StatePump, DEFAULT_FPS
+from freejay.recorder.recorder import Recorder
+from freejay.recorder.capture import make_monitor_capture
 
 logger = logging.getLogger(__name__)
 
@@ -18,28 +30,95 @@ class Model:
     Constructs and contains the model objects.
     """
 
-    def __init__(self, dir: typing.Optional[str] = None):
+    def __init__(
+        self,
+        dir: typing.Optional[str] = None,
+        fps: float = DEFAULT_FPS,
+        lazy: bool = True,
+    ):
         """
         Construct Model.
 
         Args:
             dir (str, optional): Directory to use for application files.
+            fps (float, optional): Frame rate deck and mixer state is published
+                to the view at. Defaults to DEFAULT_FPS.
+            lazy (bool, optional): Defer making the audio players until a track
+                is loaded or `warm_up()` is called. Defaults to True.
         """
-        self.left_deck = DJPlayer(player=PlayerMpv(mpv.MPV()))
-        self.right_deck = DJPlayer(player=PlayerMpv(mpv.MPV()))
-        self.mixer = Mixer(left_deck=self.left_deck, right_deck=self.right_deck)
+        self.players: typing.Dict[mes.Component, IPlayer] = {
+            spec.component: DeferredPlayer(make_player_mpv)
+            if lazy
+            else make_player_mpv()
+            for spec in CHANNELS
+        }
+        self.decks: typing.Dict[mes.Component, DJPlayer] = {
+            component: DJPlayer(player=player)
+            for component, player in self.players.items()
+        }
+        self.mixer = Mixer(
+            decks=self.decks,
+            assignments={spec.component: Assign(spec.assign) for spec in CHANNELS},
+        )
+        self.state = StatePump(decks=self.decks, mixer=self.mixer, fps=fps)
+        self.clock = MasterClock(reference=self.decks[CHANNELS[0].component])
+        self.scheduler = QuantisedScheduler(clock=self.clock, wheel=TimerWheel())
+        self.hold = HoldRamp(wheel=self.scheduler.wheel)
+        self.jogs: typing.Dict[mes.Component, JogWheel] = {
+            component: JogWheel(player=deck, wheel=self.scheduler.wheel)
+            for component, deck in self.decks.items()
+        }
         self.download = DownloadManager(
             destination=dir,
             source=mes.Source.DOWNLOAD_MODEL,
             component=mes.Component.DOWNLOAD,
+            preparer=Preparer(),
+        )
+        self.crate = Crate(
+            download_manager=self.download,
+            source=mes.Source.DOWNLOAD_MODEL,
+            component=mes.Component.DOWNLOAD,
+        )
+        self.recorder = Recorder(
+            destination=dir,
+            source=mes.Source.RECORDER_MODEL,
+            component=mes.Component.RECORDER,
+            capture=make_monitor_capture(rate=44100, channels=2, sample_width=2),
         )
 
+    def warm_up(self) -> threading.Thread:
+        """Make deferred players and import the download backend in the background.
 
-def make_model() -> Model:
+        Returns:
+            threading.Thread: Warm-up thread.
+        """
+        thread = threading.Thread(target=self.__warm_up, name="warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def __warm_up(self):
+        try:
+            for player in self.players.values():
+                if isinstance(player, DeferredPlayer):
+                    player.get()
+            importlib.import_module("pytube")
+        except Exception:
+            logger.exception("Warm-up failed.")
+        else:
+            logger.info("Warm-up done.")
+
+
+def make_model(fps: float = DEFAULT_FPS, lazy: bool = True) -> Model:
     """Construct and Configure Model.
 
+    Args:
+        fps (float, optional): Frame rate deck and mixer state is published
+            to the view at. Defaults to DEFAULT_FPS.
+        lazy (bool, optional): Defer making the audio players until a track is
+            loaded or `Model.warm_up()` is called. Defaults to True.
+
     Returns:
         Model
     """
-    model = Model(dir="instance")
+    model = Model(dir="instance", fps=fps, lazy=lazy)
     return model
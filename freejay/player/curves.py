@@ -0,0 +1,192 @@
+"""
+Crossfader Curves.
+
+A crossfader curve maps the crossfader position onto a volume level for each deck.
+Curves are described by a named family (the shape of the fade) and a curve value
+(how much of the fader travel both decks stay at full volume).
+
+Levels are precomputed into lookup tables so that evaluating a position is a single
+index operation, regardless of how expensive the curve family is to calculate.
+"""
+
+import enum
+import math
+import typing
+import logging
+import functools
+
+logger = logging.getLogger(__name__)
+
+# Number of steps between position 0 and position 1 in a lookup table.
+RESOLUTION = 4096
+
+# Fraction of the fader travel over which the 'sharp cut' family fades out.
+SHARP_CUT_WIDTH = 0.05
+
+
+class CurveFamily(enum.Enum):
+    """Enum for crossfader curve families."""
+
+    LINEAR = "linear"
+    CONSTANT_POWER = "constant_power"
+    SHARP_CUT = "sharp_cut"
+
+
+def _linear(fade: float) -> float:
+    return 1 - fade
+
+
+def _constant_power(fade: float) -> float:
+    return math.cos(fade * math.pi / 2)
+
+
+def _sharp_cut(fade: float) -> float:
+    return min(1.0, (1 - fade) / SHARP_CUT_WIDTH)
+
+
+_family_functions: typing.Dict[CurveFamily, typing.Callable[[float], float]] = {
+    CurveFamily.LINEAR: _linear,
+    CurveFamily.CONSTANT_POWER: _constant_power,
+    CurveFamily.SHARP_CUT: _sharp_cut,
+}
+
+
+def clamp_unit(value: float, name: str, default: float) -> float:
+    """Clamp a value into the range [0, 1].
+
+    Out of range values are clamped and NaN is replaced with `default`. Either case
+    is logged as a warning.
+
+    Args:
+        value (float): Value to clamp.
+        name (str): Name of the value, used for logging.
+        default (float): Value to use if `value` is not a number.
+
+    Returns:
+        float: Value in the range [0, 1].
+    """
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        logger.warning("%s must be a number, got %r.", name, value)
+        return default
+
+    if math.isnan(value):
+        logger.warning("%s must be a number, got NaN.", name)
+        return default
+    if not 0 <= value <= 1:
+        logger.warning("%s must be between 0 and 1, got %f. Clamping.", name, value)
+        return min(1.0, max(0.0, value))
+    return value
+
+
+def fade_amount(distance: float, curve: float) -> float:
+    """Calculate how far a deck has faded out.
+
+    Both decks stay at full volume until the crossfader has moved `curve` of the
+    way towards the opposite deck, after which the deck fades out over the
+    remaining travel.
+
+    Args:
+        distance (float): Distance of the crossfader from the deck's side (0 to 1).
+        curve (float): Curve value (0 to 1).
+
+    Returns:
+        float: Fade amount, 0 is no fade and 1 is fully faded.
+    """
+    if curve >= 1:
+        return 1.0 if distance >= 1 else 0.0
+    return min(1.0, max(0.0, (distance - curve) / (1 - curve)))
+
+
+class CurveTable:
+    """
+    Crossfader Curve lookup table.
+
+    Holds the precomputed deck levels for a curve family and curve value. The same
+    table serves both decks, the left deck is looked up by position and the right
+    deck by the mirrored position.
+
+    Tables are immutable and shared, construct them with `make_curve_table()`.
+    """
+
+    def __init__(self, family: CurveFamily, curve: float, resolution: int = RESOLUTION):
+        """Construct CurveTable.
+
+        Args:
+            family (CurveFamily): Curve family.
+            curve (float): Curve value (0 to 1).
+            resolution (int, optional): Number of steps between position 0 and 1.
+                Defaults to RESOLUTION.
+        """
+        self.family = family
+        self.curve = curve
+        self.resolution = resolution
+        func = _family_functions[family]
+        self.levels: typing.Tuple[float, ...] = tuple(
+            func(fade_amount(i / resolution, curve)) for i in range(resolution + 1)
+        )
+
+    def levels_at(self, position: float) -> typing.Tuple[float, float]:
+        """Look up deck levels.
+
+        Args:
+            position (float): Crossfader position (0 to 1).
+
+        Returns:
+            typing.Tuple[float, float]: (left deck volume, right deck volume)
+        """
+        i = round(position * self.resolution)
+        return (self.levels[i], self.levels[self.resolution - i])
+
+    def levels_many(
+        self, positions: typing.Iterable[float]
+    ) -> typing.Tuple[typing.List[float], typing.List[float]]:
+        """Look up deck levels for a sequence of positions, such as a ramp.
+
+        Args:
+            positions (typing.Iterable[float]): Crossfader positions (0 to 1).
+
+        Returns:
+            typing.Tuple[typing.List[float], typing.List[float]]: (left deck volumes,
+                right deck volumes)
+        """
+        res = self.resolution
+        levels = self.levels
+        indices = [round(p * res) for p in positions]
+        return ([levels[i] for i in indices], [levels[res - i] for i in indices])
+
+
+@functools.lru_cache(maxsize=64)
+def make_curve_table(
+    family: CurveFamily, curve: float, resolution: int = RESOLUTION
+) -> CurveTable:
+    """Get a (cached) curve table.
+
+    Args:
+        family (CurveFamily): Curve family.
+        curve (float): Curve value (0 to 1).
+        resolution (int, optional): Number of steps between position 0 and 1.
+            Defaults to RESOLUTION.
+
+    Returns:
+        CurveTable: Curve lookup table.
+    """
+    return CurveTable(family=family, curve=curve, resolution=resolution)
+
+
+def ramp(start: float, end: float, steps: int) -> typing.List[float]:
+    """Make a linear ramp of crossfader positions.
+
+    Args:
+        start (float): Start position.
+        end (float): End position.
+        steps (int): Number of positions in the ramp (at least 2).
+
+    Returns:
+        typing.List[float]: Positions from `start` to `end` inclusive.
+    """
+    if steps < 2:
+        return [end]
+    step = (end - start) / (steps - 1)
+    return [start + i * step for i in range(steps)]
@@ -0,0 +1,176 @@
+"""
+Deferred audio player.
+
+Making an mpv player loads libmpv and starts its threads, which slows startup.
+A DeferredPlayer stands in for a player until it is first needed, to load a
+track, or until it is warmed up in the background (see `Model.warm_up()`).
+
+Until then it reports that nothing is loaded, and keeps the speed, volume and
+filter settings it is given, to apply when the player is made.
+"""
+
+import typing
+import logging
+import threading
+from freejay.player.player import IPlayer, FileNotLoaded, FILTER_DEFAULTS
+
+logger = logging.getLogger(__name__)
+
+
+class DeferredPlayer(IPlayer):
+    """Audio player made on first use."""
+
+    def __init__(self, player: typing.Callable[[], IPlayer]):
+        """Construct DeferredPlayer.
+
+        Args:
+            player (typing.Callable[[], IPlayer]): Makes the player, e.g.
+                `player.make_player_mpv`.
+        """
+        self.__make = player
+        self.__player: typing.Optional[IPlayer] = None
+        self.__lock = threading.Lock()
+        self.__speed = 1.0
+        self.__volume = 100.0
+        self.__filters: typing.Dict[str, float] = {}
+
+    @property
+    def ready(self) -> bool:
+        """Get whether the player has been made."""
+        return self.__player is not None
+
+    def get(self) -> IPlayer:
+        """Get the player, making it if needed.
+
+        Returns:
+            IPlayer: Player.
+        """
+        player = self.__player
+        if player is not None:
+            return player
+        with self.__lock:
+            if self.__player is None:
+                player = self.__make()
+                player.speed = self.__speed
+                player.volume = self.__volume
+                for name, value in self.__filters.items():
+                    player.set_filter(name, value)
+                self.__player = player
+                logger.debug("Player made.")
+            return self.__player
+
+    @property
+    def speed(self) -> float:
+        """Playback speed."""
+        return self.__speed if self.__player is None else self.__player.speed
+
+    @speed.setter
+    def speed(self, val: float):
+        with self.__lock:
+            if self.__player is None:
+                self.__speed = val
+                return
+        self.__player.speed = val
+
+    @property
+    def volume(self) -> float:
+        """Audio volume."""
+        return self.__volume if self.__player is None else self.__player.volume
+
+    @volume.setter
+    def volume(self, val: float):
+        with self.__lock:
+            if self.__player is None:
+                self.__volume = val
+                return
+        self.__player.volume = val
+
+    @property
+    def time_start(self) -> float:
+        """Start time of track."""
+        return self.__loaded().time_start
+
+    @property
+    def time_end(self) -> float:
+        """End time of track."""
+        return self.__loaded().time_end
+
+    @property
+    def time_pos(self) -> float:
+        """Time position of track."""
+        return self.__loaded().time_pos
+
+    @property
+    def loaded(self) -> bool:
+        """Is the player loaded with a track."""
+        return self.__player is not None and self.__player.loaded
+
+    @property
+    def playing(self) -> bool:
+        """Is the track playing."""
+        return self.__player is not None and self.__player.playing
+
+    def load(self, filename: str):
+        """Load a track, making the player if needed.
+
+        Args:
+            filename (str): filename to load into player.
+        """
+        self.get().load(filename)
+
+    def play(self):
+        """Play the track."""
+        self.__loaded().play()
+
+    def pause(self):
+        """Pause the track."""
+        self.__loaded().pause()
+
+    def seek(self, value: float, reference: str = "absolute"):
+        """Seek to a position in the track.
+
+        Args:
+            value(float): Amount to seek in seconds.
+            reference(str): Allowed values ('absolute', 'relative')
+                Defaults to 'absolute'.
+        """
+        self.__loaded().seek(value, reference=reference)
+
+    def loop(self, start: float, end: float):
+        """Loop a section of the track.
+
+        Args:
+            start (float): Loop start time in seconds.
+            end (float): Loop end time in seconds.
+        """
+        self.__loaded().loop(start, end)
+
+    def clear_loop(self):
+        """Stop looping."""
+        if self.__player is not None:
+            self.__player.clear_loop()
+
+    def set_filter(self, name: str, value: float):
+        """Set an audio filter parameter.
+
+        Args:
+            name (str): Filter parameter, one of the keys of `FILTER_DEFAULTS`.
+            value (float): Parameter value.
+
+        Raises:
+            KeyError: If `name` is not a supported filter parameter.
+        """
+        if name not in FILTER_DEFAULTS:
+            raise KeyError(name)
+        with self.__lock:
+            if self.__player is None:
+                self.__filters[name] = value
+                return
+        self.__player.set_filter(name, value)
+
+    def __loaded(self) -> IPlayer:
+        # Nothing can be loaded before the player is made.
+        if self.__player is None:
+            logger.error("File not loaded.")
+            raise FileNotLoaded()
+        return self.__player
@@ -1,13 +1,40 @@
 """Contains DJ Audio Player Functionality.
 
 The DJPlayer module holds the DJPlayer class, representing a DJ audio player.
+
+A deck is changed by the model worker and, for quantised actions, holds and
+scratches, by the timer wheel thread. Changes take the deck's lock, so they
+are applied one at a time.
 """
 
+import typing
 import logging
+import functools
+import threading
 from freejay.player.player import IPlayer
 
 logger = logging.getLogger(__name__)
 
+TCallable = typing.TypeVar("TCallable", bound=typing.Callable)
+
+
+def _locked(func: TCallable) -> TCallable:
+    """Run a DJPlayer method with the deck locked.
+
+    Args:
+        func (TCallable): DJPlayer method.
+
+    Returns:
+        TCallable: DJPlayer method wrapped with the deck lock.
+    """
+
+    @functools.wraps(func)
+    def wrapper_locked(self, *args, **kwargs):
+        with self.lock:
+            return func(self, *args, **kwargs)
+
+    return typing.cast(TCallable, wrapper_locked)
+
 
 class DJPlayer:
     """DJ audio player.
@@ -17,7 +44,15 @@ class DJPlayer:
         filename (str): Audio file loaded in player.
         time_pos (float): Current time in track.
         time_cue (float): Cue point time in track.
+        duration (float): Length of the track.
+        loaded (bool): Is a track loaded.
         volume(float): The audio volume.
+        playing (bool): Is the track playing.
+        looping (bool): Is the player looping.
+        bpm (float | None): Track tempo in beats per minute, None if unknown.
+        beat_offset (float): Time of the first beat in the track.
+        lock (threading.RLock): Deck lock, taken by every change. Hold it to
+            make several changes (or a check and a change) at once.
         __filename(str): Audio file loaded in player.
         __speed(float): Playback speed.
         __cue_mode (bool): Is the player in cue mode?
@@ -34,6 +69,13 @@ class DJPlayer:
         nudge_press(value): Represents pitch nudge press.
         nudge_release(): Represents pitch nudge release.
         jog(value): Jog (relative seek) the track by value.
+        scratch(rate): Temporarily change the playback rate.
+        scratch_release(): Restore the playback rate.
+        cue_jump(): Jump to the cue point.
+        loop_on(beats): Loop from the current position.
+        loop_off(): Stop looping.
+        loop_toggle(beats): Start or stop looping.
+        set_filter(name, value): Set an audio filter parameter.
         __nudge(value): Helper to apply pitch nudge.
     """
 
@@ -50,13 +92,21 @@ class DJPlayer:
         self.__time_cue = 0.0
         self.__nudge_value = 0.0
         self.__player = player
+        self.__looping = False
+        self.bpm: typing.Optional[float] = None
+        self.beat_offset = 0.0
+        self.lock = threading.RLock()
 
-    def load(self, filename: str):
+    @_locked
+    def load(self, filename: str) -> bool:
         """Load an audio file into the player.
 
         Args:
             filename(str): path to audio file
 
+        Returns:
+            bool: Whether the file was loaded, False while a track is playing.
+
         Raises:
             FileNotFoundError: If file `filename` cannot be found.
             MPVLoadError: If the file `filename` cannot be loaded by MPV
@@ -65,13 +115,19 @@ class DJPlayer:
         # If the file is playing, do nothing and log a warning.
         if self.__player.playing:
             logger.warning("Track is still playing!")
-        else:
-            self.__cue_mode = True
-            self.__player.load(filename=filename)
-            self.__filename = filename
-            self.speed = 1.0
-            self.__time_cue = self.__player.time_start
-
+            return False
+        self.__cue_mode = True
+        if self.__looping:
+            self.loop_off()
+        self.__player.load(filename=filename)
+        self.__filename = filename
+        self.speed = 1.0
+        self.__time_cue = self.__player.time_start
+        self.bpm = None
+        self.beat_offset = 0.0
+        return True
+
+    @_locked
     def play_pause(self):
         """Play or pause the track."""
         if not self.__player.playing:
@@ -84,12 +140,14 @@ class DJPlayer:
 
         self.__cue_mode = False
 
+    @_locked
     def stop(self):
         """Stop playback and return to start of track."""
         self.__player.pause()
         self.__cue_mode = True
         self.__player.seek(self.__player.time_start, reference="absolute")
 
+    @_locked
     def cue_press(self):
         """Imitates cue button press (see method `cue_release` for release)."""
         # Cue behaviour uses the `__cue_mode` attribute to track whether the
@@ -109,6 +167,7 @@ class DJPlayer:
 
         self.__cue_mode = True
 
+    @_locked
     def cue_release(self):
         """Imitates cue button release (see method `cue_press` for press)."""
         if self.__cue_mode:
@@ -122,6 +181,7 @@ class DJPlayer:
         return self.__speed
 
     @speed.setter  # When you set the speed, update it in the player too.
+    @_locked
     def speed(self, val: float):
         self.__speed = val
         self.__nudge(self.__nudge_value)
@@ -132,9 +192,15 @@ class DJPlayer:
         return self.__player.volume
 
     @volume.setter
+    @_locked
     def volume(self, val: float):
         self.__player.volume = val
 
+    @property
+    def playing(self) -> bool:
+        """Is the track playing."""
+        return self.__player.playing
+
     @property
     def filename(self) -> str:
         """Filename."""
@@ -150,6 +216,17 @@ class DJPlayer:
         """Cue point time."""
         return self.__time_cue
 
+    @property
+    def duration(self) -> float:
+        """Track length."""
+        return self.__player.time_end
+
+    @property
+    def loaded(self) -> bool:
+        """Is a track loaded."""
+        return self.__player.loaded
+
+    @_locked
     def nudge_press(self, value: float = 0.15):
         """
         Pitch nudge start.
@@ -171,6 +248,7 @@ class DJPlayer:
             self.__nudge(value)
             self.__nudge_value = value
 
+    @_locked
     def nudge_release(self):
         """Pitch nudge stop. See also `nudge_press`."""
         self.__nudge(0)
@@ -179,6 +257,7 @@ class DJPlayer:
     def __nudge(self, value):
         self.__player.speed = self.speed * (1 + value)
 
+    @_locked
     def jog(self, value: float = 10.0):
         """Jog the track.
 
@@ -188,3 +267,71 @@ class DJPlayer:
         """
         self.__player.seek(value, reference="relative")
         self.__cue_mode = False
+
+    @_locked
+    def scratch(self, rate: float):
+        """Temporarily play at a multiple of the speed, e.g. while scratching.
+
+        See also `scratch_release`. Unlike a nudge, the rate is not limited.
+
+        Args:
+            rate (float): Playback rate, relative to the speed (and any nudge).
+        """
+        self.__player.speed = self.speed * (1 + self.__nudge_value) * rate
+
+    @_locked
+    def scratch_release(self):
+        """Restore the playback rate after a scratch. See also `scratch`."""
+        self.__nudge(self.__nudge_value)
+
+    @_locked
+    def cue_jump(self):
+        """Jump to the cue point, without changing the play state."""
+        self.__player.seek(value=self.__time_cue, reference="absolute")
+
+    @_locked
+    def loop_on(self, beats: float = 4):
+        """Loop from the current position.
+
+        Args:
+            beats (float, optional): Loop length in beats. Defaults to 4.
+        """
+        if not self.bpm:
+            logger.warning("Cannot loop, track tempo unknown.")
+            return
+        start = self.__player.time_pos
+        self.__player.loop(start, start + beats * 60 / self.bpm)
+        self.__looping = True
+
+    @_locked
+    def loop_off(self):
+        """Stop looping."""
+        self.__player.clear_loop()
+        self.__looping = False
+
+    @_locked
+    def loop_toggle(self, beats: float = 4):
+        """Start or stop looping.
+
+        Args:
+            beats (float, optional): Loop length in beats. Defaults to 4.
+        """
+        if self.__looping:
+            self.loop_off()
+        else:
+            self.loop_on(beats=beats)
+
+    @property
+    def looping(self) -> bool:
+        """Is the player looping."""
+        return self.__looping
+
+    @_locked
+    def set_filter(self, name: str, value: float):
+        """Set an audio filter parameter (e.g. EQ gain or filter cutoff).
+
+        Args:
+            name (str): Filter parameter, see `player.FILTER_DEFAULTS`.
+            value (float): Parameter value.
+        """
+        self.__player.set_filter(name, value)
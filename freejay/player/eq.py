@@ -0,0 +1,151 @@
+"""
+Contains Channel EQ Model.
+
+Each mixer channel has a three band EQ (low, mid, high) and a sweepable filter.
+The filter is a single control: negative values sweep a low-pass filter down,
+positive values sweep a high-pass filter up, and zero bypasses both.
+"""
+
+import math
+import logging
+import typing
+from freejay.player.djplayer import DJPlayer
+from freejay.player.player import FILTER_DEFAULTS
+
+logger = logging.getLogger(__name__)
+
+# EQ gain range in dB. The minimum is low enough to act as a band 'kill'.
+EQ_GAIN_MIN = -26.0
+EQ_GAIN_MAX = 6.0
+
+# Filter cutoff sweep ranges in Hz.
+LOWPASS_MIN = 200.0
+HIGHPASS_MAX = 5000.0
+
+
+def _clamp(
+    value: float, minimum: float, maximum: float, name: str
+) -> typing.Optional[float]:
+    """Clamp a value into a range.
+
+    Args:
+        value (float): Value to clamp.
+        minimum (float): Range minimum.
+        maximum (float): Range maximum.
+        name (str): Name of the value, used for logging.
+
+    Returns:
+        typing.Optional[float]: Clamped value, or None (logged as a warning) if
+            `value` is not a number.
+    """
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        logger.warning("%s must be a number, got %r.", name, value)
+        return None
+    if math.isnan(value):
+        logger.warning("%s must be a number, got NaN.", name)
+        return None
+    return min(maximum, max(minimum, value))
+
+
+class ChannelEQ:
+    """
+    Channel EQ Model.
+
+    Holds EQ and filter settings for a channel and pushes changed parameters
+    to the channel's DJPlayer. Only parameters that have changed are sent, so
+    sweeping a control sends a single filter command per update.
+
+    Note: ChannelEQ is not intended to be constructed directly, but rather
+    by the Mixer class.
+    """
+
+    def __init__(self, player: DJPlayer):
+        """Construct ChannelEQ.
+
+        Args:
+            player (DJPlayer): Channel player.
+        """
+        self.player = player
+        self.__gains = {"eq_low": 0.0, "eq_mid": 0.0, "eq_high": 0.0}
+        self.__filter = 0.0
+        self.__cutoffs = {
+            "highpass": FILTER_DEFAULTS["highpass"],
+            "lowpass": FILTER_DEFAULTS["lowpass"],
+        }
+
+    def __set_gain(self, name: str, value: float):
+        gain = _clamp(value, EQ_GAIN_MIN, EQ_GAIN_MAX, "EQ gain")
+        if gain is not None and gain != self.__gains[name]:
+            self.__gains[name] = gain
+            self.player.set_filter(name, gain)
+
+    @property
+    def low(self) -> float:
+        """Low band gain in dB."""
+        return self.__gains["eq_low"]
+
+    @low.setter
+    def low(self, value: float):
+        self.__set_gain("eq_low", value)
+
+    @property
+    def mid(self) -> float:
+        """Mid band gain in dB."""
+        return self.__gains["eq_mid"]
+
+    @mid.setter
+    def mid(self, value: float):
+        self.__set_gain("eq_mid", value)
+
+    @property
+    def high(self) -> float:
+        """High band gain in dB."""
+        return self.__gains["eq_high"]
+
+    @high.setter
+    def high(self, value: float):
+        self.__set_gain("eq_high", value)
+
+    @property
+    def filter(self) -> float:
+        """Filter position (-1 to 1)."""
+        return self.__filter
+
+    @filter.setter
+    def filter(self, value: float):
+        """Set the filter position.
+
+        Args:
+            value (float): Filter position, clamped between -1 and 1.
+        """
+        position = _clamp(value, -1.0, 1.0, "Filter")
+        if position is None:
+            return
+        self.__filter = position
+        for name, cutoff in filter_cutoffs(position).items():
+            if cutoff != self.__cutoffs[name]:
+                self.__cutoffs[name] = cutoff
+                self.player.set_filter(name, cutoff)
+
+
+def filter_cutoffs(value: float) -> typing.Dict[str, float]:
+    """Calculate filter cutoff frequencies for a filter position.
+
+    Cutoffs sweep exponentially so that equal control movements give
+    equal changes in pitch.
+
+    Args:
+        value (float): Filter position (-1 to 1).
+
+    Returns:
+        typing.Dict[str, float]: Cutoff frequencies for 'highpass' and 'lowpass'.
+    """
+    highpass = FILTER_DEFAULTS["highpass"]
+    lowpass = FILTER_DEFAULTS["lowpass"]
+    if value > 0:
+        highpass = highpass * (HIGHPASS_MAX / highpass) ** value
+    elif value < 0:
+        lowpass = lowpass * (LOWPASS_MIN / lowpass) ** -value
+    return {"highpass": round(highpass, 1), "lowpass": round(lowpass, 1)}
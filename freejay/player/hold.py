@@ -0,0 +1,138 @@
+"""
+Press-and-hold acceleration.
+
+While a button is held, an action is repeated with a factor that ramps up over
+time, e.g. seeking faster and faster while a jog button is held. Every held
+button is driven by a single repeating timer on a timer wheel, rather than by
+repeated key events, and the timer stops once no buttons are held.
+"""
+
+import time
+import typing
+import logging
+import threading
+import dataclasses
+from freejay.clock.timerwheel import TimerWheel, Timer
+
+logger = logging.getLogger(__name__)
+
+# Called every tick while held, with the ramp factor and the seconds since the
+# previous call.
+HoldAction = typing.Callable[[float, float], None]
+
+
+@dataclasses.dataclass
+class _Hold:
+    start: float
+    last: float
+    action: HoldAction
+
+
+class HoldRamp:
+    """
+    Press-and-hold ramp.
+
+    A button is held from `press()` to `release()`. Once held for `delay`
+    seconds, its action is called every tick with a factor starting at 1 and
+    doubling every `doubling` seconds, up to `max_factor`. `release()` waits for
+    a running action, so a released button's action is never called after
+    `release()` returns.
+
+    Methods are thread safe. Actions are called on the timer wheel thread, with
+    the ramp locked, and should return quickly.
+    """
+
+    def __init__(
+        self,
+        wheel: TimerWheel,
+        interval: float = 0.02,
+        delay: float = 0.3,
+        doubling: float = 0.5,
+        max_factor: float = 16.0,
+    ):
+        """Construct HoldRamp.
+
+        Args:
+            wheel (TimerWheel): Timer wheel to tick on.
+            interval (float, optional): Tick interval in seconds. Defaults to
+                0.02.
+            delay (float, optional): Seconds a button is held before the ramp
+                starts, so a tap is not a hold. Defaults to 0.3.
+            doubling (float, optional): Seconds for the factor to double.
+                Defaults to 0.5.
+            max_factor (float, optional): Maximum factor. Defaults to 16.0.
+        """
+        self.wheel = wheel
+        self.interval = interval
+        self.delay = delay
+        self.doubling = doubling
+        self.max_factor = max_factor
+        self.__holds: typing.Dict[typing.Hashable, _Hold] = {}
+        self.__timer: typing.Optional[Timer] = None
+        self.__deadline = 0.0
+        self.__lock = threading.RLock()
+
+    @property
+    def held(self) -> typing.List[typing.Hashable]:
+        """Get the keys of the held buttons."""
+        with self.__lock:
+            return list(self.__holds)
+
+    def factor(self, held: float) -> float:
+        """Get the ramp factor.
+
+        Args:
+            held (float): Seconds held beyond the delay.
+
+        Returns:
+            float: Ramp factor.
+        """
+        return min(self.max_factor, 2 ** (held / self.doubling))
+
+    def press(self, key: typing.Hashable, action: HoldAction):
+        """Start holding a button. Pressing a held button restarts its ramp.
+
+        Args:
+            key (typing.Hashable): Button key, e.g. (component, element).
+            action (HoldAction): Called every tick once held for `delay`.
+        """
+        now = time.perf_counter()
+        with self.__lock:
+            self.__holds[key] = _Hold(
+                start=now + self.delay, last=now + self.delay, action=action
+            )
+            if self.__timer is None:
+                self.__deadline = now + self.interval
+                self.__timer = self.wheel.schedule(self.__deadline, self.__tick)
+
+    def release(self, key: typing.Hashable) -> bool:
+        """Stop holding a button.
+
+        Args:
+            key (typing.Hashable): Button key.
+
+        Returns:
+            bool: True if the button was held.
+        """
+        with self.__lock:
+            return self.__holds.pop(key, None) is not None
+
+    def __tick(self):
+        """Call the held actions, and schedule the next tick while held."""
+        now = time.perf_counter()
+        with self.__lock:
+            for hold in list(self.__holds.values()):
+                if now > hold.start:
+                    try:
+                        hold.action(self.factor(now - hold.start), now - hold.last)
+                    except Exception:
+                        logger.exception("Hold action raised an exception.")
+                    hold.last = now
+            if self.__holds:
+                # Fixed rate, without catching up on missed ticks.
+                self.__deadline += self.interval
+                if self.__deadline < now:
+                    self.__deadline = now + self.interval
+                self.__timer = self.wheel.schedule(self.__deadline, self.__tick)
+            else:
+                self.__timer = None
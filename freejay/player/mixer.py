@@ -1,40 +1,144 @@
 """
 Contains DJ Mixer Model.
 
-This module currently contains the Mixer and Crossfader classes.
+This module currently contains the Mixer, Channel and Crossfader classes. Channel
+EQ lives in the `eq` module.
 """
 
+import enum
 import logging
 import typing
 from freejay.player.djplayer import DJPlayer
+from freejay.player import curves
+from freejay.player.eq import ChannelEQ
+from freejay.messages import messages as mes
 
 logger = logging.getLogger(__name__)
 
 
+class Assign(enum.Enum):
+    """Enum for channel crossfader assignment."""
+
+    THRU = "THRU"
+    A = "A"
+    B = "B"
+
+
 class Mixer:
     """
     DJ Mixer Model.
 
-    Keeps a reference to the 'connected' left and right decks.
-    Contains DJ Mixer functionality, currently just a crossfader.
+    Keeps a reference to the 'connected' channels, any number of decks keyed by
+    message component (e.g. LEFT_DECK, RIGHT_DECK). Contains DJ
+    Mixer functionality, a crossfader and a channel strip (fader, crossfader
+    assignment and EQ) for each deck.
 
-    The general idea is that any functionality that requires co-ordination between
-    players will sit here.
+    Channel gains are recomputed together whenever a fader, assignment or the
+    crossfader changes, and pushed to the decks in a single pass. Only decks whose
+    gain has changed are updated.
 
-    Note: decision to be made as to whether EQ control becomes a player.DJPlayer
-    feature, or a player.Mixer feature.
+    The general idea is that any functionality that requires co-ordination between
+    players will sit here. EQ is a Mixer feature, as on a hardware mixer, and
+    is applied through each deck's player.
     """
 
-    def __init__(self, left_deck: DJPlayer, right_deck: DJPlayer):
+    def __init__(
+        self,
+        decks: typing.Mapping[mes.Component, DJPlayer],
+        assignments: typing.Optional[typing.Mapping[mes.Component, Assign]] = None,
+    ):
         """Construct Mixer.
 
         Args:
-            left_deck (DJPlayer): Left Deck DJPlayer
-            right_deck (DJPlayer): Right Deck DJPlayer
+            decks (typing.Mapping[mes.Component, DJPlayer]): Deck for each
+                channel.
+            assignments (typing.Mapping[mes.Component, Assign], optional):
+                Crossfader assignment for each channel. Channels not included are
+                assigned THRU. Defaults to None.
         """
-        self.left_deck = left_deck
-        self.right_deck = right_deck
+        assignments = assignments or dict()
+        self.channels: typing.Dict[mes.Component, Channel] = {
+            key: Channel(self, deck, assignments.get(key, Assign.THRU))
+            for key, deck in decks.items()
+        }
         self.crossfader = Crossfader(self)
+        self.__gains = [-1.0] * len(self.channels)
+
+    def update_levels(self):
+        """Recompute channel gains and push changed levels to the decks."""
+        level_a, level_b = self.crossfader.levels
+        xf_levels = {Assign.THRU: 1.0, Assign.A: level_a, Assign.B: level_b}
+        gains = [ch.fader * xf_levels[ch.assign] for ch in self.channels.values()]
+
+        for i, (channel, gain) in enumerate(zip(self.channels.values(), gains)):
+            if gain != self.__gains[i]:
+                channel.deck.volume = gain * 100
+        self.__gains = gains
+
+    @property
+    def gains(self) -> typing.Dict[mes.Component, float]:
+        """Get the current channel gains, between 0 and 1."""
+        return dict(zip(self.channels, self.__gains))
+
+
+class Channel:
+    """
+    Mixer Channel Model.
+
+    Models a mixer channel strip, with a channel fader, crossfader assignment
+    and EQ.
+
+    Note: Channel is not intended to be constructed directly, but rather
+    by the Mixer class.
+    """
+
+    def __init__(self, mixer: Mixer, deck: DJPlayer, assign: Assign = Assign.THRU):
+        """Construct Channel.
+
+        Args:
+            mixer (Mixer): reference to parent mixer.
+            deck (DJPlayer): channel deck.
+            assign (Assign, optional): crossfader assignment. Defaults to THRU.
+        """
+        self.mixer = mixer
+        self.deck = deck
+        self.eq = ChannelEQ(deck)
+        self.__assign = assign
+        self.__fader = 1.0
+
+    @property
+    def fader(self) -> float:
+        """Channel fader level (0 to 1)."""
+        return self.__fader
+
+    @fader.setter
+    def fader(self, value: float):
+        """Set the channel fader level.
+
+        Args:
+            value (float): fader level. Clamped between 0 and 1.
+        """
+        self.__fader = curves.clamp_unit(value, "Channel fader", self.__fader)
+        self.mixer.update_levels()
+
+    @property
+    def assign(self) -> Assign:
+        """Crossfader assignment."""
+        return self.__assign
+
+    @assign.setter
+    def assign(self, value: typing.Union[Assign, str]):
+        """Set the crossfader assignment.
+
+        Args:
+            value (Assign | str): Assignment, or its value ('A', 'B' or 'THRU').
+        """
+        try:
+            self.__assign = Assign(value)
+        except ValueError:
+            logger.warning("Invalid crossfader assignment %r.", value)
+            return
+        self.mixer.update_levels()
 
 
 class Crossfader:
@@ -42,29 +146,39 @@ class Crossfader:
     Crossfader Model.
 
     The Crossfader class models a DJ Mixer crossfader. Moving the crossfader position
-    to the left (represented here as a position of 0.0) will result in the left deck
-    having maximum volume and the right deck having zero volume. Moving the crossfader
-    position over to the middle (position of 0.5) will be a blend of both decks and
-    so on.
+    to the left (represented here as a position of 0.0) will result in channels
+    assigned to the A side having maximum volume and channels assigned to the B side
+    having zero volume. Moving the crossfader position over to the middle (position
+    of 0.5) will be a blend of both sides and so on. Channels assigned THRU are not
+    affected by the crossfader.
+
+    The Crossfader curve describes relationship between channel volume and
+    crossfader position. A low curve value will result in a gradual fade between the
+    A and B sides, a high curve will result in an abrupt transition, useful for
+    'scratching'. The curve family sets the shape of the fade (see
+    `curves.CurveFamily`).
 
-    The Crossfader curve describes relationship between deck volume and crossfader
-    position. A low curve value will result in a gradual fade between the left and
-    right deck, a high curve will result in an abrupt transition, useful for
-    'scratching'.
+    Position and curve are clamped into the range [0, 1], invalid values are logged
+    and ignored.
 
     Note: Crossfader is not intended to be constructed directly, but rather
     by the Mixer class.
     """
 
-    def __init__(self, mixer: Mixer):
+    def __init__(
+        self, mixer: Mixer, family: curves.CurveFamily = curves.CurveFamily.LINEAR
+    ):
         """Construct Crossfader.
 
         Args:
             mixer (Mixer): reference to parent mixer.
+            family (CurveFamily, optional): Curve family. Defaults to LINEAR.
         """
         self.mixer = mixer
+        self.__family = family
         self.__curve = 0.5
         self.__position = 0.5
+        self.__table = curves.make_curve_table(family, self.__curve)
 
     @property
     def position(self) -> float:
@@ -76,16 +190,11 @@ class Crossfader:
         """Position (setter).
 
         Args:
-            value (float): position to set. Must be between 0 and 1.
+            value (float): position to set. Clamped between 0 and 1.
         """
-        if not 0 <= value <= 1:
-            logger.error("Crossfader position must be between 0 and 1.")
-            ValueError("Crossfader position must be between 0 and 1.")
+        value = curves.clamp_unit(value, "Crossfader position", self.__position)
         self.__position = value
-        # Update deck volume levels
-        level_left, level_right = self.calculate_levels(position=value)
-        self.mixer.left_deck.volume = level_left * 100
-        self.mixer.right_deck.volume = level_right * 100
+        self.update_levels()
 
     @property
     def curve(self) -> float:
@@ -96,17 +205,40 @@ class Crossfader:
     def curve(self, value: float):
         """Curve (setter).
 
+        Curve is rounded to 3 decimal places so that lookup tables can be shared.
+
         Args:
-            value (float): value to set. Must be between 0 and 1.
+            value (float): value to set. Clamped between 0 and 1.
         """
-        if not 0 <= value <= 1:
-            logger.error("Crossfader curve must be between 0 and 1.")
-            ValueError("Crossfader curve must be between 0 and 1.")
+        value = curves.clamp_unit(value, "Crossfader curve", self.__curve)
+        self.__curve = round(value, 3)
+        self.__table = curves.make_curve_table(self.__family, self.__curve)
+        self.update_levels()
 
-        # Division by zero error on curve = 1
-        if value == 1:
-            value = 0.99
-        self.__curve = value
+    @property
+    def family(self) -> curves.CurveFamily:
+        """Get the curve family."""
+        return self.__family
+
+    @family.setter
+    def family(self, value: curves.CurveFamily):
+        """Set the curve family.
+
+        Args:
+            value (CurveFamily): Curve family.
+        """
+        self.__family = curves.CurveFamily(value)
+        self.__table = curves.make_curve_table(self.__family, self.__curve)
+        self.update_levels()
+
+    def update_levels(self):
+        """Update channel levels for the current position."""
+        self.mixer.update_levels()
+
+    @property
+    def levels(self) -> typing.Tuple[float, float]:
+        """Levels at the current position (A side level, B side level)."""
+        return self.__table.levels_at(self.__position)
 
     def calculate_levels(self, position: float) -> typing.Tuple[float, float]:
         """Calculate deck volume levels.
@@ -118,8 +250,27 @@ class Crossfader:
             position (float): crossfader position.
 
         Returns:
-            typing.Tuple[float, float]: (left deck volume, right deck volume)
+            typing.Tuple[float, float]: (A side volume, B side volume)
+        """
+        position = curves.clamp_unit(position, "Crossfader position", 0.5)
+        return self.__table.levels_at(position)
+
+    def calculate_levels_many(
+        self, positions: typing.Iterable[float]
+    ) -> typing.Tuple[typing.List[float], typing.List[float]]:
+        """Calculate deck volume levels for a sequence of positions.
+
+        Useful for ramps (e.g. an automated crossfade), each position is clamped
+        between 0 and 1.
+
+        Args:
+            positions (typing.Iterable[float]): crossfader positions.
+
+        Returns:
+            typing.Tuple[typing.List[float], typing.List[float]]: (A side volumes,
+                B side volumes)
         """
-        level_left = min(1, 1 - ((position - self.__curve) / (1 - self.__curve)))
-        level_right = min(1, 1 - ((1 - position - self.__curve) / (1 - self.__curve)))
-        return (level_left, level_right)
+        # NaN != NaN, so NaN positions are replaced with the centre position.
+        return self.__table.levels_many(
+            min(1.0, max(0.0, p)) if p == p else 0.5 for p in positions
+        )
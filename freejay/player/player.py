@@ -11,11 +11,24 @@ import functools
 import typing
 import abc
 import retry
-from mpv import MPV
+
+if typing.TYPE_CHECKING:
+    # Imported when a player is made, loading libmpv is slow.
+    from mpv import MPV
 
 TCallable = typing.TypeVar("TCallable", bound=typing.Callable)
 logger = logging.getLogger(__name__)
 
+# Audio filter parameters supported by players and their neutral values.
+# EQ bands are gains in dB, highpass/lowpass are cutoff frequencies in Hz.
+FILTER_DEFAULTS = {
+    "eq_low": 0.0,
+    "eq_mid": 0.0,
+    "eq_high": 0.0,
+    "highpass": 10.0,
+    "lowpass": 20000.0,
+}
+
 
 """Player Interface"""
 
@@ -116,6 +129,34 @@ class IPlayer(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def loop(self, start: float, end: float):
+        """Loop a section of the track.
+
+        Args:
+            start (float): Loop start time in seconds.
+            end (float): Loop end time in seconds.
+        """
+        pass
+
+    @abc.abstractmethod
+    def clear_loop(self):
+        """Stop looping."""
+        pass
+
+    @abc.abstractmethod
+    def set_filter(self, name: str, value: float):
+        """Set an audio filter parameter.
+
+        Implementations should update the running filter in place, rather
+        than rebuilding the audio filter chain.
+
+        Args:
+            name (str): Filter parameter, one of the keys of `FILTER_DEFAULTS`.
+            value (float): Parameter value.
+        """
+        pass
+
 
 class LoadError(Exception):
     """
@@ -172,6 +213,15 @@ def _check_file_loaded(func: TCallable) -> TCallable:
 
 """MPV Implementation"""
 
+# mpv audio filters for each filter parameter: (label, lavfi filter, command)
+_mpv_filters = {
+    "eq_low": ("eq_low", "bass=f=100:g={}", "g"),
+    "eq_mid": ("eq_mid", "equalizer=f=1000:t=o:w=2:g={}", "g"),
+    "eq_high": ("eq_high", "treble=f=8000:g={}", "g"),
+    "highpass": ("hpf", "highpass=f={}", "f"),
+    "lowpass": ("lpf", "lowpass=f={}", "f"),
+}
+
 
 def mpv_log_handler(loglevel: str, component: str, message: str) -> None:
     """Convert mpv log events into log events.
@@ -212,9 +262,12 @@ class PlayerMpv(IPlayer):
         play(): Play the track.
         pause(): Pause the track.
         seek(value, reference): Seek to a position in the track.
+        loop(start, end): Loop a section of the track.
+        clear_loop(): Stop looping.
+        set_filter(name, value): Set an audio filter parameter.
     """
 
-    def __init__(self, player: MPV):
+    def __init__(self, player: "MPV"):
         """
         Construct PlayerMpv.
 
@@ -223,6 +276,15 @@ class PlayerMpv(IPlayer):
         """
         self.__player = player
         self.__playing = False
+        self.__filters = dict(FILTER_DEFAULTS)
+        self.__player.af = self.__filter_chain()
+
+    def __filter_chain(self) -> str:
+        """Build the mpv audio filter chain from the current filter values."""
+        return ",".join(
+            f"@{label}:lavfi=[{template.format(self.__filters[name])}]"
+            for name, (label, template, _) in _mpv_filters.items()
+        )
 
     def load(self, filename: str):
         """Load an audio file into the player.
@@ -241,6 +303,7 @@ class PlayerMpv(IPlayer):
 
         self.__playing = False
         self.__player.pause = True
+        self.__player.af = self.__filter_chain()
         self.__player.play(filename=filename)
         self.__check_load_error(filename=filename)
 
@@ -285,6 +348,46 @@ class PlayerMpv(IPlayer):
 
         self.__player.seek(amount=value, reference=reference)
 
+    @_check_file_loaded
+    def loop(self, start: float, end: float):
+        """Loop a section of the track.
+
+        Args:
+            start (float): Loop start time in seconds.
+            end (float): Loop end time in seconds.
+        """
+        self.__player.ab_loop_a = start
+        self.__player.ab_loop_b = end
+
+    def clear_loop(self):
+        """Stop looping."""
+        self.__player.ab_loop_a = "no"
+        self.__player.ab_loop_b = "no"
+
+    def set_filter(self, name: str, value: float):
+        """Set an audio filter parameter.
+
+        The parameter is sent to the running filter with mpv's `af-command`.
+        Until audio is playing there is no running filter, so the filter chain
+        is rebuilt with the value instead.
+
+        Args:
+            name (str): Filter parameter, one of the keys of `FILTER_DEFAULTS`.
+            value (float): Parameter value.
+
+        Raises:
+            KeyError: If `name` is not a supported filter parameter.
+        """
+        label, _, command = _mpv_filters[name]
+        self.__filters[name] = value
+        try:
+            self.__player.af_command(label, command, f"{value}")
+        except SystemError:
+            # Filters are not initialised until audio is playing, set the chain
+            # so the value applies when playback starts.
+            logger.debug("Filter %s not initialised, rebuilding chain.", label)
+            self.__player.af = self.__filter_chain()
+
     @property
     def speed(self) -> float:
         """Playback speed."""
@@ -333,3 +436,14 @@ class PlayerMpv(IPlayer):
     def playing(self) -> bool:
         """Is the track playing."""
         return self.__playing
+
+
+def make_player_mpv() -> PlayerMpv:
+    """Make an mpv player, importing mpv on first use.
+
+    Returns:
+        PlayerMpv: Player.
+    """
+    import mpv
+
+    return PlayerMpv(mpv.MPV())
@@ -0,0 +1,189 @@
+"""
+Jog wheel and scratch input.
+
+A jog wheel sends small relative movements, many per second. `JogWheel.move()`
+accumulates them from any thread, and a control tick on a timer wheel applies
+the accumulated movement directly to the player. The first movement is applied
+on the next wheel tick, then movements accumulate per control tick while the
+wheel keeps moving:
+
+- Paused, the track is jogged (seeked) by the movement.
+- Playing, the playback rate follows the wheel like a vinyl scratch, playing
+  the movement on top of normal playback over the tick. Rates beyond what the
+  player can play (e.g. backwards) are made up by a seek. Once the wheel stops
+  moving the normal rate is restored.
+
+This bypasses the model queue, taking the deck lock (see `DJPlayer`) instead,
+the latency from a movement to the player call is recorded in
+`JogWheel.latency`.
+"""
+
+import time
+import typing
+import logging
+import threading
+import collections
+import dataclasses
+from freejay.clock.timerwheel import TimerWheel, Timer
+from freejay.player.djplayer import DJPlayer
+
+logger = logging.getLogger(__name__)
+
+# Smallest seek made up for a clamped scratch rate, in seconds.
+_MIN_SEEK = 0.001
+
+
+@dataclasses.dataclass
+class LatencyStats:
+    """Latency statistics, in seconds."""
+
+    count: int = 0
+    total: float = 0.0
+    worst: float = 0.0
+    recent: typing.Deque[float] = dataclasses.field(
+        default_factory=lambda: collections.deque(maxlen=1000)
+    )
+
+    @property
+    def mean(self) -> float:
+        """Get the mean latency."""
+        return self.total / self.count if self.count else 0.0
+
+    def record(self, latency: float):
+        """Record a latency.
+
+        Args:
+            latency (float): Latency in seconds.
+        """
+        self.count += 1
+        self.total += latency
+        self.worst = max(self.worst, latency)
+        self.recent.append(latency)
+
+    def percentile(self, percent: float) -> float:
+        """Get a percentile of the recent latencies.
+
+        Args:
+            percent (float): Percentile, 0-100.
+
+        Returns:
+            float: Latency in seconds, 0 if none recorded.
+        """
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+class JogWheel:
+    """
+    Jog wheel for a deck.
+
+    Methods are thread safe. The player is called on the timer wheel thread.
+    """
+
+    def __init__(
+        self,
+        player: DJPlayer,
+        wheel: TimerWheel,
+        interval: float = 0.005,
+        release: float = 0.05,
+        min_rate: float = 0.1,
+        max_rate: float = 4.0,
+        clock: typing.Callable[[], float] = time.perf_counter,
+    ):
+        """Construct JogWheel.
+
+        Args:
+            player (DJPlayer): Deck player.
+            wheel (TimerWheel): Timer wheel to tick on.
+            interval (float, optional): Control tick interval in seconds.
+                Defaults to 0.005.
+            release (float, optional): Seconds without movement before the
+                normal rate is restored after a scratch. Defaults to 0.05.
+            min_rate (float, optional): Minimum scratch rate. Defaults to 0.1.
+            max_rate (float, optional): Maximum scratch rate. Defaults to 4.0.
+            clock (typing.Callable[[], float], optional): Time source, the wheel's
+                time base. Defaults to `time.perf_counter`.
+        """
+        self.player = player
+        self.wheel = wheel
+        self.interval = interval
+        self.release = release
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.clock = clock
+        self.latency = LatencyStats()
+        self.__pending = 0.0
+        self.__since: typing.Optional[float] = None
+        self.__moved = 0.0
+        self.__ticked = 0.0
+        self.__scratching = False
+        self.__timer: typing.Optional[Timer] = None
+        self.__lock = threading.Lock()
+
+    @property
+    def scratching(self) -> bool:
+        """Get whether the playback rate is following the wheel."""
+        return self.__scratching
+
+    def move(self, delta: float):
+        """Move the wheel.
+
+        Args:
+            delta (float): Movement in track seconds, positive is forward.
+        """
+        now = self.clock()
+        with self.__lock:
+            if self.__since is None:
+                self.__since = now
+            self.__pending += delta
+            self.__moved = now
+            if self.__timer is None:
+                # Apply the first movement on the next wheel tick.
+                self.__timer = self.wheel.schedule(now, self.__tick)
+
+    def __scratch(self, delta: float, elapsed: float):
+        """Play the movement on top of normal playback over the elapsed time."""
+        target = 1 + delta / elapsed
+        rate = max(self.min_rate, min(self.max_rate, target))
+        self.player.scratch(rate)
+        self.__scratching = True
+        excess = (target - rate) * elapsed
+        if abs(excess) >= _MIN_SEEK:
+            self.player.jog(excess)
+
+    def __apply(self, now: float):
+        """Apply the pending movement, or end a scratch once still."""
+        delta, self.__pending = self.__pending, 0.0
+        since, self.__since = self.__since, None
+        elapsed = now - self.__ticked if self.__scratching else self.interval
+        self.__ticked = now
+        if delta and not self.player.playing:
+            self.player.jog(delta)
+            if self.__scratching:
+                self.player.scratch_release()
+                self.__scratching = False
+        elif delta:
+            self.__scratch(delta, max(elapsed, self.interval))
+        elif self.__scratching and now - self.__moved >= self.release:
+            self.player.scratch_release()
+            self.__scratching = False
+        if since is not None:
+            self.latency.record(self.clock() - since)
+
+    def __tick(self):
+        """Apply movement, and schedule the next tick while active."""
+        now = self.clock()
+        with self.__lock:
+            try:
+                # Check the play state and change the deck in one go.
+                with self.player.lock:
+                    self.__apply(now)
+            except Exception:
+                logger.exception("Jog wheel update failed.")
+            # Keep ticking while the wheel is moving, accumulating per tick.
+            if self.__scratching or now - self.__moved < self.release:
+                self.__timer = self.wheel.schedule(now + self.interval, self.__tick)
+            else:
+                self.__timer = None
@@ -0,0 +1,309 @@
+"""
+Deck and mixer state publishing.
+
+`StatePump` samples the decks and mixer at a fixed frame rate into an immutable
+`Snapshot`, compares it with the previous snapshot and sends a STATE data
+message for each component that has changed, holding only the changed fields.
+The first frame after starting holds every field.
+
+    {"component": LEFT_DECK, "element": STATE, "data": {"position": 12.3}}
+"""
+
+import time
+import typing
+import logging
+import threading
+import dataclasses
+from freejay.messages import messages as mes
+from freejay.messages import produce_consume as prodcon
+from freejay.player.djplayer import DJPlayer
+from freejay.player.mixer import Mixer
+from freejay.player.player import FileNotLoaded
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FPS = 30.0
+
+
+@dataclasses.dataclass(frozen=True)
+class DeckState:
+    """
+    Deck state.
+
+    Attributes:
+        loaded (bool): Is a track loaded.
+        filename (str): Loaded track.
+        playing (bool): Is the track playing.
+        looping (bool): Is the deck looping.
+        position (float): Time position in the track, in seconds.
+        duration (float): Track length, in seconds.
+        speed (float): Playback speed (pitch), 1.0 is the track tempo.
+        bpm (float | None): Track tempo, None if unknown.
+        level (float): Channel gain, between 0 and 1.
+    """
+
+    loaded: bool = False
+    filename: str = ""
+    playing: bool = False
+    looping: bool = False
+    position: float = 0.0
+    duration: float = 0.0
+    speed: float = 1.0
+    bpm: typing.Optional[float] = None
+    level: float = 0.0
+
+
+@dataclasses.dataclass(frozen=True)
+class MixerState:
+    """
+    Mixer state.
+
+    Attributes:
+        crossfader (float): Crossfader position, between 0 (A) and 1 (B).
+    """
+
+    crossfader: float = 0.5
+
+
+@dataclasses.dataclass(frozen=True)
+class Snapshot:
+    """
+    Deck and mixer state at one time.
+
+    Attributes:
+        time (float): Sample time (`time.perf_counter()`).
+        decks (typing.Tuple[typing.Tuple[mes.Component, DeckState], ...]): Deck
+            states, in deck order.
+        mixer (MixerState): Mixer state.
+    """
+
+    time: float
+    decks: typing.Tuple[typing.Tuple[mes.Component, DeckState], ...]
+    mixer: MixerState
+
+    def states(self) -> typing.Iterator[typing.Tuple[mes.Component, typing.Any]]:
+        """Iterate over the (component, state) of the decks, then the mixer.
+
+        Yields:
+            typing.Tuple[mes.Component, typing.Any]: Component and its state.
+        """
+        yield from self.decks
+        yield mes.Component.MIXER, self.mixer
+
+
+def sample_deck(deck: DJPlayer, level: float) -> DeckState:
+    """Sample the state of a deck.
+
+    Args:
+        deck (DJPlayer): Deck.
+        level (float): Channel gain.
+
+    Returns:
+        DeckState: Deck state.
+    """
+    position = duration = 0.0
+    if deck.loaded:
+        try:
+            # mpv reports None until the track has started decoding.
+            position = deck.time_pos or 0.0
+            duration = deck.duration or 0.0
+        except FileNotLoaded:
+            pass
+    return DeckState(
+        loaded=deck.loaded,
+        filename=deck.filename,
+        playing=deck.playing,
+        looping=deck.looping,
+        position=position,
+        duration=duration,
+        speed=deck.speed,
+        bpm=deck.bpm,
+        level=level,
+    )
+
+
+def sample(decks: typing.Dict[mes.Component, DJPlayer], mixer: Mixer) -> Snapshot:
+    """Sample the state of the decks and mixer.
+
+    Args:
+        decks (typing.Dict[mes.Component, DJPlayer]): Decks.
+        mixer (Mixer): Mixer.
+
+    Returns:
+        Snapshot: Snapshot.
+    """
+    gains = mixer.gains
+    return Snapshot(
+        time=time.perf_counter(),
+        decks=tuple(
+            (component, sample_deck(deck, gains.get(component, 0.0)))
+            for component, deck in decks.items()
+        ),
+        mixer=MixerState(crossfader=mixer.crossfader.position),
+    )
+
+
+def diff(
+    previous: typing.Optional[Snapshot], current: Snapshot
+) -> typing.Dict[mes.Component, typing.Dict[str, typing.Any]]:
+    """Find the fields that have changed between two snapshots.
+
+    Args:
+        previous (Snapshot, optional): Previous snapshot, None for every field.
+        current (Snapshot): Current snapshot.
+
+    Returns:
+        typing.Dict[mes.Component, typing.Dict[str, typing.Any]]: Changed fields
+            by component, components without changes are left out.
+    """
+    before = dict(previous.states()) if previous is not None else {}
+    changes = {}
+    for component, state in current.states():
+        old = before.get(component)
+        if state == old:
+            continue
+        fields = dataclasses.asdict(state)
+        if old is not None:
+            fields = {
+                name: value
+                for name, value in fields.items()
+                if getattr(old, name) != value
+            }
+        changes[component] = fields
+    return changes
+
+
+@dataclasses.dataclass
+class PumpStats:
+    """
+    State pump statistics.
+
+    Attributes:
+        frames (int): Number of frames sampled.
+        messages (int): Number of messages sent.
+        fields (int): Number of changed fields sent.
+        late_frames (int): Number of frames overrunning the next frame.
+        cpu_time (float): Pump thread CPU time, in seconds.
+    """
+
+    frames: int = 0
+    messages: int = 0
+    fields: int = 0
+    late_frames: int = 0
+    cpu_time: float = 0.0
+
+
+class StatePump(prodcon.Producer):
+    """
+    Fixed rate deck and mixer state publisher.
+
+    Sampling runs on its own thread, so that slow player property reads never
+    delay the timer wheel.
+    """
+
+    def __init__(
+        self,
+        decks: typing.Dict[mes.Component, DJPlayer],
+        mixer: Mixer,
+        fps: float = DEFAULT_FPS,
+        source: mes.Source = mes.Source.PLAYER_MODEL,
+    ):
+        """Construct StatePump.
+
+        Args:
+            decks (typing.Dict[mes.Component, DJPlayer]): Decks.
+            mixer (Mixer): Mixer.
+            fps (float, optional): Frames per second. Defaults to DEFAULT_FPS.
+            source (mes.Source, optional): Message source. Defaults to
+                PLAYER_MODEL.
+
+        Raises:
+            ValueError: If fps is not positive.
+        """
+        if fps <= 0:
+            raise ValueError(f"fps must be positive, not {fps}")
+        self.decks = decks
+        self.mixer = mixer
+        self.fps = fps
+        self.source = source
+        self.stats = PumpStats()
+        self.snapshot: typing.Optional[Snapshot] = None
+        self.__stop = threading.Event()
+        self.__thread: typing.Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Get whether the pump is running."""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def start(self):
+        """Start publishing, beginning with a frame holding every field."""
+        if self.running:
+            return
+        self.snapshot = None
+        self.__stop.clear()
+        self.__thread = threading.Thread(
+            target=self.__run, name="state-pump", daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self):
+        """Stop publishing."""
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def pump(self) -> int:
+        """Sample a frame and send the changes.
+
+        Returns:
+            int: Number of messages sent.
+        """
+        snapshot = sample(self.decks, self.mixer)
+        changes = diff(self.snapshot, snapshot)
+        self.snapshot = snapshot
+        self.stats.frames += 1
+        for component, fields in changes.items():
+            self.stats.fields += len(fields)
+            self.send_message(self.make_message(component, fields))
+        self.stats.messages += len(changes)
+        return len(changes)
+
+    def make_message(
+        self, component: mes.Component, fields: typing.Dict[str, typing.Any]
+    ) -> mes.Message[mes.Data]:
+        """Construct a state message.
+
+        Args:
+            component (mes.Component): Deck or mixer component.
+            fields (typing.Dict[str, typing.Any]): Changed fields.
+
+        Returns:
+            mes.Message[mes.Data]: Data message.
+        """
+        return mes.Message(
+            sender=mes.Sender(source=self.source, trigger=mes.Trigger.DATA_OUTPUT),
+            content=mes.Data(
+                component=component, element=mes.Element.STATE, data=fields
+            ),
+        )
+
+    def __run(self):
+        period = 1 / self.fps
+        deadline = time.perf_counter()
+        while not self.__stop.is_set():
+            start = time.thread_time()
+            try:
+                self.pump()
+            except Exception:
+                logger.exception("State sample failed.")
+            self.stats.cpu_time += time.thread_time() - start
+            deadline += period
+            delay = deadline - time.perf_counter()
+            if delay < 0:
+                # Skip the missed frames rather than catching up.
+                self.stats.late_frames += 1
+                deadline = time.perf_counter()
+            else:
+                self.__stop.wait(delay)
@@ -0,0 +1,7 @@
+"""
+Master mix recording.
+
+The master mix is captured from the sound server (see `capture`) into a
+lock-free ring buffer and written to disk by a separate
+writer thread, so the audio path never waits on file I/O.
+"""
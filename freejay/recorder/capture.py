@@ -0,0 +1,197 @@
+"""
+Master mix capture.
+
+The decks play through mpv to the system sound server, which mixes them at the
+levels set by the mixer. A MonitorCapture records that mix from the monitor of
+the default output, by running a capture tool (PulseAudio's `parec` or
+PipeWire's `pw-record`) that writes raw PCM to a pipe. A reader thread pushes
+the PCM to the recorder with `Recorder.write()`.
+
+The monitor holds everything played to the output, so other applications'
+sound is recorded too.
+"""
+
+import io
+import shutil
+import typing
+import logging
+import threading
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the capture tool at a time, about 50 ms of 44.1 kHz stereo.
+READ_SIZE = 8192
+
+
+class Capture(typing.Protocol):
+    """Capture Source Protocol."""
+
+    def start(self, write: typing.Callable[[bytes], typing.Any]):
+        """Start capturing, passing PCM frames to `write` as they arrive.
+
+        Args:
+            write (typing.Callable[[bytes], typing.Any]): PCM frame consumer,
+                e.g. `Recorder.write`.
+
+        Raises:
+            OSError: If capture cannot start.
+        """
+
+    def stop(self):
+        """Stop capturing."""
+
+
+def monitor_command(
+    rate: int, channels: int, sample_width: int
+) -> typing.Optional[typing.List[str]]:
+    """Get a command writing the default output's monitor to stdout as raw PCM.
+
+    Args:
+        rate (int): Sample rate in Hz.
+        channels (int): Number of channels.
+        sample_width (int): Bytes per sample, 2 (16 bit) or 4 (32 bit).
+
+    Returns:
+        typing.Optional[typing.List[str]]: Command, None if no capture tool is
+            installed.
+    """
+    sample_format = {2: "s16le", 4: "s32le"}.get(sample_width)
+    if sample_format is None:
+        return None
+    if shutil.which("parec") is not None:
+        return [
+            "parec",
+            "--raw",
+            "--device=@DEFAULT_MONITOR@",
+            f"--format={sample_format}",
+            f"--rate={rate}",
+            f"--channels={channels}",
+        ]
+    if shutil.which("pw-record") is not None:
+        return [
+            "pw-record",
+            "--target=@DEFAULT_MONITOR@",
+            f"--format={sample_format[:3]}",
+            f"--rate={rate}",
+            f"--channels={channels}",
+            "-",
+        ]
+    return None
+
+
+class MonitorCapture:
+    """
+    Capture PCM written to stdout by a capture tool, see `monitor_command()`.
+
+    The tool runs while capturing, and is stopped with the capture.
+    """
+
+    def __init__(
+        self, command: typing.List[str], frame_size: int, read_size: int = READ_SIZE
+    ):
+        """Construct MonitorCapture.
+
+        Args:
+            command (typing.List[str]): Capture tool command, writing raw PCM in
+                the recorder format to stdout.
+            frame_size (int): Bytes per frame, channels * sample width.
+            read_size (int, optional): Bytes read at a time. Defaults to
+                READ_SIZE.
+        """
+        self.command = command
+        self.frame_size = frame_size
+        self.read_size = read_size
+        self.__process: typing.Optional[subprocess.Popen] = None
+        self.__reader: typing.Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Get whether the capture tool is running."""
+        return self.__process is not None and self.__process.poll() is None
+
+    def start(self, write: typing.Callable[[bytes], typing.Any]):
+        """Start the capture tool, passing its PCM to `write` on a reader thread.
+
+        Args:
+            write (typing.Callable[[bytes], typing.Any]): PCM frame consumer.
+
+        Raises:
+            OSError: If the capture tool cannot be started.
+        """
+        if self.__process is not None:
+            return
+        self.__process = subprocess.Popen(
+            self.command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        self.__reader = threading.Thread(
+            target=self.__read_loop,
+            args=(self.__process, write),
+            name="recorder-capture",
+            daemon=True,
+        )
+        self.__reader.start()
+        logger.info("Capturing from %s", self.command[0])
+
+    def stop(self):
+        """Stop the capture tool, after passing on the PCM it has written."""
+        process, self.__process = self.__process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            process.terminate()
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        if self.__reader is not None:
+            self.__reader.join()
+            self.__reader = None
+
+    def __read_loop(
+        self, process: subprocess.Popen, write: typing.Callable[[bytes], typing.Any]
+    ):
+        """Pass PCM to `write` until the capture tool exits."""
+        stdout = typing.cast(io.BufferedReader, process.stdout)
+        # Pipe reads can split a frame, hold the partial frame back.
+        pending = b""
+        try:
+            while True:
+                data = stdout.read1(self.read_size)
+                if not data:
+                    break
+                data = pending + data
+                whole = len(data) - len(data) % self.frame_size
+                if whole:
+                    write(data[:whole])
+                pending = data[whole:]
+        finally:
+            stdout.close()
+        # Terminated by `stop()`, or exited.
+        if process.wait() not in (0, -15):
+            logger.warning("Capture tool exited with %d.", process.returncode)
+
+
+def make_monitor_capture(
+    rate: int, channels: int, sample_width: int
+) -> typing.Optional[MonitorCapture]:
+    """Make a monitor capture, if a capture tool is installed.
+
+    Args:
+        rate (int): Sample rate in Hz.
+        channels (int): Number of channels.
+        sample_width (int): Bytes per sample.
+
+    Returns:
+        typing.Optional[MonitorCapture]: Capture, None if no capture tool is
+            installed.
+    """
+    command = monitor_command(rate, channels, sample_width)
+    if command is None:
+        logger.info(
+            "No capture tool found, install parec (PulseAudio) or pw-record "
+            "(PipeWire) to record the master mix."
+        )
+        return None
+    return MonitorCapture(command, frame_size=channels * sample_width)
@@ -0,0 +1,344 @@
+"""
+Master mix recorder.
+
+A capture source (see `capture`) pushes the mixed PCM frames with
+`Recorder.write()`, which copies them into a ring buffer and returns immediately.
+A writer thread drains the buffer to a sink in large sequential writes.
+"""
+
+import os
+import time
+import wave
+import typing
+import logging
+import threading
+import dataclasses
+from freejay.messages import produce_consume as prodcon
+from freejay.messages import messages as mes
+from freejay.recorder.ringbuffer import RingBuffer
+from freejay.recorder.capture import Capture
+
+logger = logging.getLogger(__name__)
+
+
+class Sink(typing.Protocol):
+    """Recording Sink Protocol."""
+
+    def write(self, data: memoryview):
+        """Write frames.
+
+        Args:
+            data (memoryview): PCM frames.
+        """
+
+    def close(self):
+        """Close the sink."""
+
+
+class WavSink:
+    """Write PCM frames to a WAV file."""
+
+    def __init__(self, file_path: str, rate: int, channels: int, sample_width: int):
+        """Construct WavSink.
+
+        Args:
+            file_path (str): WAV file path.
+            rate (int): Sample rate in Hz.
+            channels (int): Number of channels.
+            sample_width (int): Bytes per sample.
+        """
+        self.file_path = file_path
+        self.__wav = wave.open(file_path, "wb")
+        self.__wav.setnchannels(channels)
+        self.__wav.setsampwidth(sample_width)
+        self.__wav.setframerate(rate)
+
+    def write(self, data: memoryview):
+        """Write frames.
+
+        Args:
+            data (memoryview): PCM frames.
+        """
+        self.__wav.writeframesraw(data)
+
+    def close(self):
+        """Close the file, updating the WAV header."""
+        self.__wav.close()
+
+
+class NullSink:
+    """
+    Discard PCM frames.
+
+    Attributes:
+        bytes_written (int): Total bytes written.
+        writes (int): Number of writes.
+    """
+
+    file_path = None
+
+    def __init__(self):
+        """Construct NullSink."""
+        self.bytes_written = 0
+        self.writes = 0
+
+    def write(self, data: memoryview):
+        """Write frames.
+
+        Args:
+            data (memoryview): PCM frames.
+        """
+        self.bytes_written += len(data)
+        self.writes += 1
+
+    def close(self):
+        """Close the sink."""
+
+
+@dataclasses.dataclass(frozen=True)
+class RecorderStats:
+    """Recording statistics, frame counts are per recording."""
+
+    frames_written: int
+    dropped_frames: int
+    high_water: int
+    capacity: int
+
+
+class Recorder(prodcon.Producer):
+    """
+    Master mix recorder.
+
+    Start and stop a recording with `start()` and `stop()`. The capture source,
+    if any, runs while recording and feeds it with `write()`. Writes never block:
+    if the writer falls behind and the ring buffer fills, frames are dropped and
+    counted.
+
+    A message is sent when recording starts and stops, or fails, the stop and
+    failure messages report the recording statistics (see `RecorderStats`).
+    """
+
+    def __init__(
+        self,
+        source: mes.Source,
+        component: mes.Component,
+        destination: typing.Optional[str] = None,
+        rate: int = 44100,
+        channels: int = 2,
+        sample_width: int = 2,
+        buffer_seconds: float = 10.0,
+        block_seconds: float = 0.5,
+        poll_interval: float = 0.05,
+        capture: typing.Optional[Capture] = None,
+    ):
+        """Construct Recorder.
+
+        Args:
+            source (mes.Source): Message source.
+            component (mes.Component): Message component.
+            destination (str, optional): Recordings directory. Defaults to None
+                (the current directory).
+            rate (int, optional): Sample rate in Hz. Defaults to 44100.
+            channels (int, optional): Number of channels. Defaults to 2.
+            sample_width (int, optional): Bytes per sample. Defaults to 2.
+            buffer_seconds (float, optional): Ring buffer size in seconds of audio.
+                Defaults to 10.0.
+            block_seconds (float, optional): Minimum size of a write to the sink in
+                seconds of audio. Defaults to 0.5.
+            poll_interval (float, optional): Writer thread poll interval in
+                seconds. Defaults to 0.05.
+            capture (Capture, optional): Capture source of the master mix, in
+                the recorder format. Defaults to None (only frames passed to
+                `write()` are recorded).
+        """
+        self.source = source
+        self.component = component
+        self.destination = destination or os.getcwd()
+        self.rate = rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.block_frames = max(1, int(block_seconds * rate))
+        self.poll_interval = poll_interval
+        self.capture = capture
+        self.buffer = RingBuffer(
+            capacity=max(self.block_frames, int(buffer_seconds * rate)),
+            frame_size=channels * sample_width,
+        )
+        self.recording = False
+        self.__frames_written = 0
+        self.__failed = False
+        self.__sink: typing.Optional[Sink] = None
+        self.__stopping = threading.Event()
+        self.__writer: typing.Optional[threading.Thread] = None
+
+    @property
+    def available(self) -> bool:
+        """Get whether the recorder has a capture source."""
+        return self.capture is not None
+
+    @property
+    def stats(self) -> RecorderStats:
+        """Get the statistics for the current (or last) recording."""
+        return RecorderStats(
+            frames_written=self.__frames_written,
+            dropped_frames=self.buffer.dropped,
+            high_water=self.buffer.high_water,
+            capacity=self.buffer.capacity,
+        )
+
+    def write(self, data: typing.Union[bytes, bytearray, memoryview]) -> int:
+        """Push PCM frames from the audio path. Never blocks.
+
+        Args:
+            data (typing.Union[bytes, bytearray, memoryview]): Interleaved PCM
+                frames in the recorder format.
+
+        Returns:
+            int: Number of frames buffered, 0 if not recording.
+        """
+        if not self.recording:
+            return 0
+        return self.buffer.write(data)
+
+    def start(
+        self, file_path: typing.Optional[str] = None, sink: typing.Optional[Sink] = None
+    ):
+        """Start recording.
+
+        Args:
+            file_path (str, optional): WAV file path. Defaults to None (a time
+                stamped file in the destination directory).
+            sink (Sink, optional): Sink to record to instead of a WAV file.
+                Defaults to None.
+        """
+        if self.recording:
+            logger.warning("Already recording.")
+            return
+
+        if sink is None:
+            if file_path is None:
+                file_path = os.path.join(
+                    self.destination, time.strftime("freejay-%Y%m%d-%H%M%S.wav")
+                )
+            sink = WavSink(
+                file_path=file_path,
+                rate=self.rate,
+                channels=self.channels,
+                sample_width=self.sample_width,
+            )
+
+        self.__sink = sink
+        self.__frames_written = 0
+        self.__failed = False
+        self.buffer.clear()
+        self.__stopping.clear()
+        self.__writer = threading.Thread(
+            target=self.__write_loop, name="recorder-writer", daemon=True
+        )
+        self.__writer.start()
+        self.recording = True
+        if self.capture is not None:
+            try:
+                self.capture.start(self.write)
+            except OSError as exc:
+                logger.exception("Capture failed to start.")
+                self.__stop_writer()
+                self.send_message(
+                    self.make_message(data={"status": "failed", "error": str(exc)})
+                )
+                return
+        logger.info("Recording started: %s", getattr(sink, "file_path", None))
+        self.send_message(self.make_message(data={"status": "recording"}))
+
+    def stop(self):
+        """Stop recording, flushing buffered frames to the sink."""
+        if not self.recording:
+            return
+        if self.capture is not None:
+            # Buffer the last captured frames before stopping the writer.
+            self.capture.stop()
+        self.__stop_writer()
+        if self.__failed:
+            # The writer reported the failure.
+            return
+
+        stats = self.stats
+        logger.info(
+            "Recording stopped: %d frames written, %d dropped, high water %d/%d.",
+            stats.frames_written,
+            stats.dropped_frames,
+            stats.high_water,
+            stats.capacity,
+        )
+        data = {
+            "status": "stopped",
+            "file_path": getattr(self.__sink, "file_path", None),
+            "rate": self.rate,
+        }
+        data.update(dataclasses.asdict(stats))
+        self.send_message(self.make_message(data=data))
+
+    def __stop_writer(self):
+        """Stop buffering, and wait for the writer to flush the buffer."""
+        self.recording = False
+        self.__stopping.set()
+        if self.__writer is not None:
+            self.__writer.join()
+
+    def toggle(self):
+        """Start or stop recording."""
+        if self.recording:
+            self.stop()
+        else:
+            self.start()
+
+    def __write_loop(self):
+        """Drain the ring buffer to the sink until stopped."""
+        sink = self.__sink
+        assert sink is not None
+        try:
+            while not self.__stopping.is_set():
+                if len(self.buffer) >= self.block_frames:
+                    self.__drain(sink)
+                else:
+                    self.__stopping.wait(self.poll_interval)
+            self.__drain(sink)
+        except OSError as exc:
+            logger.exception("Recording write failed.")
+            self.__failed = True
+            self.recording = False
+            if self.capture is not None:
+                self.capture.stop()
+            data = {"status": "failed", "error": str(exc), "rate": self.rate}
+            data.update(dataclasses.asdict(self.stats))
+            self.send_message(self.make_message(data=data))
+        finally:
+            sink.close()
+
+    def __drain(self, sink: Sink):
+        """Write all buffered frames to the sink."""
+        # At most two writes, the buffered frames may wrap around the buffer end.
+        remaining = len(self.buffer)
+        while remaining:
+            chunk = self.buffer.read(remaining)
+            frames = len(chunk) // self.buffer.frame_size
+            sink.write(chunk)
+            self.buffer.advance(frames)
+            self.__frames_written += frames
+            remaining -= frames
+
+    def make_message(self, data: dict) -> mes.Message:
+        """Construct a message.
+
+        Args:
+            data (dict): Data
+
+        Returns:
+            Message: Message
+        """
+        return mes.Message(
+            sender=mes.Sender(source=self.source, trigger=mes.Trigger.DATA_OUTPUT),
+            content=mes.Data(
+                component=self.component, element=mes.Element.RECORD, data=data
+            ),
+        )
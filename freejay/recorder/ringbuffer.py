@@ -0,0 +1,117 @@
+"""
+Single producer, single consumer ring buffer for audio frames.
+
+The producer (audio capture) and consumer (file writer) each own one position
+counter, so no lock is needed: the producer only advances the write position and
+the consumer only advances the read position. Counters increase monotonically and
+are reduced modulo the capacity when indexing the buffer.
+
+The write position is only published after the frames have been copied in, so the
+consumer never sees a partially written frame.
+"""
+
+import typing
+
+
+class RingBuffer:
+    """
+    Audio frame ring buffer.
+
+    Writes never block, frames that do not fit are dropped and counted. Reads
+    return a view of the buffer (without copying), which is released with
+    `advance()` once the frames have been consumed.
+
+    Note: Safe for one producer thread and one consumer thread only.
+
+    Attributes:
+        frame_size (int): Bytes per frame (channels * sample width).
+        capacity (int): Buffer size in frames.
+        dropped (int): Frames dropped because the buffer was full.
+        high_water (int): Highest number of frames held in the buffer.
+    """
+
+    def __init__(self, capacity: int, frame_size: int):
+        """Construct RingBuffer.
+
+        Args:
+            capacity (int): Buffer size in frames.
+            frame_size (int): Bytes per frame.
+        """
+        self.frame_size = frame_size
+        self.capacity = capacity
+        self.__buffer = memoryview(bytearray(capacity * frame_size))
+        self.__write_pos = 0
+        self.__read_pos = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        """Get the number of frames available to read."""
+        return self.__write_pos - self.__read_pos
+
+    def write(self, data: typing.Union[bytes, bytearray, memoryview]) -> int:
+        """Write frames to the buffer (producer only).
+
+        Args:
+            data (typing.Union[bytes, bytearray, memoryview]): Whole frames of
+                audio, any trailing partial frame is ignored.
+
+        Returns:
+            int: Number of frames written.
+        """
+        size = self.frame_size
+        data = memoryview(data).cast("B")
+        frames = len(data) // size
+        write_pos = self.__write_pos
+        fill = write_pos - self.__read_pos
+        count = min(frames, self.capacity - fill)
+        self.dropped += frames - count
+        if count:
+            start = write_pos % self.capacity
+            first = min(count, self.capacity - start)
+            self.__buffer[start * size : (start + first) * size] = data[: first * size]
+            if count > first:
+                rest = count - first
+                self.__buffer[: rest * size] = data[first * size : count * size]
+            self.__write_pos = write_pos + count
+            self.high_water = max(self.high_water, fill + count)
+        return count
+
+    def read(self, max_frames: typing.Optional[int] = None) -> memoryview:
+        """Get a view of the next frames in the buffer (consumer only).
+
+        The view is contiguous, so may hold fewer frames than are available if the
+        data wraps around the end of the buffer. Call `advance()` after using it.
+
+        Args:
+            max_frames (int, optional): Maximum frames to return. Defaults to None
+                (all contiguous frames).
+
+        Returns:
+            memoryview: Frames, empty if the buffer is empty.
+        """
+        available = self.__write_pos - self.__read_pos
+        start = self.__read_pos % self.capacity
+        count = min(available, self.capacity - start)
+        if max_frames is not None:
+            count = min(count, max_frames)
+        return self.__buffer[
+            start * self.frame_size : (start + count) * self.frame_size
+        ]
+
+    def advance(self, frames: int):
+        """Release frames returned by `read()` (consumer only).
+
+        Args:
+            frames (int): Number of frames consumed.
+        """
+        self.__read_pos += min(frames, len(self))
+
+    def clear(self):
+        """Discard buffered frames and reset the dropped and high water counters.
+
+        Note: Must not be called while the producer is writing.
+        """
+        self.__read_pos = self.__write_pos
+        self.dropped = 0
+        self.high_water = 0
@@ -0,0 +1,8 @@
+"""
+Local control socket.
+
+External programs control the engine over a local Unix or TCP socket (see
+`server.ControlServer`), sending batches of text commands and subscribing to
+deck and mixer state. The framing is in `protocol`, and `client.ControlClient`
+is a blocking client, e.g. for automation scripts.
+"""
@@ -0,0 +1,134 @@
+"""
+Control socket client.
+
+A blocking client for the control socket, e.g. for automation scripts:
+
+    with ControlClient(parse_address("unix:/tmp/freejay.sock")) as client:
+        client.subscribe()
+        client.send(["tap LEFT_DECK PLAY_PAUSE"])
+        for event in client.events():
+            print(event)
+"""
+
+import json
+import socket
+import typing
+from freejay.remote import protocol
+
+Event = typing.Dict[str, typing.Any]
+
+
+class ControlClient:
+    """Blocking control socket client."""
+
+    def __init__(
+        self, address: protocol.Address, timeout: typing.Optional[float] = 5.0
+    ):
+        """Construct ControlClient, connecting to the server.
+
+        Args:
+            address (protocol.Address): Server address.
+            timeout (float, optional): Socket timeout in seconds. Defaults to
+                5.0.
+
+        Raises:
+            OSError: If the connection fails.
+        """
+        self.sock = socket.socket(address.family, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(address.target)
+        self.batches = 0
+        self.__decoder = protocol.FrameDecoder(max_frame=1 << 30)
+        self.__events: typing.List[Event] = []
+
+    def send(self, commands: typing.Iterable[str]) -> int:
+        """Send a batch of commands.
+
+        Args:
+            commands (typing.Iterable[str]): Commands, see
+                `freejay.session.commands`.
+
+        Returns:
+            int: Batch number, acknowledged by an `ack` event.
+        """
+        self.sock.sendall(protocol.encode_batch(commands))
+        self.batches += 1
+        return self.batches
+
+    def subscribe(self) -> int:
+        """Subscribe to deck and mixer state events.
+
+        Returns:
+            int: Batch number.
+        """
+        return self.send([protocol.SUBSCRIBE])
+
+    def unsubscribe(self) -> int:
+        """Unsubscribe from deck and mixer state events.
+
+        Returns:
+            int: Batch number.
+        """
+        return self.send([protocol.UNSUBSCRIBE])
+
+    def read(self) -> Event:
+        """Read the next event, blocking until one arrives.
+
+        Raises:
+            EOFError: If the server closed the connection.
+            socket.timeout: If no event arrives within the timeout.
+
+        Returns:
+            Event: Event.
+        """
+        while not self.__events:
+            data = self.sock.recv(64 * 1024)
+            if not data:
+                raise EOFError("Connection closed.")
+            self.__events.extend(
+                json.loads(payload) for payload in self.__decoder.feed(data)
+            )
+        return self.__events.pop(0)
+
+    def events(self) -> typing.Iterator[Event]:
+        """Read events until the server closes the connection.
+
+        Yields:
+            Event: Event.
+        """
+        while True:
+            try:
+                yield self.read()
+            except EOFError:
+                return
+
+    def wait(self, batch: int) -> Event:
+        """Read events until a batch is acknowledged.
+
+        Other events read are dropped.
+
+        Args:
+            batch (int): Batch number, from `send()`.
+
+        Raises:
+            EOFError: If the server closed the connection.
+
+        Returns:
+            Event: Acknowledgement.
+        """
+        while True:
+            event = self.read()
+            if event.get("ack", 0) >= batch:
+                return event
+
+    def close(self):
+        """Close the connection."""
+        self.sock.close()
+
+    def __enter__(self) -> "ControlClient":
+        """Enter the context, returning the client."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Exit the context, closing the connection."""
+        self.close()
@@ -0,0 +1,162 @@
+"""
+Control socket protocol.
+
+Every frame is a 4 byte big endian payload length followed by the payload.
+
+Clients send batches of commands, a frame holding UTF-8 text commands one per
+line (see `freejay.session.commands`), plus the control commands `subscribe`
+and `unsubscribe`:
+
+    press LEFT_DECK PLAY_PAUSE
+    data MIXER CROSSFADER position=0.5
+    subscribe
+
+The server sends compact JSON events. Each batch is acknowledged, in order, with
+the number of messages sent and any invalid commands, including commands with
+data their element does not take (see `commands.check_message()`), which are
+not sent. Subscribers are sent the
+full deck and mixer state, then the fields that change:
+
+    {"ack":1,"messages":2,"errors":[]}
+    {"state":{"LEFT_DECK":{"position":12.3},"MIXER":{"crossfader":0.5}}}
+    {"error":"Too many connections"}
+
+An `error` event is sent before the server closes a connection.
+"""
+
+import json
+import socket
+import struct
+import typing
+import ipaddress
+
+HEADER = struct.Struct(">I")
+MAX_FRAME = 256 * 1024
+SUBSCRIBE = "subscribe"
+UNSUBSCRIBE = "unsubscribe"
+
+
+class FrameError(ValueError):
+    """Invalid frame."""
+
+
+class Address(typing.NamedTuple):
+    """
+    Control socket address.
+
+    Attributes:
+        family (int): `socket.AF_UNIX` or `socket.AF_INET`.
+        target (typing.Union[str, typing.Tuple[str, int]]): Socket path, or
+            (host, port).
+    """
+
+    family: int
+    target: typing.Union[str, typing.Tuple[str, int]]
+
+
+def parse_address(spec: str) -> Address:
+    """Parse a control socket address.
+
+    Args:
+        spec (str): "unix:PATH", or "tcp:PORT" or "tcp:HOST:PORT" for a loopback
+            host. HOST defaults to 127.0.0.1.
+
+    Raises:
+        ValueError: If the address is invalid or not local.
+
+    Returns:
+        Address: Address.
+    """
+    kind, _, rest = spec.partition(":")
+    if kind == "unix" and rest:
+        return Address(socket.AF_UNIX, rest)
+    if kind != "tcp" or not rest:
+        raise ValueError(f"Expected unix:PATH or tcp:[HOST:]PORT, got {spec!r}")
+    host, _, port = rest.rpartition(":")
+    host = host or "127.0.0.1"
+    if host != "localhost" and not ipaddress.ip_address(host).is_loopback:
+        raise ValueError(f"Control socket host must be local, not {host!r}")
+    return Address(socket.AF_INET, (host, int(port)))
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """Frame a payload.
+
+    Args:
+        payload (bytes): Payload.
+
+    Returns:
+        bytes: Frame.
+    """
+    return HEADER.pack(len(payload)) + payload
+
+
+def encode_batch(commands: typing.Iterable[str]) -> bytes:
+    """Frame a batch of commands.
+
+    Args:
+        commands (typing.Iterable[str]): Commands.
+
+    Returns:
+        bytes: Frame.
+    """
+    return encode_frame("\n".join(commands).encode("utf-8"))
+
+
+def encode_event(event: typing.Dict[str, typing.Any]) -> bytes:
+    """Frame an event.
+
+    Args:
+        event (typing.Dict[str, typing.Any]): JSON serialisable event.
+
+    Returns:
+        bytes: Frame.
+    """
+    return encode_frame(json.dumps(event, separators=(",", ":")).encode("utf-8"))
+
+
+class FrameDecoder:
+    """
+    Decode a byte stream into frame payloads.
+
+    Bytes are decoded in bulk, as read. A frame split across reads is completed
+    by the next `feed()`.
+    """
+
+    def __init__(self, max_frame: int = MAX_FRAME):
+        """Construct FrameDecoder.
+
+        Args:
+            max_frame (int, optional): Largest payload accepted, in bytes.
+                Defaults to MAX_FRAME.
+        """
+        self.max_frame = max_frame
+        self.__buffer = bytearray()
+
+    def feed(self, data: bytes) -> typing.List[bytes]:
+        """Decode bytes read.
+
+        Args:
+            data (bytes): Bytes read.
+
+        Raises:
+            FrameError: If a frame is larger than `max_frame`.
+
+        Returns:
+            typing.List[bytes]: Payloads completed by the data, in order.
+        """
+        buffer = self.__buffer
+        buffer += data
+        payloads = []
+        start = 0
+        while len(buffer) - start >= HEADER.size:
+            (length,) = HEADER.unpack_from(buffer, start)
+            if length > self.max_frame:
+                raise FrameError(f"Frame of {length} bytes exceeds {self.max_frame}")
+            end = start + HEADER.size + length
+            if end > len(buffer):
+                break
+            payloads.append(bytes(buffer[start + HEADER.size : end]))
+            start = end
+        del buffer[:start]
+        return payloads
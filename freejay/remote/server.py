@@ -0,0 +1,395 @@
+"""
+Control socket server.
+
+A ControlServer runs a selector loop on its own thread, accepting up to
+`max_connections` local clients. Each batch of commands a client sends is
+parsed, its messages sent to the consumer (e.g. the controller's input router)
+and acknowledged, see `protocol`.
+
+Backpressure:
+
+* While the model queue holds `max_queued` messages or more, no commands are
+  read, so clients block in `send()` once the socket buffers fill.
+* A client is not read from while `max_buffered` bytes of events are waiting
+  for it to read, so a client must read its acknowledgements.
+* State changes for a subscriber are merged per component until they can be
+  sent, so a slow subscriber gets the latest state rather than a growing
+  backlog.
+
+State messages are received from the state pump thread, e.g. through a model
+router tap (see `controller.register_control_server()`).
+"""
+
+import os
+import stat
+import socket
+import typing
+import logging
+import selectors
+import threading
+import dataclasses
+from freejay.messages import messages as mes
+from freejay.messages import produce_consume as prodcon
+from freejay.session.commands import parse_command, CommandError
+from freejay.remote import protocol
+
+logger = logging.getLogger(__name__)
+
+READ_SIZE = 64 * 1024
+
+
+@dataclasses.dataclass
+class ServerStats:
+    """
+    Control server statistics.
+
+    Attributes:
+        connections (int): Number of connections accepted.
+        refused (int): Number of connections refused over the limit.
+        batches (int): Number of command batches read.
+        commands (int): Number of commands read.
+        messages (int): Number of messages sent.
+        errors (int): Number of invalid commands.
+        paused (int): Number of times reading paused for the model queue.
+        state_events (int): Number of state events sent.
+    """
+
+    connections: int = 0
+    refused: int = 0
+    batches: int = 0
+    commands: int = 0
+    messages: int = 0
+    errors: int = 0
+    paused: int = 0
+    state_events: int = 0
+
+
+class _Connection:
+    """Client connection state, used on the server thread."""
+
+    def __init__(self, sock: socket.socket, max_frame: int):
+        self.sock = sock
+        self.decoder = protocol.FrameDecoder(max_frame)
+        self.outgoing = bytearray()
+        self.batches = 0
+        self.subscribed = False
+        # Merged state changes waiting to be sent, guarded by the server lock.
+        self.state: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        # Selector events registered for, 0 when unregistered.
+        self.interest = 0
+
+
+class ControlServer(prodcon.Producer, prodcon.Consumer):
+    """
+    Local control socket server.
+
+    Sends the messages of the commands it is sent to its consumer, and sends
+    the state messages it receives to subscribers. Implements the headless
+    engine input protocol, running until stopped.
+    """
+
+    def __init__(
+        self,
+        address: protocol.Address,
+        max_connections: int = 8,
+        max_queued: int = 1000,
+        max_buffered: int = 1024 * 1024,
+        max_frame: int = protocol.MAX_FRAME,
+    ):
+        """Construct ControlServer.
+
+        Args:
+            address (protocol.Address): Address to listen on, see
+                `protocol.parse_address()`.
+            max_connections (int, optional): Maximum clients. Defaults to 8.
+            max_queued (int, optional): Model queue length at which reading
+                commands pauses. Defaults to 1000.
+            max_buffered (int, optional): Bytes of events waiting for a client
+                at which reading its commands pauses. Defaults to 1 MiB.
+            max_frame (int, optional): Largest batch accepted, in bytes.
+                Defaults to protocol.MAX_FRAME.
+        """
+        self.address = address
+        self.max_connections = max_connections
+        self.max_queued = max_queued
+        self.max_buffered = max_buffered
+        self.max_frame = max_frame
+        # Model queue length, set by `controller.register_control_server()`.
+        self.backlog: typing.Callable[[], int] = lambda: 0
+        self.stats = ServerStats()
+        self.__lock = threading.Lock()
+        self.__state: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        self.__connections: typing.Dict[socket.socket, _Connection] = {}
+        self.__stopping = threading.Event()
+        self.__woken = False
+        self.__thread: typing.Optional[threading.Thread] = None
+        self.__listener: typing.Optional[socket.socket] = None
+        self.__waker, self.__wake_sock = socket.socketpair()
+        self.__selector = selectors.DefaultSelector()
+
+    @property
+    def running(self) -> bool:
+        """Get whether the server thread is running."""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @property
+    def connections(self) -> int:
+        """Get the number of connected clients."""
+        return len(self.__connections)
+
+    def bind(self) -> protocol.Address:
+        """Listen on the address, without serving yet.
+
+        Raises:
+            OSError: If the address cannot be bound.
+
+        Returns:
+            protocol.Address: Address bound, with the port for TCP port 0.
+        """
+        if self.__listener is not None:
+            return self.address
+        if self.address.family == socket.AF_UNIX:
+            _remove_stale_socket(typing.cast(str, self.address.target))
+        listener = socket.socket(self.address.family, socket.SOCK_STREAM)
+        if self.address.family != socket.AF_UNIX:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind(self.address.target)
+        listener.listen(self.max_connections)
+        listener.setblocking(False)
+        self.__listener = listener
+        if self.address.family != socket.AF_UNIX:
+            self.address = protocol.Address(
+                self.address.family, listener.getsockname()[:2]
+            )
+        return self.address
+
+    def start(self):
+        """Start serving, binding the address if needed."""
+        if self.running:
+            return
+        self.bind()
+        self.__stopping.clear()
+        self.__thread = threading.Thread(
+            target=self.__serve, name="control-server", daemon=True
+        )
+        self.__thread.start()
+        logger.info("Control socket listening on %s", self.address.target)
+
+    def stop(self):
+        """Stop serving, closing every connection and the socket."""
+        self.__stopping.set()
+        self.__wake()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        self.__close_listener()
+
+    def join(self, timeout: typing.Optional[float] = None):
+        """Wait for the server to stop.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to None (until
+                it stops).
+        """
+        thread = self.__thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def on_message_recieved(self, message: mes.Message):
+        """Merge a state message into the state sent to subscribers.
+
+        Args:
+            message (mes.Message): State message.
+        """
+        content = message.content
+        if not isinstance(content, mes.Data) or content.element != mes.Element.STATE:
+            return
+        component = content.component.name
+        with self.__lock:
+            self.__state.setdefault(component, {}).update(content.data)
+            subscribers = [c for c in self.__connections.values() if c.subscribed]
+            for connection in subscribers:
+                connection.state.setdefault(component, {}).update(content.data)
+        if subscribers:
+            self.__wake()
+
+    def __wake(self):
+        if not self.__woken:
+            self.__woken = True
+            try:
+                self.__wake_sock.send(b"\0")
+            except OSError:
+                pass
+
+    def __serve(self):
+        listener = typing.cast(socket.socket, self.__listener)
+        selector = self.__selector
+        selector.register(listener, selectors.EVENT_READ)
+        selector.register(self.__waker, selectors.EVENT_READ)
+        paused = False
+        try:
+            while not self.__stopping.is_set():
+                if paused != (self.backlog() >= self.max_queued):
+                    paused = not paused
+                    self.stats.paused += paused
+                self.__flush_state()
+                self.__update_interest(paused)
+                # Poll while paused, for the model queue to drain.
+                for key, mask in selector.select(0.005 if paused else None):
+                    if key.fileobj is listener:
+                        self.__accept(listener)
+                    elif key.fileobj is self.__waker:
+                        self.__waker.recv(4096)
+                        self.__woken = False
+                    else:
+                        self.__service(key.data, mask)
+        except Exception:
+            logger.exception("Control server failed.")
+        finally:
+            for connection in list(self.__connections.values()):
+                self.__close(connection)
+            selector.unregister(listener)
+            selector.unregister(self.__waker)
+
+    def __update_interest(self, paused: bool):
+        for connection in list(self.__connections.values()):
+            events = 0
+            if not paused and len(connection.outgoing) < self.max_buffered:
+                events |= selectors.EVENT_READ
+            if connection.outgoing:
+                events |= selectors.EVENT_WRITE
+            if events == connection.interest:
+                continue
+            # A selector needs some interest, so unregister to wait.
+            if not events:
+                self.__selector.unregister(connection.sock)
+            elif not connection.interest:
+                self.__selector.register(connection.sock, events, connection)
+            else:
+                self.__selector.modify(connection.sock, events, connection)
+            connection.interest = events
+
+    def __accept(self, listener: socket.socket):
+        try:
+            sock, _ = listener.accept()
+        except BlockingIOError:
+            return
+        if len(self.__connections) >= self.max_connections:
+            self.stats.refused += 1
+            logger.warning("Control connection refused, too many connections.")
+            try:
+                sock.sendall(protocol.encode_event({"error": "Too many connections"}))
+            except OSError:
+                pass
+            sock.close()
+            return
+        sock.setblocking(False)
+        connection = _Connection(sock, self.max_frame)
+        with self.__lock:
+            self.__connections[sock] = connection
+        self.stats.connections += 1
+        logger.info("Control client connected.")
+
+    def __service(self, connection: _Connection, mask: int):
+        try:
+            if mask & selectors.EVENT_WRITE:
+                self.__write(connection)
+            if mask & selectors.EVENT_READ:
+                self.__read(connection)
+        except protocol.FrameError as exc:
+            logger.warning("Closing control client: %s", exc)
+            connection.outgoing += protocol.encode_event({"error": str(exc)})
+            self.__write(connection)
+            self.__close(connection)
+        except (ConnectionError, EOFError):
+            self.__close(connection)
+
+    def __read(self, connection: _Connection):
+        try:
+            data = connection.sock.recv(READ_SIZE)
+        except BlockingIOError:
+            return
+        if not data:
+            raise EOFError
+        for payload in connection.decoder.feed(data):
+            self.__handle_batch(connection, payload)
+
+    def __handle_batch(self, connection: _Connection, payload: bytes):
+        connection.batches += 1
+        self.stats.batches += 1
+        sent = 0
+        errors = []
+        for line in payload.decode("utf-8", errors="replace").splitlines():
+            command = line.strip()
+            if command in (protocol.SUBSCRIBE, protocol.UNSUBSCRIBE):
+                self.__subscribe(connection, command == protocol.SUBSCRIBE)
+                continue
+            try:
+                messages = parse_command(command)
+            except CommandError as exc:
+                errors.append(str(exc))
+                continue
+            self.stats.commands += bool(messages)
+            for message in messages:
+                self.send_message(message)
+            sent += len(messages)
+        self.stats.messages += sent
+        self.stats.errors += len(errors)
+        connection.outgoing += protocol.encode_event(
+            {"ack": connection.batches, "messages": sent, "errors": errors}
+        )
+
+    def __subscribe(self, connection: _Connection, subscribe: bool):
+        with self.__lock:
+            connection.subscribed = subscribe
+            # Start from the full state.
+            connection.state = (
+                {name: dict(fields) for name, fields in self.__state.items()}
+                if subscribe
+                else {}
+            )
+
+    def __flush_state(self):
+        """Send merged state changes to subscribers with room to send them."""
+        for connection in list(self.__connections.values()):
+            if not connection.state or len(connection.outgoing) >= self.max_buffered:
+                continue
+            with self.__lock:
+                state, connection.state = connection.state, {}
+            connection.outgoing += protocol.encode_event({"state": state})
+            self.stats.state_events += 1
+
+    def __write(self, connection: _Connection):
+        if not connection.outgoing:
+            return
+        try:
+            sent = connection.sock.send(connection.outgoing)
+        except BlockingIOError:
+            return
+        del connection.outgoing[:sent]
+
+    def __close(self, connection: _Connection):
+        with self.__lock:
+            self.__connections.pop(connection.sock, None)
+        if connection.interest:
+            self.__selector.unregister(connection.sock)
+        connection.sock.close()
+        logger.info("Control client disconnected.")
+
+    def __close_listener(self):
+        listener = self.__listener
+        if listener is None:
+            return
+        listener.close()
+        self.__listener = None
+        if self.address.family == socket.AF_UNIX:
+            _remove_stale_socket(typing.cast(str, self.address.target))
+        logger.info("Control socket closed.")
+
+
+def _remove_stale_socket(path: str):
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
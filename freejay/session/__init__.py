@@ -0,0 +1,7 @@
+"""
+Session recording and replay.
+
+The control message stream is written to an append-only log that can be replayed
+into a controller, e.g. to reproduce a session or generate realistic load.
+Control messages can also be written as one line text commands (see `commands`).
+"""
@@ -0,0 +1,362 @@
+"""
+Text commands.
+
+Control messages written as one line commands, e.g. typed into a headless engine
+or piped to it on stdin:
+
+    press LEFT_DECK PLAY_PAUSE
+    release LEFT_DECK PLAY_PAUSE
+    tap RIGHT_DECK CUE
+    data MIXER CROSSFADER position=0.5 curve=0.2
+    press LEFT_DECK LOOP beats=8 quantise=bar
+    press DOWNLOAD DOWNLOAD url="https://youtu.be/..." queue=true
+    key space
+
+`tap` is a press followed by a release, and `key` a key press and release, which
+is mapped by the keymap like a key typed in the window. Names are case
+insensitive. Data values are parsed as JSON, falling back to the plain text, so
+quote text holding spaces. Each element takes either button or data commands,
+with the data fields listed in `CONTROLS`, checked before any message is sent,
+so an invalid command cannot reach the model. Blank lines and lines starting
+with `#` are ignored. A line starting with `{` is read as a session log record
+(see `log.decode()`), so a session log can be piped in as commands.
+"""
+
+import math
+import json
+import shlex
+import typing
+import logging
+import threading
+import dataclasses
+from freejay.messages import messages as mes
+from freejay.messages import produce_consume as prodcon
+from freejay.session import log
+
+logger = logging.getLogger(__name__)
+
+
+class CommandError(ValueError):
+    """Invalid command."""
+
+
+# Number fields accept JSON integers or finite floats.
+NUMBER = "number"
+
+
+@dataclasses.dataclass(frozen=True)
+class Control:
+    """
+    Control element message format.
+
+    Attributes:
+        content (typing.Type[mes.Content]): mes.Button or mes.Data.
+        fields (typing.Dict[str, typing.Any]): Data field types, NUMBER or a
+            type, or a tuple of them.
+        required (typing.FrozenSet[str]): Fields that must be given.
+    """
+
+    content: typing.Type[mes.Content]
+    fields: typing.Dict[str, typing.Any] = dataclasses.field(default_factory=dict)
+    required: typing.FrozenSet[str] = frozenset()
+
+
+_quantise = {"quantise": (str, type(None))}
+
+# Message format of each control element handled by the model.
+CONTROLS: typing.Dict[mes.Element, Control] = {
+    mes.Element.CUE: Control(mes.Button),
+    mes.Element.PLAY_PAUSE: Control(mes.Button, _quantise),
+    mes.Element.STOP: Control(mes.Button),
+    mes.Element.NUDGE: Control(mes.Button, {"value": NUMBER}),
+    mes.Element.JOG: Control(mes.Button, {"value": NUMBER}),
+    mes.Element.CUE_JUMP: Control(mes.Button, _quantise),
+    mes.Element.LOOP: Control(mes.Button, {"beats": NUMBER, **_quantise}),
+    mes.Element.LOAD: Control(mes.Button),
+    mes.Element.MASTER: Control(mes.Button),
+    mes.Element.RECORD: Control(mes.Button),
+    mes.Element.DOWNLOAD: Control(
+        mes.Button,
+        {"url": str, "cancel": bool, "queue": bool},
+        frozenset({"url"}),
+    ),
+    mes.Element.CRATE: Control(mes.Button),
+    mes.Element.CROSSFADER: Control(
+        mes.Data, {"position": NUMBER, "curve": NUMBER}, frozenset({"position"})
+    ),
+    mes.Element.SPEED: Control(mes.Data, {"value": NUMBER}, frozenset({"value"})),
+    mes.Element.BPM: Control(
+        mes.Data,
+        {"value": (NUMBER, type(None)), "offset": NUMBER},
+        frozenset({"value"}),
+    ),
+    mes.Element.CHANNEL_FADER: Control(
+        mes.Data, {"value": NUMBER}, frozenset({"value"})
+    ),
+    mes.Element.XF_ASSIGN: Control(mes.Data, {"assign": str}, frozenset({"assign"})),
+    **{
+        element: Control(mes.Data, {"value": NUMBER}, frozenset({"value"}))
+        for element in (
+            mes.Element.EQ_LOW,
+            mes.Element.EQ_MID,
+            mes.Element.EQ_HIGH,
+            mes.Element.FILTER,
+        )
+    },
+}
+
+
+def _is_type(value: typing.Any, kind: typing.Any) -> bool:
+    if isinstance(kind, tuple):
+        return any(_is_type(value, k) for k in kind)
+    if kind == NUMBER:
+        return (
+            isinstance(value, (int, float))
+            and not isinstance(value, bool)
+            and math.isfinite(value)
+        )
+    return isinstance(value, kind)
+
+
+def check_message(message: mes.Message):
+    """Check a control message has the format its element takes, see CONTROLS.
+
+    Key messages are mapped before they reach the model, so are not checked.
+
+    Args:
+        message (mes.Message): Message to check.
+
+    Raises:
+        CommandError: If the message is not a valid control message.
+    """
+    content = message.content
+    if not isinstance(content, (mes.Button, mes.Data)):
+        return
+    name = f"{content.component.name} {content.element.name}"
+    data = content.data
+    control = CONTROLS.get(content.element)
+    if control is None:
+        raise CommandError(f"{name} is not a control")
+    if not isinstance(content, control.content):
+        kind = "button" if control.content is mes.Button else "data"
+        raise CommandError(f"{name} takes {kind} commands")
+    if not isinstance(data, dict):
+        raise CommandError(f"{name} data must be an object")
+    missing = control.required - data.keys()
+    if missing:
+        raise CommandError(f"{name} requires {', '.join(sorted(missing))}")
+    for field, value in data.items():
+        if field not in control.fields:
+            raise CommandError(f"{name} has no field {field!r}")
+        if not _is_type(value, control.fields[field]):
+            raise CommandError(f"{name} invalid {field}: {value!r}")
+
+
+def _enum(kind: typing.Type[typing.Any], name: str) -> typing.Any:
+    try:
+        return kind[name.upper()]
+    except KeyError:
+        raise CommandError(f"Unknown {kind.__name__.lower()}: {name!r}") from None
+
+
+def _value(text: str) -> typing.Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def _data(fields: typing.List[str]) -> typing.Dict[str, typing.Any]:
+    data = {}
+    for field in fields:
+        name, sep, value = field.partition("=")
+        if not sep or not name:
+            raise CommandError(f"Expected name=value, got {field!r}")
+        data[name] = _value(value)
+    return data
+
+
+def _button(
+    press_release: mes.PressRelease,
+    component: mes.Component,
+    element: mes.Element,
+    data: typing.Dict[str, typing.Any],
+) -> mes.Message:
+    return mes.Message(
+        sender=mes.Sender(source=mes.Source.COMMAND, trigger=mes.Trigger.BUTTON),
+        content=mes.Button(
+            press_release=press_release,
+            component=component,
+            element=element,
+            data=dict(data),
+        ),
+    )
+
+
+def _key(press_release: mes.PressRelease, sym: str) -> mes.Message:
+    return mes.Message(
+        sender=mes.Sender(source=mes.Source.COMMAND, trigger=mes.Trigger.KEY),
+        content=mes.Key(press_release=press_release, sym=sym),
+    )
+
+
+def _control(verb: str, args: typing.List[str], line: str) -> typing.List[mes.Message]:
+    """Parse a press, release, tap or data command."""
+    if verb not in ("press", "release", "tap", "data") or len(args) < 2:
+        raise CommandError(f"Invalid command: {line!r}")
+    component = _enum(mes.Component, args[0])
+    element = _enum(mes.Element, args[1])
+    data = _data(args[2:])
+    if verb == "data":
+        messages = [
+            mes.Message(
+                sender=mes.Sender(
+                    source=mes.Source.COMMAND, trigger=mes.Trigger.DATA_INPUT
+                ),
+                content=mes.Data(component=component, element=element, data=data),
+            )
+        ]
+    elif verb == "tap":
+        messages = [
+            _button(mes.PressRelease.PRESS, component, element, data),
+            _button(mes.PressRelease.RELEASE, component, element, data),
+        ]
+    else:
+        messages = [_button(mes.PressRelease[verb.upper()], component, element, data)]
+    check_message(messages[0])
+    return messages
+
+
+def parse_command(line: str) -> typing.List[mes.Message]:
+    """Parse a command.
+
+    Args:
+        line (str): Command line.
+
+    Raises:
+        CommandError: If the line is not a valid command, or its messages are
+            not valid control messages (see `check_message()`).
+
+    Returns:
+        typing.List[mes.Message]: Messages, in order. Empty for a blank line or
+            a comment.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return []
+    if line.startswith("{"):
+        try:
+            message = log.decode(line)[1]
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        check_message(message)
+        return [message]
+    try:
+        verb, *args = shlex.split(line)
+    except ValueError as exc:
+        raise CommandError(f"{exc}: {line!r}") from exc
+    verb = verb.lower()
+    if verb == "key":
+        if len(args) != 1:
+            raise CommandError(f"Expected key SYM, got {line!r}")
+        return [
+            _key(mes.PressRelease.PRESS, args[0]),
+            _key(mes.PressRelease.RELEASE, args[0]),
+        ]
+    return _control(verb, args, line)
+
+
+@dataclasses.dataclass
+class CommandStats:
+    """Command input statistics."""
+
+    commands: int = 0
+    messages: int = 0
+    errors: int = 0
+
+
+class CommandInput(prodcon.Producer):
+    """
+    Read commands from a text stream on a reader thread.
+
+    Each command's messages are sent to the consumer as it is read. Invalid
+    commands are logged and skipped. The input stops at the end of the stream.
+    """
+
+    def __init__(self, stream: typing.TextIO, name: str = "stdin"):
+        """Construct CommandInput.
+
+        Args:
+            stream (typing.TextIO): Command stream, e.g. `sys.stdin` or an open
+                command file.
+            name (str, optional): Stream name, for logging. Defaults to "stdin".
+        """
+        self.stream = stream
+        self.name = name
+        self.stats = CommandStats()
+        self.__stopping = threading.Event()
+        self.__reader: typing.Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Get whether the reader thread is running."""
+        return self.__reader is not None and self.__reader.is_alive()
+
+    def start(self):
+        """Start reading."""
+        if self.running:
+            return
+        self.__stopping.clear()
+        self.__reader = threading.Thread(
+            target=self.__read_loop, name="command-input", daemon=True
+        )
+        self.__reader.start()
+        logger.info("Reading commands from %s", self.name)
+
+    def stop(self):
+        """Stop reading, after the line being read.
+
+        A reader blocked on an interactive stream is left to finish with the
+        process.
+        """
+        self.__stopping.set()
+
+    def join(self, timeout: typing.Optional[float] = None):
+        """Wait for the input to end.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to None (until
+                it ends).
+        """
+        if self.__reader is not None:
+            self.__reader.join(timeout)
+
+    def feed(self, line: str) -> int:
+        """Parse a command and send its messages.
+
+        Args:
+            line (str): Command line.
+
+        Returns:
+            int: Number of messages sent, 0 for an invalid command.
+        """
+        try:
+            messages = parse_command(line)
+        except CommandError as exc:
+            self.stats.errors += 1
+            logger.warning("Skipping command from %s: %s", self.name, exc)
+            return 0
+        if messages:
+            self.stats.commands += 1
+        for message in messages:
+            self.send_message(message)
+        self.stats.messages += len(messages)
+        return len(messages)
+
+    def __read_loop(self):
+        """Read commands until the end of the stream or stopped."""
+        for line in self.stream:
+            if self.__stopping.is_set():
+                break
+            self.feed(line)
+        logger.info("End of commands from %s", self.name)
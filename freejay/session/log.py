@@ -0,0 +1,171 @@
+"""
+Session log.
+
+Messages are written one per line as compact JSON, with enums stored by name:
+
+    {"t":1.25,"type":"BUTTON","source":"PLAYER_VIEW","trigger":"BUTTON",
+     "component":"LEFT_DECK","element":"PLAY_PAUSE","press_release":"PRESS",
+     "data":{}}
+
+`t` is the monotonic time in seconds since the session started. Each session
+appended to a log starts with a header line, e.g. `{"session":1700000000.0,
+"version":1}`, where `session` is the wall clock start time.
+"""
+
+import json
+import time
+import typing
+import logging
+import threading
+from freejay.messages import messages as mes
+from freejay.messages import produce_consume as prodcon
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+
+def encode(message: mes.Message, t: float) -> str:
+    """Encode a message as a log line.
+
+    Data values that are not JSON serialisable (e.g. exceptions) are stored as
+    their repr().
+
+    Args:
+        message (mes.Message): Message to encode.
+        t (float): Session time in seconds.
+
+    Returns:
+        str: Log line, without a line ending.
+    """
+    content = message.content
+    record: typing.Dict[str, typing.Any] = {
+        "t": round(t, 6),
+        "type": message.type.name if message.type else None,
+        "source": message.sender.source.name,
+        "trigger": message.sender.trigger.name,
+    }
+    if isinstance(content, mes.Key):
+        record["press_release"] = content.press_release.name
+        record["sym"] = content.sym
+    elif isinstance(content, (mes.Button, mes.Data)):
+        record["component"] = content.component.name
+        record["element"] = content.element.name
+        if isinstance(content, mes.Button):
+            record["press_release"] = content.press_release.name
+        record["data"] = content.data
+    return json.dumps(record, separators=(",", ":"), default=repr)
+
+
+def decode(line: str) -> typing.Tuple[float, mes.Message]:
+    """Decode a log line.
+
+    Args:
+        line (str): Log line.
+
+    Raises:
+        ValueError: If the line is not a valid message record.
+
+    Returns:
+        typing.Tuple[float, mes.Message]: (session time, message)
+    """
+    try:
+        record = json.loads(line)
+        sender = mes.Sender(
+            source=mes.Source[record["source"]],
+            trigger=mes.Trigger[record["trigger"]],
+        )
+        content: mes.Content
+        if record["type"] == mes.Type.KEY.name:
+            content = mes.Key(
+                press_release=mes.PressRelease[record["press_release"]],
+                sym=record["sym"],
+            )
+        elif record["type"] == mes.Type.BUTTON.name:
+            content = mes.Button(
+                press_release=mes.PressRelease[record["press_release"]],
+                component=mes.Component[record["component"]],
+                element=mes.Element[record["element"]],
+                data=record["data"],
+            )
+        else:
+            content = mes.Data(
+                component=mes.Component[record["component"]],
+                element=mes.Element[record["element"]],
+                data=record["data"],
+            )
+        return float(record["t"]), mes.Message(sender=sender, content=content)
+    except (KeyError, TypeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"Invalid session log line: {line!r}") from exc
+
+
+def read_log(
+    file_path: str,
+) -> typing.Iterator[typing.Tuple[float, mes.Message]]:
+    """Read messages from a session log.
+
+    Sessions are read in order, the times of each session following on from the
+    end of the previous session. Invalid lines (e.g. a line truncated by a crash)
+    are logged and skipped.
+
+    Args:
+        file_path (str): Session log path.
+
+    Yields:
+        typing.Tuple[float, mes.Message]: (time, message)
+    """
+    offset = 0.0
+    last = 0.0
+    with open(file_path, encoding="utf-8") as file:
+        for number, line in enumerate(file, start=1):
+            if line.startswith('{"session"'):
+                offset = last
+                continue
+            try:
+                t, message = decode(line)
+            except ValueError:
+                logger.warning("Skipping invalid line %d in %s.", number, file_path)
+                continue
+            last = offset + t
+            yield last, message
+
+
+class SessionLog(prodcon.Consumer):
+    """
+    Session Log.
+
+    Consumer that appends every message it receives to a session log. Register
+    it as a `MessageRouter` tap to record the messages passing through a router.
+
+    Messages may be received from several threads, lines are written whole.
+    """
+
+    def __init__(self, file_path: str):
+        """Construct SessionLog, starting a new session in the log.
+
+        Args:
+            file_path (str): Session log path, appended to if it exists.
+        """
+        self.file_path = file_path
+        self.__lock = threading.Lock()
+        self.__file = open(file_path, "a", encoding="utf-8", buffering=1)
+        self.__start = time.perf_counter()
+        header = {"session": time.time(), "version": FORMAT_VERSION}
+        self.__file.write(json.dumps(header, separators=(",", ":")) + "\n")
+        logger.info("Recording session to %s", file_path)
+
+    def on_message_recieved(self, message: mes.Message):
+        """Append a message to the log.
+
+        Args:
+            message (mes.Message): Message to log.
+        """
+        line = encode(message, time.perf_counter() - self.__start)
+        with self.__lock:
+            if not self.__file.closed:
+                self.__file.write(line + "\n")
+
+    def close(self):
+        """Close the log."""
+        with self.__lock:
+            self.__file.close()
@@ -0,0 +1,205 @@
+"""
+Session replay.
+
+Replay a session log into a message consumer, in real time (or scaled) or as fast
+as possible. Run as a module to replay a log into a headless controller:
+
+    python -m freejay.session.replay session.log --speed 0
+"""
+
+import time
+import typing
+import logging
+import argparse
+import itertools
+import threading
+import statistics
+import dataclasses
+from freejay.messages import messages as mes
+from freejay.messages import produce_consume as prodcon
+from freejay.session.log import read_log
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class ReplayStats:
+    """
+    Replay statistics.
+
+    Attributes:
+        messages (int): Number of messages replayed.
+        duration (float): Replay duration in seconds.
+        lateness (typing.List[float]): Seconds each message was sent after its
+            scheduled time (0 when replaying as fast as possible).
+        handle_times (typing.List[float]): Seconds the consumer took for each
+            message.
+    """
+
+    messages: int = 0
+    duration: float = 0.0
+    lateness: typing.List[float] = dataclasses.field(default_factory=list)
+    handle_times: typing.List[float] = dataclasses.field(default_factory=list)
+
+    def summary(self) -> typing.Dict[str, float]:
+        """Summarise the replay.
+
+        Returns:
+            typing.Dict[str, float]: Message rate, and median, 99th percentile
+                and maximum handle time and lateness in milliseconds.
+        """
+        result = {
+            "messages": self.messages,
+            "rate": self.messages / self.duration if self.duration else 0.0,
+        }
+        for name, values in (
+            ("handle", self.handle_times),
+            ("lateness", self.lateness),
+        ):
+            if values:
+                result[f"{name}_p50_ms"] = statistics.median(values) * 1000
+                result[f"{name}_p99_ms"] = _percentile(values, 99) * 1000
+                result[f"{name}_max_ms"] = max(values) * 1000
+        return result
+
+
+def _percentile(values: typing.Sequence[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def replay(
+    messages: typing.Iterable[typing.Tuple[float, mes.Message]],
+    consumer: typing.Callable[[mes.Message], typing.Any],
+    speed: float = 1.0,
+) -> ReplayStats:
+    """Replay messages into a consumer.
+
+    Args:
+        messages (typing.Iterable[typing.Tuple[float, mes.Message]]): (time,
+            message) pairs, e.g. from `log.read_log()`.
+        consumer (typing.Callable[[mes.Message], typing.Any]): Message consumer,
+            e.g. a MessageRouter or Handler.
+        speed (float, optional): Replay speed, 1 for real time or 0 for as fast
+            as possible. Defaults to 1.0.
+
+    Returns:
+        ReplayStats: Replay statistics.
+    """
+    stats = ReplayStats()
+    start = time.perf_counter()
+    first: typing.Optional[float] = None
+    for t, message in messages:
+        if first is None:
+            first = t
+        if speed > 0:
+            due = start + (t - first) / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            stats.lateness.append(max(0.0, time.perf_counter() - due))
+        sent = time.perf_counter()
+        consumer(message)
+        stats.handle_times.append(time.perf_counter() - sent)
+        stats.messages += 1
+    stats.duration = time.perf_counter() - start
+    return stats
+
+
+class ReplayInput(prodcon.Producer):
+    """
+    Replay a session log to the consumer on a replay thread.
+
+    An input for a headless engine (see `freejay.headless`), ending when the log
+    has been replayed.
+    """
+
+    def __init__(self, file_path: str, speed: float = 1.0):
+        """Construct ReplayInput.
+
+        Args:
+            file_path (str): Session log path.
+            speed (float, optional): Replay speed, 1 for real time or 0 for as
+                fast as possible. Defaults to 1.0.
+        """
+        self.file_path = file_path
+        self.speed = speed
+        self.stats: typing.Optional[ReplayStats] = None
+        self.__stopping = threading.Event()
+        self.__replayer: typing.Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Get whether the replay thread is running."""
+        return self.__replayer is not None and self.__replayer.is_alive()
+
+    def start(self):
+        """Start replaying."""
+        if self.running:
+            return
+        self.__stopping.clear()
+        self.__replayer = threading.Thread(
+            target=self.__replay, name="replay-input", daemon=True
+        )
+        self.__replayer.start()
+        logger.info("Replaying %s", self.file_path)
+
+    def stop(self):
+        """Stop replaying, before the next message."""
+        self.__stopping.set()
+
+    def join(self, timeout: typing.Optional[float] = None):
+        """Wait for the replay to end.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to None (until
+                it ends).
+        """
+        if self.__replayer is not None:
+            self.__replayer.join(timeout)
+
+    def __replay(self):
+        messages = itertools.takewhile(
+            lambda _: not self.__stopping.is_set(), read_log(self.file_path)
+        )
+        self.stats = replay(messages, self.send_message, speed=self.speed)
+        logger.info("Replayed %d messages", self.stats.messages)
+
+
+def main(argv: typing.Optional[typing.List[str]] = None):
+    """Replay a session log into a headless controller.
+
+    Args:
+        argv (typing.List[str], optional): Command line arguments. Defaults to
+            None (`sys.argv`).
+    """
+    parser = argparse.ArgumentParser(description="Replay a freejay session log.")
+    parser.add_argument("log", help="Session log path.")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Replay speed, 1 for real time, 0 for as fast as possible.",
+    )
+    args = parser.parse_args(argv)
+
+    from freejay.model import make_model
+    from freejay.controller import make_headless_controller
+
+    model = make_model()
+    controller = make_headless_controller(model)
+    controller.work_manager.start()
+
+    stats = replay(read_log(args.log), controller.view_message_router, speed=args.speed)
+    # Wait for the model to handle the replayed messages.
+    controller.work_manager.join("model")
+    controller.work_manager.stop()
+
+    for key, value in stats.summary().items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
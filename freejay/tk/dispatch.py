@@ -0,0 +1,187 @@
+"""
+Marshal view updates onto the Tk main loop.
+
+Tk is not thread safe, so widgets must only be changed on the thread running the
+main loop. Other threads (e.g. the view worker) post view updates to a
+`TkDispatcher`, which the main loop drains in batches on a recurring `after()`
+tick. Batches are bounded so that a burst of updates cannot stall input
+handling and redraws; a backlog is drained over several ticks, a millisecond
+apart.
+
+View callbacks are wrapped when registered with the view message handler:
+
+    handler.register_handler(
+        callback=dispatcher.wrap(callback), component=..., element=...
+    )
+"""
+
+import typing
+import logging
+import collections
+import dataclasses
+
+logger = logging.getLogger(__name__)
+
+# Tick interval in milliseconds, when there is no backlog.
+DEFAULT_INTERVAL = 10
+# Maximum updates run per tick.
+DEFAULT_MAX_BATCH = 200
+
+
+class AfterScheduler(typing.Protocol):
+    """The Tk widget `after()` interface used by TkDispatcher."""
+
+    def after(self, ms: int, func: typing.Callable[[], None]) -> str:
+        """Call a function after a delay, on the main loop.
+
+        Args:
+            ms (int): Delay in milliseconds.
+            func (typing.Callable[[], None]): Function to call.
+
+        Returns:
+            str: Identifier, for `after_cancel()`.
+        """
+
+    def after_cancel(self, id: str):
+        """Cancel a call scheduled with `after()`.
+
+        Args:
+            id (str): Identifier returned by `after()`.
+        """
+
+
+@dataclasses.dataclass
+class DispatchStats:
+    """
+    View dispatch statistics.
+
+    Attributes:
+        dispatched (int): Number of updates run.
+        batches (int): Number of non-empty batches run.
+        largest_batch (int): Most updates run in one batch.
+        max_pending (int): Largest backlog seen at the start of a tick.
+        errors (int): Number of updates raising an exception.
+    """
+
+    dispatched: int = 0
+    batches: int = 0
+    largest_batch: int = 0
+    max_pending: int = 0
+    errors: int = 0
+
+
+class TkDispatcher:
+    """
+    Run view updates posted from any thread on the Tk main loop.
+
+    `post()` and `wrap()` may be called from any thread. Updates are run in the
+    order they were posted.
+    """
+
+    def __init__(
+        self,
+        root: AfterScheduler,
+        interval: int = DEFAULT_INTERVAL,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        """Construct TkDispatcher.
+
+        Args:
+            root (AfterScheduler): Tk widget the main loop ticks are scheduled on.
+            interval (int, optional): Tick interval in milliseconds. Defaults to
+                DEFAULT_INTERVAL.
+            max_batch (int, optional): Maximum updates run per tick. Defaults to
+                DEFAULT_MAX_BATCH.
+        """
+        self.root = root
+        self.interval = interval
+        self.max_batch = max_batch
+        self.stats = DispatchStats()
+        # deque appends and pops are atomic, so posting needs no lock.
+        self.__pending: typing.Deque[
+            typing.Tuple[typing.Callable[..., None], typing.Tuple]
+        ] = collections.deque()
+        self.__after_id: typing.Optional[str] = None
+
+    def __len__(self) -> int:
+        """Get the number of pending updates."""
+        return len(self.__pending)
+
+    @property
+    def running(self) -> bool:
+        """Get whether ticks are scheduled."""
+        return self.__after_id is not None
+
+    def post(self, callback: typing.Callable[..., None], *args):
+        """Post a view update, to be run on the main loop.
+
+        Args:
+            callback (typing.Callable[..., None]): View update.
+            *args: Arguments to call the update with.
+        """
+        self.__pending.append((callback, args))
+
+    def wrap(self, callback: typing.Callable[..., None]) -> typing.Callable[..., None]:
+        """Wrap a view callback, so that calling it posts it to the main loop.
+
+        Args:
+            callback (typing.Callable[..., None]): View callback.
+
+        Returns:
+            typing.Callable[..., None]: Thread safe callback.
+        """
+
+        def post(*args):
+            self.post(callback, *args)
+
+        return post
+
+    def start(self):
+        """Start ticking, must be called on the main loop thread."""
+        if self.__after_id is None:
+            self.__after_id = self.root.after(self.interval, self.__tick)
+
+    def stop(self):
+        """Stop ticking, must be called on the main loop thread."""
+        if self.__after_id is not None:
+            self.root.after_cancel(self.__after_id)
+            self.__after_id = None
+
+    def drain(self, limit: typing.Optional[int] = None) -> int:
+        """Run pending view updates, on the main loop thread.
+
+        Args:
+            limit (int, optional): Maximum updates to run. Defaults to None
+                (max_batch).
+
+        Returns:
+            int: Number of updates run.
+        """
+        limit = self.max_batch if limit is None else limit
+        self.stats.max_pending = max(self.stats.max_pending, len(self.__pending))
+        count = 0
+        while count < limit:
+            try:
+                callback, args = self.__pending.popleft()
+            except IndexError:
+                break
+            count += 1
+            try:
+                callback(*args)
+            except Exception:
+                self.stats.errors += 1
+                logger.exception("View update failed.")
+        if count:
+            self.stats.dispatched += count
+            self.stats.batches += 1
+            self.stats.largest_batch = max(self.stats.largest_batch, count)
+        return count
+
+    def __tick(self):
+        self.drain()
+        if self.__after_id is None:
+            # Stopped by an update.
+            return
+        # Clear a backlog quickly, but let Tk handle events between batches.
+        delay = 1 if self.__pending else self.interval
+        self.__after_id = self.root.after(delay, self.__tick)
@@ -0,0 +1,202 @@
+"""
+Icon image cache.
+
+Button icons are decoded and resized once per process, keyed by path and size,
+and shared by every button (see `TkRoot.icon()`), rather than once per button.
+
+Icons can also be loaded pre-sized from a packed atlas, a single PNG of resized
+icons with a JSON index alongside it (`<atlas>.json`), built by `pack_atlas()`:
+
+    python -m freejay.tk.icons assets/icons/atlas.png assets/icons/*.png
+
+An atlas is decoded once, then icons are cropped from it without resampling.
+Icons missing from the atlas are loaded from their files as usual.
+"""
+
+import os
+import json
+import typing
+import logging
+import argparse
+import threading
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+ICON_SIZE = (20, 20)
+# Loaded by `freejay.view.make_view()` if present.
+ICON_ATLAS = os.path.join("assets", "icons", "atlas.png")
+ATLAS_VERSION = 1
+
+# Cache key, (normalised path, (width, height)).
+IconKey = typing.Tuple[str, typing.Tuple[int, int]]
+
+
+def _key(path: str, size: typing.Tuple[int, int]) -> IconKey:
+    return os.path.normpath(path), (int(size[0]), int(size[1]))
+
+
+class IconCache:
+    """
+    Process wide icon image cache.
+
+    Methods are thread safe. Cached images are shared, and must not be modified.
+    """
+
+    def __init__(self):
+        """Construct IconCache."""
+        self.hits = 0
+        self.misses = 0
+        self.__images: typing.Dict[IconKey, Image.Image] = {}
+        self.__atlas: typing.Optional[Image.Image] = None
+        self.__boxes: typing.Dict[IconKey, typing.Tuple[int, int, int, int]] = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of cached images."""
+        return len(self.__images)
+
+    def get(self, path: str, size: typing.Tuple[int, int] = ICON_SIZE) -> Image.Image:
+        """Get an icon, resized.
+
+        Args:
+            path (str): Icon file path.
+            size (typing.Tuple[int, int], optional): (width, height). Defaults to
+                ICON_SIZE.
+
+        Raises:
+            OSError: If the icon is not in the atlas and cannot be loaded.
+
+        Returns:
+            Image.Image: Icon image.
+        """
+        key = _key(path, size)
+        with self.__lock:
+            image = self.__images.get(key)
+            if image is not None:
+                self.hits += 1
+                return image
+            self.misses += 1
+            box = self.__boxes.get(key)
+            if self.__atlas is not None and box is not None:
+                image = self.__atlas.crop(box)
+            else:
+                with Image.open(path) as file:
+                    image = file.resize(key[1], Image.LANCZOS)
+            self.__images[key] = image
+            return image
+
+    def load_atlas(self, atlas_path: str) -> int:
+        """Load pre-sized icons from a packed atlas, see `pack_atlas()`.
+
+        Args:
+            atlas_path (str): Atlas PNG path, indexed by `<atlas_path>.json`.
+
+        Raises:
+            OSError: If the atlas cannot be loaded.
+            ValueError: If the atlas index is invalid.
+
+        Returns:
+            int: Number of icons in the atlas.
+        """
+        with open(atlas_path + ".json", encoding="utf-8") as file:
+            index = json.load(file)
+        boxes: typing.Dict[IconKey, typing.Tuple[int, int, int, int]] = {}
+        try:
+            if index["version"] != ATLAS_VERSION:
+                raise ValueError(f"Unsupported atlas version {index['version']!r}")
+            for icon in index["icons"]:
+                left, top, right, bottom = icon["box"]
+                boxes[_key(icon["path"], icon["size"])] = (left, top, right, bottom)
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"Invalid icon atlas index: {atlas_path}.json") from exc
+        with Image.open(atlas_path) as file:
+            atlas = file.copy()
+        with self.__lock:
+            self.__atlas = atlas
+            self.__boxes = boxes
+        logger.info("Loaded %d icons from atlas %s", len(boxes), atlas_path)
+        return len(boxes)
+
+    def clear(self):
+        """Clear the cached images and any atlas."""
+        with self.__lock:
+            self.__images.clear()
+            self.__atlas = None
+            self.__boxes = {}
+            self.hits = self.misses = 0
+
+
+ICONS = IconCache()
+
+
+def pack_atlas(
+    atlas_path: str,
+    paths: typing.Sequence[str],
+    sizes: typing.Sequence[typing.Tuple[int, int]] = (ICON_SIZE,),
+) -> int:
+    """Pack resized icons into an atlas PNG, with a JSON index.
+
+    Icons are packed in a row per size. Paths are indexed as given, so should
+    match the paths the icons are loaded with (e.g. relative to the app).
+
+    Args:
+        atlas_path (str): Atlas PNG path, the index is `<atlas_path>.json`.
+        paths (typing.Sequence[str]): Icon file paths.
+        sizes (typing.Sequence[typing.Tuple[int, int]], optional): Icon sizes
+            to pack. Defaults to (ICON_SIZE,).
+
+    Raises:
+        OSError: If an icon cannot be loaded or the atlas cannot be written.
+
+    Returns:
+        int: Number of icons packed.
+    """
+    width = max(w for w, _ in sizes) * len(paths)
+    height = sum(h for _, h in sizes)
+    atlas = Image.new("RGBA", (max(1, width), max(1, height)))
+    icons = []
+    y = 0
+    for w, h in sizes:
+        for i, path in enumerate(paths):
+            with Image.open(path) as file:
+                image = file.convert("RGBA").resize((w, h), Image.LANCZOS)
+            atlas.paste(image, (i * w, y))
+            icons.append(
+                {
+                    "path": os.path.normpath(path),
+                    "size": [w, h],
+                    "box": [i * w, y, i * w + w, y + h],
+                }
+            )
+        y += h
+    atlas.save(atlas_path, format="PNG", optimize=True)
+    with open(atlas_path + ".json", "w", encoding="utf-8") as file:
+        json.dump({"version": ATLAS_VERSION, "icons": icons}, file, indent=1)
+    return len(icons)
+
+
+def main(argv: typing.Optional[typing.List[str]] = None):
+    """Pack an icon atlas from the command line.
+
+    Args:
+        argv (typing.List[str], optional): Command line arguments. Defaults to
+            None (`sys.argv`).
+    """
+    parser = argparse.ArgumentParser(description="Pack an icon atlas.")
+    parser.add_argument("atlas", help="Atlas PNG path.")
+    parser.add_argument("icons", nargs="+", help="Icon file paths.")
+    parser.add_argument(
+        "--size",
+        type=int,
+        action="append",
+        help=f"Icon size in pixels, may be repeated. Defaults to {ICON_SIZE[0]}.",
+    )
+    args = parser.parse_args(argv)
+    sizes = [(size, size) for size in args.size or [ICON_SIZE[0]]]
+    count = pack_atlas(args.atlas, args.icons, sizes)
+    print(f"Packed {count} icons into {args.atlas}")
+
+
+if __name__ == "__main__":
+    main()
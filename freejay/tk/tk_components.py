@@ -5,7 +5,8 @@ import tkinter as tk
 import customtkinter as ctk
 from freejay.messages import messages as mes
 from freejay.messages import produce_consume as prodcon
-from PIL import Image
+from freejay.tk import icons
+from freejay.tk.dispatch import TkDispatcher
 
 
 class TkRoot(ctk.CTk, prodcon.Producer):
@@ -16,12 +17,37 @@ class TkRoot(ctk.CTk, prodcon.Producer):
 
     Attributes:
         +keybindings_active(bool): Are keyboard shortcuts (keybindings) active.
+        +dispatcher(TkDispatcher): Runs view updates from other threads on the
+            main loop.
     """
 
     def __init__(self):
         """Construct TKRoot Object."""
         ctk.CTk.__init__(self)
         self.keybindings_active = False
+        self.dispatcher = TkDispatcher(self)
+        self.__icons: typing.Dict[icons.IconKey, ctk.CTkImage] = {}
+
+    def icon(
+        self, path: str, size: typing.Tuple[int, int] = icons.ICON_SIZE
+    ) -> ctk.CTkImage:
+        """Get a button icon, shared by every widget using it.
+
+        Args:
+            path (str): Icon file path.
+            size (typing.Tuple[int, int], optional): (width, height). Defaults to
+                icons.ICON_SIZE.
+
+        Returns:
+            ctk.CTkImage: Icon image.
+        """
+        key = (path, size)
+        image = self.__icons.get(key)
+        if image is None:
+            image = self.__icons[key] = ctk.CTkImage(
+                icons.ICONS.get(path, size), size=size
+            )
+        return image
 
 
 class TkComponent:
@@ -172,8 +198,7 @@ class TkComponent:
         """
         # Use image if supplied
         if image_path:
-            image = Image.open(image_path).resize((20, 20), Image.LANCZOS)
-            photo_image = ctk.CTkImage(image)
+            photo_image = self.tkroot.icon(image_path)
         else:
             photo_image = None
 
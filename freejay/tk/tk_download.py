@@ -12,8 +12,9 @@ class TkDownload(TkComponent):
     """
     Download View.
 
-    Has a search bar, download button and label to show the
-    name of the most recently downloaded track.
+    Has a search bar, download and queue buttons, a label to show the
+    name of the most recently downloaded track, a label to show the crate and a
+    button to drop the crate tracks that failed to prefetch.
     """
 
     def __init__(
@@ -37,7 +38,7 @@ class TkDownload(TkComponent):
         # Configure Tk frame
         self.frame = ctk.CTkFrame(parent)
         self.frame.grid_rowconfigure((0, 1), weight=1)
-        self.frame.grid_columnconfigure((0, 1, 2, 3, 4), weight=1)
+        self.frame.grid_columnconfigure((0, 1, 2, 3, 4, 5), weight=1)
         self.frame.grid(padx=15, pady=15)
 
         # Create attributes to store file info
@@ -64,19 +65,38 @@ class TkDownload(TkComponent):
             master=self.frame, text="download", command=self.download_cb
         )
 
+        # Queue Button, adds the track to the crate
+        self.queue_btn = ctk.CTkButton(
+            master=self.frame, text="queue", command=self.queue_cb
+        )
+
         # Display file name
         self.file_name_lbl = ctk.CTkLabel(
             master=self.frame, textvariable=self.label_var
         )
 
+        # Display crate status
+        self.crate_var = ctk.StringVar(master=self.frame, value="")
+        self.crate_lbl = ctk.CTkLabel(master=self.frame, textvariable=self.crate_var)
+        self.drop_failed_btn = self.make_button(
+            parent=self.frame,
+            row=1,
+            column=5,
+            component=self.component,
+            element=mes.Element.CRATE,
+            text="drop failed",
+        )
+
         # Arrange Tk elements
         self.download_entry.grid(
             row=0, column=0, columnspan=4, padx=5, pady=5, sticky=(tk.E, tk.W)
         )
         self.download_btn.grid(row=0, column=4, padx=5, pady=5, sticky=(tk.E, tk.W))
+        self.queue_btn.grid(row=0, column=5, padx=5, pady=5, sticky=(tk.E, tk.W))
         self.file_name_lbl.grid(
-            row=1, column=0, columnspan=5, padx=5, pady=5, sticky=(tk.E, tk.W)
+            row=1, column=0, columnspan=4, padx=5, pady=5, sticky=(tk.E, tk.W)
         )
+        self.crate_lbl.grid(row=1, column=4, padx=5, pady=5, sticky=(tk.E, tk.W))
 
     @property
     def file_path(self):
@@ -90,6 +110,55 @@ class TkDownload(TkComponent):
         self.__file_name = pathlib.Path(value).stem
         self.label_var.set(f"Track ready: {self.__file_name}")
 
+    def show_progress(
+        self,
+        bytes: int,
+        total: int,
+        rate: float,
+        eta: typing.Optional[float] = None,
+        **kwargs,
+    ):
+        """Show download progress.
+
+        Args:
+            bytes (int): Bytes downloaded.
+            total (int): Total bytes, 0 if unknown.
+            rate (float): Download rate in bytes per second.
+            eta (float, optional): Estimated seconds remaining. Defaults to None.
+            **kwargs: Other message data, ignored.
+        """
+        text = f"Downloading... {bytes / 1e6:.1f} MB"
+        if total:
+            text += f" ({100 * bytes / total:.0f}%)"
+        text += f", {rate / 1e6:.1f} MB/s"
+        if eta is not None:
+            text += f", {eta:.0f}s left"
+        self.label_var.set(text)
+
+    def show_crate(self, ready: int, waiting: int, failed: int = 0, **kwargs):
+        """Show the crate status.
+
+        Args:
+            ready (int): Number of tracks ready to load.
+            waiting (int): Number of tracks waiting to be prefetched.
+            failed (int, optional): Number of tracks that failed. Defaults to 0.
+            **kwargs: Other message data, ignored.
+        """
+        text = f"Crate: {ready} ready, {waiting} waiting"
+        if failed:
+            text += f", {failed} failed"
+        self.crate_var.set(text)
+
+    def queue_cb(self):
+        """Queue callback, adds the entered URL to the crate."""
+        self.entry_send(
+            component=self.component,
+            element=mes.Element.DOWNLOAD,
+            data={"url": self.download_entry.get(), "queue": True},
+        )
+        self.download_entry.delete(0, tk.END)
+        self.tkroot.focus_set()
+
     def download_cb(self):
         """Download callback."""
         self.entry_send(
@@ -68,6 +68,19 @@ class TkCrossfader(TkComponent):
             self.__position = value
             self.send_message(self.make_message(value))
 
+    def update_state(self, crossfader: float):
+        """Move the slider to the model crossfader position.
+
+        E.g. when moved by a hardware controller. The position is not sent back
+        to the controller.
+
+        Args:
+            crossfader (float): xfader position.
+        """
+        if crossfader != self.__position:
+            self.__position = crossfader
+            self.crossfader_slider.set(crossfader)
+
     def slider_cb(self, value: float):
         """Slider Callback.
 
@@ -97,3 +110,120 @@ class TkCrossfader(TkComponent):
             ),
         )
         return msg
+
+
+class TkChannelStrip(TkComponent):
+    """Tk widget for a mixer channel: EQ, filter, channel fader and assignment."""
+
+    # (element, label, minimum, maximum, initial) for each channel slider.
+    sliders = (
+        (mes.Element.EQ_HIGH, "HI", -26.0, 6.0, 0.0),
+        (mes.Element.EQ_MID, "MID", -26.0, 6.0, 0.0),
+        (mes.Element.EQ_LOW, "LOW", -26.0, 6.0, 0.0),
+        (mes.Element.FILTER, "FILTER", -1.0, 1.0, 0.0),
+        (mes.Element.CHANNEL_FADER, "LEVEL", 0.0, 1.0, 1.0),
+    )
+
+    def __init__(
+        self,
+        tkroot: TkRoot,
+        parent: typing.Any,
+        source: mes.Source,
+        component: mes.Component,
+        name: str = "",
+        assign: str = "THRU",
+    ):
+        """Construct channel strip Tk widget.
+
+        Args:
+            tkroot (TkRoot): root tk widget
+            parent (typing.Any): parent Tk widget
+            source (mes.Source): source used for messages.
+            component (mes.Component): component (deck) used for messages.
+            name (str, optional): channel name to display. Defaults to "".
+            assign (str, optional): initial crossfader assignment ('A', 'B' or
+                'THRU'). Defaults to "THRU".
+        """
+        super().__init__(tkroot=tkroot, parent=parent, source=source)
+        self.component = component
+        self.__values: typing.Dict[mes.Element, typing.Any] = dict()
+
+        # Configure Tk frame
+        self.frame = ctk.CTkFrame(parent)
+        self.frame.grid_rowconfigure((0, 1, 2, 3), weight=1)
+        self.frame.grid_columnconfigure(tuple(range(len(self.sliders))), weight=1)
+        self.frame.grid(padx=5, pady=5)
+
+        self.name_lbl = ctk.CTkLabel(master=self.frame, text=name)
+        self.name_lbl.grid(row=0, column=0, columnspan=len(self.sliders))
+
+        self.channel_sliders: typing.Dict[mes.Element, ctk.CTkSlider] = dict()
+        for column, (element, text, minimum, maximum, initial) in enumerate(
+            self.sliders
+        ):
+            self.__values[element] = initial
+            slider = ctk.CTkSlider(
+                master=self.frame,
+                from_=minimum,
+                to=maximum,
+                orientation="vertical",
+                width=16,
+                height=80,
+                command=lambda value, element=element: self.value_cb(
+                    element, {"value": value}
+                ),
+            )
+            slider.set(initial)
+            label = ctk.CTkLabel(master=self.frame, text=text)
+            slider.grid(row=1, column=column, padx=2, pady=5)
+            label.grid(row=2, column=column, padx=2)
+            self.channel_sliders[element] = slider
+
+        # Crossfader assignment
+        self.__values[mes.Element.XF_ASSIGN] = assign
+        self.assign_btn = ctk.CTkSegmentedButton(
+            master=self.frame,
+            values=["A", "THRU", "B"],
+            command=lambda value: self.value_cb(
+                mes.Element.XF_ASSIGN, {"assign": value}
+            ),
+        )
+        self.assign_btn.set(assign)
+        self.assign_btn.grid(row=3, column=0, columnspan=len(self.sliders), pady=5)
+
+    def value_cb(self, element: mes.Element, data: typing.Dict):
+        """Channel control callback.
+
+        When a control value has changed, a message is sent to the controller.
+
+        Args:
+            element (mes.Element): element of the control.
+            data (typing.Dict): message data, a single item dictionary holding the
+                control value.
+        """
+        (value,) = data.values()
+        if value != self.__values[element]:
+            self.__values[element] = value
+            self.send_message(self.make_message(element, data))
+
+    def make_message(
+        self, element: mes.Element, data: typing.Dict
+    ) -> mes.Message[mes.Data]:
+        """Construct a message to send to the controller.
+
+        Args:
+            element (mes.Element): channel element.
+            data (typing.Dict): message data.
+
+        Returns:
+            mes.Message[mes.Data]: Data Message to send.
+        """
+        msg = mes.Message(
+            sender=mes.Sender(source=self.source, trigger=mes.Trigger.SLIDER),
+            content=mes.Data(
+                component=self.component,
+                element=element,
+                data=data,
+            ),
+        )
+        return msg
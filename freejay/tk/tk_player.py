@@ -26,7 +26,7 @@ class TkDeckPlayControls(TkComponent):
             tkroot (TkRoot): Top-level Tk widget.
             parent: Parent Tk widget.
             source (mes.Source): Message source.
-            component (mes.Component): Message Component (LEFT_DECK or RIGHT_DECK)
+            component (mes.Component): Message Component (e.g. LEFT_DECK)
         """
         super().__init__(tkroot=tkroot, parent=parent, source=source)
         self.component = component
@@ -124,12 +124,12 @@ class TkDeckPitchControls(TkComponent):
             tkroot (TkRoot): Top-level Tk widget.
             parent: Parent Tk widget.
             source (mes.Source): Message source.
-            component (mes.Component): Message Component (LEFT_DECK or RIGHT_DECK)
+            component (mes.Component): Message Component (e.g. LEFT_DECK)
         """
         super().__init__(tkroot=tkroot, parent=parent, source=source)
         self.component = component
         self.frame = ctk.CTkFrame(parent)
-        self.frame.grid_rowconfigure((0, 1), weight=1)
+        self.frame.grid_rowconfigure((0, 1, 2), weight=1)
         self.frame.grid_columnconfigure((0, 1), weight=1)
         self.frame.grid(padx=30, pady=15)
 
@@ -164,17 +164,31 @@ class TkDeckPitchControls(TkComponent):
             placeholder_text="Pitch %",
         )
 
+        self.bpm_entry = self.make_entry(
+            parent=self.frame,
+            component=self.component,
+            element=mes.Element.BPM,
+            data_callback=lambda x: {"value": float(x) if x else None},
+            drop_focus=True,
+            placeholder_text="BPM",
+        )
+
         # Arrange Tk elements
         self.speed_entry.grid(
             row=1, column=0, columnspan=2, padx=5, pady=5, sticky=(tk.E, tk.W)
         )
+        self.bpm_entry.grid(
+            row=2, column=0, columnspan=2, padx=5, pady=5, sticky=(tk.E, tk.W)
+        )
 
 
 class TkDeckFileControls(TkComponent):
     """
     Deck file controls frame.
 
-    Currently a simple 'load' button to load the most recently downloaded track.
+    Has a 'load' button to load the most recently downloaded track, a 'master'
+    button to make the deck the master clock reference and a 'loop' button to
+    start/stop a four beat loop on the next beat.
     """
 
     def __init__(
@@ -192,7 +206,7 @@ class TkDeckFileControls(TkComponent):
             tkroot (TkRoot): Top-level Tk widget.
             parent: Parent Tk widget.
             source (mes.Source): Message source.
-            component (mes.Component): Message Component (LEFT_DECK or RIGHT_DECK)
+            component (mes.Component): Message Component (e.g. LEFT_DECK)
         """
         super().__init__(tkroot=tkroot, parent=parent, source=source)
         self.component = component
@@ -210,6 +224,151 @@ class TkDeckFileControls(TkComponent):
             image_path=os.path.join("assets", "icons", "icons8-insert-96.png"),
         )
 
+        self.master_btn = self.make_button(
+            parent=self.frame,
+            row=0,
+            column=0,
+            component=self.component,
+            element=mes.Element.MASTER,
+            text="MASTER",
+            text_color="black",
+        )
+
+        self.loop_btn = self.make_button(
+            parent=self.frame,
+            row=1,
+            column=0,
+            component=self.component,
+            element=mes.Element.LOOP,
+            data_press={"beats": 4, "quantise": "beat"},
+            text="LOOP",
+            text_color="black",
+        )
+
+
+def format_time(seconds: float) -> str:
+    """Format a track time as minutes and seconds, e.g. '-3:05.2'.
+
+    Args:
+        seconds (float): Time in seconds.
+
+    Returns:
+        str: Formatted time.
+    """
+    sign = "-" if seconds < 0 else ""
+    minutes, seconds = divmod(round(abs(seconds), 1), 60)
+    return f"{sign}{minutes:.0f}:{seconds:04.1f}"
+
+
+def format_pitch(speed: float, bpm: typing.Optional[float]) -> str:
+    """Format the pitch as a percentage, with the playing tempo if known.
+
+    Args:
+        speed (float): Playback speed.
+        bpm (float | None): Track tempo.
+
+    Returns:
+        str: Formatted pitch, e.g. '+2.50% 123.0 BPM'.
+    """
+    pitch = f"{(speed - 1) * 100:+.2f}%"
+    return f"{pitch} {bpm * speed:.1f} BPM" if bpm else pitch
+
+
+class TkDeckStatus(TkComponent):
+    """
+    Deck status frame.
+
+    Shows the loaded track, the time position and remaining time, the pitch
+    and the channel level, as published by the model's state pump.
+    """
+
+    # Fields each label is formatted from.
+    labels = {
+        "track": ("filename",),
+        "time": ("position", "duration"),
+        "pitch": ("speed", "bpm"),
+        "level": ("level",),
+    }
+
+    def __init__(
+        self,
+        tkroot: TkRoot,
+        parent: typing.Any,
+        source: mes.Source,
+        component: mes.Component,
+    ):
+        """Construct TkDeckStatus.
+
+        Note: this is intended to be created by TkDeck.
+
+        Args:
+            tkroot (TkRoot): Top-level Tk widget.
+            parent: Parent Tk widget.
+            source (mes.Source): Message source.
+            component (mes.Component): Message Component (e.g. LEFT_DECK)
+        """
+        super().__init__(tkroot=tkroot, parent=parent, source=source)
+        self.component = component
+        self.__state: typing.Dict[str, typing.Any] = {
+            "filename": "",
+            "position": 0.0,
+            "duration": 0.0,
+            "speed": 1.0,
+            "bpm": None,
+            "level": 0.0,
+        }
+        self.frame = ctk.CTkFrame(parent)
+        self.frame.grid_columnconfigure((0, 1, 2), weight=1)
+
+        self.label_vars: typing.Dict[str, ctk.StringVar] = {
+            name: ctk.StringVar(master=self.frame, value=self.format(name))
+            for name in self.labels
+        }
+        ctk.CTkLabel(master=self.frame, textvariable=self.label_vars["track"]).grid(
+            row=0, column=0, columnspan=3, padx=5, sticky=tk.W
+        )
+        for column, name in enumerate(("time", "pitch", "level")):
+            ctk.CTkLabel(master=self.frame, textvariable=self.label_vars[name]).grid(
+                row=1, column=column, padx=5
+            )
+
+    def format(self, label: str) -> str:
+        """Format a label from the current state.
+
+        Args:
+            label (str): Label name, see `labels`.
+
+        Returns:
+            str: Label text.
+        """
+        state = self.__state
+        if label == "track":
+            return os.path.basename(state["filename"]) or "No track loaded"
+        if label == "time":
+            return (
+                f"{format_time(state['position'])}"
+                f"  {format_time(state['position'] - state['duration'])}"
+            )
+        if label == "pitch":
+            return format_pitch(state["speed"], state["bpm"])
+        return f"LVL {state['level'] * 100:.0f}%"
+
+    def update_state(self, **fields):
+        """Update the labels formatted from changed state fields.
+
+        Labels are only set when their text changes, so that Tk only redraws
+        what has changed.
+
+        Args:
+            **fields: Changed deck state fields, see `state.DeckState`.
+        """
+        self.__state.update(fields)
+        for name, depends in self.labels.items():
+            if not fields.keys().isdisjoint(depends):
+                text = self.format(name)
+                if text != self.label_vars[name].get():
+                    self.label_vars[name].set(text)
+
 
 class TkDeck(TkComponent):
     """Deck (player) frame."""
@@ -227,12 +386,12 @@ class TkDeck(TkComponent):
             tkroot (TkRoot): Top-level Tk widget.
             parent: Parent Tk widget.
             source (mes.Source): Message source.
-            component (mes.Component): Message Component (LEFT_DECK or RIGHT_DECK)
+            component (mes.Component): Message Component (e.g. LEFT_DECK)
         """
         super().__init__(tkroot=tkroot, parent=parent, source=source)
         self.component = component
         self.frame = ctk.CTkFrame(parent)
-        self.frame.grid_rowconfigure((0, 1), weight=1)
+        self.frame.grid_rowconfigure((0, 1, 2), weight=1)
         self.frame.grid_columnconfigure((0, 1), weight=1)
         self.frame.grid(padx=15, pady=15)
         self.play_controls = TkDeckPlayControls(
@@ -244,7 +403,11 @@ class TkDeck(TkComponent):
         self.file_controls = TkDeckFileControls(
             tkroot=tkroot, parent=self.frame, source=source, component=component
         )
+        self.status = TkDeckStatus(
+            tkroot=tkroot, parent=self.frame, source=source, component=component
+        )
 
+        self.status.frame.grid(row=2, column=0, columnspan=2, sticky="ew")
         self.play_controls.frame.grid(row=1, column=0, columnspan=2, sticky="W")
         self.pitch_controls.frame.grid(row=0, column=0, sticky="W")
         self.file_controls.frame.grid(row=0, column=1, sticky="ew")
@@ -0,0 +1,71 @@
+"""Tkinter components for the master mix recorder."""
+
+import typing
+import tkinter as tk
+import customtkinter as ctk
+from freejay.messages import messages as mes
+from .tk_components import TkComponent, TkRoot
+
+
+class TkRecorder(TkComponent):
+    """
+    Recorder View.
+
+    Has a record button and a label to show the recording status.
+    """
+
+    def __init__(
+        self,
+        tkroot: TkRoot,
+        parent: typing.Any,
+        source: mes.Source,
+        component: mes.Component,
+    ):
+        """Construct TkRecorder.
+
+        Args:
+            tkroot (TkRoot): Top-level Tk widget.
+            parent: Parent Tk widget.
+            source (mes.Source): Message source.
+            component (mes.Component): Message Component.
+        """
+        super().__init__(tkroot=tkroot, parent=parent, source=source)
+        self.component = component
+
+        # Configure Tk frame
+        self.frame = ctk.CTkFrame(parent)
+        self.frame.grid_rowconfigure(0, weight=1)
+        self.frame.grid_columnconfigure((0, 1), weight=1)
+
+        # Store the recording status
+        self.label_var = ctk.StringVar(master=self.frame, value="")
+
+        # Tk elements
+        self.record_btn = self.make_button(
+            parent=self.frame,
+            row=0,
+            column=0,
+            component=self.component,
+            element=mes.Element.RECORD,
+            text="REC",
+        )
+        self.status_lbl = ctk.CTkLabel(master=self.frame, textvariable=self.label_var)
+        self.status_lbl.grid(row=0, column=1, padx=5, pady=5, sticky=(tk.E, tk.W))
+
+    def update_status(self, status: str, **stats):
+        """Show the recording status.
+
+        Args:
+            status (str): 'recording', 'stopped' or 'failed'.
+            **stats: Recording statistics, see `recorder.RecorderStats`.
+        """
+        if status == "recording":
+            self.label_var.set("Recording...")
+        elif status == "stopped":
+            seconds = stats.get("frames_written", 0) / stats.get("rate", 44100)
+            self.label_var.set(
+                f"Recorded {seconds:.0f}s, dropped {stats.get('dropped_frames', 0)}"
+                " frames"
+            )
+        elif status == "failed":
+            self.label_var.set("Recording failed.")
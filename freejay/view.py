@@ -1,11 +1,20 @@
 """Application View."""
 
+import os
+import time
+import typing
+import logging
 import customtkinter as ctk
+from freejay.tk import icons
 from freejay.tk import tk_components
 from freejay.tk import tk_player
 from freejay.tk import tk_download
 from freejay.tk import tk_mixer
+from freejay.tk import tk_recorder
 from freejay.messages import messages as mes
+from freejay.channels import CHANNELS
+
+logger = logging.getLogger(__name__)
 
 
 class View:
@@ -22,26 +31,43 @@ class View:
             self.tkroot, parent=self.tkroot, source=mes.Source.MAIN_WINDOW
         )
 
-        self.left_deck = tk_player.TkDeck(
-            tkroot=self.tkroot,
-            parent=self.tkmain.frame,
-            source=mes.Source.PLAYER_VIEW,
-            component=mes.Component.LEFT_DECK,
-        )
-        self.right_deck = tk_player.TkDeck(
-            tkroot=self.tkroot,
-            parent=self.tkmain.frame,
-            source=mes.Source.PLAYER_VIEW,
-            component=mes.Component.RIGHT_DECK,
-        )
+        self.decks: typing.Dict[mes.Component, tk_player.TkDeck] = {
+            spec.component: tk_player.TkDeck(
+                tkroot=self.tkroot,
+                parent=self.tkmain.frame,
+                source=mes.Source.PLAYER_VIEW,
+                component=spec.component,
+            )
+            for spec in CHANNELS
+        }
+
+        self.mixer_frame = ctk.CTkFrame(self.tkmain.frame)
+        self.channel_strips: typing.Dict[mes.Component, tk_mixer.TkChannelStrip] = {
+            spec.component: tk_mixer.TkChannelStrip(
+                tkroot=self.tkroot,
+                parent=self.mixer_frame,
+                source=mes.Source.MIXER,
+                component=spec.component,
+                name=spec.name,
+                assign=spec.assign,
+            )
+            for spec in CHANNELS
+        }
 
         self.mixer = tk_mixer.TkCrossfader(
             tkroot=self.tkroot,
-            parent=self.tkmain.frame,
+            parent=self.mixer_frame,
             source=mes.Source.MIXER,
             component=mes.Component.MIXER,
         )
 
+        self.recorder = tk_recorder.TkRecorder(
+            tkroot=self.tkroot,
+            parent=self.mixer_frame,
+            source=mes.Source.RECORDER_VIEW,
+            component=mes.Component.RECORDER,
+        )
+
         self.download = tk_download.TkDownload(
             tkroot=self.tkroot,
             parent=self.tkmain.frame,
@@ -50,13 +76,24 @@ class View:
         )
 
 
-def make_view() -> View:
+def make_view(icon_atlas: typing.Optional[str] = None) -> View:
     """
     Construct and Configure the View.
 
+    Args:
+        icon_atlas (str, optional): Packed icon atlas path (see
+            `icons.pack_atlas()`). Defaults to None (icons.ICON_ATLAS if it
+            exists, otherwise icons are loaded from their files).
+
     Returns:
         View: View
     """
+    start = time.perf_counter()
+    if icon_atlas is None and os.path.exists(icons.ICON_ATLAS):
+        icon_atlas = icons.ICON_ATLAS
+    if icon_atlas is not None:
+        icons.ICONS.load_atlas(icon_atlas)
+
     # CTk settings
     ctk.set_appearance_mode("System")
     ctk.set_default_color_theme("blue")
@@ -65,15 +102,33 @@ def make_view() -> View:
     view = View()
 
     # Configure layout
-    view.tkroot.geometry("1200x300")
+    # Decks are arranged in two columns, followed by the mixer.
+    deck_rows = (len(view.decks) + 1) // 2
+    view.tkroot.geometry(f"1200x{200 * deck_rows + 400}")
     view.tkroot.grid_rowconfigure(0, weight=1)
     view.tkroot.grid_columnconfigure(0, weight=1)
     view.tkmain.frame.grid(row=0, column=0)
-    view.tkmain.frame.grid_rowconfigure((0, 1, 2), weight=1)
+    view.tkmain.frame.grid_rowconfigure(tuple(range(deck_rows + 2)), weight=1)
     view.tkmain.frame.grid_columnconfigure((0, 1), weight=1)
     view.download.frame.grid(row=0, column=0, columnspan=2, sticky="ew")
-    view.left_deck.frame.grid(row=1, column=0, sticky="w")
-    view.right_deck.frame.grid(row=1, column=1, sticky="e")
-    view.mixer.frame.grid(row=2, column=0, columnspan=2)
+    for i, deck in enumerate(view.decks.values()):
+        deck.frame.grid(row=1 + i // 2, column=i % 2, sticky=("w", "e")[i % 2])
+
+    view.mixer_frame.grid(row=deck_rows + 1, column=0, columnspan=2)
+    view.mixer_frame.grid_columnconfigure(
+        tuple(range(len(view.channel_strips))), weight=1
+    )
+    for i, strip in enumerate(view.channel_strips.values()):
+        strip.frame.grid(row=0, column=i)
+    view.mixer.frame.grid(row=1, column=0, columnspan=len(view.channel_strips))
+    view.recorder.frame.grid(row=2, column=0, columnspan=len(view.channel_strips))
+
+    # Run view updates from the view worker on the main loop.
+    view.tkroot.dispatcher.start()
 
+    logger.info(
+        "View built in %.1f ms, %d icons loaded",
+        (time.perf_counter() - start) * 1000,
+        icons.ICONS.misses,
+    )
     return view
@@ -0,0 +1,90 @@
+import re
+import time
+import threading
+import http.server
+import pytest
+from freejay.audio_download.backend import LocalBackend
+
+CHUNK_SIZE = 4096
+
+
+def content(size):
+    """Get the bytes served by the local HTTP server."""
+    return (bytes(range(256)) * (size // 256 + 1))[:size]
+
+
+# Local HTTP stand-in for the download source. Serves `content(size)` for any
+# path after `latency` seconds, supports range requests, and counts requests per
+# path. The first `drops` responses are cut off after `drop_after` bytes.
+@pytest.fixture
+def http_server_f():
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            server = self.server
+            with server.lock:
+                server.requests[self.path] = server.requests.get(self.path, 0) + 1
+                server.ranges.append(self.headers.get("Range"))
+                drop = server.drops > 0
+                server.drops -= drop
+            time.sleep(server.latency)
+            start = 0
+            match = re.match(r"bytes=(\d+)-$", self.headers.get("Range") or "")
+            if match and server.etag in (None, self.headers.get("If-Range")):
+                start = int(match.group(1))
+                if start >= server.size:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{server.size}")
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header(
+                    "Content-Range", f"bytes {start}-{server.size - 1}/{server.size}"
+                )
+            else:
+                self.send_response(200)
+            if server.etag:
+                self.send_header("ETag", server.etag)
+            self.send_header("Content-Length", str(server.size - start))
+            self.end_headers()
+            # Send in chunks, `chunk_delay` seconds apart (for slow downloads).
+            data = content(server.size)
+            end = server.size
+            if drop:
+                end = min(end, start + server.drop_after)
+            for i in range(start, end, server.chunk_size):
+                self.wfile.write(data[i : min(i + server.chunk_size, end)])
+                time.sleep(server.chunk_delay)
+            if drop:
+                self.close_connection = True
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = dict()
+    server.ranges = []
+    server.latency = 0.0
+    server.size = 1024
+    server.chunk_size = 65536
+    server.chunk_delay = 0.0
+    server.drops = 0
+    server.drop_after = 0
+    server.etag = None
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+# Offline download backend, for local files and the local HTTP server.
+@pytest.fixture
+def local_backend_f(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    return LocalBackend(root=str(source), chunk_size=CHUNK_SIZE)
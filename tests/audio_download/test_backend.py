@@ -0,0 +1,118 @@
+import os
+import time
+from unittest import mock
+import pytest
+from freejay.audio_download.backend import DownloadError, Stream
+from pytube.exceptions import VideoUnavailable, RegexMatchError
+from freejay.audio_download.ytrip import PytubeBackend
+
+
+@pytest.fixture
+def source_f(local_backend_f, tmp_path):
+    path = tmp_path / "source" / "my track.mp3"
+    path.write_bytes(os.urandom(100_000))
+    return path
+
+
+def test_local_resolve(local_backend_f, source_f):
+    stream = local_backend_f.resolve("my track.mp3")
+    assert stream.filename == "my track.mp3"
+    assert stream.size == 100_000
+    assert stream.title == "my track"
+    assert local_backend_f.resolve(f"file://{source_f}").size == 100_000
+    assert local_backend_f.resolve("file:my%20track.mp3").handle == str(source_f)
+
+
+def test_local_resolve_missing(local_backend_f):
+    with pytest.raises(FileNotFoundError):
+        local_backend_f.resolve("missing.mp3")
+
+
+def test_local_download(local_backend_f, source_f, tmp_path):
+    progress = mock.Mock()
+    stream = local_backend_f.resolve("my track.mp3")
+    file_path = local_backend_f.download(stream, str(tmp_path), progress=progress)
+    assert file_path == str(tmp_path / "my track.mp3")
+    with open(file_path, "rb") as file:
+        assert file.read() == source_f.read_bytes()
+    progress.assert_called_with(100_000, 100_000)
+
+
+def test_local_download_latency_bandwidth(local_backend_f, source_f, tmp_path):
+    local_backend_f.latency = 0.1
+    local_backend_f.bandwidth = 500_000
+    stream = local_backend_f.resolve("my track.mp3")
+    start = time.perf_counter()
+    local_backend_f.download(stream, str(tmp_path))
+    elapsed = time.perf_counter() - start
+    # 100 ms latency, then 100 kB at 500 kB/s.
+    assert 0.3 <= elapsed < 0.5
+
+
+def test_local_http(local_backend_f, http_server_f, tmp_path):
+    http_server_f.size = 10_000
+    progress = mock.Mock()
+    stream = local_backend_f.resolve(f"{http_server_f.url}/a%20b.mp3")
+    assert stream.filename == "a b.mp3"
+    file_path = local_backend_f.download(stream, str(tmp_path), progress=progress)
+    assert os.path.getsize(file_path) == 10_000
+    progress.assert_called_with(10_000, 10_000)
+
+
+def test_local_metadata(local_backend_f, source_f):
+    assert local_backend_f.metadata("my track.mp3") == {
+        "title": "my track",
+        "size": 100_000,
+    }
+
+
+def test_pytube_backend(mocker):
+    m_youtube_c = mocker.patch("pytube.YouTube", autospec=True)
+    m_download = mocker.patch(
+        "freejay.audio_download.ytrip.download_resumable",
+        side_effect=lambda u, f, **k: f,
+    )
+    audio = m_youtube_c.return_value.streams.get_audio_only.return_value
+    audio.default_filename = "track.mp4"
+    backend = PytubeBackend()
+    stream = backend.resolve("some_link")
+    assert stream == Stream(url="some_link", filename="track.mp4", handle=audio)
+    file_path = os.path.join("some_dir", "track.mp4")
+    assert backend.download(stream, "some_dir") == file_path
+    m_download.assert_called_once_with(audio.url, file_path, progress=None)
+
+
+def test_pytube_backend_unavailable(mocker):
+    m_youtube_c = mocker.patch("pytube.YouTube", autospec=True)
+    m_download = mocker.patch("freejay.audio_download.ytrip.download_resumable")
+    audio = m_youtube_c.return_value.streams.get_audio_only.return_value
+    audio.default_filename = "Video Not Available.mp4"
+    backend = PytubeBackend()
+    with pytest.raises(DownloadError, match="Video unavailable") as e_info:
+        backend.download(backend.resolve("some_link"), "some_dir")
+    assert isinstance(e_info.value.__cause__, VideoUnavailable)
+    m_download.assert_not_called()
+
+
+def test_pytube_backend_errors(mocker):
+    m_youtube_c = mocker.patch("pytube.YouTube", autospec=True)
+    m_youtube_c.side_effect = RegexMatchError("caller", "pattern")
+    backend = PytubeBackend()
+    with pytest.raises(DownloadError, match="Not recognised as a valid link"):
+        backend.resolve("some_link")
+    m_youtube_c.side_effect = None
+    m_youtube_c.return_value.streams.get_audio_only.return_value = None
+    with pytest.raises(DownloadError, match="No audio stream"):
+        backend.resolve("some_link")
+
+
+def test_pytube_metadata(mocker):
+    m_youtube_c = mocker.patch("pytube.YouTube", autospec=True)
+    m_youtube_c.return_value.title = "title"
+    m_youtube_c.return_value.author = "author"
+    m_youtube_c.return_value.length = 180
+    assert PytubeBackend().metadata("some_link") == {
+        "title": "title",
+        "author": "author",
+        "length": 180,
+    }
@@ -0,0 +1,165 @@
+import os
+import pytest
+from unittest import mock
+from freejay.audio_download import cache
+from freejay.controller_cb.player_cb import make_load_callback
+from freejay.messages import messages as mes
+
+VID = "dQw4w9WgXcQ"
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        f"https://www.youtube.com/watch?v={VID}",
+        f"https://youtube.com/watch?v={VID}&t=42s",
+        f"https://m.youtube.com/watch?feature=share&v={VID}",
+        f"https://music.youtube.com/watch?v={VID}",
+        f"https://youtu.be/{VID}",
+        f"https://youtu.be/{VID}?si=abc",
+        f"https://www.youtube.com/shorts/{VID}",
+        f"https://www.youtube.com/embed/{VID}",
+        f"  https://www.youtube.com/watch?v={VID}  ",
+    ],
+)
+def test_video_id(url):
+    assert cache.video_id(url) == VID
+    assert cache.cache_key(url) == f"yt-{VID}"
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.youtube.com/watch?v=short",
+        "https://www.youtube.com/channel/abc",
+        "https://example.com/watch?v=dQw4w9WgXcQ",
+        "not a url",
+    ],
+)
+def test_not_video_id(url):
+    assert cache.video_id(url) is None
+    assert cache.cache_key(url).startswith("url-")
+
+
+def make_file(download_cache, key, size):
+    file_path = os.path.join(download_cache.path_for(key), f"{key}.mp3")
+    with open(file_path, "wb") as f:
+        f.write(bytes(size))
+    return file_path
+
+
+@pytest.fixture
+def cache_f(tmp_path):
+    return cache.DownloadCache(directory=str(tmp_path), max_bytes=300)
+
+
+def test_get_put(cache_f):
+    assert cache_f.get("a") is None
+    file_path = make_file(cache_f, "a", 100)
+    cache_f.put("a", file_path)
+    assert cache_f.get("a") == file_path
+    assert cache_f.size == 100
+
+
+def test_evict_least_recently_used(cache_f):
+    paths = {key: make_file(cache_f, key, 100) for key in "abc"}
+    for key in "abc":
+        cache_f.put(key, paths[key])
+    cache_f.get("a")
+    cache_f.put("d", make_file(cache_f, "d", 100))
+    assert cache_f.get("b") is None
+    assert not os.path.exists(paths["b"])
+    assert cache_f.get("a") == paths["a"]
+    assert cache_f.size == 300
+
+
+def test_pinned_not_evicted(cache_f):
+    paths = {key: make_file(cache_f, key, 100) for key in "abc"}
+    for key in "abc":
+        cache_f.put(key, paths[key])
+    cache_f.pin(paths["a"])
+    cache_f.pin(paths["a"])
+    cache_f.unpin(paths["a"])
+    cache_f.put("d", make_file(cache_f, "d", 100))
+    assert os.path.exists(paths["a"])
+    assert not os.path.exists(paths["b"])
+
+    # Least recently used once unpinned.
+    cache_f.unpin(paths["a"])
+    cache_f.put("e", make_file(cache_f, "e", 100))
+    assert not os.path.exists(paths["a"])
+    assert os.path.exists(paths["c"])
+
+
+def test_large_file_kept(cache_f):
+    file_path = make_file(cache_f, "a", 1000)
+    cache_f.put("a", file_path)
+    assert cache_f.get("a") == file_path
+
+
+def test_index_persists(cache_f, tmp_path):
+    file_path = make_file(cache_f, "a", 100)
+    cache_f.put("a", file_path)
+    cache_f.put("b", make_file(cache_f, "b", 100))
+    os.remove(cache_f.get("b"))
+    reloaded = cache.DownloadCache(directory=str(tmp_path), max_bytes=300)
+    assert len(reloaded) == 1
+    assert reloaded.get("a") == file_path
+
+
+def test_lookup_order_saved_on_flush(cache_f, tmp_path):
+    for key in "ab":
+        cache_f.put(key, make_file(cache_f, key, 100))
+    index = (tmp_path / cache.INDEX_FILE).read_text()
+    # Lookups do not write the index.
+    cache_f.get("a")
+    assert (tmp_path / cache.INDEX_FILE).read_text() == index
+    cache_f.flush()
+    reloaded = cache.DownloadCache(directory=str(tmp_path), max_bytes=200)
+    reloaded.put("c", make_file(reloaded, "c", 100))
+    assert reloaded.get("a") is not None
+    assert reloaded.get("b") is None
+
+
+def test_missing_file_dropped(cache_f, caplog):
+    file_path = make_file(cache_f, "a", 100)
+    cache_f.put("a", file_path)
+    os.remove(file_path)
+    assert cache_f.get("a") is None
+    assert len(cache_f) == 0
+
+
+def test_corrupt_index_ignored(tmp_path, caplog):
+    (tmp_path / cache.INDEX_FILE).write_text("{")
+    assert len(cache.DownloadCache(directory=str(tmp_path))) == 0
+    assert "Could not read cache index" in caplog.text
+
+
+def test_deck_load_pins(cache_f):
+    player = mock.Mock(filename="")
+    player.load.side_effect = lambda filename: not setattr(player, "filename", filename)
+    manager = mock.Mock(cache=cache_f)
+    callback = make_load_callback(player, manager)
+    message = mes.Message(
+        sender=mes.Sender(source=mes.Source.PLAYER_VIEW, trigger=mes.Trigger.BUTTON),
+        content=mes.Button(
+            press_release=mes.PressRelease.PRESS,
+            component=mes.Component.LEFT_DECK,
+            element=mes.Element.LOAD,
+        ),
+    )
+    paths = {key: make_file(cache_f, key, 100) for key in "abc"}
+    for key in "abc":
+        cache_f.put(key, paths[key])
+
+    manager.current = paths["a"]
+    callback(message)
+    cache_f.put("d", make_file(cache_f, "d", 100))
+    assert os.path.exists(paths["a"])
+
+    # Loading another track unpins the previous one.
+    manager.current = paths["c"]
+    callback(message)
+    cache_f.put("e", make_file(cache_f, "e", 100))
+    assert not os.path.exists(paths["a"])
+    assert os.path.exists(paths["c"])
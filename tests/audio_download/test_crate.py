@@ -0,0 +1,330 @@
+import time
+import threading
+from concurrent import futures
+from unittest import mock
+import pytest
+from freejay.audio_download import crate
+from freejay.audio_download.ytrip import DownloadManager
+from freejay.controller_cb.download_cb import (
+    make_download_model_callback,
+    register_download_model_cb,
+)
+from freejay.controller_cb.player_cb import make_load_callback
+from freejay.message_dispatcher.handler import Handler
+from freejay.player.djplayer import DJPlayer
+from freejay.messages import messages as mes
+
+SIZE = 100_000
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def manager_f(tmp_path, local_backend_f):
+    for i in range(5):
+        (tmp_path / "source" / f"{i}.mp3").write_bytes(bytes(SIZE))
+    manager = DownloadManager(
+        source=mes.Source.DOWNLOAD_MODEL,
+        component=mes.Component.DOWNLOAD,
+        destination=str(tmp_path),
+        backend=local_backend_f,
+    )
+    manager.register_consumer(mock.Mock())
+    yield manager
+    manager.prefetch_running.set()
+    manager.shutdown()
+
+
+@pytest.fixture
+def crate_f(manager_f):
+    crate_ = crate.Crate(
+        download_manager=manager_f,
+        source=mes.Source.DOWNLOAD_MODEL,
+        component=mes.Component.DOWNLOAD,
+        prefetch=2,
+    )
+    crate_.register_consumer(mock.Mock())
+    return crate_
+
+
+def states(crate_):
+    return [entry.state for entry in crate_.entries]
+
+
+def test_prefetch_ahead(crate_f, manager_f):
+    for i in range(4):
+        crate_f.add(f"{i}.mp3")
+    wait_for(lambda: states(crate_f)[:2] == [crate.READY] * 2)
+    assert states(crate_f) == [crate.READY, crate.READY, crate.QUEUED, crate.QUEUED]
+    # Prefetches do not change the current track.
+    assert manager_f.current is None
+    data = crate_f.consumer.call_args.args[0].content.data
+    assert data == {"ready": 2, "waiting": 2, "failed": 0}
+
+
+def test_one_prefetch_at_a_time(crate_f, manager_f):
+    manager_f.backend.latency = 0.1
+    crate_f.add("0.mp3")
+    crate_f.add("1.mp3")
+    assert states(crate_f) == [crate.FETCHING, crate.QUEUED]
+    assert manager_f.in_flight == ["0.mp3"]
+    wait_for(lambda: states(crate_f) == [crate.READY, crate.READY])
+
+
+def test_next_ready(crate_f):
+    crate_f.add("0.mp3")
+    crate_f.add("1.mp3")
+    crate_f.add("2.mp3")
+    wait_for(lambda: states(crate_f)[:2] == [crate.READY] * 2)
+    assert crate_f.next_ready().endswith("0.mp3")
+    # Taking a track prefetches the next.
+    wait_for(lambda: states(crate_f) == [crate.READY] * 2)
+    assert crate_f.next_ready().endswith("1.mp3")
+    assert crate_f.next_ready().endswith("2.mp3")
+    assert crate_f.next_ready() is None
+
+
+def test_failed_prefetch_skipped(crate_f):
+    crate_f.add("missing.mp3")
+    crate_f.add("0.mp3")
+    wait_for(lambda: states(crate_f) == [crate.FAILED, crate.READY])
+    assert crate_f.next_ready().endswith("0.mp3")
+
+
+def test_user_downloads_first(crate_f, manager_f):
+    manager_f.backend.latency = 0.1
+    download = manager_f.download("4.mp3")
+    crate_f.add("0.mp3")
+    assert states(crate_f) == [crate.QUEUED]
+    download.add_done_callback(lambda _: crate_f.fill())
+    download.result(timeout=5)
+    wait_for(lambda: states(crate_f) == [crate.READY])
+    assert manager_f.current.endswith("4.mp3")
+
+
+def test_pause(crate_f, manager_f):
+    with crate_f.paused():
+        crate_f.add("0.mp3")
+        time.sleep(0.05)
+        assert states(crate_f) == [crate.QUEUED]
+    wait_for(lambda: states(crate_f) == [crate.READY])
+
+
+def test_pause_holds_running_prefetch(crate_f, manager_f):
+    manager_f.backend.chunk_size = 10_000
+    manager_f.backend.bandwidth = 1_000_000  # 0.1s per track
+    crate_f.add("0.mp3")
+    time.sleep(0.03)
+    crate_f.pause()
+    time.sleep(0.05)
+    progress = [
+        c.args[0].content.data["bytes"]
+        for c in manager_f.consumer.call_args_list
+        if c.args[0].content.data["status"] == "progress"
+    ]
+    time.sleep(0.1)
+    # No further progress while paused.
+    assert len(manager_f.consumer.call_args_list) == len(progress)
+    assert states(crate_f) == [crate.FETCHING]
+    crate_f.resume()
+    wait_for(lambda: states(crate_f) == [crate.READY])
+
+
+def test_prefetch_promoted_by_user_download(crate_f, manager_f):
+    manager_f.backend.latency = 0.1
+    crate_f.add("0.mp3")
+    file_path = manager_f.download("0.mp3").result(timeout=5)
+    assert manager_f.current == file_path
+    data = [c.args[0].content.data for c in manager_f.consumer.call_args_list]
+    assert not data[-1].get("prefetch")
+
+
+def test_load_next_ready(crate_f, manager_f):
+    player = mock.Mock(filename=None)
+    player.load.side_effect = lambda filename: not setattr(player, "filename", filename)
+    load = make_load_callback(player, manager_f, crate_f)
+    press = mes.Message(
+        sender=mes.Sender(source=mes.Source.PLAYER_VIEW, trigger=mes.Trigger.BUTTON),
+        content=mes.Button(
+            press_release=mes.PressRelease.PRESS,
+            component=mes.Component.LEFT_DECK,
+            element=mes.Element.LOAD,
+        ),
+    )
+    crate_f.add("0.mp3")
+    wait_for(lambda: states(crate_f) == [crate.READY])
+
+    start = time.perf_counter()
+    load(press)
+    elapsed = time.perf_counter() - start
+    assert player.filename.endswith("0.mp3")
+    assert crate_f.entries == []
+    assert elapsed < 0.05
+    # Falls back to the current download once the crate is empty.
+    current = manager_f.download("1.mp3").result(timeout=5)
+    load(press)
+    assert player.filename == current
+
+
+def test_load_while_playing_keeps_track(crate_f, manager_f):
+    player = mock.Mock(filename="playing.mp3")
+    player.load.return_value = False
+    load = make_load_callback(player, manager_f, crate_f)
+    crate_f.add("0.mp3")
+    wait_for(lambda: states(crate_f) == [crate.READY])
+    # The player refuses to load, leaving its filename unchanged.
+    load(
+        mes.Message(
+            sender=mes.Sender(
+                source=mes.Source.PLAYER_VIEW, trigger=mes.Trigger.BUTTON
+            ),
+            content=mes.Button(
+                press_release=mes.PressRelease.PRESS,
+                component=mes.Component.LEFT_DECK,
+                element=mes.Element.LOAD,
+            ),
+        )
+    )
+    assert player.load.call_count == 1
+    assert states(crate_f) == [crate.READY]
+    assert crate_f.peek_ready().endswith("0.mp3")
+
+
+def test_reload_playing_track_keeps_track(crate_f, manager_f):
+    player = mock.Mock(playing=False, time_start=0.0)
+    deck = DJPlayer(player)
+    load = make_load_callback(deck, manager_f, crate_f)
+    press = mes.Message(
+        sender=mes.Sender(source=mes.Source.PLAYER_VIEW, trigger=mes.Trigger.BUTTON),
+        content=mes.Button(
+            press_release=mes.PressRelease.PRESS,
+            component=mes.Component.LEFT_DECK,
+            element=mes.Element.LOAD,
+        ),
+    )
+    crate_f.add("0.mp3")
+    wait_for(lambda: states(crate_f) == [crate.READY])
+    load(press)
+    playing = deck.filename
+    assert crate_f.entries == []
+    # Queue the playing track again, the deck refuses to re-load it.
+    deck.play_pause()
+    player.playing = True
+    crate_f.add("0.mp3")
+    wait_for(lambda: states(crate_f) == [crate.READY])
+    load(press)
+    assert deck.filename == playing
+    assert crate_f.peek_ready() == playing
+
+
+def test_load_pauses_prefetch(crate_f, manager_f):
+    running = []
+    player = mock.Mock(filename=None)
+    player.load.side_effect = lambda filename: running.append(
+        manager_f.prefetch_running.is_set()
+    )
+    load = make_load_callback(player, manager_f, crate_f)
+    manager_f.current = "track.mp3"
+    load(
+        mes.Message(
+            sender=mes.Sender(
+                source=mes.Source.PLAYER_VIEW, trigger=mes.Trigger.BUTTON
+            ),
+            content=mes.Button(
+                press_release=mes.PressRelease.PRESS,
+                component=mes.Component.LEFT_DECK,
+                element=mes.Element.LOAD,
+            ),
+        )
+    )
+    assert running == [False]
+    assert manager_f.prefetch_running.is_set()
+
+
+def test_queue_message(crate_f, manager_f):
+    callback = make_download_model_callback(manager_f, crate_f)
+    callback(
+        mes.Message(
+            sender=mes.Sender(
+                source=mes.Source.DOWNLOAD_VIEW, trigger=mes.Trigger.DATA_INPUT
+            ),
+            content=mes.Data(
+                component=mes.Component.DOWNLOAD,
+                element=mes.Element.DOWNLOAD,
+                data={"url": "0.mp3", "queue": True},
+            ),
+        )
+    )
+    assert [entry.url for entry in crate_f.entries] == ["0.mp3"]
+
+
+def test_concurrent_adds_and_takes(crate_f):
+    taken = []
+
+    def take():
+        deadline = time.perf_counter() + 5
+        while len(taken) < 20 and time.perf_counter() < deadline:
+            file_path = crate_f.next_ready()
+            if file_path:
+                taken.append(file_path)
+            time.sleep(0.001)
+
+    taker = threading.Thread(target=take)
+    taker.start()
+    with futures.ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda i: crate_f.add(f"{i % 5}.mp3"), range(20)))
+    taker.join()
+    assert len(taken) == 20
+
+
+def test_prefetch_exception_continues(crate_f, manager_f, caplog):
+    download = manager_f.download
+
+    def failing_download(url, prefetch=False):
+        if url != "broken.mp3":
+            return download(url, prefetch=prefetch)
+        future = futures.Future()
+        future.set_exception(RuntimeError("backend failed"))
+        return future
+
+    with mock.patch.object(manager_f, "download", failing_download):
+        crate_f.add("broken.mp3")
+        crate_f.add("0.mp3")
+        wait_for(lambda: states(crate_f) == [crate.FAILED, crate.READY])
+    assert "Prefetching broken.mp3 failed" in caplog.text
+
+
+def test_drop_failed(crate_f):
+    handler = Handler()
+    register_download_model_cb(handler, crate_f.download_manager, crate_f)
+    crate_f.add("missing.mp3")
+    crate_f.add("0.mp3")
+    crate_f.add("other.mp3")
+    wait_for(lambda: states(crate_f) == [crate.FAILED, crate.READY, crate.FAILED])
+    for press_release in (mes.PressRelease.PRESS, mes.PressRelease.RELEASE):
+        handler(
+            mes.Message(
+                sender=mes.Sender(
+                    source=mes.Source.DOWNLOAD_VIEW, trigger=mes.Trigger.BUTTON
+                ),
+                content=mes.Button(
+                    component=mes.Component.DOWNLOAD,
+                    element=mes.Element.CRATE,
+                    press_release=press_release,
+                ),
+            )
+        )
+    assert states(crate_f) == [crate.READY]
+    assert crate_f.consumer.call_args.args[0].content.data == {
+        "ready": 1,
+        "waiting": 0,
+        "failed": 0,
+    }
+    consumer_calls = crate_f.consumer.call_count
+    crate_f.drop_failed()
+    assert crate_f.consumer.call_count == consumer_calls
@@ -0,0 +1,178 @@
+import os
+import math
+import wave
+import array
+import shutil
+import logging
+from unittest import mock
+import pytest
+from freejay.audio_download import prepare
+from freejay.audio_download.ytrip import DownloadManager
+from freejay.messages import messages as mes
+
+RATE = 44100
+AMPLITUDE = 0.5
+
+
+def write_sine(file_path, seconds, amplitude=AMPLITUDE, rate=RATE):
+    """Write a stereo 440 Hz sine WAV file."""
+    frames = int(seconds * rate)
+    samples = array.array("h")
+    for i in range(frames):
+        value = int(amplitude * 32767 * math.sin(2 * math.pi * 440 * i / rate))
+        samples.extend((value, value))
+    with wave.open(str(file_path), "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.tobytes())
+    return str(file_path)
+
+
+@pytest.fixture
+def track_f(tmp_path):
+    return write_sine(tmp_path / "track.wav", seconds=3)
+
+
+def test_prepare_wav(track_f):
+    record = prepare.prepare_track(track_f)
+    assert record.path == track_f
+    assert record.duration == pytest.approx(3)
+    assert (record.rate, record.channels) == (RATE, 2)
+    # Sine RMS is peak / sqrt(2), -3 dB.
+    peak_db = 20 * math.log10(AMPLITUDE)
+    assert record.peak == pytest.approx(peak_db, abs=0.1)
+    assert record.loudness == pytest.approx(peak_db - 3.01, abs=0.1)
+    assert len(record.overview) == prepare.OVERVIEW_POINTS
+    assert all(p == pytest.approx(AMPLITUDE, abs=0.01) for p in record.overview)
+    for stage in ("probe", "decode", "loudness", "transcode", "analysis", "total"):
+        assert record.timings[stage] >= 0
+    assert record.timings["total"] >= record.timings["decode"]
+
+
+def test_prepare_silence(tmp_path):
+    record = prepare.prepare_track(write_sine(tmp_path / "s.wav", 1, amplitude=0))
+    assert record.peak == -math.inf
+    assert record.overview[0] == 0
+
+
+def test_prepare_short_track(tmp_path):
+    # Fewer frames than overview points.
+    record = prepare.prepare_track(write_sine(tmp_path / "s.wav", 500 / RATE))
+    assert record.duration == pytest.approx(500 / RATE)
+    assert 0 < len(record.overview) <= 500
+
+
+def test_prepare_unknown_duration(track_f, mocker):
+    mocker.patch.object(
+        prepare, "probe", return_value={"decoder": "wav", "duration": None}
+    )
+    record = prepare.prepare_track(track_f)
+    assert record.duration == pytest.approx(3)
+    assert max(record.overview) == pytest.approx(AMPLITUDE, abs=0.01)
+
+
+def test_record_cached(track_f):
+    record = prepare.prepare_track(track_f)
+    assert os.path.isfile(prepare.record_path(track_f))
+    with mock.patch.object(prepare, "decode") as m_decode:
+        assert prepare.prepare_track(track_f) == record
+    m_decode.assert_not_called()
+
+
+def test_record_stale(track_f):
+    prepare.prepare_track(track_f)
+    write_sine(track_f, seconds=1)
+    assert prepare.load_record(track_f) is None
+    assert prepare.prepare_track(track_f).duration == pytest.approx(1)
+
+
+def test_record_corrupt(track_f):
+    with open(prepare.record_path(track_f), "w") as file:
+        file.write("{not json")
+    assert prepare.load_record(track_f) is None
+
+
+def test_undecodable(tmp_path, mocker):
+    mocker.patch.object(prepare.shutil, "which", return_value=None)
+    file_path = tmp_path / "track.mp4"
+    file_path.write_bytes(bytes(1000))
+    record = prepare.prepare_track(str(file_path))
+    assert record.path == str(file_path)
+    assert record.duration is None
+    assert record.source_size == 1000
+
+
+def test_decode_failure_not_cached(tmp_path, monkeypatch):
+    # An ffmpeg that fails, like on a corrupt file.
+    bin_path = tmp_path / "bin"
+    bin_path.mkdir()
+    ffmpeg = bin_path / "ffmpeg"
+    ffmpeg.write_text("#!/bin/sh\necho 'Invalid data' >&2\nexit 1\n")
+    ffmpeg.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_path))
+    file_path = tmp_path / "track.mp4"
+    file_path.write_bytes(bytes(1000))
+    with pytest.raises(prepare.DecodeError):
+        prepare.prepare_track(str(file_path), transcode=True)
+    assert prepare.load_record(str(file_path)) is None
+    assert not (tmp_path / "track.wav").exists()
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="requires ffmpeg")
+def test_prepare_transcode(track_f, tmp_path):
+    source = str(tmp_path / "track.flac")
+    os.system(f"ffmpeg -v error -i {track_f} {source}")
+    record = prepare.prepare_track(source, transcode=True)
+    assert record.path == str(tmp_path / "track.wav")
+    assert record.duration == pytest.approx(3, abs=0.05)
+
+
+def test_preparer_process_pool(track_f):
+    preparer = prepare.Preparer(max_workers=1)
+    try:
+        record = preparer.prepare(track_f).result(timeout=30)
+    finally:
+        preparer.shutdown()
+    assert record.duration == pytest.approx(3)
+    assert prepare.load_record(track_f) == record
+
+
+def test_download_manager_prepares(tmp_path, local_backend_f):
+    write_sine(tmp_path / "source" / "track.wav", seconds=1)
+    preparer = prepare.Preparer(max_workers=1)
+    manager = DownloadManager(
+        source=mes.Source.DOWNLOAD_MODEL,
+        component=mes.Component.DOWNLOAD,
+        destination=str(tmp_path),
+        backend=local_backend_f,
+        preparer=preparer,
+    )
+    manager.register_consumer(mock.Mock())
+    try:
+        file_path = manager.download("track.wav").result(timeout=30)
+        # Served from cache with the prepared record.
+        manager.download("track.wav")
+    finally:
+        manager.shutdown()
+        preparer.shutdown()
+    assert manager.current == file_path
+    data = [c.args[0].content.data for c in manager.consumer.call_args_list]
+    first, second = [d for d in data if d["status"] == "success"]
+    assert first["track"].duration == pytest.approx(1)
+    assert second["cached"] and second["track"] == first["track"]
+    # The cache entry includes the prepared record.
+    assert manager.cache.size > os.path.getsize(file_path)
+
+
+@pytest.mark.benchmark
+def test_prepare_benchmark(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    track = write_sine(tmp_path / "long.wav", seconds=30)
+    record = prepare.prepare_track(track)
+    logging.info(
+        "Prepared 30 s track: %s",
+        ", ".join(f"{k} {v * 1000:.0f} ms" for k, v in record.timings.items()),
+    )
+    # Preparation runs well faster than real time.
+    assert record.timings["total"] < 15
@@ -0,0 +1,81 @@
+import pytest
+from unittest import mock
+from freejay.audio_download.progress import ProgressReporter, ProgressThrottle
+
+
+@pytest.fixture
+def reporter_f():
+    clock = mock.Mock(return_value=0.0)
+    send = mock.Mock()
+    return ProgressReporter(send=send, max_rate=10, clock=clock), send, clock
+
+
+def test_first_update_sent(reporter_f):
+    reporter, send, clock = reporter_f
+    clock.return_value = 1.0
+    reporter(100, 1000)
+    send.assert_called_once_with(
+        {"bytes": 100, "total": 1000, "rate": 0.0, "eta": None}
+    )
+
+
+def test_rate_from_first_update(reporter_f):
+    reporter, send, clock = reporter_f
+    clock.return_value = 1.0
+    reporter(100, 1000)
+    clock.return_value = 2.0
+    reporter(200, 1000)
+    send.assert_called_with({"bytes": 200, "total": 1000, "rate": 100.0, "eta": 8.0})
+
+
+def test_resumed_rate_excludes_offset(reporter_f):
+    reporter, send, clock = reporter_f
+    clock.return_value = 1.0
+    reporter(900_000, 1_000_000)
+    clock.return_value = 2.0
+    reporter(910_000, 1_000_000)
+    assert send.call_args.args[0]["rate"] == 10_000
+    assert send.call_args.args[0]["eta"] == 9.0
+
+
+def test_throttled(reporter_f):
+    reporter, send, clock = reporter_f
+    for i in range(1, 1001):
+        clock.return_value = i / 1000
+        reporter(i, 10_000)
+    # 1 second at 10 updates per second.
+    assert send.call_count == 10
+
+
+def test_final_update_always_sent(reporter_f):
+    reporter, send, clock = reporter_f
+    clock.return_value = 0.5
+    reporter(500, 1000)
+    clock.return_value = 0.51
+    reporter(1000, 1000)
+    assert send.call_count == 2
+    assert send.call_args.args[0]["eta"] == 0
+
+
+def test_unknown_total(reporter_f):
+    reporter, send, clock = reporter_f
+    clock.return_value = 1.0
+    reporter(100, 0)
+    assert send.call_args.args[0]["eta"] is None
+
+
+def test_shared_throttle():
+    """Parallel downloads share the update rate."""
+    clock = mock.Mock(return_value=0.0)
+    throttle = ProgressThrottle(max_rate=10, clock=clock)
+    sends = [mock.Mock() for _ in range(4)]
+    reporters = [
+        ProgressReporter(send=send, clock=clock, throttle=throttle) for send in sends
+    ]
+    for i in range(1, 1001):
+        clock.return_value = i / 1000
+        for reporter in reporters:
+            reporter(i, 10_000)
+    # 1 second at 10 updates per second, plus each download's first update.
+    assert sum(send.call_count for send in sends) <= 10 + len(sends)
+    assert all(send.called for send in sends)
@@ -0,0 +1,177 @@
+import os
+import json
+import logging
+import urllib.error
+from unittest import mock
+import pytest
+from freejay.audio_download import resumable
+from tests.audio_download.conftest import content
+
+
+def download(server, tmp_path, **kwargs):
+    kwargs.setdefault("chunk_size", 4096)
+    kwargs.setdefault("timeout", 5)
+    # No backoff delay.
+    kwargs.setdefault("rand", lambda: 0.0)
+    return resumable.download_resumable(
+        f"{server.url}/track.mp3", str(tmp_path / "track.mp3"), **kwargs
+    )
+
+
+def test_download(http_server_f, tmp_path):
+    http_server_f.size = 100_000
+    progress = mock.Mock()
+    file_path = download(http_server_f, tmp_path, progress=progress)
+    with open(file_path, "rb") as file:
+        assert file.read() == content(100_000)
+    progress.assert_called_with(100_000, 100_000)
+    assert os.listdir(tmp_path) == ["track.mp3"]
+    assert http_server_f.ranges == [None]
+
+
+def test_resume_after_dropped_connections(http_server_f, tmp_path):
+    http_server_f.size = 100_000
+    http_server_f.chunk_size = 10_000
+    http_server_f.drops = 3
+    http_server_f.drop_after = 30_000
+    progress = mock.Mock()
+    file_path = download(http_server_f, tmp_path, progress=progress)
+    with open(file_path, "rb") as file:
+        assert file.read() == content(100_000)
+    assert http_server_f.ranges == [
+        None,
+        "bytes=30000-",
+        "bytes=60000-",
+        "bytes=90000-",
+    ]
+    downloaded = [c.args[0] for c in progress.call_args_list]
+    assert downloaded == sorted(downloaded)
+
+
+def test_changed_resource_restarts(http_server_f, tmp_path):
+    http_server_f.size = 50_000
+    http_server_f.etag = '"v1"'
+    http_server_f.drops = 1
+    http_server_f.drop_after = 20_000
+
+    def rand():
+        # The resource changes after the first (dropped) response.
+        http_server_f.etag = '"v2"'
+        return 0.0
+
+    file_path = download(http_server_f, tmp_path, rand=rand)
+    with open(file_path, "rb") as file:
+        assert file.read() == content(50_000)
+    assert http_server_f.requests == {"/track.mp3": 2}
+
+
+def test_gives_up_without_progress(http_server_f, tmp_path):
+    http_server_f.size = 50_000
+    http_server_f.drops = 100
+    http_server_f.drop_after = 0
+    with pytest.raises(OSError):
+        download(http_server_f, tmp_path, max_retries=3)
+    assert http_server_f.requests == {"/track.mp3": 3}
+    # Partial download kept for the next attempt.
+    assert not (tmp_path / "track.mp3").exists()
+
+
+def test_resume_next_attempt(http_server_f, tmp_path):
+    http_server_f.size = 50_000
+    http_server_f.etag = '"v1"'
+    http_server_f.drops = 2
+    http_server_f.drop_after = 20_000
+
+    def rand():
+        # The retry fails without progress.
+        http_server_f.drop_after = 0
+        return 0.0
+
+    with pytest.raises(OSError):
+        download(http_server_f, tmp_path, max_retries=1, rand=rand)
+    part = tmp_path / ("track.mp3" + resumable.PART_SUFFIX)
+    assert part.stat().st_size == 20_000
+    with open(str(part) + ".json") as file:
+        assert json.load(file) == {"validator": '"v1"', "total": 50_000}
+
+    http_server_f.drops = 0
+    file_path = download(http_server_f, tmp_path)
+    with open(file_path, "rb") as file:
+        assert file.read() == content(50_000)
+    assert http_server_f.ranges[-1] == "bytes=20000-"
+    assert os.listdir(tmp_path) == ["track.mp3"]
+
+
+def test_already_complete_part(http_server_f, tmp_path):
+    http_server_f.size = 10_000
+    part = tmp_path / ("track.mp3" + resumable.PART_SUFFIX)
+    part.write_bytes(content(10_000))
+    with open(str(part) + ".json", "w") as file:
+        json.dump({"validator": None, "total": 10_000}, file)
+    file_path = download(http_server_f, tmp_path)
+    with open(file_path, "rb") as file:
+        assert file.read() == content(10_000)
+
+
+def test_not_found_not_retried(tmp_path):
+    error = urllib.error.HTTPError("url", 404, "Not Found", None, None)
+    rand = mock.Mock(return_value=0.0)
+    with mock.patch.object(
+        resumable.urllib.request, "urlopen", side_effect=error
+    ) as m_urlopen:
+        with pytest.raises(urllib.error.HTTPError):
+            resumable.download_resumable(
+                "http://x/track", str(tmp_path / "track"), rand=rand
+            )
+    m_urlopen.assert_called_once()
+    rand.assert_not_called()
+
+
+def test_integrity_check(http_server_f, tmp_path, mocker):
+    http_server_f.size = 10_000
+    # Server sends more than it reports.
+    mocker.patch.object(resumable, "_total_size", return_value=5_000)
+    with pytest.raises(resumable.IntegrityError):
+        download(http_server_f, tmp_path)
+    assert os.listdir(tmp_path) == []
+
+
+def test_inconsistent_size_gives_up(http_server_f, tmp_path, mocker):
+    http_server_f.size = 10_000
+    # Server sends less than it reports, and refuses to resume.
+    mocker.patch.object(resumable, "_total_size", return_value=20_000)
+    with pytest.raises(OSError):
+        download(http_server_f, tmp_path, max_retries=2)
+    assert not (tmp_path / "track.mp3").exists()
+
+
+def test_backoff_delay():
+    delays = [resumable.backoff_delay(n, 0.5, 4.0, lambda: 1.0) for n in range(1, 7)]
+    assert delays == [0.5, 1.0, 2.0, 4.0, 4.0, 4.0]
+    assert resumable.backoff_delay(3, 0.5, 4.0, lambda: 0.25) == 0.5
+
+
+def test_manager_resumes(http_server_f, tmp_path, local_backend_f, caplog):
+    caplog.set_level(logging.WARNING)
+    from freejay.audio_download.ytrip import DownloadManager
+    from freejay.messages import messages as mes
+
+    local_backend_f.backoff = 0.01
+    http_server_f.size = 100_000
+    http_server_f.drops = 2
+    http_server_f.drop_after = 40_000
+    manager = DownloadManager(
+        source=mes.Source.DOWNLOAD_MODEL,
+        component=mes.Component.DOWNLOAD,
+        destination=str(tmp_path),
+        backend=local_backend_f,
+    )
+    manager.register_consumer(mock.Mock())
+    try:
+        file_path = manager.download(f"{http_server_f.url}/track.mp3").result(5)
+    finally:
+        manager.shutdown()
+    with open(file_path, "rb") as file:
+        assert file.read() == content(100_000)
+    assert manager.current == file_path
+    assert "Download interrupted at 40000 bytes" in caplog.text
@@ -1,25 +1,42 @@
+import os
+import time
+import logging
+from concurrent import futures
+from urllib.error import HTTPError
 from unittest import mock
+from urllib.parse import quote
 import pytest
+from pytube.exceptions import VideoUnavailable
 import freejay.audio_download.ytrip
+from freejay.audio_download.backend import LocalBackend, DownloadError
+from freejay.messages import messages as mes
+
+ASSETS = os.path.join(os.path.dirname(__file__), "..", "..", "assets")
+TRACK = "HoliznaCC0 - Mercury.mp3"
 
 
 def test_yt_rip_calls(mocker):
     """Test yt_rip() makes expected pytest method calls."""
     video_link = "https://www.youtube.com/watch?v=myfavetrack"
     destination = "some_destination"
-    m_youtube_c = mocker.patch("freejay.audio_download.ytrip.YouTube", autospec=True)
+    m_youtube_c = mocker.patch("pytube.YouTube", autospec=True)
+    m_download = mocker.patch("freejay.audio_download.ytrip.download_resumable")
+    audio = m_youtube_c.return_value.streams.get_audio_only.return_value
+    audio.default_filename = "track.mp4"
     freejay.audio_download.ytrip.yt_rip(video_link, destination=destination)
     m_youtube_c.assert_has_calls(
         [
             mock.call(video_link),
             mock.call().streams.get_audio_only(),
-            mock.call().streams.get_audio_only().download(output_path=destination),
         ]
     )
+    m_download.assert_called_once_with(
+        audio.url, os.path.join(destination, "track.mp4"), progress=None
+    )
 
 
 def test_vid_unav_raises():
-    with pytest.raises(freejay.audio_download.ytrip.VideoUnavailable) as e_info:
+    with pytest.raises(VideoUnavailable) as e_info:
         freejay.audio_download.ytrip._check_video_available(
             filepath="Video Not Available.mp4",
             video_link="https://www.youtube.com/watch?v=myfavetrack",
@@ -32,5 +49,237 @@ def test_vid_unav_passes():
             filepath="My Favourite Track.mp4",
             video_link="https://www.youtube.com/watch?v=myfavetrack",
         )
-    except freejay.audio_download.ytrip.VideoUnavailable as exc:
+    except VideoUnavailable as exc:
         assert False, f"'_check_video_available raised an exception {exc}"
+
+
+@pytest.fixture
+def manager_f(tmp_path, local_backend_f):
+    manager = freejay.audio_download.ytrip.DownloadManager(
+        source=mes.Source.DOWNLOAD_MODEL,
+        component=mes.Component.DOWNLOAD,
+        destination=str(tmp_path),
+        max_workers=4,
+        backend=local_backend_f,
+    )
+    manager.register_consumer(mock.Mock())
+    yield manager
+    manager.shutdown()
+
+
+def sent_data(manager):
+    return [c.args[0].content.data for c in manager.consumer.call_args_list]
+
+
+def test_download_success_message(manager_f, http_server_f):
+    url = f"{http_server_f.url}/track.mp3"
+    file_path = manager_f.download(url).result(timeout=5)
+    assert os.path.getsize(file_path) == http_server_f.size
+    assert manager_f.current == file_path
+    assert sent_data(manager_f)[-1] == {
+        "status": "success",
+        "url": url,
+        "file_path": file_path,
+        "cached": False,
+    }
+
+
+def test_download_failed_message(manager_f, http_server_f):
+    manager_f.backend = mock.Mock(spec=LocalBackend)
+    manager_f.backend.download.side_effect = HTTPError("url", 404, "", None, None)
+    assert manager_f.download("some_url").result(timeout=5) is None
+    (data,) = sent_data(manager_f)
+    assert data["status"] == "failed"
+
+
+@pytest.mark.parametrize(
+    "exc", [DownloadError("age restricted"), AttributeError("backend bug")]
+)
+def test_download_unexpected_error_message(manager_f, exc, caplog):
+    manager_f.backend = mock.Mock(spec=LocalBackend)
+    manager_f.backend.resolve.side_effect = exc
+    assert manager_f.download("some_url").result(timeout=5) is None
+    (data,) = sent_data(manager_f)
+    assert data["status"] == "failed" and data["exception"] is exc
+    assert "Download failed" in caplog.text
+
+
+def test_in_flight_deduplicated(manager_f, http_server_f):
+    http_server_f.latency = 0.2
+    url = f"{http_server_f.url}/track.mp3"
+    first = manager_f.download(url)
+    second = manager_f.download(url)
+    assert first is second
+    assert manager_f.in_flight == [url]
+    first.result(timeout=5)
+    assert http_server_f.requests == {"/track.mp3": 1}
+
+
+def test_cancel_queued(manager_f, http_server_f):
+    http_server_f.latency = 0.2
+    urls = [f"{http_server_f.url}/{i}.mp3" for i in range(5)]
+    downloads = [manager_f.download(url) for url in urls]
+    # Pool has 4 workers, the fifth download is queued.
+    assert manager_f.cancel(urls[4])
+    assert downloads[4].cancelled()
+    futures.wait(downloads[:4], timeout=5)
+    assert "/4.mp3" not in http_server_f.requests
+    assert {"status": "cancelled", "url": urls[4]} in sent_data(manager_f)
+
+
+def test_cancel_running_discards_file(manager_f, http_server_f, tmp_path):
+    http_server_f.latency = 0.2
+    url = f"{http_server_f.url}/track.mp3"
+    download = manager_f.download(url)
+    time.sleep(0.05)
+    assert manager_f.cancel(url)
+    assert download.result(timeout=5) is None
+    assert not list(tmp_path.glob("*/track.mp3"))
+    assert sent_data(manager_f)[-1] == {"status": "cancelled", "url": url}
+
+
+def test_cancel_unknown(manager_f):
+    assert not manager_f.cancel("some_url")
+
+
+def test_completion_order(manager_f, tmp_path):
+    for name in ("slow", "fast"):
+        (tmp_path / "source" / name).write_bytes(bytes(10))
+    download = manager_f.backend.download
+
+    def slow_download(stream, destination, progress=None):
+        if stream.url == "slow":
+            time.sleep(0.2)
+        return download(stream, destination, progress=progress)
+
+    manager_f.backend.download = slow_download
+    manager_f.download("slow")
+    manager_f.download("fast").result(timeout=5)
+    futures.wait([manager_f.download("slow")], timeout=5)
+    done = [d["url"] for d in sent_data(manager_f) if d["status"] == "success"]
+    assert done == ["fast", "slow"]
+
+
+def test_old_downloads_removed(manager_f, http_server_f, tmp_path):
+    manager_f.cache.max_bytes = 3 * http_server_f.size
+    for i in range(5):
+        manager_f.download(f"{http_server_f.url}/{i}.mp3").result(timeout=5)
+    files = sorted(p.name for p in tmp_path.glob("*/*.mp3"))
+    assert files == ["2.mp3", "3.mp3", "4.mp3"]
+
+
+def test_repeat_download_served_from_cache(manager_f, http_server_f, caplog):
+    caplog.set_level(logging.INFO)
+    url = f"{http_server_f.url}/track.mp3"
+    file_path = manager_f.download(url).result(timeout=5)
+    manager_f.backend = mock.Mock()
+
+    start = time.perf_counter()
+    cached = manager_f.download(url)
+    elapsed = time.perf_counter() - start
+    logging.info("Cached download served in %.2f ms", elapsed * 1000)
+
+    assert cached.done()
+    assert cached.result() == file_path
+    manager_f.backend.resolve.assert_not_called()
+    assert sent_data(manager_f)[-1]["cached"]
+    assert http_server_f.requests == {"/track.mp3": 1}
+    assert elapsed < 0.05
+
+
+def test_cache_persists(manager_f, http_server_f, tmp_path):
+    url = f"{http_server_f.url}/track.mp3"
+    file_path = manager_f.download(url).result(timeout=5)
+    manager = freejay.audio_download.ytrip.DownloadManager(
+        source=mes.Source.DOWNLOAD_MODEL,
+        component=mes.Component.DOWNLOAD,
+        destination=str(tmp_path),
+        backend=mock.Mock(),
+    )
+    manager.register_consumer(mock.Mock())
+    assert manager.download(url).result() == file_path
+    manager.backend.resolve.assert_not_called()
+    manager.shutdown()
+
+
+@pytest.mark.benchmark
+def test_download_throughput(manager_f, http_server_f, caplog):
+    """Concurrent downloads against a local server with 100 ms latency."""
+    caplog.set_level(logging.INFO)
+    http_server_f.latency = 0.1
+    http_server_f.size = 1_000_000
+    urls = [f"{http_server_f.url}/{i}.mp3" for i in range(8)]
+
+    start = time.perf_counter()
+    downloads = [manager_f.download(url) for url in urls]
+    for download in futures.as_completed(downloads, timeout=10):
+        assert download.result() is not None
+    elapsed = time.perf_counter() - start
+
+    logging.info(
+        "8 downloads in %.2fs, %.1f MB/s",
+        elapsed,
+        8 * http_server_f.size / elapsed / 1e6,
+    )
+    # Serial downloads would take at least 0.8s.
+    assert elapsed < 0.6
+
+
+@pytest.mark.benchmark
+def test_download_throughput_limited(manager_f, caplog):
+    """Concurrent downloads of fixture audio at 50 ms latency and 4 MB/s each."""
+    caplog.set_level(logging.INFO)
+    manager_f.backend.root = ASSETS
+    manager_f.backend.latency = 0.05
+    manager_f.backend.bandwidth = 4e6
+    size = os.path.getsize(os.path.join(ASSETS, TRACK))
+    urls = [f"file:{quote(TRACK)}?copy={i}" for i in range(8)]
+
+    start = time.perf_counter()
+    downloads = [manager_f.download(url) for url in urls]
+    for download in futures.as_completed(downloads, timeout=30):
+        assert os.path.getsize(download.result()) == size
+    elapsed = time.perf_counter() - start
+
+    logging.info(
+        "8 x %.1f MB downloads in %.2fs, %.1f MB/s",
+        size / 1e6,
+        elapsed,
+        8 * size / elapsed / 1e6,
+    )
+    # Two batches of 4 concurrent downloads, each bandwidth limited.
+    serial = 8 * (0.05 + size / 4e6)
+    assert elapsed < serial / 2
+
+
+def test_yt_rip_reports_progress(mocker):
+    m_youtube_c = mocker.patch("pytube.YouTube", autospec=True)
+    m_download = mocker.patch("freejay.audio_download.ytrip.download_resumable")
+    audio = m_youtube_c.return_value.streams.get_audio_only.return_value
+    audio.default_filename = "track.mp4"
+    progress = mock.Mock()
+    freejay.audio_download.ytrip.yt_rip("some_link", "some_dir", progress=progress)
+    assert m_download.call_args.kwargs["progress"] is progress
+
+
+def test_download_progress_messages(manager_f, http_server_f):
+    """Progress messages from a slow local download are throttled."""
+    manager_f.progress_rate = 20
+    http_server_f.size = 1_000_000
+    http_server_f.chunk_size = 50_000
+    http_server_f.chunk_delay = 0.02  # 20 chunks, ~0.4s
+    url = f"{http_server_f.url}/track.mp3"
+
+    start = time.perf_counter()
+    manager_f.download(url).result(timeout=5)
+    elapsed = time.perf_counter() - start
+
+    progress = [d for d in sent_data(manager_f) if d["status"] == "progress"]
+    assert 2 < len(progress) <= elapsed * 20 + 2
+    assert [d["bytes"] for d in progress] == sorted(d["bytes"] for d in progress)
+    assert progress[-1]["bytes"] == progress[-1]["total"] == 1_000_000
+    assert progress[-1]["eta"] == 0
+    assert all(d["url"] == url for d in progress)
+    # Measured from the first update.
+    assert all(d["rate"] > 0 for d in progress[1:])
+    assert sent_data(manager_f)[-1]["status"] == "success"
@@ -0,0 +1,122 @@
+import time
+import logging
+import threading
+import statistics
+import pytest
+from unittest import mock
+from freejay.clock.master import MasterClock, QuantisedScheduler
+from freejay.clock.timerwheel import TimerWheel
+
+
+# Deck stand-in playing from clock time `start` with a beat grid.
+@pytest.fixture
+def deck_f():
+    class Deck:
+        def __init__(self, bpm=120.0, speed=1.0):
+            self.bpm = bpm
+            self.speed = speed
+            self.beat_offset = 0.0
+            self.playing = True
+            self.start = time.perf_counter()
+
+        @property
+        def time_pos(self):
+            return (time.perf_counter() - self.start) * self.speed
+
+    return Deck()
+
+
+@pytest.fixture
+def scheduler_f(deck_f):
+    wheel = TimerWheel()
+    yield QuantisedScheduler(MasterClock(reference=deck_f), wheel)
+    wheel.stop()
+
+
+def test_tempo(deck_f):
+    deck_f.speed = 1.1
+    clock = MasterClock(reference=deck_f)
+    assert clock.tempo == pytest.approx(132)
+
+
+@pytest.mark.parametrize("attr,value", [("bpm", None), ("playing", False)])
+def test_no_tempo(deck_f, attr, value):
+    setattr(deck_f, attr, value)
+    clock = MasterClock(reference=deck_f)
+    assert clock.tempo is None
+    assert clock.beat() is None
+    assert clock.next_boundary() is None
+
+
+def test_no_reference():
+    assert MasterClock().next_boundary() is None
+
+
+def test_next_boundary_on_beat(deck_f):
+    deck_f.start = time.perf_counter() - 10.2  # beat 20.4 at 120 bpm
+    clock = MasterClock(reference=deck_f)
+    t, beat = clock.beat()
+    target = clock.next_boundary(1)
+    assert (target - t) * 2 == pytest.approx(21 - beat, abs=1e-3)
+    bar = clock.next_boundary(4)
+    assert bar - t == pytest.approx((24 - beat) / 2, abs=1e-3)
+
+
+def test_schedule_immediate_without_tempo(scheduler_f):
+    scheduler_f.clock.reference = None
+    action = mock.Mock()
+    assert scheduler_f.schedule(action, "beat", 1) is None
+    action.assert_called_once_with(1)
+
+
+def test_schedule_immediate_unknown_quantise(scheduler_f, caplog):
+    action = mock.Mock()
+    scheduler_f.schedule(action, "fortnight")
+    action.assert_called_once()
+    assert "Unknown quantise value" in caplog.text
+
+
+def test_schedule_on_beat(scheduler_f):
+    fired = threading.Event()
+    timer = scheduler_f.schedule(fired.set, "beat")
+    assert fired.wait(1)
+    clock = scheduler_f.clock
+    beat = (timer.fired - clock.reference.start) * 2
+    assert beat - round(beat) == pytest.approx(0, abs=0.02)
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+def test_quantise_error_under_load(scheduler_f, caplog):
+    """Measure how far scheduled actions land from the target beat under load."""
+    caplog.set_level(logging.INFO)
+    stop = threading.Event()
+
+    def load():
+        while not stop.is_set():
+            sum(i * i for i in range(1000))
+
+    workers = [threading.Thread(target=load, daemon=True) for _ in range(4)]
+    for w in workers:
+        w.start()
+
+    scheduler_f.clock.reference.bpm = 600  # 10 beats per second
+    timers = []
+    try:
+        for _ in range(20):
+            timers.append(scheduler_f.schedule(lambda: None, "beat"))
+            time.sleep(0.1)
+        time.sleep(0.2)
+    finally:
+        stop.set()
+
+    errors = [(t.fired - t.deadline) * 1000 for t in timers]
+    logging.info(
+        "Quantise error: median %.2f ms, max %.2f ms",
+        statistics.median(errors),
+        max(errors),
+    )
+    # CPU bound Python threads hold the GIL for up to the switch interval (5 ms)
+    # each, so the bound allows for a few switches.
+    assert min(errors) >= 0
+    assert statistics.median(errors) < 50
@@ -0,0 +1,69 @@
+import time
+import threading
+import retry
+
+
+@retry.retry(tries=20, delay=0.05)
+def assert_eventually(func):
+    assert func()
+
+
+def test_timer_fires(wheel_f):
+    fired = threading.Event()
+    wheel_f.schedule_after(0.01, fired.set)
+    assert fired.wait(1)
+    assert len(wheel_f) == 0
+
+
+def test_timer_not_early(wheel_f):
+    timers = [wheel_f.schedule_after(i * 0.003, lambda: None) for i in range(20)]
+    assert_eventually(lambda: all(t.fired for t in timers))
+    for timer in timers:
+        assert timer.fired >= timer.deadline
+
+
+def test_timer_passes_args(wheel_f):
+    result = []
+    wheel_f.schedule_after(0.001, result.append, "x")
+    assert_eventually(lambda: result == ["x"])
+
+
+def test_cancel(wheel_f):
+    result = []
+    timer = wheel_f.schedule_after(0.02, result.append, 1)
+    assert wheel_f.cancel(timer)
+    assert not wheel_f.cancel(timer)
+    time.sleep(0.05)
+    assert result == []
+    assert timer.cancelled
+
+
+def test_beyond_one_rotation(wheel_f):
+    # 64 slots of 1 ms, deadline wraps around the wheel.
+    fired = threading.Event()
+    timer = wheel_f.schedule_after(0.15, fired.set)
+    time.sleep(0.1)
+    assert not fired.is_set()
+    assert fired.wait(1)
+    assert timer.fired >= timer.deadline
+
+
+def test_past_deadline_fires(wheel_f):
+    fired = threading.Event()
+    wheel_f.schedule(time.perf_counter() - 1, fired.set)
+    assert fired.wait(1)
+
+
+def test_callback_exception_logged(wheel_f, caplog):
+    fired = threading.Event()
+    wheel_f.schedule_after(0.001, lambda: 1 / 0)
+    wheel_f.schedule_after(0.005, fired.set)
+    assert fired.wait(1)
+    assert "Timer callback raised an exception." in caplog.text
+
+
+def test_single_thread(wheel_f):
+    before = threading.active_count()
+    timers = [wheel_f.schedule_after(0.05, lambda: None) for _ in range(200)]
+    assert threading.active_count() <= before + 1
+    assert_eventually(lambda: all(t.fired for t in timers))
@@ -0,0 +1,10 @@
+import pytest
+from freejay.clock.timerwheel import TimerWheel
+
+
+@pytest.fixture
+def wheel_f():
+    # Few slots, so deadlines beyond one rotation are quick to test.
+    wheel = TimerWheel(tick=0.001, slots=64)
+    yield wheel
+    wheel.stop()
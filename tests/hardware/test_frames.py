@@ -0,0 +1,40 @@
+from freejay.hardware import frames
+from freejay.hardware.frames import Frame, FrameDecoder, NOTE, CC
+
+
+def test_decode():
+    data = bytes([0x90, 36, 127, 0x80, 36, 64, 0xB1, 7, 100, 0x91, 37, 0])
+    assert FrameDecoder().feed(data) == [
+        Frame(NOTE, 0, 36, 127),
+        Frame(NOTE, 0, 36, 0),
+        Frame(CC, 1, 7, 100),
+        Frame(NOTE, 1, 37, 0),
+    ]
+
+
+def test_split_frames():
+    decoder = FrameDecoder()
+    data = bytes([0xB0, 7, 1, 0xB0, 7, 2])
+    decoded = []
+    for byte in data:
+        decoded += decoder.feed(bytes([byte]))
+    assert decoded == [Frame(CC, 0, 7, 1), Frame(CC, 0, 7, 2)]
+
+
+def test_running_status():
+    data = bytes([0xB0, 16, 1, 16, 127, 16, 2])
+    assert [f.value for f in FrameDecoder().feed(data)] == [1, 127, 2]
+
+
+def test_skipped_bytes():
+    data = bytes(
+        # Data without a status, sysex, real time clock mid-frame, program change.
+        [5, 0xF0, 1, 2, 3, 0xF7, 0x90, 0xF8, 36, 127, 0xC0, 5, 0xB0, 7, 9]
+    )
+    assert FrameDecoder().feed(data) == [Frame(NOTE, 0, 36, 127), Frame(CC, 0, 7, 9)]
+
+
+def test_encode_roundtrip():
+    recorded = [Frame(NOTE, 3, 40, 90), Frame(NOTE, 3, 40, 0), Frame(CC, 15, 8, 64)]
+    data = b"".join(frames.encode(frame) for frame in recorded)
+    assert FrameDecoder().feed(data) == recorded
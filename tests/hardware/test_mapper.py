@@ -0,0 +1,188 @@
+import json
+import pytest
+from freejay.messages import messages as mes
+from freejay.messages import produce_consume as prodcon
+from freejay.hardware import mapper
+from freejay.hardware.frames import Frame, NOTE, CC
+
+
+@pytest.fixture
+def consumer_f():
+    class ConsumerFixture(prodcon.Consumer):
+        def __init__(self):
+            self.messages = []
+
+        def on_message_recieved(self, message):
+            self.messages.append(message)
+
+    return ConsumerFixture()
+
+
+@pytest.fixture
+def control_config_f():
+    return {
+        "controls": {
+            "note:0:36": {"component": "LEFT_DECK", "element": "CUE"},
+            "note:0:38": {
+                "component": "LEFT_DECK",
+                "element": "NUDGE",
+                "data": {"value": 0.1},
+            },
+            "cc:0:7": {
+                "component": "LEFT_DECK",
+                "element": "CHANNEL_FADER",
+                "range": [0, 2],
+            },
+            "cc:0:16": {
+                "component": "LEFT_DECK",
+                "element": "JOG",
+                "mode": "relative",
+                "scale": 0.5,
+            },
+            "cc:0:64": {"component": "LEFT_DECK", "element": "LOOP", "mode": "button"},
+        }
+    }
+
+
+@pytest.fixture
+def mapper_f(control_config_f, consumer_f):
+    control_mapper = mapper.ControlMapper(
+        mapper.ControlMap.from_config(control_config_f)
+    )
+    consumer_f.listen(control_mapper)
+    return control_mapper
+
+
+def contents(consumer):
+    return [message.content for message in consumer.messages]
+
+
+def test_buttons(mapper_f, consumer_f):
+    sent = mapper_f.map(
+        [
+            Frame(NOTE, 0, 36, 127),
+            Frame(NOTE, 0, 36, 0),
+            Frame(NOTE, 0, 36, 127),
+            Frame(CC, 0, 64, 127),
+        ]
+    )
+    assert sent == 4
+    assert [(c.element, c.press_release) for c in contents(consumer_f)] == [
+        (mes.Element.CUE, mes.PressRelease.PRESS),
+        (mes.Element.CUE, mes.PressRelease.RELEASE),
+        (mes.Element.CUE, mes.PressRelease.PRESS),
+        (mes.Element.LOOP, mes.PressRelease.PRESS),
+    ]
+    message = consumer_f.messages[0]
+    assert message.sender == mes.Sender(mes.Source.HARDWARE, mes.Trigger.BUTTON)
+    assert message.type == mes.Type.BUTTON
+
+
+def test_button_data_not_shared(mapper_f, consumer_f):
+    mapper_f.map([Frame(NOTE, 0, 38, 127), Frame(NOTE, 0, 38, 127)])
+    first, second = contents(consumer_f)
+    first.data["value"] = 1
+    assert second.data == {"value": 0.1}
+
+
+def test_absolute_coalesced(mapper_f, consumer_f):
+    mapper_f.map(
+        [Frame(CC, 0, 7, v) for v in range(100)]
+        + [Frame(NOTE, 0, 36, 127)]
+        + [Frame(CC, 0, 7, 127)]
+    )
+    fader, cue = contents(consumer_f)
+    # Sent at the first fader frame, with the last value.
+    assert fader == mes.Data(
+        mes.Component.LEFT_DECK, mes.Element.CHANNEL_FADER, {"value": 2.0}
+    )
+    assert consumer_f.messages[0].sender.trigger == mes.Trigger.SLIDER
+    assert cue.element == mes.Element.CUE
+
+
+def test_relative_summed(mapper_f, consumer_f):
+    # +1 x 10, -1 x 3 (two's complement)
+    mapper_f.map([Frame(CC, 0, 16, 1)] * 10 + [Frame(CC, 0, 16, 127)] * 3)
+    press, release = contents(consumer_f)
+    assert press.press_release == mes.PressRelease.PRESS
+    assert press.data == {"value": 3.5}
+    assert release.press_release == mes.PressRelease.RELEASE
+    # Changes cancelling out send nothing.
+    assert mapper_f.map([Frame(CC, 0, 16, 1), Frame(CC, 0, 16, 127)]) == 0
+
+
+def test_unbound(mapper_f, consumer_f):
+    assert mapper_f.map([Frame(NOTE, 5, 36, 127), Frame(CC, 0, 99, 1)]) == 0
+    assert consumer_f.messages == []
+
+
+def test_default_control_map(consumer_f):
+    control_mapper = mapper.ControlMapper()
+    consumer_f.listen(control_mapper)
+    control_mapper.map([Frame(CC, 15, 8, 127)])
+    assert consumer_f.messages[0].content.data == {"position": 1.0}
+
+
+def test_invalid_config():
+    config = {
+        "controls": {
+            "note:0": {"component": "LEFT_DECK", "element": "CUE"},
+            "cc:16:1": {"component": "LEFT_DECK", "element": "CUE"},
+            "note:0:1": {"component": "LEFT_DECK", "element": "NOPE"},
+            "note:0:2": {"component": "LEFT_DECK", "element": "CUE", "mode": "x"},
+            "cc:0:3": {"component": "MIXER", "element": "CROSSFADER", "range": 1},
+            "cc:0:4": {"component": "MIXER", "element": "CROSSFADER", "speed": 1},
+            "cc:0:5": {"element": "CROSSFADER"},
+            "cc:0:6": "CROSSFADER",
+        }
+    }
+    with pytest.raises(mapper.ControlMapError) as exc_info:
+        mapper.ControlMap.from_config(config)
+    errors = str(exc_info.value).splitlines()[1:]
+    assert errors == [
+        "controls.note:0: control must be 'note|cc:<channel>:<number>'",
+        "controls.cc:16:1: control must be 'note|cc:<channel>:<number>'",
+        "controls.note:0:1: unknown element 'NOPE'",
+        "controls.note:0:2: unknown mode 'x'",
+        "controls.cc:0:3: range must be [low, high] and scale a number",
+        "controls.cc:0:4: unknown fields ['speed']",
+        "controls.cc:0:5: binding needs a component and an element",
+        "controls.cc:0:6: binding must be a table",
+    ]
+    with pytest.raises(mapper.ControlMapError):
+        mapper.ControlMap.from_config({})
+
+
+def test_load(tmp_path, control_config_f):
+    toml_path = tmp_path / "controls.toml"
+    toml_path.write_text(
+        "[controls]\n"
+        '"cc:2:1" = { component = "mixer", element = "crossfader", '
+        'field = "position", range = [-1, 1] }\n'
+    )
+    control_map = mapper.load_control_map(str(toml_path))
+    binding = control_map.bindings[(CC, 2, 1)]
+    assert (binding.low, binding.high, binding.field) == (-1.0, 1.0, "position")
+
+    json_path = tmp_path / "controls.json"
+    json_path.write_text(json.dumps(control_config_f))
+    assert len(mapper.load_control_map(str(json_path)).bindings) == 5
+
+    with pytest.raises(mapper.ControlMapError, match="toml or .json"):
+        mapper.load_control_map(str(tmp_path / "controls.yaml"))
+    bad_path = tmp_path / "bad.json"
+    bad_path.write_text("{")
+    with pytest.raises(mapper.ControlMapError, match="Cannot parse"):
+        mapper.load_control_map(str(bad_path))
+
+
+def test_direct(mapper_f, consumer_f):
+    moves = []
+    mapper_f.register_direct(mes.Component.LEFT_DECK, mes.Element.JOG, moves.append)
+    sent = mapper_f.map(
+        [Frame(CC, 0, 16, 1)] * 4 + [Frame(NOTE, 0, 36, 127), Frame(CC, 0, 16, 127)]
+    )
+    assert moves == [1.5]
+    # Only the button is sent as a message.
+    assert sent == 1
+    assert [c.element for c in contents(consumer_f)] == [mes.Element.CUE]
@@ -0,0 +1,195 @@
+import os
+import time
+import logging
+import threading
+import pytest
+import serial
+from unittest import mock
+from freejay.clock.timerwheel import TimerWheel
+from freejay.player.player import IPlayer
+from freejay.player.djplayer import DJPlayer
+from freejay.player.scratch import JogWheel
+from freejay.messages import messages as mes
+from freejay.messages import produce_consume as prodcon
+from freejay.hardware import frames
+from freejay.hardware.frames import Frame, NOTE, CC
+from freejay.hardware.mapper import ControlMapper
+from freejay.hardware.serial_input import SerialInput, open_serial_input
+
+
+@pytest.fixture
+def consumer_f():
+    class ConsumerFixture(prodcon.Consumer):
+        def __init__(self):
+            self.messages = []
+
+        def on_message_recieved(self, message):
+            self.messages.append(message)
+
+    return ConsumerFixture()
+
+
+@pytest.fixture
+def pty_f():
+    """Pseudo-terminal standing in for a serial controller, (master fd, device)."""
+    master, slave = os.openpty()
+    yield master, os.ttyname(slave)
+    os.close(master)
+    os.close(slave)
+
+
+@pytest.fixture
+def input_f(pty_f, consumer_f):
+    serial_input = open_serial_input(pty_f[1])
+    consumer_f.listen(serial_input.mapper)
+    yield serial_input
+    if serial_input.port.is_open:
+        serial_input.stop()
+
+
+def replay(master: int, recording: list):
+    """Write recorded frames to the controller at full speed."""
+    data = b"".join(frames.encode(frame) for frame in recording)
+    threading.Thread(target=os.write, args=(master, data), daemon=True).start()
+
+
+def wait_for_frames(serial_input: SerialInput, count: int, timeout: float = 10):
+    deadline = time.perf_counter() + timeout
+    while serial_input.stats.frames < count and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    assert serial_input.stats.frames == count
+
+
+def recording():
+    """Cue tap, fader sweeps and jog wheel spins, then a play tap."""
+    recorded = [Frame(NOTE, 0, 36, 127), Frame(NOTE, 0, 36, 0)]
+    for _ in range(5):
+        recorded += [Frame(CC, 1, 7, value) for value in range(128)]
+    recorded += [Frame(CC, 0, 16, 1)] * 400 + [Frame(CC, 0, 16, 126)] * 50
+    recorded += [Frame(NOTE, 0, 37, 127), Frame(NOTE, 0, 37, 0)]
+    return recorded
+
+
+def test_replay(pty_f, input_f, consumer_f):
+    recorded = recording()
+    input_f.start()
+    assert input_f.running
+    replay(pty_f[0], recorded)
+    wait_for_frames(input_f, len(recorded))
+    input_f.stop()
+    assert not input_f.running
+    assert not input_f.port.is_open
+
+    assert input_f.stats.bytes_read == 3 * len(recorded)
+    messages = consumer_f.messages
+    assert input_f.stats.messages == len(messages)
+    assert all(m.sender.source == mes.Source.HARDWARE for m in messages)
+    # Buttons are delivered in order.
+    buttons = [
+        (m.content.element, m.content.press_release)
+        for m in messages
+        if m.content.element in (mes.Element.CUE, mes.Element.PLAY_PAUSE)
+    ]
+    assert buttons == [
+        (mes.Element.CUE, mes.PressRelease.PRESS),
+        (mes.Element.CUE, mes.PressRelease.RELEASE),
+        (mes.Element.PLAY_PAUSE, mes.PressRelease.PRESS),
+        (mes.Element.PLAY_PAUSE, mes.PressRelease.RELEASE),
+    ]
+    # Fader and jog frames are coalesced, keeping the final position.
+    faders = [m for m in messages if m.content.element == mes.Element.CHANNEL_FADER]
+    assert 0 < len(faders) < 5 * 128
+    assert faders[-1].content.data == {"value": 1.0}
+    jogs = [
+        m.content.data["value"]
+        for m in messages
+        if m.content.element == mes.Element.JOG
+        and m.content.press_release == mes.PressRelease.PRESS
+    ]
+    assert 0 < len(jogs) < 450
+    assert sum(jogs) == pytest.approx((400 - 2 * 50) * 0.05)
+    assert input_f.stats.messages < len(recorded)
+
+
+def test_first_frame_immediate(pty_f, input_f, consumer_f):
+    input_f.interval = 1.0
+    input_f.start()
+    start = time.perf_counter()
+    replay(pty_f[0], [Frame(NOTE, 0, 36, 127)])
+    wait_for_frames(input_f, 1)
+    assert time.perf_counter() - start < 0.5
+    assert consumer_f.messages[0].content.element == mes.Element.CUE
+
+
+def test_read_error(caplog):
+    class FailingPort(serial.SerialBase):
+        name = "failing"
+
+        def read(self, size=1):
+            raise serial.SerialException("unplugged")
+
+        def close(self):
+            pass
+
+    serial_input = SerialInput(FailingPort(), ControlMapper())
+    serial_input.start()
+    time.sleep(0.05)
+    assert not serial_input.running
+    assert "Controller read failed" in caplog.text
+    serial_input.stop()
+
+
+@pytest.mark.benchmark
+def test_replay_throughput(pty_f, input_f, caplog):
+    caplog.set_level(logging.INFO)
+    recorded = recording() * 50
+    input_f.mapper.send_message = lambda message: None
+    input_f.start()
+    start = time.perf_counter()
+    replay(pty_f[0], recorded)
+    wait_for_frames(input_f, len(recorded))
+    elapsed = time.perf_counter() - start
+    stats = input_f.stats
+    logging.info(
+        "Replayed %d frames: %.0f frames/s, %d batches, %d messages",
+        stats.frames,
+        stats.frames / elapsed,
+        stats.batches,
+        stats.messages,
+    )
+    assert stats.frames / elapsed > 10_000
+    assert stats.messages < stats.frames / 2
+
+
+@pytest.mark.benchmark
+def test_jog_latency(pty_f, input_f, caplog):
+    """Measure the latency from a jog frame written to the player seeking."""
+    caplog.set_level(logging.INFO)
+    player = mock.create_autospec(IPlayer, instance=True)
+    player.playing = False
+    seeked = threading.Event()
+    player.seek.side_effect = lambda *args, **kwargs: seeked.set()
+    wheel = TimerWheel()
+    jog_wheel = JogWheel(DJPlayer(player), wheel)
+    input_f.mapper.register_direct(
+        mes.Component.LEFT_DECK, mes.Element.JOG, jog_wheel.move
+    )
+    input_f.start()
+    latencies = []
+    for _ in range(100):
+        seeked.clear()
+        start = time.perf_counter()
+        os.write(pty_f[0], frames.encode(Frame(CC, 0, 16, 1)))
+        assert seeked.wait(1)
+        latencies.append(time.perf_counter() - start)
+        # Wait for the jog wheel to go idle, so each frame is a first movement.
+        time.sleep(jog_wheel.release + 0.01)
+    wheel.stop()
+    latencies.sort()
+    logging.info(
+        "Jog frame to player seek: p50 %.2f ms, p99 %.2f ms (jog wheel p50 %.2f ms)",
+        latencies[50] * 1000,
+        latencies[99] * 1000,
+        jog_wheel.latency.percentile(50) * 1000,
+    )
+    assert latencies[50] < 0.01
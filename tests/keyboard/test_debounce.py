@@ -0,0 +1,134 @@
+import time
+import threading
+from unittest import mock
+import pytest
+from freejay.keyboard import debounce
+from freejay.messages import messages as mes
+
+TIMEOUT = 0.05
+
+
+@pytest.fixture
+def keyboard_f(wheel_f):
+    """Debounce keys, recording (key, time) of debounced events."""
+    events = {"pressed": [], "released": []}
+    keyboard = debounce.KeyBoardDebouncer(
+        getkey=lambda key: key,
+        pressed_cb=lambda key: events["pressed"].append((key, time.perf_counter())),
+        released_cb=lambda key: events["released"].append((key, time.perf_counter())),
+        released_timeout=TIMEOUT,
+        wheel=wheel_f,
+    )
+    keyboard.events = events
+    return keyboard
+
+
+def test_press_release(keyboard_f):
+    keyboard_f.pressed("a")
+    released = time.perf_counter()
+    keyboard_f.released("a")
+    assert [key for key, _ in keyboard_f.events["pressed"]] == ["a"]
+    assert keyboard_f.events["released"] == []
+    time.sleep(TIMEOUT * 3)
+    ((key, fired),) = keyboard_f.events["released"]
+    assert key == "a"
+    assert fired - released >= TIMEOUT
+
+
+def test_repeat_debounced(keyboard_f):
+    for _ in range(5):
+        keyboard_f.pressed("a")
+        keyboard_f.released("a")
+        time.sleep(TIMEOUT / 5)
+    time.sleep(TIMEOUT * 3)
+    assert len(keyboard_f.events["pressed"]) == 1
+    assert len(keyboard_f.events["released"]) == 1
+
+
+def test_release_rescheduled(keyboard_f, wheel_f):
+    keyboard_f.pressed("a")
+    keyboard_f.released("a")
+    keyboard_f.released("a")
+    assert len(wheel_f) == 1
+    time.sleep(TIMEOUT * 3)
+    assert len(keyboard_f.events["released"]) == 1
+
+
+def test_stale_timer_ignored(wheel_f):
+    released_cb = mock.Mock()
+    debouncer = debounce.Debouncer(mock.Mock(), released_cb, wheel=wheel_f)
+    debouncer.pressed("a")
+    debouncer.released("a")
+    timer = debouncer.key_released_timer
+    # The timer is due as the key is pressed again.
+    debouncer.pressed("a")
+    timer.callback(*timer.args)
+    released_cb.assert_not_called()
+    assert debouncer.key_pressed
+
+
+def test_keys_share_wheel(keyboard_f, wheel_f):
+    for key in "abc":
+        keyboard_f.pressed(key)
+        keyboard_f.released(key)
+    assert {d.wheel for d in keyboard_f.debouncer.values()} == {wheel_f}
+    assert len(wheel_f) == 3
+
+
+def test_message_debouncer(wheel_f):
+    debouncer = debounce.MessageDebouncer(wheel=wheel_f)
+    debouncer.register_consumer(mock.Mock())
+
+    def message(press_release):
+        return mes.Message(
+            sender=mes.Sender(source=mes.Source.PLAYER_VIEW, trigger=mes.Trigger.KEY),
+            content=mes.Key(press_release=press_release, sym="q"),
+        )
+
+    press = message(mes.PressRelease.PRESS)
+    release = message(mes.PressRelease.RELEASE)
+    for _ in range(3):
+        debouncer.on_message_recieved(press)
+        debouncer.on_message_recieved(release)
+    time.sleep(TIMEOUT * 3)
+    assert [c.args[0] for c in debouncer.consumer.call_args_list] == [press, release]
+
+
+@pytest.mark.slow
+def test_held_keys_auto_repeat(keyboard_f):
+    """Hold 10 keys with 30 Hz auto-repeat for 10 s, then release them."""
+    keys = [f"key{i}" for i in range(10)]
+    interval = 1 / 30
+    threads = threading.active_count()
+    max_threads = threads
+
+    for key in keys:
+        keyboard_f.pressed(key)
+    start = time.perf_counter()
+    repeat = 0
+    while time.perf_counter() - start < 10:
+        repeat += 1
+        for i, key in enumerate(keys):
+            # Auto-repeat sends release, press pairs. Keys repeat out of phase.
+            time.sleep(
+                max(0, start + (repeat + i / 10) * interval - time.perf_counter())
+            )
+            keyboard_f.released(key)
+            keyboard_f.pressed(key)
+        max_threads = max(max_threads, threading.active_count())
+
+    released = {}
+    for key in keys:
+        released[key] = time.perf_counter()
+        keyboard_f.released(key)
+        time.sleep(0.005)
+    time.sleep(TIMEOUT * 4)
+
+    assert len(keyboard_f.events["pressed"]) == len(keys)
+    assert sorted(key for key, _ in keyboard_f.events["released"]) == sorted(keys)
+    # A single timer wheel thread for all keys.
+    assert max_threads <= threads + 1
+    assert threading.active_count() <= threads + 1
+    # Released once the timeout expires, within a few wheel ticks.
+    for key, fired in keyboard_f.events["released"]:
+        assert TIMEOUT <= fired - released[key] < TIMEOUT + 0.01
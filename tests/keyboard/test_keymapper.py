@@ -1,3 +1,6 @@
+import json
+import time
+import logging
 import pytest
 from freejay.messages import messages as mes
 from freejay.messages import produce_consume as prodcon
@@ -9,59 +12,228 @@ from freejay.keyboard import keymapper
 @pytest.fixture
 def consumer_f():
     class ConsumerFixture(prodcon.Consumer):
-        def init(self):
+        def __init__(self):
             self.message = None
+            self.messages = []
 
         def on_message_recieved(self, message):
             self.message = message
+            self.messages.append(message)
 
     return ConsumerFixture()
 
 
-# Construct message for use in tests
-@pytest.fixture
-def message_f():
-    msg = mes.Message(
+def key_message(sym, press_release=mes.PressRelease.PRESS):
+    return mes.Message(
         sender=mes.Sender(source=mes.Source.PLAYER_VIEW, trigger=mes.Trigger.KEY),
-        content=mes.Key(press_release=mes.PressRelease.PRESS, sym="q"),
+        content=mes.Key(press_release=press_release, sym=sym),
         type=mes.Type.KEY,
     )
-    return msg
+
+
+# Construct message for use in tests
+@pytest.fixture
+def message_f():
+    return key_message("q")
 
 
 @pytest.fixture
-def keybindings_f():
-    keybindings = {
-        "q": {
-            "name": "cue-left",
-            "content_type": mes.Button,
-            "type": mes.Type.BUTTON,
-            "content": {
-                "component": mes.Component.LEFT_DECK,
-                "element": mes.Element.CUE,
+def keymap_config_f():
+    return {
+        "profile": "left",
+        "profiles": {
+            "left": {
+                "q": {"name": "cue-left", "component": "LEFT_DECK", "element": "CUE"},
+                "w": {
+                    "name": "play_pause-left",
+                    "component": "LEFT_DECK",
+                    "element": "PLAY_PAUSE",
+                },
+                "e": {
+                    "component": "LEFT_DECK",
+                    "element": "NUDGE",
+                    "data": {"value": -0.1},
+                },
+                "Tab": {"profile": "right"},
             },
-        },
-        "w": {
-            "name": "play_pause-left",
-            "content_type": mes.Button,
-            "type": mes.Type.BUTTON,
-            "content": {
-                "component": mes.Component.LEFT_DECK,
-                "element": mes.Element.PLAY_PAUSE,
+            "right": {
+                "q": {"component": "RIGHT_DECK", "element": "CUE"},
+                "Tab": {"profile": "left"},
             },
         },
     }
-    return keybindings
 
 
 @pytest.fixture
-def key_mapper_f(keybindings_f):
-    key_mapper = keymapper.KeyMapper(keybindings=keybindings_f)
+def key_mapper_f(keymap_config_f, consumer_f):
+    key_mapper = keymapper.KeyMapper(keymapper.Keymap.from_config(keymap_config_f))
+    consumer_f.listen(key_mapper)
     return key_mapper
 
 
 def test_key_mapper(key_mapper_f, message_f, consumer_f):
-    consumer_f.listen(key_mapper_f)
     key_mapper_f(message_f)
     mapped_message = consumer_f.message
     assert mapped_message.content.element == mes.Element.CUE
+
+
+def test_mapped_message(key_mapper_f, consumer_f):
+    message = key_message("e", mes.PressRelease.RELEASE)
+    key_mapper_f(message)
+    assert consumer_f.message.sender == mes.Sender(
+        source=mes.Source.KEY_MAPPER, trigger=mes.Trigger.KEY
+    )
+    assert consumer_f.message.content == mes.Button(
+        press_release=mes.PressRelease.RELEASE,
+        component=mes.Component.LEFT_DECK,
+        element=mes.Element.NUDGE,
+        data={"value": -0.1},
+    )
+    assert consumer_f.message.type == mes.Type.BUTTON
+    # The key message is not modified.
+    assert message.sender.source == mes.Source.PLAYER_VIEW
+
+
+def test_data_not_shared(key_mapper_f, consumer_f):
+    key_mapper_f(key_message("e"))
+    consumer_f.message.content.data["value"] = 1
+    key_mapper_f(key_message("e"))
+    assert consumer_f.message.content.data == {"value": -0.1}
+
+
+def test_unbound_key(key_mapper_f, consumer_f, caplog):
+    caplog.set_level(logging.INFO)
+    key_mapper_f(key_message("z"))
+    assert consumer_f.message is None
+    assert "No keybinding registered for 'z'" in caplog.text
+
+
+def test_not_key_message(key_mapper_f):
+    with pytest.raises(TypeError):
+        key_mapper_f(
+            mes.Message(
+                sender=mes.Sender(mes.Source.PLAYER_VIEW, mes.Trigger.BUTTON),
+                content=mes.Button(
+                    mes.PressRelease.PRESS, mes.Component.LEFT_DECK, mes.Element.CUE
+                ),
+            )
+        )
+
+
+def test_switch_profile(key_mapper_f, consumer_f):
+    assert key_mapper_f.profile == "left"
+    key_mapper_f(key_message("Tab"))
+    key_mapper_f(key_message("Tab", mes.PressRelease.RELEASE))
+    assert key_mapper_f.profile == "right"
+    key_mapper_f(key_message("q"))
+    assert consumer_f.message.content.component == mes.Component.RIGHT_DECK
+    # Profile switches send no messages.
+    assert len(consumer_f.messages) == 1
+    key_mapper_f.set_profile("left")
+    key_mapper_f(key_message("q"))
+    assert consumer_f.message.content.component == mes.Component.LEFT_DECK
+    with pytest.raises(keymapper.KeymapError):
+        key_mapper_f.set_profile("missing")
+
+
+def test_default_keymap(consumer_f):
+    key_mapper = keymapper.KeyMapper()
+    consumer_f.listen(key_mapper)
+    assert set(key_mapper.keymap.profiles) == {"left", "right"}
+    key_mapper(key_message("w"))
+    assert consumer_f.message.content.element == mes.Element.PLAY_PAUSE
+
+
+def test_set_keymap(key_mapper_f, consumer_f):
+    keymap = keymapper.Keymap.from_config(
+        {"profiles": {"main": {"q": {"component": "MIXER", "element": "CROSSFADER"}}}}
+    )
+    with pytest.raises(keymapper.KeymapError):
+        key_mapper_f.set_keymap(keymap, profile="left")
+    assert key_mapper_f.profile == "left"
+    key_mapper_f.set_keymap(keymap)
+    key_mapper_f(key_message("q"))
+    assert consumer_f.message.content.element == mes.Element.CROSSFADER
+    assert key_mapper_f.profile == "main"
+
+
+def test_invalid_config():
+    config = {
+        "profile": "missing",
+        "profiles": {
+            "left": {
+                "q": {"component": "LEFT_DECK", "element": "NOPE"},
+                "w": {"component": "LEFT_DECK"},
+                "e": {"component": "LEFT_DECK", "element": "CUE", "colour": "red"},
+                "r": {"component": "LEFT_DECK", "element": "CUE", "data": 1},
+                "t": {"profile": "other"},
+                "y": "CUE",
+            }
+        },
+    }
+    with pytest.raises(keymapper.KeymapError) as exc_info:
+        keymapper.Keymap.from_config(config)
+    errors = str(exc_info.value).splitlines()[1:]
+    assert errors == [
+        "profiles.left.q: unknown element 'NOPE'",
+        "profiles.left.w: binding needs a component and an element",
+        "profiles.left.e: unknown fields ['colour']",
+        "profiles.left.r: data must be a table",
+        "profiles.left.t: unknown profile 'other'",
+        "profiles.left.y: binding must be a table",
+        "profile: unknown profile 'missing'",
+    ]
+    with pytest.raises(keymapper.KeymapError):
+        keymapper.Keymap.from_config({"profiles": {}})
+
+
+def test_load_toml(tmp_path, consumer_f):
+    path = tmp_path / "keymap.toml"
+    path.write_text(
+        "[profiles.main]\n"
+        'j = { component = "right_deck", element = "nudge", data = { value = 0.1 } }\n'
+        '1 = { profile = "main" }\n'
+    )
+    keymap = keymapper.load_keymap(str(path))
+    assert keymap.profile == "main"
+    assert set(keymap.profiles["main"]) == {"j", "1"}
+    key_mapper = keymapper.KeyMapper(keymap)
+    consumer_f.listen(key_mapper)
+    key_mapper(key_message("j"))
+    assert consumer_f.message.content.data == {"value": 0.1}
+
+
+def test_load_json(tmp_path, keymap_config_f):
+    path = tmp_path / "keymap.json"
+    path.write_text(json.dumps(keymap_config_f))
+    keymap = keymapper.load_keymap(str(path))
+    assert set(keymap.profiles) == {"left", "right"}
+
+
+def test_load_errors(tmp_path):
+    bad_toml = tmp_path / "keymap.toml"
+    bad_toml.write_text("[profiles\n")
+    with pytest.raises(keymapper.KeymapError, match="Cannot parse"):
+        keymapper.load_keymap(str(bad_toml))
+    with pytest.raises(keymapper.KeymapError, match="toml or .json"):
+        keymapper.load_keymap(str(tmp_path / "keymap.yaml"))
+    with pytest.raises(OSError):
+        keymapper.load_keymap(str(tmp_path / "missing.toml"))
+
+
+@pytest.mark.benchmark
+def test_mapping_throughput(key_mapper_f, consumer_f, caplog):
+    caplog.set_level(logging.INFO)
+    messages = [
+        key_message(sym, press_release)
+        for sym in "qwe"
+        for press_release in mes.PressRelease
+    ] * 20_000
+    consumer_f.on_message_recieved = lambda message: None
+    start = time.perf_counter()
+    for message in messages:
+        key_mapper_f.map(message)
+    elapsed = time.perf_counter() - start
+    rate = len(messages) / elapsed
+    logging.info("Mapped %d key messages: %.0f messages/s", len(messages), rate)
+    assert rate > 20_000
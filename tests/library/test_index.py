@@ -0,0 +1,232 @@
+import os
+import time
+import wave
+import struct
+import random
+import shutil
+import logging
+import statistics
+from unittest import mock
+import pytest
+from freejay.library import index
+from tests.library.test_tags import TRACK, FRAME_HEADER
+
+
+def write_mp3(path, seconds=1):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Constant bitrate, 128 kbit/s.
+    path.write_bytes(FRAME_HEADER + bytes(16_000 * seconds - 4))
+    return str(path)
+
+
+@pytest.fixture
+def music_f(tmp_path):
+    music = tmp_path / "music"
+    write_mp3(music / "Artist One - First Song.mp3")
+    write_mp3(music / "Artist Two - Second Song.mp3", seconds=2)
+    write_mp3(music / "album" / "Artist Two - Third Track.mp3")
+    shutil.copy(TRACK, music / "album")
+    (music / "notes.txt").write_text("not audio")
+    return music
+
+
+@pytest.fixture
+def library_f(tmp_path, music_f):
+    library = index.Library(str(tmp_path / "library.db"), directories=[str(music_f)])
+    yield library
+    library.close()
+
+
+def paths(tracks):
+    return [os.path.basename(track.path) for track in tracks]
+
+
+def test_scan(library_f, music_f):
+    stats = library_f.scan()
+    assert (stats.files, stats.added, stats.unchanged) == (4, 4, 0)
+    assert len(library_f) == 4
+    track = library_f.get(str(music_f / "Artist Two - Second Song.mp3"))
+    assert track == index.Track(
+        path=str(music_f / "Artist Two - Second Song.mp3"),
+        format="mp3",
+        duration=pytest.approx(2),
+        title="Second Song",
+        artist="Artist Two",
+        album="",
+    )
+
+
+def test_search(library_f):
+    library_f.scan()
+    assert paths(library_f.search("mercury")) == ["HoliznaCC0 - Mercury.mp3"]
+    # Every word matches as a prefix, in any column.
+    assert paths(library_f.search("holi merc")) == ["HoliznaCC0 - Mercury.mp3"]
+    assert sorted(paths(library_f.search("artist tw"))) == [
+        "Artist Two - Second Song.mp3",
+        "Artist Two - Third Track.mp3",
+    ]
+    # Title matches rank above artist matches.
+    assert paths(library_f.search("t"))[0] == "Artist Two - Third Track.mp3"
+    assert len(library_f.search("song", limit=1)) == 1
+    assert library_f.search("nothing") == []
+    # FTS5 query syntax is not interpreted.
+    assert library_f.search(' " * ( NOT ') == []
+    assert paths(library_f.search('"first" so*')) == ["Artist One - First Song.mp3"]
+
+
+def test_search_ranks_every_match(library_f):
+    """The best match is found among many, whatever its position in the index."""
+    tracks = [
+        index.Track(f"/music/{i}.mp3", "mp3", None, f"Song {i}", "Zed", "")
+        for i in range(1500)
+    ]
+    tracks.append(index.Track("/music/best.mp3", "mp3", None, "Zed", "", ""))
+    library_f.add((track, (i, i, i)) for i, track in enumerate(tracks))
+    assert paths(library_f.search("zed", limit=1)) == ["best.mp3"]
+    assert len(library_f.search("ze", limit=100)) == 100
+
+
+def test_rescan_unchanged(library_f):
+    library_f.scan()
+    with mock.patch.object(index.tags_, "read_tags") as m_read_tags:
+        stats = library_f.scan()
+    m_read_tags.assert_not_called()
+    assert (stats.files, stats.unchanged) == (4, 4)
+
+
+def test_rescan_changes(library_f, music_f):
+    library_f.scan()
+    changed = music_f / "Artist One - First Song.mp3"
+    write_mp3(changed, seconds=3)
+    os.utime(changed, ns=(0, time.time_ns() + 10**9))
+    (music_f / "Artist Two - Second Song.mp3").unlink()
+    write_mp3(music_f / "new" / "New - Track.mp3")
+    with mock.patch.object(
+        index.tags_, "read_tags", wraps=index.tags_.read_tags
+    ) as m_read_tags:
+        stats = library_f.scan()
+    assert sorted(os.path.basename(c.args[0]) for c in m_read_tags.call_args_list) == [
+        "Artist One - First Song.mp3",
+        "New - Track.mp3",
+    ]
+    assert (stats.added, stats.updated, stats.removed, stats.unchanged) == (1, 1, 1, 2)
+    assert library_f.get(str(changed)).duration == pytest.approx(3)
+    assert library_f.search("second") == []
+    assert paths(library_f.search("new")) == ["New - Track.mp3"]
+
+
+def test_rescan_moved(library_f, music_f):
+    library_f.scan()
+    os.rename(music_f / "album", music_f / "renamed")
+    with mock.patch.object(index.tags_, "read_tags") as m_read_tags:
+        stats = library_f.scan()
+    m_read_tags.assert_not_called()
+    assert (stats.moved, stats.removed) == (2, 0)
+    (track,) = library_f.search("third")
+    assert track.path == str(music_f / "renamed" / "Artist Two - Third Track.mp3")
+
+
+def test_scan_other_directory(library_f, music_f, tmp_path):
+    library_f.scan()
+    write_mp3(tmp_path / "other" / "Other - Track.mp3")
+    stats = library_f.scan([str(tmp_path / "other")])
+    # Tracks outside the scanned directory are kept.
+    assert (stats.added, stats.removed) == (1, 0)
+    assert len(library_f) == 5
+
+
+def test_unreadable_file(library_f, music_f, caplog):
+    with mock.patch.object(
+        index.tags_, "read_tags", side_effect=PermissionError("denied")
+    ):
+        stats = library_f.scan()
+    assert (stats.failed, stats.unchanged) == (4, 0)
+    assert "Cannot read" in caplog.text
+    # Retried on the next scan.
+    assert library_f.scan().added == 4
+
+
+def test_corrupt_file(library_f, music_f):
+    path = music_f / "corrupt.wav"
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(44100)
+        wav.writeframes(bytes(4000))
+    data = bytearray(path.read_bytes())
+    # A fmt chunk longer than the file.
+    data[16:20] = struct.pack("<I", 0x01970000)
+    path.write_bytes(bytes(data))
+    # Any error reading a file counts it as failed, without aborting the scan.
+    with mock.patch.object(index.tags_, "read_tags", side_effect=RuntimeError):
+        assert library_f.scan().failed == 5
+    stats = library_f.scan()
+    assert (stats.files, stats.added, stats.failed) == (5, 5, 0)
+    assert paths(library_f.search("corrupt")) == ["corrupt.wav"]
+
+
+def test_persistent(library_f, tmp_path):
+    library_f.scan()
+    library_f.close()
+    library = index.Library(str(tmp_path / "library.db"))
+    try:
+        assert paths(library.search("mercury")) == ["HoliznaCC0 - Mercury.mp3"]
+    finally:
+        library.close()
+
+
+def test_main(tmp_path, music_f, capsys):
+    index.main([str(tmp_path / "library.db"), "--scan", str(music_f)])
+    index.main([str(tmp_path / "library.db"), "--search", "merc"])
+    assert "HoliznaCC0 - Mercury (mp3)" in capsys.readouterr().out
+
+
+@pytest.mark.benchmark
+def test_search_benchmark(caplog):
+    caplog.set_level(logging.INFO)
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = [
+        "".join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+        for _ in range(3000)
+    ]
+
+    def words(count):
+        return " ".join(rng.choice(vocabulary) for _ in range(count))
+
+    library = index.Library(":memory:")
+    library.add(
+        (
+            index.Track(
+                path=f"/music/{i}/{words(2)}.mp3",
+                format="mp3",
+                duration=180.0,
+                title=words(rng.randint(1, 4)),
+                artist=words(rng.randint(1, 2)),
+                album=words(2),
+            ),
+            (i, i, i),
+        )
+        for i in range(50_000)
+    )
+    library.optimize()
+
+    # Type queries a letter at a time.
+    times = []
+    for _ in range(100):
+        query = f"{rng.choice(vocabulary)} {rng.choice(vocabulary)}"
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            library.search(query[:end])
+            times.append(time.perf_counter() - start)
+    library.close()
+    p50 = statistics.median(times) * 1000
+    p99 = statistics.quantiles(times, n=100)[98] * 1000
+    logging.info(
+        "Search 50k tracks, %d queries: p50 %.2f ms, p99 %.2f ms, max %.2f ms",
+        len(times),
+        p50,
+        p99,
+        max(times) * 1000,
+    )
+    assert p99 < 10
@@ -0,0 +1,105 @@
+import os
+import wave
+import struct
+import pytest
+from freejay.library import tags
+
+TRACK = os.path.join(
+    os.path.dirname(__file__), "..", "..", "assets", "HoliznaCC0 - Mercury.mp3"
+)
+# MPEG 1 layer 3, 128 kbit/s, 44.1 kHz, joint stereo.
+FRAME_HEADER = b"\xff\xfb\x90\x64"
+
+
+def id3(frames, version=3):
+    body = b""
+    for frame_id, text in frames.items():
+        data = b"\x03" + text.encode("utf-8")
+        body += frame_id.encode() + len(data).to_bytes(4, "big") + b"\x00\x00" + data
+    body += bytes(20)  # Padding.
+    size = len(body)
+    syncsafe = bytes((size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3" + bytes((version, 0, 0)) + syncsafe + body
+
+
+def test_mp3_xing(tmp_path):
+    xing = b"Xing" + (1).to_bytes(4, "big") + (1000).to_bytes(4, "big")
+    frame = FRAME_HEADER + bytes(32) + xing
+    path = tmp_path / "file.mp3"
+    path.write_bytes(
+        id3({"TIT2": "Title", "TPE1": "Artist", "TALB": "Album"}) + frame + bytes(417)
+    )
+    assert tags.read_tags(str(path)) == tags.Tags(
+        format="mp3",
+        duration=pytest.approx(1000 * 1152 / 44100),
+        title="Title",
+        artist="Artist",
+        album="Album",
+    )
+
+
+def test_mp3_constant_bitrate(tmp_path):
+    path = tmp_path / "Artist - Title.mp3"
+    # One second at 128 kbit/s.
+    path.write_bytes(FRAME_HEADER + bytes(16_000 - 4))
+    track = tags.read_tags(str(path))
+    assert track.duration == pytest.approx(1.0)
+    assert (track.artist, track.title) == ("Artist", "Title")
+
+
+def test_mp3_asset():
+    track = tags.read_tags(TRACK)
+    assert track.format == "mp3"
+    assert track.duration == pytest.approx(119.2, abs=0.1)
+    assert (track.artist, track.title) == ("HoliznaCC0", "Mercury")
+
+
+def test_flac(tmp_path):
+    info = (44100 << 44) | (1 << 41) | (15 << 36) | 44100 * 3
+    streaminfo = bytes(10) + info.to_bytes(8, "big") + bytes(16)
+    comments = [b"TITLE=Title", b"artist=Artist"]
+    vorbis = struct.pack("<I", 6) + b"vendor" + struct.pack("<I", len(comments))
+    for comment in comments:
+        vorbis += struct.pack("<I", len(comment)) + comment
+    data = (
+        b"fLaC"
+        + bytes((0,))
+        + len(streaminfo).to_bytes(3, "big")
+        + streaminfo
+        + bytes((0x84,))
+        + len(vorbis).to_bytes(3, "big")
+        + vorbis
+    )
+    path = tmp_path / "file.flac"
+    path.write_bytes(data)
+    track = tags.read_tags(str(path))
+    assert track.duration == pytest.approx(3)
+    assert (track.title, track.artist, track.album) == ("Title", "Artist", "")
+
+
+def test_wav_info(tmp_path):
+    path = tmp_path / "file.wav"
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(8000)
+        wav.writeframes(bytes(2 * 4000))
+    info = b"INAM" + struct.pack("<I", 6) + b"Title\x00"
+    chunk = b"LIST" + struct.pack("<I", 4 + len(info)) + b"INFO" + info
+    data = bytearray(path.read_bytes() + chunk)
+    data[4:8] = struct.pack("<I", len(data) - 8)
+    path.write_bytes(bytes(data))
+    track = tags.read_tags(str(path))
+    assert track.duration == pytest.approx(0.5)
+    assert track.title == "Title"
+
+
+def test_malformed(tmp_path):
+    path = tmp_path / "broken.flac"
+    path.write_bytes(b"fLaC\x84\xff\xff\xff")
+    assert tags.read_tags(str(path)) == tags.Tags(format="flac", title="broken")
+
+
+def test_is_audio():
+    assert tags.is_audio("a/b.MP3")
+    assert not tags.is_audio("a/b.txt")
@@ -99,3 +99,43 @@ def test_make_button_cb_cb_calls_correct_no_data():
     test_cb(msg)
     mocker1.assert_called_once()
     mocker2.assert_called_once_with()
+
+
+def test_make_quantised_cb_schedules_press():
+    cb = mock.Mock()
+    scheduler = mock.Mock()
+    test_cb = factories.make_quantised_cb(cb, scheduler)
+    msg = mes.Message(
+        sender=mes.Sender(source=mes.Source.PLAYER_VIEW, trigger=mes.Trigger.BUTTON),
+        content=mes.Button(
+            press_release=mes.PressRelease.PRESS,
+            component=mes.Component.LEFT_DECK,
+            element=mes.Element.LOOP,
+            data={"beats": 4, "quantise": "bar"},
+        ),
+    )
+    test_cb(msg)
+    cb.assert_not_called()
+    scheduled_cb, quantise, scheduled = scheduler.schedule.call_args.args
+    assert scheduled_cb is cb
+    assert quantise == "bar"
+    assert scheduled.content.data == {"beats": 4}
+    # Original message is unchanged.
+    assert msg.content.data == {"beats": 4, "quantise": "bar"}
+
+
+def test_make_quantised_cb_calls_unquantised():
+    cb = mock.Mock()
+    scheduler = mock.Mock()
+    test_cb = factories.make_quantised_cb(cb, scheduler)
+    msg = mes.Message(
+        sender=mes.Sender(source=mes.Source.PLAYER_VIEW, trigger=mes.Trigger.BUTTON),
+        content=mes.Button(
+            press_release=mes.PressRelease.PRESS,
+            component=mes.Component.LEFT_DECK,
+            element=mes.Element.CUE_JUMP,
+        ),
+    )
+    test_cb(msg)
+    cb.assert_called_once_with(msg)
+    scheduler.schedule.assert_not_called()
@@ -1,4 +1,5 @@
 import pytest
+import time
 import queue
 import threading
 import retry
@@ -148,3 +149,28 @@ def test_worker_running_multi_thread(handler_f, msg):
 
     assert_returns_true_false(lambda: handler_f.count == 3, True)
     t_worker.stop()
+
+
+def test_work_manager_join(msg):
+    handled = []
+    started = threading.Event()
+
+    def slow_handler(message):
+        started.set()
+        time.sleep(0.1)
+        handled.append(message)
+
+    manager = worker.WorkManager()
+    manager.add_worker(
+        worker.Worker(worker.WorkCycle(queue.Queue(), slow_handler)), "model"
+    )
+    manager.start()
+    manager.put(msg, "model")
+    # The queue is empty while the message is handled, join waits for it.
+    started.wait(1)
+    assert manager.get_queue("model").empty()
+    assert manager.join("model", timeout=5)
+    assert handled == [msg]
+    manager.put(msg, "model")
+    assert not manager.join("model", timeout=0.01)
+    manager.stop()
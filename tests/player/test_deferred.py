@@ -0,0 +1,68 @@
+import threading
+from unittest import mock
+import pytest
+from freejay.player.player import IPlayer, FileNotLoaded
+from freejay.player.deferred import DeferredPlayer
+from freejay.player.djplayer import DJPlayer
+
+
+@pytest.fixture
+def make_f():
+    player = mock.create_autospec(IPlayer, instance=True)
+    player.loaded = False
+    player.playing = False
+    return mock.Mock(return_value=player)
+
+
+@pytest.fixture
+def deferred_f(make_f):
+    return DeferredPlayer(make_f)
+
+
+def test_not_made_until_needed(deferred_f, make_f):
+    deck = DJPlayer(deferred_f)
+    deck.speed = 1.1
+    deck.volume = 50
+    deferred_f.set_filter("eq_low", -6.0)
+    deck.loop_off()
+    assert not deck.loaded and not deck.playing
+    assert (deck.volume, deferred_f.speed) == (50, 1.1)
+    with pytest.raises(FileNotLoaded):
+        deferred_f.time_pos
+    with pytest.raises(FileNotLoaded):
+        deferred_f.play()
+    with pytest.raises(KeyError):
+        deferred_f.set_filter("reverb", 1.0)
+    make_f.assert_not_called()
+    assert not deferred_f.ready
+
+
+def test_settings_applied_when_made(deferred_f, make_f, mock_mp4):
+    deferred_f.speed = 1.1
+    deferred_f.volume = 50
+    deferred_f.set_filter("eq_low", -6.0)
+    deferred_f.load(mock_mp4)
+    player = make_f.return_value
+    make_f.assert_called_once_with()
+    assert (player.speed, player.volume) == (1.1, 50)
+    player.set_filter.assert_called_once_with("eq_low", -6.0)
+    player.load.assert_called_once_with(mock_mp4)
+    # Calls are passed straight through once made.
+    player.loaded = True
+    player.time_pos = 12.0
+    deferred_f.speed = 0.9
+    deferred_f.seek(5, reference="relative")
+    assert deferred_f.loaded and deferred_f.time_pos == 12.0
+    assert player.speed == 0.9
+    player.seek.assert_called_once_with(5, reference="relative")
+
+
+def test_made_once(deferred_f, make_f):
+    threads = [threading.Thread(target=deferred_f.get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert deferred_f.ready
+    make_f.assert_called_once_with()
+    assert deferred_f.get() is make_f.return_value
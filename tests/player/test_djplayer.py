@@ -1,4 +1,5 @@
 import pytest
+import threading
 from freejay.player.player import IPlayer
 from freejay.player.djplayer import DJPlayer
 from unittest import mock
@@ -179,6 +180,17 @@ def test_nudge_updated_if_speed_updated(loaded_player_f):
     assert player.speed == 2.0
 
 
+def test_scratch_temp_changes_rate(loaded_player_f):
+    player, djplayer = loaded_player_f
+    djplayer.speed = 2.0
+    djplayer.nudge_press(value=0.5)
+    djplayer.scratch(rate=0.25)
+    assert player.speed == 0.75
+    djplayer.scratch_release()
+    assert player.speed == 3.0
+    assert djplayer.speed == 2.0
+
+
 def test_jog_does_relative_seek(loaded_player_f):
     player, djplayer = loaded_player_f
     djplayer.jog(20)
@@ -190,3 +202,51 @@ def test_volume_updates_player_volume(loaded_player_f):
     player.volume = 100
     djplayer.volume = 50
     assert player.volume == 50
+
+
+def test_loop_needs_bpm(loaded_player_f, caplog):
+    player, djplayer = loaded_player_f
+    djplayer.loop_on()
+    player.loop.assert_not_called()
+    assert "tempo unknown" in caplog.text
+
+
+def test_loop_toggle(loaded_player_f):
+    player, djplayer = loaded_player_f
+    player.time_pos = 10.0
+    djplayer.bpm = 120
+    djplayer.loop_toggle(beats=4)
+    player.loop.assert_called_once_with(10.0, 12.0)
+    assert djplayer.looping
+    djplayer.loop_toggle()
+    player.clear_loop.assert_called_once()
+    assert not djplayer.looping
+
+
+def test_cue_jump_keeps_play_state(loaded_player_f):
+    player, djplayer = loaded_player_f
+    djplayer.cue_jump()
+    player.seek.assert_called_once_with(value=djplayer.time_cue, reference="absolute")
+    player.play.assert_not_called()
+    player.pause.assert_not_called()
+
+
+def test_loaded_and_duration(loaded_player_f):
+    player, djplayer = loaded_player_f
+    player.loaded = True
+    player.time_end = 180.0
+    assert djplayer.loaded
+    assert djplayer.duration == 180.0
+
+
+def test_changes_wait_for_deck_lock(loaded_player_f):
+    player, djplayer = loaded_player_f
+    # E.g. the timer wheel jogging while the model worker holds the deck.
+    jogger = threading.Thread(target=djplayer.jog, args=(1.0,))
+    with djplayer.lock:
+        jogger.start()
+        jogger.join(0.05)
+        assert jogger.is_alive()
+        player.seek.assert_not_called()
+    jogger.join(1)
+    player.seek.assert_called_once_with(1.0, reference="relative")
@@ -0,0 +1,161 @@
+import os
+import time
+import pytest
+import mpv
+from unittest import mock
+from freejay.player import eq
+from freejay.player.player import PlayerMpv, FILTER_DEFAULTS
+from freejay.player.djplayer import DJPlayer
+
+ASSET = os.path.join("assets", "HoliznaCC0 - Mercury.mp3")
+
+
+# Null output standing in for MPV, records filter changes.
+@pytest.fixture
+def recorder_f():
+    class RecordingMpv:
+        def __init__(self):
+            self.af_sets = []
+            self.af_commands = []
+            self.path = "some_path"
+
+        def __setattr__(self, name, value):
+            if name == "af":
+                self.af_sets.append(value)
+            object.__setattr__(self, name, value)
+
+        def af_command(self, label, command, argument):
+            self.af_commands.append((time.perf_counter(), label, command, argument))
+
+    return RecordingMpv()
+
+
+@pytest.fixture
+def channel_f():
+    player = mock.Mock()
+    return player, eq.ChannelEQ(player)
+
+
+def test_gain_sends_filter(channel_f):
+    player, channel = channel_f
+    channel.low = -6
+    player.set_filter.assert_called_once_with("eq_low", -6)
+    assert channel.low == -6
+
+
+def test_gain_unchanged_not_sent(channel_f):
+    player, channel = channel_f
+    channel.mid = 0
+    player.set_filter.assert_not_called()
+
+
+def test_gain_clamped(channel_f):
+    player, channel = channel_f
+    channel.high = 100
+    assert channel.high == eq.EQ_GAIN_MAX
+    channel.high = -100
+    assert channel.high == eq.EQ_GAIN_MIN
+
+
+@pytest.mark.parametrize("value", [float("nan"), None, "x"])
+def test_invalid_ignored(channel_f, value, caplog):
+    player, channel = channel_f
+    channel.low = value
+    channel.filter = value
+    player.set_filter.assert_not_called()
+    assert caplog.records[0].levelname == "WARNING"
+
+
+def test_filter_cutoffs_bypass_at_zero():
+    cutoffs = eq.filter_cutoffs(0)
+    assert cutoffs["highpass"] == FILTER_DEFAULTS["highpass"]
+    assert cutoffs["lowpass"] == FILTER_DEFAULTS["lowpass"]
+
+
+def test_filter_cutoffs_range():
+    assert eq.filter_cutoffs(1)["highpass"] == eq.HIGHPASS_MAX
+    assert eq.filter_cutoffs(-1)["lowpass"] == eq.LOWPASS_MIN
+
+
+def test_filter_sends_one_command_per_update(channel_f):
+    player, channel = channel_f
+    channel.filter = 0.5
+    player.set_filter.assert_called_once_with(
+        "highpass", eq.filter_cutoffs(0.5)["highpass"]
+    )
+
+
+def test_player_filter_uses_af_command(recorder_f):
+    recorder = recorder_f
+    player = PlayerMpv(recorder)
+    player.set_filter("eq_low", -3)
+    assert len(recorder.af_sets) == 1
+    assert recorder.af_commands[0][1:] == ("eq_low", "g", "-3")
+
+
+def test_player_filter_applied_on_load(recorder_f, mock_mp4):
+    recorder = recorder_f
+    recorder.play = mock.Mock()
+    player = PlayerMpv(recorder)
+    recorder.af_command = mock.Mock(side_effect=SystemError)
+    player.set_filter("eq_high", -10.0)
+    recorder.path = str(mock_mp4)
+    player.load(str(mock_mp4))
+    assert "treble=f=8000:g=-10.0" in recorder.af_sets[-1]
+
+
+def test_player_filter_set_after_load(recorder_f, mock_mp4):
+    recorder = recorder_f
+    recorder.play = mock.Mock()
+    player = PlayerMpv(recorder)
+    recorder.path = str(mock_mp4)
+    player.load(str(mock_mp4))
+    # Loaded but not playing, the filters are not initialised yet.
+    recorder.af_command = mock.Mock(side_effect=SystemError)
+    player.set_filter("eq_low", -6.0)
+    assert "bass=f=100:g=-6.0" in recorder.af_sets[-1]
+
+
+@pytest.mark.slow
+def test_filter_sweep_100_per_second(recorder_f):
+    """Sweep the filter at 100 updates/s without rebuilding the filter chain."""
+    recorder = recorder_f
+    channel = eq.ChannelEQ(DJPlayer(PlayerMpv(recorder)))
+    steps = 100
+    start = time.perf_counter()
+    for i in range(steps):
+        channel.filter = -1 + 2 * i / (steps - 1)
+        time.sleep(max(0, start + (i + 1) / 100 - time.perf_counter()))
+
+    # Chain only set on construction, every update sent to the live filter.
+    assert len(recorder.af_sets) == 1
+    assert len(recorder.af_commands) >= steps - 1
+    times = [t for t, *_ in recorder.af_commands]
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert max(gaps) < 0.05
+
+
+@pytest.mark.slow
+def test_filter_sweep_null_output():
+    """Sweep the filter on a real mpv null output, playback must not stall."""
+    handle = mpv.MPV(ao="null", vid="no")
+    player = PlayerMpv(handle)
+    channel = eq.ChannelEQ(DJPlayer(player))
+    player.load(ASSET)
+    player.play()
+    time.sleep(0.5)
+    af_before = handle.af
+
+    pos_start = player.time_pos
+    start = time.perf_counter()
+    for i in range(100):
+        channel.filter = -1 + 2 * i / 99
+        time.sleep(max(0, start + (i + 1) / 100 - time.perf_counter()))
+    elapsed = time.perf_counter() - start
+    pos_end = player.time_pos
+    handle_af = handle.af
+
+    handle.terminate()
+
+    assert handle_af == af_before
+    assert pos_end - pos_start == pytest.approx(elapsed, abs=0.1)
@@ -0,0 +1,159 @@
+import time
+import threading
+from unittest import mock
+import pytest
+from freejay.controller_cb import player_cb
+from freejay.messages import messages as mes
+from freejay.player.hold import HoldRamp
+
+INTERVAL = 0.01
+DELAY = 0.05
+
+
+@pytest.fixture
+def ramp_f(wheel_f):
+    return HoldRamp(wheel_f, interval=INTERVAL, delay=DELAY, doubling=0.1, max_factor=8)
+
+
+def button(element, press_release, value):
+    return mes.Message(
+        sender=mes.Sender(source=mes.Source.KEY_MAPPER, trigger=mes.Trigger.KEY),
+        content=mes.Button(
+            press_release=press_release,
+            component=mes.Component.LEFT_DECK,
+            element=element,
+            data={"value": value} if press_release == mes.PressRelease.PRESS else {},
+        ),
+    )
+
+
+def test_factor(ramp_f):
+    assert ramp_f.factor(0) == 1
+    assert ramp_f.factor(0.1) == pytest.approx(2)
+    assert ramp_f.factor(0.2) == pytest.approx(4)
+    assert ramp_f.factor(10) == 8
+
+
+def test_tap_not_held(ramp_f, wheel_f):
+    action = mock.Mock()
+    ramp_f.press("a", action)
+    time.sleep(DELAY / 2)
+    assert ramp_f.release("a")
+    time.sleep(DELAY * 2)
+    action.assert_not_called()
+    # The tick stops once nothing is held.
+    assert len(wheel_f) == 0
+
+
+def test_hold_ramps(ramp_f):
+    calls = []
+    ramp_f.press("a", lambda factor, elapsed: calls.append((factor, elapsed)))
+    time.sleep(DELAY + 0.4)
+    ramp_f.release("a")
+    factors = [factor for factor, _ in calls]
+    assert factors == sorted(factors)
+    assert factors[0] < 2
+    assert factors[-1] == 8
+    # Elapsed time adds up to the time held beyond the delay.
+    assert sum(elapsed for _, elapsed in calls) == pytest.approx(0.4, abs=0.05)
+
+
+def test_single_tick(ramp_f, wheel_f):
+    calls = []
+    for key in "abcde":
+        ramp_f.press(key, lambda factor, elapsed, key=key: calls.append(key))
+    for _ in range(10):
+        assert len(wheel_f) <= 1
+        time.sleep(INTERVAL)
+    for key in "abcde":
+        ramp_f.release(key)
+    assert set(calls) == set("abcde")
+
+
+def test_stops_on_release(ramp_f, wheel_f):
+    action = mock.Mock()
+    ramp_f.press("a", action)
+    time.sleep(DELAY + 0.05)
+    ramp_f.release("a")
+    calls = action.call_count
+    assert calls
+    time.sleep(INTERVAL * 5)
+    assert action.call_count == calls
+    assert len(wheel_f) == 0
+    assert not ramp_f.release("a")
+
+
+def test_release_waits_for_action(ramp_f):
+    running = threading.Event()
+    done = []
+
+    def action(factor, elapsed):
+        running.set()
+        time.sleep(0.05)
+        done.append(factor)
+
+    ramp_f.press("a", action)
+    assert running.wait(1)
+    ramp_f.release("a")
+    finished = len(done)
+    assert finished
+    time.sleep(INTERVAL * 5)
+    assert len(done) == finished
+
+
+def test_action_exception_logged(ramp_f, caplog):
+    ramp_f.press("a", mock.Mock(side_effect=RuntimeError))
+    ok = mock.Mock()
+    ramp_f.press("b", ok)
+    time.sleep(DELAY + 0.05)
+    ramp_f.release("a")
+    ramp_f.release("b")
+    ok.assert_called()
+    assert "Hold action raised an exception" in caplog.text
+
+
+def test_jog_hold(ramp_f):
+    player = mock.Mock()
+    callback = player_cb.make_jog_callback(player, ramp_f)
+    callback(button(mes.Element.JOG, mes.PressRelease.PRESS, 2))
+    player.jog.assert_called_once_with(2)
+    time.sleep(DELAY + 0.2)
+    callback(button(mes.Element.JOG, mes.PressRelease.RELEASE, 2))
+    seeks = [c.args[0] for c in player.jog.call_args_list[1:]]
+    assert seeks and all(seek > 0 for seek in seeks)
+    # Faster than the initial JOG_HOLD_RATE jogs per second.
+    assert sum(seeks) > 2 * player_cb.JOG_HOLD_RATE * 0.2
+    calls = player.jog.call_count
+    time.sleep(INTERVAL * 5)
+    assert player.jog.call_count == calls
+
+
+def test_jog_tap(ramp_f):
+    player = mock.Mock()
+    callback = player_cb.make_jog_callback(player, ramp_f)
+    callback(button(mes.Element.JOG, mes.PressRelease.PRESS, -0.1))
+    callback(button(mes.Element.JOG, mes.PressRelease.RELEASE, -0.1))
+    time.sleep(DELAY * 2)
+    player.jog.assert_called_once_with(-0.1)
+
+
+def test_nudge_hold(ramp_f):
+    player = mock.Mock()
+    callback = player_cb.make_nudge_callback(player, ramp_f)
+    callback(button(mes.Element.NUDGE, mes.PressRelease.PRESS, -0.1))
+    time.sleep(DELAY + 0.3)
+    callback(button(mes.Element.NUDGE, mes.PressRelease.RELEASE, -0.1))
+    values = [c.args[0] for c in player.nudge_press.call_args_list]
+    assert values[0] == -0.1
+    assert values[-1] == -player_cb.NUDGE_HOLD_MAX
+    time.sleep(INTERVAL * 5)
+    # Released last.
+    assert player.method_calls[-1] == mock.call.nudge_release()
+
+
+def test_without_ramp():
+    player = mock.Mock()
+    player_cb.make_jog_callback(player)(
+        button(mes.Element.JOG, mes.PressRelease.PRESS, 2)
+    )
+    player.jog.assert_called_once_with(value=2)
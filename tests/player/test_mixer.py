@@ -0,0 +1,227 @@
+import math
+import time
+import random
+import logging
+import pytest
+from unittest import mock
+from freejay.player import curves
+from freejay.player.mixer import Mixer, Assign
+from freejay.messages import messages as mes
+
+FAMILIES = list(curves.CurveFamily)
+
+# Random positions/curves for property tests, seeded for reproducibility.
+rng = random.Random(1234)
+POSITIONS = [0.0, 0.5, 1.0] + [rng.random() for _ in range(50)]
+CURVES = [0.0, 0.5, 0.99, 1.0] + [rng.random() for _ in range(10)]
+
+
+LEFT = mes.Component.LEFT_DECK
+RIGHT = mes.Component.RIGHT_DECK
+SAMPLER = mes.Component.SAMPLER
+
+
+@pytest.fixture
+def mixer_f():
+    return Mixer(
+        decks={LEFT: mock.Mock(), RIGHT: mock.Mock(), SAMPLER: mock.Mock()},
+        assignments={LEFT: Assign.A, RIGHT: Assign.B},
+    )
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+@pytest.mark.parametrize("curve", CURVES)
+def test_levels_in_unit_range(family, curve):
+    table = curves.make_curve_table(family, curve)
+    for position in POSITIONS:
+        left, right = table.levels_at(position)
+        assert 0 <= left <= 1
+        assert 0 <= right <= 1
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+@pytest.mark.parametrize("curve", CURVES)
+def test_levels_symmetric(family, curve):
+    table = curves.make_curve_table(family, curve)
+    for position in POSITIONS:
+        left, right = table.levels_at(position)
+        mirrored_left, mirrored_right = table.levels_at(1 - position)
+        assert left == pytest.approx(mirrored_right, abs=1e-3)
+        assert right == pytest.approx(mirrored_left, abs=1e-3)
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+@pytest.mark.parametrize("curve", CURVES)
+def test_levels_monotonic(family, curve):
+    table = curves.make_curve_table(family, curve)
+    left, right = table.levels_many(curves.ramp(0, 1, 1001))
+    assert all(a >= b for a, b in zip(left, left[1:]))
+    assert all(a <= b for a, b in zip(right, right[1:]))
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+@pytest.mark.parametrize("curve", CURVES)
+def test_levels_end_points(family, curve):
+    table = curves.make_curve_table(family, curve)
+    assert table.levels_at(0) == pytest.approx((1, 0))
+    assert table.levels_at(1) == pytest.approx((0, 1))
+
+
+@pytest.mark.parametrize("position", POSITIONS)
+def test_constant_power(position):
+    table = curves.make_curve_table(curves.CurveFamily.CONSTANT_POWER, 0.0)
+    left, right = table.levels_at(position)
+    assert left**2 + right**2 == pytest.approx(1, abs=1e-3)
+
+
+@pytest.mark.parametrize("position", POSITIONS)
+def test_linear_matches_formula(position):
+    # Original division based formula, valid for curve < 1.
+    curve = 0.5
+    table = curves.make_curve_table(curves.CurveFamily.LINEAR, curve)
+    expected_left = min(1, 1 - ((position - curve) / (1 - curve)))
+    expected_right = min(1, 1 - ((1 - position - curve) / (1 - curve)))
+    left, right = table.levels_at(position)
+    assert left == pytest.approx(expected_left, abs=1e-3)
+    assert right == pytest.approx(expected_right, abs=1e-3)
+
+
+def test_curve_one_is_a_cut():
+    table = curves.make_curve_table(curves.CurveFamily.LINEAR, 1.0)
+    assert table.levels_at(0.5) == (1, 1)
+    assert table.levels_at(0.999) == (1, 1)
+
+
+def test_levels_many_matches_levels_at():
+    table = curves.make_curve_table(curves.CurveFamily.CONSTANT_POWER, 0.2)
+    left, right = table.levels_many(POSITIONS)
+    assert list(zip(left, right)) == [table.levels_at(p) for p in POSITIONS]
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [(-1, 0), (2, 1), (math.inf, 1), (-math.inf, 0), (math.nan, 0.5), ("x", 0.5)],
+)
+def test_position_stays_valid(mixer_f, value, expected, caplog):
+    mixer_f.crossfader.position = value
+    assert mixer_f.crossfader.position == expected
+    assert caplog.records[0].levelname == "WARNING"
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [(-1, 0), (2, 1), (math.nan, 0.5), (None, 0.5)],
+)
+def test_curve_stays_valid(mixer_f, value, expected, caplog):
+    mixer_f.crossfader.curve = value
+    assert mixer_f.crossfader.curve == expected
+    assert caplog.records[0].levelname == "WARNING"
+
+
+def test_curve_one_not_clamped(mixer_f):
+    mixer_f.crossfader.curve = 1
+    assert mixer_f.crossfader.curve == 1
+
+
+def test_position_sets_deck_volume(mixer_f):
+    mixer_f.crossfader.curve = 0
+    mixer_f.crossfader.position = 0.25
+    assert mixer_f.channels[LEFT].deck.volume == pytest.approx(75, abs=0.1)
+    assert mixer_f.channels[RIGHT].deck.volume == pytest.approx(25, abs=0.1)
+
+
+def test_family_updates_levels(mixer_f):
+    mixer_f.crossfader.curve = 0
+    mixer_f.crossfader.family = curves.CurveFamily.CONSTANT_POWER
+    expected = 100 * math.cos(math.pi / 4)
+    assert mixer_f.channels[LEFT].deck.volume == pytest.approx(expected)
+
+
+def test_calculate_levels_many_clamps(mixer_f):
+    left, right = mixer_f.crossfader.calculate_levels_many([-1, math.nan, 2])
+    assert left == [1, 1, 0]
+    assert right == [0, 1, 1]
+
+
+def test_thru_channel_ignores_crossfader(mixer_f):
+    mixer_f.crossfader.position = 0
+    assert mixer_f.gains[SAMPLER] == 1
+    assert mixer_f.gains[RIGHT] == 0
+
+
+def test_channel_fader_scales_gain(mixer_f):
+    mixer_f.crossfader.position = 0
+    mixer_f.channels[LEFT].fader = 0.5
+    assert mixer_f.channels[LEFT].deck.volume == 50
+
+
+def test_assign_moves_channel(mixer_f):
+    mixer_f.crossfader.position = 0
+    mixer_f.channels[SAMPLER].assign = "B"
+    assert mixer_f.channels[SAMPLER].assign is Assign.B
+    assert mixer_f.gains[SAMPLER] == 0
+
+
+def test_invalid_assign_ignored(mixer_f, caplog):
+    mixer_f.channels[LEFT].assign = "C"
+    assert mixer_f.channels[LEFT].assign is Assign.A
+    assert caplog.records[0].levelname == "WARNING"
+
+
+def test_update_pushes_changed_gains_only():
+    decks = {c: mock.PropertyMock() for c in (LEFT, RIGHT, SAMPLER)}
+    players = dict()
+    for component, volume in decks.items():
+        players[component] = mock.Mock()
+        type(players[component]).volume = volume
+    mixer = Mixer(decks=players, assignments={LEFT: Assign.A, RIGHT: Assign.B})
+    mixer.update_levels()
+    for volume in decks.values():
+        volume.reset_mock()
+
+    mixer.channels[LEFT].fader = 0.5
+    decks[LEFT].assert_called_once_with(50)
+    decks[RIGHT].assert_not_called()
+    decks[SAMPLER].assert_not_called()
+
+
+@pytest.mark.benchmark
+def test_benchmark_levels(caplog):
+    caplog.set_level(logging.INFO)
+    n = 100_000
+    positions = [i / n for i in range(n)]
+    table = curves.make_curve_table(curves.CurveFamily.CONSTANT_POWER, 0.3)
+
+    start = time.perf_counter()
+    for p in positions:
+        table.levels_at(p)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table.levels_many(positions)
+    batch = time.perf_counter() - start
+
+    logging.info(
+        "levels_at: %.0f ns/position, levels_many: %.0f ns/position",
+        single / n * 1e9,
+        batch / n * 1e9,
+    )
+    assert single < 1
+    assert batch < 1
+
+
+@pytest.mark.benchmark
+def test_benchmark_update_levels(caplog):
+    caplog.set_level(logging.INFO)
+    components = (LEFT, RIGHT, mes.Component.DECK_3, mes.Component.DECK_4, SAMPLER)
+    mixer = Mixer(
+        decks={c: mock.NonCallableMock() for c in components},
+        assignments={LEFT: Assign.A, RIGHT: Assign.B},
+    )
+    n = 10_000
+    start = time.perf_counter()
+    for i in range(n):
+        mixer.crossfader.position = i / n
+    elapsed = time.perf_counter() - start
+    logging.info("update_levels: %.1f us/update", elapsed / n * 1e6)
+    assert elapsed < 2
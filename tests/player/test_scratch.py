@@ -0,0 +1,165 @@
+import time
+from unittest import mock
+import pytest
+from freejay.clock.timerwheel import Timer
+from freejay.player.player import IPlayer
+from freejay.player.djplayer import DJPlayer
+from freejay.player.scratch import JogWheel, LatencyStats
+
+INTERVAL = 0.005
+RELEASE = 0.03
+
+
+@pytest.fixture
+def manual_wheel_f():
+    class ManualWheel:
+        """Timer wheel stand-in, firing timers as its clock is advanced."""
+
+        def __init__(self):
+            self.now = 0.0
+            self.timers = []
+
+        def __len__(self):
+            return len(self.timers)
+
+        def clock(self):
+            return self.now
+
+        def schedule(self, deadline, callback, *args):
+            timer = Timer(deadline=deadline, callback=callback, args=args, tick=0)
+            self.timers.append(timer)
+            return timer
+
+        def advance(self, seconds):
+            end = self.now + seconds
+            while self.timers:
+                timer = min(self.timers, key=lambda t: t.deadline)
+                if timer.deadline > end:
+                    break
+                self.timers.remove(timer)
+                self.now = max(self.now, timer.deadline)
+                timer.callback(*timer.args)
+            self.now = end
+
+    return ManualWheel()
+
+
+@pytest.fixture
+def player_f():
+    player = mock.create_autospec(IPlayer, instance=True)
+    player.playing = False
+    player.speed = 1.0
+    return player
+
+
+@pytest.fixture
+def jog_f(player_f, manual_wheel_f):
+    return JogWheel(
+        DJPlayer(player_f),
+        manual_wheel_f,
+        interval=INTERVAL,
+        release=RELEASE,
+        max_rate=3,
+        clock=manual_wheel_f.clock,
+    )
+
+
+def seeks(player):
+    return [c.args[0] for c in player.seek.call_args_list]
+
+
+def spin(jog, wheel, delta, seconds, step=0.001):
+    moves = round(seconds / step)
+    for _ in range(moves):
+        jog.move(delta)
+        wheel.advance(step)
+    return moves
+
+
+def test_paused_seeks(jog_f, player_f, manual_wheel_f):
+    for _ in range(5):
+        jog_f.move(0.1)
+    manual_wheel_f.advance(INTERVAL * 2)
+    assert sum(seeks(player_f)) == pytest.approx(0.5)
+    player_f.seek.assert_called_with(mock.ANY, reference="relative")
+    assert not jog_f.scratching
+    assert jog_f.latency.count == 1
+
+
+def test_paused_accumulates_per_tick(jog_f, player_f, manual_wheel_f):
+    moves = spin(jog_f, manual_wheel_f, -0.01, 0.1)
+    manual_wheel_f.advance(RELEASE * 2)
+    assert sum(seeks(player_f)) == pytest.approx(-0.01 * moves)
+    assert len(seeks(player_f)) < moves
+    # Stops ticking once still.
+    assert len(manual_wheel_f) == 0
+
+
+def test_playing_scratch(jog_f, player_f, manual_wheel_f):
+    player_f.playing = True
+    spin(jog_f, manual_wheel_f, 0.001, 0.1)
+    assert jog_f.scratching
+    # One extra second per second, on top of playback.
+    assert player_f.speed == pytest.approx(2)
+    player_f.seek.assert_not_called()
+    manual_wheel_f.advance(RELEASE + INTERVAL * 3)
+    assert not jog_f.scratching
+    assert player_f.speed == 1.0
+
+
+def test_playing_backwards(jog_f, player_f, manual_wheel_f):
+    player_f.playing = True
+    moves = spin(jog_f, manual_wheel_f, -0.002, 0.05)
+    assert player_f.speed == pytest.approx(0.1)
+    # The wheel moves backwards, more than the slowest rate can play.
+    backwards = -sum(seeks(player_f))
+    assert 0 < backwards <= 0.002 * moves
+    manual_wheel_f.advance(RELEASE + INTERVAL * 3)
+    assert player_f.speed == 1.0
+
+
+def test_pause_while_scratching(jog_f, player_f, manual_wheel_f):
+    player_f.playing = True
+    spin(jog_f, manual_wheel_f, 0.001, 0.02)
+    assert jog_f.scratching
+    player_f.playing = False
+    jog_f.move(0.5)
+    manual_wheel_f.advance(INTERVAL * 2)
+    assert not jog_f.scratching
+    assert player_f.speed == 1.0
+    assert seeks(player_f)[-1] == pytest.approx(0.5)
+
+
+def test_update_exception_logged(jog_f, player_f, manual_wheel_f, caplog):
+    player_f.seek.side_effect = RuntimeError
+    jog_f.move(1)
+    manual_wheel_f.advance(INTERVAL * 2)
+    assert "Jog wheel update failed" in caplog.text
+    player_f.seek.side_effect = None
+    jog_f.move(1)
+    manual_wheel_f.advance(INTERVAL * 2)
+    assert player_f.seek.call_count == 2
+
+
+def test_first_move_latency(player_f, wheel_f):
+    jog = JogWheel(
+        DJPlayer(player_f), wheel_f, interval=INTERVAL, release=RELEASE, max_rate=3
+    )
+    for _ in range(10):
+        jog.move(0.1)
+        time.sleep(RELEASE + INTERVAL * 2)
+    # Applied on the next wheel tick, not the next control tick.
+    assert jog.latency.count == 10
+    assert jog.latency.percentile(50) < INTERVAL
+
+
+def test_latency_stats():
+    stats = LatencyStats()
+    assert stats.mean == stats.percentile(99) == 0
+    for latency in range(1, 101):
+        stats.record(latency / 1000)
+    assert stats.count == 100
+    assert stats.mean == pytest.approx(0.0505)
+    assert stats.worst == 0.1
+    assert stats.percentile(50) == 0.051
+    assert stats.percentile(100) == 0.1
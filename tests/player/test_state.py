@@ -0,0 +1,203 @@
+import time
+import logging
+import dataclasses
+from unittest import mock
+import pytest
+from freejay.player.player import IPlayer
+from freejay.player.djplayer import DJPlayer
+from freejay.player.mixer import Mixer, Assign
+from freejay.player import state
+from freejay.messages import messages as mes
+from freejay.messages import produce_consume as prodcon
+
+LEFT = mes.Component.LEFT_DECK
+RIGHT = mes.Component.RIGHT_DECK
+
+
+@pytest.fixture
+def consumer_f():
+    class ConsumerFixture(prodcon.Consumer):
+        def __init__(self):
+            self.messages = []
+
+        def on_message_recieved(self, message):
+            self.messages.append(message)
+
+    return ConsumerFixture()
+
+
+def make_player():
+    player = mock.create_autospec(IPlayer, instance=True)
+    player.loaded = False
+    player.playing = False
+    player.volume = 1.0
+    return player
+
+
+@pytest.fixture
+def players_f():
+    return {LEFT: make_player(), RIGHT: make_player()}
+
+
+@pytest.fixture
+def pump_f(players_f, consumer_f):
+    decks = {component: DJPlayer(player) for component, player in players_f.items()}
+    mixer = Mixer(decks=decks, assignments={LEFT: Assign.A, RIGHT: Assign.B})
+    pump = state.StatePump(decks=decks, mixer=mixer, fps=100)
+    consumer_f.listen(pump)
+    yield pump
+    pump.stop()
+
+
+def load(player, position=12.0, duration=180.0):
+    player.loaded = True
+    player.time_pos = position
+    player.time_end = duration
+
+
+def changes(consumer):
+    return {m.content.component: m.content.data for m in consumer.messages}
+
+
+def test_sample(pump_f, players_f):
+    load(players_f[LEFT])
+    pump_f.decks[LEFT].bpm = 120.0
+    pump_f.decks[LEFT].speed = 1.02
+    pump_f.mixer.crossfader.position = 0.25
+    snapshot = state.sample(pump_f.decks, pump_f.mixer)
+    left, right = (deck_state for _, deck_state in snapshot.decks)
+    assert (left.loaded, left.position, left.duration) == (True, 12.0, 180.0)
+    assert (left.speed, left.bpm) == (1.02, 120.0)
+    assert left.level == pump_f.mixer.gains[LEFT]
+    assert right == state.DeckState(level=pump_f.mixer.gains[RIGHT])
+    assert snapshot.mixer == state.MixerState(crossfader=0.25)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        left.position = 0.0
+
+
+def test_sample_not_started(pump_f, players_f):
+    # mpv reports no position or duration until the track is decoding.
+    load(players_f[LEFT], position=None, duration=None)
+    snapshot = state.sample(pump_f.decks, pump_f.mixer)
+    assert snapshot.decks[0][1].position == snapshot.decks[0][1].duration == 0.0
+
+
+def test_diff():
+    before = state.Snapshot(
+        time=0.0,
+        decks=((LEFT, state.DeckState()), (RIGHT, state.DeckState())),
+        mixer=state.MixerState(),
+    )
+    after = dataclasses.replace(
+        before,
+        decks=((LEFT, state.DeckState(position=1.5, playing=True)), before.decks[1]),
+    )
+    assert state.diff(before, before) == {}
+    assert state.diff(before, after) == {LEFT: {"position": 1.5, "playing": True}}
+    everything = state.diff(None, after)
+    assert set(everything) == {LEFT, RIGHT, mes.Component.MIXER}
+    assert everything[mes.Component.MIXER] == {"crossfader": 0.5}
+    assert len(everything[RIGHT]) == len(dataclasses.fields(state.DeckState))
+
+
+def test_pump_sends_changes(pump_f, players_f, consumer_f):
+    assert pump_f.pump() == 3
+    assert consumer_f.messages[0].sender == mes.Sender(
+        mes.Source.PLAYER_MODEL, mes.Trigger.DATA_OUTPUT
+    )
+    assert all(m.content.element == mes.Element.STATE for m in consumer_f.messages)
+    consumer_f.messages.clear()
+
+    assert pump_f.pump() == 0
+    load(players_f[RIGHT])
+    assert pump_f.pump() == 1
+    assert consumer_f.messages[-1].content.data == {
+        "loaded": True,
+        "position": 12.0,
+        "duration": 180.0,
+    }
+    consumer_f.messages.clear()
+
+    # The crossfader changes the channel levels too.
+    pump_f.mixer.crossfader.position = 1.0
+    assert pump_f.pump() == 3
+    sent = changes(consumer_f)
+    assert sent[mes.Component.MIXER] == {"crossfader": 1.0}
+    assert sent[LEFT] == {"level": 0.0}
+    assert sent[RIGHT] == {"level": pump_f.mixer.gains[RIGHT]}
+    assert pump_f.stats.frames == 4
+    assert pump_f.stats.messages == 7
+
+
+def test_pump_fixed_rate(pump_f, players_f, consumer_f):
+    load(players_f[LEFT])
+    players_f[LEFT].playing = True
+    pump_f.start()
+    assert pump_f.running
+    for i in range(10):
+        players_f[LEFT].time_pos = float(i)
+        time.sleep(0.02)
+    pump_f.stop()
+    assert not pump_f.running
+    # Every field in the first frame, then only the position.
+    positions = [m.content.data for m in consumer_f.messages[3:]]
+    assert positions and all(list(data) == ["position"] for data in positions)
+    assert 10 <= pump_f.stats.frames <= 30
+    # Restarting sends every field again.
+    consumer_f.messages.clear()
+    pump_f.start()
+    time.sleep(0.02)
+    pump_f.stop()
+    assert set(changes(consumer_f)) == {LEFT, RIGHT, mes.Component.MIXER}
+
+
+def test_pump_exception_logged(pump_f, players_f, caplog):
+    type(players_f[LEFT]).playing = mock.PropertyMock(side_effect=RuntimeError)
+    pump_f.start()
+    time.sleep(0.03)
+    assert pump_f.running
+    assert "State sample failed" in caplog.text
+
+
+def test_invalid_fps(pump_f):
+    with pytest.raises(ValueError):
+        state.StatePump(decks=pump_f.decks, mixer=pump_f.mixer, fps=0)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("fps", [30, 60])
+def test_pump_cpu(fps, caplog):
+    """Measure the pump CPU cost with five decks, two of them playing."""
+    caplog.set_level(logging.INFO)
+    components = [LEFT, RIGHT, mes.Component.DECK_3, mes.Component.DECK_4]
+    components.append(mes.Component.SAMPLER)
+    players = {component: make_player() for component in components}
+    for player in list(players.values())[:2]:
+        load(player)
+        player.playing = True
+        type(player).time_pos = mock.PropertyMock(side_effect=time.perf_counter)
+    decks = {component: DJPlayer(player) for component, player in players.items()}
+    mixer = Mixer(decks=decks, assignments={LEFT: Assign.A, RIGHT: Assign.B})
+    pump = state.StatePump(decks=decks, mixer=mixer, fps=fps)
+    pump.send_message = lambda message: None
+
+    seconds = 1.0
+    pump.start()
+    time.sleep(seconds)
+    pump.stop()
+    stats = pump.stats
+    logging.info(
+        "State pump at %d fps: %d frames, %.2f%% CPU (%.0f us/frame), "
+        "%d messages, %d fields, %d late",
+        fps,
+        stats.frames,
+        stats.cpu_time / seconds * 100,
+        stats.cpu_time / stats.frames * 1e6,
+        stats.messages,
+        stats.fields,
+        stats.late_frames,
+    )
+    assert stats.frames == pytest.approx(fps * seconds, rel=0.2)
+    # Two playing decks send a position each frame.
+    assert stats.fields < 3 * stats.frames + 20
+    assert stats.cpu_time / seconds < 0.05
@@ -0,0 +1,76 @@
+import sys
+import time
+import wave
+from unittest import mock
+from freejay.messages import messages as mes
+from freejay.recorder import capture
+from freejay.recorder.capture import MonitorCapture, monitor_command
+from freejay.recorder.recorder import Recorder
+
+FRAME = 4  # 16 bit stereo
+AUDIO = bytes(range(256)) * 40
+
+# Writes AUDIO to stdout in chunks that split frames.
+WRITER = """
+import sys, time
+audio = bytes(range(256)) * 40
+for i in range(0, len(audio), 1001):
+    sys.stdout.buffer.write(audio[i:i + 1001])
+    sys.stdout.buffer.flush()
+    time.sleep(0.001)
+"""
+
+
+def test_monitor_command():
+    with mock.patch.object(capture.shutil, "which", lambda name: name == "parec"):
+        command = monitor_command(48000, 2, 2)
+    assert command[0] == "parec"
+    assert "--format=s16le" in command and "--rate=48000" in command
+    with mock.patch.object(capture.shutil, "which", lambda name: None):
+        assert monitor_command(44100, 2, 2) is None
+        assert capture.make_monitor_capture(44100, 2, 2) is None
+
+
+def test_capture_whole_frames():
+    chunks = []
+    source = MonitorCapture([sys.executable, "-c", WRITER], frame_size=FRAME)
+    source.start(chunks.append)
+    # Stop waits for the tool, let it finish writing first.
+    while source.running:
+        time.sleep(0.005)
+    source.stop()
+    assert all(len(chunk) % FRAME == 0 for chunk in chunks)
+    assert b"".join(chunks) == AUDIO
+
+
+def test_recorder_records_capture(tmp_path):
+    source = MonitorCapture([sys.executable, "-c", WRITER], frame_size=FRAME)
+    recorder = Recorder(
+        source=mes.Source.RECORDER_MODEL,
+        component=mes.Component.RECORDER,
+        poll_interval=0.01,
+        capture=source,
+    )
+    recorder.register_consumer(mock.Mock())
+    assert recorder.available
+    file_path = str(tmp_path / "set.wav")
+    recorder.start(file_path=file_path)
+    while source.running:
+        time.sleep(0.005)
+    recorder.stop()
+    with wave.open(file_path, "rb") as wav:
+        assert wav.readframes(wav.getnframes()) == AUDIO
+
+
+def test_capture_fails_to_start(tmp_path):
+    recorder = Recorder(
+        source=mes.Source.RECORDER_MODEL,
+        component=mes.Component.RECORDER,
+        destination=str(tmp_path),
+        capture=MonitorCapture([str(tmp_path / "missing")], frame_size=FRAME),
+    )
+    recorder.register_consumer(mock.Mock())
+    recorder.start()
+    assert not recorder.recording
+    (message,) = [c.args[0] for c in recorder.consumer.call_args_list]
+    assert message.content.data["status"] == "failed"
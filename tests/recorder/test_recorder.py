@@ -0,0 +1,147 @@
+import time
+import wave
+import logging
+import pytest
+from unittest import mock
+from freejay.messages import messages as mes
+from freejay.recorder.recorder import Recorder, NullSink
+
+RATE = 44100
+FRAME = 4  # 16 bit stereo
+
+
+@pytest.fixture
+def recorder_f(tmp_path):
+    recorder = Recorder(
+        source=mes.Source.RECORDER_MODEL,
+        component=mes.Component.RECORDER,
+        destination=str(tmp_path),
+        poll_interval=0.01,
+    )
+    recorder.register_consumer(mock.Mock())
+    yield recorder
+    recorder.stop()
+
+
+def test_write_when_stopped_ignored(recorder_f):
+    assert recorder_f.write(bytes(FRAME * 10)) == 0
+
+
+def test_records_wav(recorder_f, tmp_path):
+    file_path = str(tmp_path / "set.wav")
+    recorder_f.start(file_path=file_path)
+    audio = (bytes(range(256)) * (FRAME * RATE // 256 + 1))[: FRAME * RATE]
+    assert recorder_f.write(audio) == RATE
+    recorder_f.stop()
+
+    with wave.open(file_path, "rb") as wav:
+        assert wav.getnchannels() == 2
+        assert wav.getsampwidth() == 2
+        assert wav.getframerate() == RATE
+        assert wav.readframes(wav.getnframes()) == audio
+
+
+def test_default_file_in_destination(recorder_f, tmp_path):
+    recorder_f.toggle()
+    recorder_f.toggle()
+    assert len(list(tmp_path.glob("freejay-*.wav"))) == 1
+
+
+def test_start_stop_messages(recorder_f):
+    sink = NullSink()
+    recorder_f.start(sink=sink)
+    recorder_f.write(bytes(FRAME * 100))
+    recorder_f.stop()
+    started, stopped = [c.args[0] for c in recorder_f.consumer.call_args_list]
+    assert started.content.element == mes.Element.RECORD
+    assert started.content.data == {"status": "recording"}
+    assert stopped.content.data["status"] == "stopped"
+    assert stopped.content.data["frames_written"] == 100
+    assert stopped.content.data["dropped_frames"] == 0
+    assert stopped.content.data["high_water"] == 100
+
+
+def test_write_failure_reported(recorder_f):
+    class FullSink(NullSink):
+        def write(self, data):
+            raise OSError(28, "No space left on device")
+
+    recorder_f.start(sink=FullSink())
+    # A full block, so the writer writes while recording.
+    recorder_f.write(bytes(FRAME * RATE))
+    deadline = time.perf_counter() + 5
+    while recorder_f.recording and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    assert not recorder_f.recording
+    recorder_f.stop()
+    started, failed = [c.args[0] for c in recorder_f.consumer.call_args_list]
+    assert failed.content.data["status"] == "failed"
+    assert "No space left" in failed.content.data["error"]
+
+
+def test_already_recording(recorder_f, caplog):
+    recorder_f.start(sink=NullSink())
+    recorder_f.start(sink=NullSink())
+    assert "Already recording." in caplog.text
+
+
+def test_overrun_counts_dropped(tmp_path):
+    recorder = Recorder(
+        source=mes.Source.RECORDER_MODEL,
+        component=mes.Component.RECORDER,
+        buffer_seconds=1,
+        block_seconds=1,
+        poll_interval=10,
+    )
+    recorder.register_consumer(mock.Mock())
+    sink = NullSink()
+    recorder.start(sink=sink)
+    # Writer is waiting for a full block, fill the buffer and overrun it.
+    assert recorder.write(bytes(FRAME * (RATE + 10))) == RATE
+    recorder.stop()
+    assert recorder.stats.dropped_frames == 10
+    assert recorder.stats.high_water == recorder.stats.capacity
+    assert sink.bytes_written == FRAME * RATE
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+def test_hour_of_audio_null_sink(caplog):
+    """Record an hour of simulated audio to the null sink, faster than real time."""
+    caplog.set_level(logging.INFO)
+    # At 1000x real time, 60 s of buffer is 60 ms of wall clock time.
+    recorder = Recorder(
+        source=mes.Source.RECORDER_MODEL,
+        component=mes.Component.RECORDER,
+        buffer_seconds=60,
+        block_seconds=5,
+        poll_interval=0.005,
+    )
+    recorder.register_consumer(mock.Mock())
+    sink = NullSink()
+    block = bytes(FRAME * RATE // 10)  # 100 ms of audio
+    blocks = 36_000  # 1 hour
+
+    recorder.start(sink=sink)
+    start = time.perf_counter()
+    for i in range(blocks):
+        recorder.write(block)
+        # Simulate 1000x real time.
+        if i % 10 == 9:
+            time.sleep(max(0, start + (i + 1) / 10_000 - time.perf_counter()))
+    recorder.stop()
+    elapsed = time.perf_counter() - start
+
+    stats = recorder.stats
+    logging.info(
+        "1 hour recorded in %.2fs, %d sink writes, high water %.1f%%, %d dropped.",
+        elapsed,
+        sink.writes,
+        100 * stats.high_water / stats.capacity,
+        stats.dropped_frames,
+    )
+    assert stats.dropped_frames == 0
+    assert stats.frames_written == RATE * 3600
+    assert sink.bytes_written == RATE * 3600 * FRAME
+    # Large writes, not one per block pushed.
+    assert sink.writes < blocks / 5
@@ -0,0 +1,82 @@
+import time
+import threading
+import pytest
+from freejay.recorder.ringbuffer import RingBuffer
+
+
+def frames(start, count, frame_size=4):
+    """Make frames numbered from start, each byte of a frame is its number."""
+    return bytes(
+        i % 256 for i in range(start, start + count) for _ in range(frame_size)
+    )
+
+
+@pytest.fixture
+def ring_f():
+    return RingBuffer(capacity=8, frame_size=4)
+
+
+def test_write_read(ring_f):
+    assert ring_f.write(frames(0, 3)) == 3
+    assert len(ring_f) == 3
+    assert bytes(ring_f.read()) == frames(0, 3)
+    ring_f.advance(3)
+    assert len(ring_f) == 0
+    assert bytes(ring_f.read()) == b""
+
+
+def test_partial_frame_ignored(ring_f):
+    assert ring_f.write(frames(0, 2) + b"\x00") == 2
+
+
+def test_full_drops(ring_f):
+    assert ring_f.write(frames(0, 10)) == 8
+    assert ring_f.dropped == 2
+    assert ring_f.high_water == 8
+    assert ring_f.write(frames(10, 1)) == 0
+    assert ring_f.dropped == 3
+
+
+def test_wrap_around(ring_f):
+    ring_f.write(frames(0, 6))
+    ring_f.advance(6)
+    ring_f.write(frames(6, 5))
+    first = bytes(ring_f.read())
+    assert first == frames(6, 2)
+    ring_f.advance(2)
+    assert bytes(ring_f.read()) == frames(8, 3)
+
+
+def test_read_max_frames(ring_f):
+    ring_f.write(frames(0, 5))
+    assert bytes(ring_f.read(2)) == frames(0, 2)
+
+
+def test_clear(ring_f):
+    ring_f.write(frames(0, 10))
+    ring_f.clear()
+    assert len(ring_f) == 0
+    assert ring_f.dropped == 0
+    assert ring_f.high_water == 0
+
+
+def test_producer_consumer_threads():
+    ring = RingBuffer(capacity=64, frame_size=4)
+    total = 20_000
+    received = bytearray()
+
+    def consume():
+        while len(received) < total * 4:
+            chunk = ring.read()
+            received.extend(chunk)
+            ring.advance(len(chunk) // 4)
+            time.sleep(0)
+
+    consumer = threading.Thread(target=consume, daemon=True)
+    consumer.start()
+    sent = 0
+    while sent < total:
+        sent += ring.write(frames(sent, min(16, total - sent)))
+        time.sleep(0)
+    consumer.join(timeout=10)
+    assert bytes(received) == frames(0, total)
@@ -0,0 +1,39 @@
+import json
+import socket
+import pytest
+from freejay.remote import protocol
+
+
+def test_parse_address():
+    assert protocol.parse_address("unix:/tmp/fj.sock") == (
+        socket.AF_UNIX,
+        "/tmp/fj.sock",
+    )
+    assert protocol.parse_address("tcp:7000") == (socket.AF_INET, ("127.0.0.1", 7000))
+    assert protocol.parse_address("tcp:localhost:0").target == ("localhost", 0)
+
+
+@pytest.mark.parametrize(
+    "spec", ["/tmp/fj.sock", "unix:", "tcp:", "tcp:0.0.0.0:7000", "tcp:a:b", "udp:1"]
+)
+def test_parse_address_invalid(spec):
+    with pytest.raises(ValueError):
+        protocol.parse_address(spec)
+
+
+def test_frames_split_across_reads():
+    data = protocol.encode_batch(["tap LEFT_DECK CUE", "key space"])
+    data += protocol.encode_event({"ack": 1})
+    decoder = protocol.FrameDecoder()
+    payloads = []
+    for i in range(0, len(data), 5):
+        payloads += decoder.feed(data[i : i + 5])
+    assert payloads[0].decode().splitlines() == ["tap LEFT_DECK CUE", "key space"]
+    assert json.loads(payloads[1]) == {"ack": 1}
+
+
+def test_frame_too_large():
+    decoder = protocol.FrameDecoder(max_frame=8)
+    assert decoder.feed(protocol.encode_frame(b"x" * 8)) == [b"x" * 8]
+    with pytest.raises(protocol.FrameError):
+        decoder.feed(protocol.encode_frame(b"x" * 9)[:4])
@@ -0,0 +1,234 @@
+import time
+import socket
+import logging
+import threading
+import pytest
+from freejay.messages import messages as mes
+from freejay.headless import Headless, open_input
+from freejay.remote import protocol
+from freejay.remote.client import ControlClient
+from freejay.remote.server import ControlServer
+
+LEFT = mes.Component.LEFT_DECK
+
+
+def state(component, **fields):
+    return mes.Message(
+        sender=mes.Sender(
+            source=mes.Source.PLAYER_MODEL, trigger=mes.Trigger.DATA_OUTPUT
+        ),
+        content=mes.Data(component=component, element=mes.Element.STATE, data=fields),
+    )
+
+
+@pytest.fixture
+def address_f(tmp_path):
+    return protocol.parse_address(f"unix:{tmp_path / 'control.sock'}")
+
+
+@pytest.fixture
+def server_f(address_f):
+    received = []
+    server = ControlServer(address_f, max_connections=2)
+    server.register_consumer(received.append)
+    server.received = received
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_batch(server_f, address_f):
+    with ControlClient(address_f) as client:
+        batch = client.send(
+            ["tap LEFT_DECK CUE", "bogus", "", "data MIXER CROSSFADER position=0.5"]
+        )
+        ack = client.wait(batch)
+    assert ack["ack"] == 1 and ack["messages"] == 3
+    assert ack["errors"] == ["Invalid command: 'bogus'"]
+    assert [m.content.element for m in server_f.received] == [
+        mes.Element.CUE,
+        mes.Element.CUE,
+        mes.Element.CROSSFADER,
+    ]
+    stats = server_f.stats
+    assert (stats.batches, stats.commands, stats.errors) == (1, 2, 1)
+
+
+def test_bad_data(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "instance").mkdir()
+    engine = Headless(open_input(f"control:unix:{tmp_path / 'control.sock'}"))
+    engine.start()
+    try:
+        with ControlClient(engine.source.address) as client:
+            ack = client.wait(
+                client.send(
+                    [
+                        "data LEFT_DECK BPM value=abc",
+                        'data LEFT_DECK LOAD filename="track one.mp3"',
+                        "data MIXER CROSSFADER position=0.2",
+                    ]
+                )
+            )
+        assert ack["messages"] == 1 and len(ack["errors"]) == 2
+        assert "invalid value" in ack["errors"][0]
+        assert "takes button commands" in ack["errors"][1]
+        mixer = engine.model.mixer
+        deadline = time.monotonic() + 5
+        while mixer.crossfader.position != 0.2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert mixer.crossfader.position == 0.2
+    finally:
+        engine.stop()
+
+
+def test_subscribe(server_f, address_f):
+    server_f(state(LEFT, position=1.0, playing=True))
+    with ControlClient(address_f) as client:
+        # Not subscribed yet.
+        client.wait(client.send([]))
+        client.subscribe()
+        assert client.read()["ack"] == 2
+        assert client.read() == {
+            "state": {"LEFT_DECK": {"position": 1.0, "playing": True}}
+        }
+        # Changes are merged until they are sent.
+        for i in range(100):
+            server_f(state(LEFT, position=float(i)))
+        server_f(state(mes.Component.MIXER, crossfader=0.25))
+        merged = {}
+        while merged.get("LEFT_DECK", {}).get("position") != 99.0:
+            for name, fields in client.read()["state"].items():
+                merged.setdefault(name, {}).update(fields)
+        assert merged["MIXER"] == {"crossfader": 0.25}
+        client.unsubscribe()
+        client.wait(3)
+        server_f(state(LEFT, position=100.0))
+        client.wait(client.send([]))
+    assert server_f.stats.state_events < 100
+
+
+def test_connection_limit(server_f, address_f):
+    with ControlClient(address_f) as first, ControlClient(address_f) as second:
+        first.wait(first.send([]))
+        second.wait(second.send([]))
+        with ControlClient(address_f) as third:
+            assert third.read() == {"error": "Too many connections"}
+            with pytest.raises(EOFError):
+                third.read()
+        assert server_f.connections == 2
+    assert server_f.stats.refused == 1
+
+
+def test_frame_too_large(address_f):
+    server = ControlServer(address_f, max_frame=16)
+    server.start()
+    with ControlClient(address_f) as client:
+        client.send(["data MIXER CROSSFADER position=0.5"])
+        assert "exceeds 16" in client.read()["error"]
+        with pytest.raises(EOFError):
+            client.read()
+    server.stop()
+
+
+def test_backpressure(server_f, address_f):
+    queued = [server_f.max_queued]
+    server_f.backlog = lambda: queued[0]
+    with ControlClient(address_f, timeout=0.2) as client:
+        batch = client.send(["tap LEFT_DECK CUE"])
+        with pytest.raises(socket.timeout):
+            client.wait(batch)
+        assert server_f.received == []
+        queued[0] = 0
+        client.sock.settimeout(5)
+        assert client.wait(batch)["messages"] == 2
+    assert server_f.stats.paused == 1
+
+
+def test_tcp_loopback():
+    server = ControlServer(protocol.parse_address("tcp:0"))
+    address = server.bind()
+    assert address.target[1] != 0
+    server.register_consumer(lambda message: None)
+    server.start()
+    with ControlClient(address) as client:
+        assert client.wait(client.send(["key space"]))["messages"] == 2
+    server.stop()
+    assert not server.running
+
+
+def test_stop_removes_socket(server_f, address_f):
+    with ControlClient(address_f) as client:
+        client.wait(client.send([]))
+        server_f.stop()
+        with pytest.raises(EOFError):
+            client.read()
+    assert server_f.connections == 0
+    with pytest.raises(OSError):
+        ControlClient(address_f)
+
+
+@pytest.mark.benchmark
+def test_throughput(tmp_path, monkeypatch, caplog):
+    """Send 50k commands in pipelined batches, with a state subscriber reading."""
+    caplog.set_level(logging.INFO)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "instance").mkdir()
+    engine = Headless(open_input(f"control:unix:{tmp_path / 'bench.sock'}"))
+    address = engine.source.address
+    batches, per_batch, window = 100, 500, 4
+    engine.start()
+    subscriber = ControlClient(address)
+    subscriber.subscribe()
+    updates = []
+
+    def read_state():
+        for event in subscriber.events():
+            if "state" in event:
+                updates.append(event)
+
+    reader = threading.Thread(target=read_state, daemon=True)
+    reader.start()
+
+    latencies = []
+    sent = {}
+    with ControlClient(address) as client:
+        start = time.perf_counter()
+        for i in range(batches):
+            commands = [
+                f"data MIXER CROSSFADER position={(i * per_batch + j) % 101 / 100}"
+                for j in range(per_batch)
+            ]
+            sent[client.send(commands)] = time.perf_counter()
+            # Keep a window of batches in flight.
+            if i >= window - 1:
+                ack = client.read()
+                latencies.append(time.perf_counter() - sent[ack["ack"]])
+        while len(latencies) < batches:
+            ack = client.read()
+            latencies.append(time.perf_counter() - sent[ack["ack"]])
+        engine.controller.work_manager.join("model")
+        elapsed = time.perf_counter() - start
+    time.sleep(0.1)
+    engine.stop()
+    reader.join(5)
+    subscriber.close()
+
+    total = batches * per_batch
+    stats = engine.source.stats
+    latencies.sort()
+    logging.info(
+        "Control socket: %d commands in %.2f s (%.0f/s), batch ack p50 %.1f ms "
+        "p99 %.1f ms, paused %d times, %d state events to the subscriber",
+        total,
+        elapsed,
+        total / elapsed,
+        latencies[len(latencies) // 2] * 1000,
+        latencies[int(len(latencies) * 0.99)] * 1000,
+        stats.paused,
+        len(updates),
+    )
+    assert stats.messages == total and stats.errors == 0
+    assert engine.model.mixer.crossfader.position == (total - 1) % 101 / 100
+    assert updates
+    assert total / elapsed > 5000
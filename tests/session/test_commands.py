@@ -0,0 +1,108 @@
+import io
+import pytest
+from unittest import mock
+from freejay.messages import messages as mes
+from freejay.session import log
+from freejay.session.commands import parse_command, CommandError, CommandInput
+
+LEFT = mes.Component.LEFT_DECK
+
+
+def test_parse_buttons():
+    (press,) = parse_command("press left_deck play_pause")
+    assert press.type == mes.Type.BUTTON
+    assert press.sender.source == mes.Source.COMMAND
+    assert press.content == mes.Button(
+        press_release=mes.PressRelease.PRESS,
+        component=LEFT,
+        element=mes.Element.PLAY_PAUSE,
+    )
+    (release,) = parse_command("RELEASE LEFT_DECK NUDGE value=-0.1")
+    assert release.content.press_release == mes.PressRelease.RELEASE
+    assert release.content.data == {"value": -0.1}
+    press, release = parse_command("tap RIGHT_DECK CUE")
+    assert [press.content.press_release, release.content.press_release] == [
+        mes.PressRelease.PRESS,
+        mes.PressRelease.RELEASE,
+    ]
+
+
+def test_parse_data():
+    (message,) = parse_command("data LEFT_DECK BPM value=null offset=0.5")
+    assert message.type == mes.Type.DATA
+    assert message.content.data == {"value": None, "offset": 0.5}
+    (message,) = parse_command("data MIXER CROSSFADER position=0.5 curve=0.2")
+    assert message.content.data == {"position": 0.5, "curve": 0.2}
+    (message,) = parse_command('press DOWNLOAD DOWNLOAD url="a b" queue=true')
+    assert message.content.data == {"url": "a b", "queue": True}
+
+
+def test_parse_key():
+    press, release = parse_command("key space")
+    assert press.type == mes.Type.KEY
+    assert (press.content.sym, release.content.press_release) == (
+        "space",
+        mes.PressRelease.RELEASE,
+    )
+
+
+def test_parse_log_record():
+    (message,) = parse_command("press LEFT_DECK CUE")
+    (parsed,) = parse_command(log.encode(message, 1.0))
+    assert parsed.content == message.content
+
+
+@pytest.mark.parametrize("line", ["", "   ", "# comment"])
+def test_parse_ignored(line):
+    assert parse_command(line) == []
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "jump LEFT_DECK CUE",
+        "press LEFT_DECK",
+        "press TURNTABLE CUE",
+        "press LEFT_DECK SCRATCH",
+        "data MIXER CROSSFADER 0.5",
+        "key",
+        'press LEFT_DECK CUE "unclosed',
+        '{"type": "BUTTON"}',
+        "data LEFT_DECK BPM value=abc",
+        "data LEFT_DECK BPM",
+        "data LEFT_DECK LOAD",
+        'data LEFT_DECK LOAD filename="track one.mp3"',
+        "press MIXER CROSSFADER position=0.5",
+        "data MIXER CROSSFADER position=NaN",
+        "data MIXER CROSSFADER position=true",
+        "press LEFT_DECK CUE value=1",
+        "press LEFT_DECK LOOP quantise=4",
+        "press DOWNLOAD DOWNLOAD",
+        "data LEFT_DECK STATE position=1",
+    ],
+)
+def test_parse_invalid(line):
+    with pytest.raises(CommandError):
+        parse_command(line)
+
+
+def test_parse_invalid_log_record():
+    (message,) = parse_command("press LEFT_DECK CUE")
+    message.content.data = {"value": "abc"}
+    with pytest.raises(CommandError):
+        parse_command(log.encode(message, 1.0))
+
+
+def test_command_input():
+    stream = io.StringIO(
+        "tap LEFT_DECK CUE\nbogus\n\ndata MIXER CROSSFADER position=1\n"
+    )
+    consumer = mock.Mock()
+    command_input = CommandInput(stream, name="test")
+    command_input.register_consumer(consumer)
+    command_input.start()
+    command_input.join(5)
+    assert not command_input.running
+    assert consumer.call_count == 3
+    stats = command_input.stats
+    assert (stats.commands, stats.messages, stats.errors) == (2, 3, 1)
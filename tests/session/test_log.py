@@ -0,0 +1,110 @@
+import json
+import pytest
+from unittest import mock
+from freejay.messages import messages as mes
+from freejay.messages import router
+from freejay.session import log
+
+
+@pytest.fixture
+def messages_f():
+    return [
+        mes.Message(
+            sender=mes.Sender(source=mes.Source.MAIN_WINDOW, trigger=mes.Trigger.KEY),
+            content=mes.Key(press_release=mes.PressRelease.PRESS, sym="q"),
+        ),
+        mes.Message(
+            sender=mes.Sender(
+                source=mes.Source.PLAYER_VIEW, trigger=mes.Trigger.BUTTON
+            ),
+            content=mes.Button(
+                press_release=mes.PressRelease.RELEASE,
+                component=mes.Component.RIGHT_DECK,
+                element=mes.Element.NUDGE,
+                data={"value": 0.1},
+            ),
+        ),
+        mes.Message(
+            sender=mes.Sender(source=mes.Source.MIXER, trigger=mes.Trigger.SLIDER),
+            content=mes.Data(
+                component=mes.Component.MIXER,
+                element=mes.Element.CROSSFADER,
+                data={"position": 0.25, "curve": 0.1},
+            ),
+        ),
+    ]
+
+
+def test_round_trip(messages_f):
+    for message in messages_f:
+        t, decoded = log.decode(log.encode(message, 1.5))
+        assert t == 1.5
+        assert decoded.sender == message.sender
+        assert decoded.content == message.content
+        assert decoded.type == message.type
+
+
+def test_encode_is_one_line_with_enum_names(messages_f):
+    line = log.encode(messages_f[1], 0)
+    assert "\n" not in line
+    record = json.loads(line)
+    assert record["component"] == "RIGHT_DECK"
+    assert record["press_release"] == "RELEASE"
+
+
+def test_unserialisable_data_stored_as_repr():
+    message = mes.Message(
+        sender=mes.Sender(
+            source=mes.Source.DOWNLOAD_MODEL, trigger=mes.Trigger.EXCEPTION
+        ),
+        content=mes.Data(
+            component=mes.Component.DOWNLOAD,
+            element=mes.Element.DOWNLOAD,
+            data={"exception": ValueError("x")},
+        ),
+    )
+    _, decoded = log.decode(log.encode(message, 0))
+    assert decoded.content.data == {"exception": "ValueError('x')"}
+
+
+@pytest.mark.parametrize("line", ["not json", '{"t":0}', '{"t":0,"type":"BUTTON"}'])
+def test_decode_invalid(line):
+    with pytest.raises(ValueError):
+        log.decode(line)
+
+
+def test_session_log_appends_sessions(tmp_path, messages_f):
+    file_path = str(tmp_path / "session.log")
+    for _ in range(2):
+        session = log.SessionLog(file_path)
+        for message in messages_f:
+            session(message)
+        session.close()
+
+    records = list(log.read_log(file_path))
+    assert len(records) == 2 * len(messages_f)
+    times = [t for t, _ in records]
+    assert times == sorted(times)
+    assert [m.content for _, m in records] == [m.content for m in messages_f] * 2
+
+
+def test_read_log_skips_invalid_lines(tmp_path, messages_f, caplog):
+    file_path = tmp_path / "session.log"
+    lines = [log.encode(m, i) for i, m in enumerate(messages_f)]
+    file_path.write_text("\n".join(lines[:2] + ['{"t":2,"ty'] + lines[2:]) + "\n")
+    assert len(list(log.read_log(str(file_path)))) == 3
+    assert "Skipping invalid line 3" in caplog.text
+
+
+def test_router_tap(messages_f):
+    tap = mock.Mock()
+    consumer = mock.Mock()
+    message_router = router.MessageRouter()
+    message_router.register_route(condition=lambda m: True, consumer=consumer)
+    message_router.register_tap(
+        consumer=tap, condition=lambda m: m.type == mes.Type.BUTTON
+    )
+    for message in messages_f:
+        message_router(message)
+    assert consumer.call_count == 3
+    tap.assert_called_once_with(messages_f[1])
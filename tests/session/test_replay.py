@@ -0,0 +1,159 @@
+import time
+import queue
+import logging
+import pytest
+from unittest import mock
+from freejay.messages import messages as mes
+from freejay.message_dispatcher.handler import Handler
+from freejay.controller import register_model_callbacks, make_headless_controller
+from freejay.player.mixer import Mixer, Assign
+from freejay.recorder.recorder import Recorder
+from freejay.session import log
+from freejay.session.replay import replay, ReplayInput
+
+LEFT = mes.Component.LEFT_DECK
+RIGHT = mes.Component.RIGHT_DECK
+
+
+def button(component, element, press_release=mes.PressRelease.PRESS, data=None):
+    return mes.Message(
+        sender=mes.Sender(source=mes.Source.PLAYER_VIEW, trigger=mes.Trigger.BUTTON),
+        content=mes.Button(
+            press_release=press_release,
+            component=component,
+            element=element,
+            data=data,
+        ),
+    )
+
+
+def crossfader(position):
+    return mes.Message(
+        sender=mes.Sender(source=mes.Source.MIXER, trigger=mes.Trigger.SLIDER),
+        content=mes.Data(
+            component=mes.Component.MIXER,
+            element=mes.Element.CROSSFADER,
+            data={"position": position, "curve": 0.2},
+        ),
+    )
+
+
+# Model stand-in with mock decks and a real mixer.
+@pytest.fixture
+def model_f():
+    model = mock.Mock()
+    model.decks = {LEFT: mock.Mock(), RIGHT: mock.Mock()}
+    model.mixer = Mixer(
+        decks=model.decks, assignments={LEFT: Assign.A, RIGHT: Assign.B}
+    )
+    model.recorder = Recorder(
+        source=mes.Source.RECORDER_MODEL, component=mes.Component.RECORDER
+    )
+    return model
+
+
+# A short, DJ-like session: play, crossfade, nudge, cue.
+@pytest.fixture
+def session_f(tmp_path):
+    file_path = str(tmp_path / "session.log")
+    session = log.SessionLog(file_path)
+    lines = [button(LEFT, mes.Element.PLAY_PAUSE)]
+    lines += [crossfader(i / 100) for i in range(101)]
+    for _ in range(20):
+        lines.append(button(RIGHT, mes.Element.NUDGE, data={"value": 0.1}))
+        lines.append(button(RIGHT, mes.Element.NUDGE, mes.PressRelease.RELEASE))
+    lines.append(button(LEFT, mes.Element.CUE))
+    for message in lines:
+        session(message)
+        time.sleep(0.001)
+    session.close()
+    return file_path
+
+
+def test_replay_in_order(session_f):
+    consumer = mock.Mock()
+    stats = replay(log.read_log(session_f), consumer, speed=0)
+    assert stats.messages == consumer.call_count == 143
+    first, last = consumer.call_args_list[0].args[0], consumer.call_args_list[-1]
+    assert first.content.element == mes.Element.PLAY_PAUSE
+    assert last.args[0].content.element == mes.Element.CUE
+
+
+def test_replay_real_time():
+    messages = [(i * 0.02, crossfader(0.5)) for i in range(10)]
+    stats = replay(messages, mock.Mock(), speed=1)
+    assert stats.duration == pytest.approx(0.18, abs=0.05)
+    assert max(stats.lateness) < 0.02
+
+
+def test_replay_speed_scales_time():
+    messages = [(i * 0.1, crossfader(0.5)) for i in range(5)]
+    stats = replay(messages, mock.Mock(), speed=4)
+    assert stats.duration == pytest.approx(0.1, abs=0.03)
+
+
+def test_headless_controller(model_f, session_f):
+    controller = make_headless_controller(model_f)
+    controller.work_manager.start()
+    replay(log.read_log(session_f), controller.view_message_router, speed=0)
+    assert controller.work_manager.join("model", timeout=5)
+    controller.work_manager.stop()
+
+    model_f.decks[LEFT].play_pause.assert_called_once()
+    model_f.decks[LEFT].cue_press.assert_called_once()
+    assert model_f.decks[RIGHT].nudge_press.call_count == 20
+    assert model_f.decks[RIGHT].nudge_release.call_count == 20
+    assert model_f.mixer.crossfader.position == 1
+
+
+def test_headless_controller_records_session(model_f, tmp_path):
+    file_path = str(tmp_path / "out.log")
+    controller = make_headless_controller(model_f, session=file_path)
+    controller.view_message_router(button(LEFT, mes.Element.PLAY_PAUSE))
+    assert controller.work_manager.get_queue("model").qsize() == 1
+    ((_, message),) = log.read_log(file_path)
+    assert message.content.element == mes.Element.PLAY_PAUSE
+
+
+@pytest.mark.benchmark
+def test_handler_latency(model_f, session_f, caplog):
+    """Handler latency regression test, replaying a session into the handler."""
+    caplog.set_level(logging.INFO)
+    handler = Handler()
+    register_model_callbacks(handler=handler, model=model_f)
+    records = list(log.read_log(session_f)) * 50
+
+    stats = replay(records, handler, speed=0)
+    summary = stats.summary()
+    logging.info(
+        "Handler latency: p50 %.3f ms, p99 %.3f ms, max %.3f ms, %.0f msg/s",
+        summary["handle_p50_ms"],
+        summary["handle_p99_ms"],
+        summary["handle_max_ms"],
+        summary["rate"],
+    )
+    assert summary["handle_p50_ms"] < 0.5
+    assert summary["handle_p99_ms"] < 5
+
+
+@pytest.mark.benchmark
+def test_router_throughput(model_f, session_f, caplog):
+    """Replay into the input router and model queue as fast as possible."""
+    caplog.set_level(logging.INFO)
+    controller = make_headless_controller(model_f)
+    records = list(log.read_log(session_f)) * 50
+    stats = replay(records, controller.view_message_router, speed=0)
+    logging.info("Router throughput: %.0f msg/s", stats.summary()["rate"])
+    model_queue: queue.Queue = controller.work_manager.get_queue("model")
+    assert model_queue.qsize() == len(records)
+    assert stats.summary()["rate"] > 10_000
+
+
+def test_replay_input(session_f):
+    consumer = mock.Mock()
+    replay_input = ReplayInput(session_f, speed=0)
+    replay_input.register_consumer(consumer)
+    replay_input.start()
+    replay_input.join(5)
+    assert not replay_input.running
+    assert replay_input.stats.messages == consumer.call_count == 143
@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import logging
+import subprocess
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Imported on first use or warm-up, not at startup.
+DEFERRED = ("mpv", "pytube", "serial")
+
+STARTUP = """
+import json, time, tkinter
+start = time.perf_counter()
+import freejay.app
+from freejay.model import make_model
+from freejay.view import make_view
+times = {"import": time.perf_counter() - start}
+try:
+    view = make_view()
+    view.tkroot.update()
+    times["first_frame"] = time.perf_counter() - start
+except tkinter.TclError:
+    pass
+model = make_model()
+times["model"] = time.perf_counter() - start
+print(json.dumps(times))
+"""
+
+
+def run_importtime(code, cwd):
+    """Run code with `-X importtime`, (cumulative import times by module, stdout)."""
+    (cwd / "instance").mkdir(exist_ok=True)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        env=dict(os.environ, PYTHONPATH=REPO),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times, result.stdout
+
+
+def test_startup_is_lazy(tmp_path):
+    times, _ = run_importtime(
+        "import freejay.app\nfrom freejay.model import make_model\nmake_model()",
+        tmp_path,
+    )
+    assert "freejay.app" in times
+    assert times.keys().isdisjoint(DEFERRED)
+
+
+def test_local_download_is_lazy(tmp_path):
+    (tmp_path / "track.mp3").write_bytes(bytes(1000))
+    code = (
+        "from freejay.messages import messages as mes\n"
+        "from freejay.audio_download.backend import LocalBackend\n"
+        "from freejay.audio_download.ytrip import DownloadManager\n"
+        "manager = DownloadManager(mes.Source.DOWNLOAD_MODEL,"
+        " mes.Component.DOWNLOAD, destination='instance', backend=LocalBackend())\n"
+        "manager.register_consumer(print)\n"
+        "assert manager.download('track.mp3').result(timeout=5)\n"
+        "assert not manager.download('missing.mp3').result(timeout=5)\n"
+        "manager.shutdown()"
+    )
+    times, _ = run_importtime(code, tmp_path)
+    assert "freejay.audio_download.ytrip" in times
+    assert "pytube" not in times
+
+
+def test_import_freejay_is_light(tmp_path):
+    times, _ = run_importtime("import freejay", tmp_path)
+    assert times.keys().isdisjoint({"customtkinter", "PIL"})
+
+
+@pytest.mark.benchmark
+def test_startup_time(tmp_path, caplog):
+    """Time startup to the first frame, with the slowest imports."""
+    caplog.set_level(logging.INFO)
+    times, stdout = run_importtime(STARTUP, tmp_path)
+    startup = json.loads(stdout)
+    # Slowest packages, excluding the interpreter's own.
+    packages = {
+        name: cumulative
+        for name, cumulative in times.items()
+        if "." not in name and name not in ("site", "encodings")
+    }
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:5]
+    # The import time saved by deferring, for those installed.
+    deferred = {}
+    for name in DEFERRED:
+        try:
+            deferred[name] = run_importtime(f"import {name}", tmp_path)[0][name]
+        except subprocess.CalledProcessError:
+            pass
+    logging.info(
+        "Startup: imports %.0f ms, first frame %s, model %.0f ms; "
+        "slowest imports %s; deferred imports %s",
+        startup["import"] * 1000,
+        f"{startup['first_frame'] * 1000:.0f} ms"
+        if "first_frame" in startup
+        else "n/a (no display)",
+        startup["model"] * 1000,
+        ", ".join(f"{name} {us / 1000:.1f} ms" for name, us in slowest),
+        ", ".join(f"{name} {us / 1000:.1f} ms" for name, us in deferred.items()),
+    )
+    assert times.keys().isdisjoint(DEFERRED)
+    assert startup["model"] < 5
@@ -0,0 +1,113 @@
+import io
+import time
+import logging
+import pytest
+from freejay.messages import messages as mes
+from freejay.headless import Headless, open_input
+from freejay.session.commands import CommandInput
+from freejay.session.replay import ReplayInput
+from freejay.remote.server import ControlServer
+from tests.test_app import run_importtime
+
+LEFT = mes.Component.LEFT_DECK
+# Imported by the window, not by the headless engine.
+GUI = ("tkinter", "_tkinter", "customtkinter", "PIL", "freejay.view", "freejay.app")
+
+HEADLESS = """
+import sys, runpy
+sys.argv = ["freejay", "--headless", "--input", "commands:commands.txt"]
+runpy.run_module("freejay", run_name="__main__")
+"""
+
+
+@pytest.fixture
+def engine_f(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "instance").mkdir()
+
+    def make(commands):
+        return Headless(CommandInput(io.StringIO(commands), name="test"))
+
+    return make
+
+
+def test_headless_run(engine_f):
+    engine = engine_f(
+        "data MIXER CROSSFADER position=1\n"
+        "data LEFT_DECK CHANNEL_FADER value=0.25\n"
+        "data LEFT_DECK XF_ASSIGN assign=THRU\n"
+    )
+    engine.run()
+    assert not engine.source.running
+    assert engine.source.stats.messages == 3
+    mixer = engine.model.mixer
+    assert mixer.crossfader.position == 1
+    assert mixer.channels[LEFT].fader == 0.25
+
+
+def test_headless_bad_messages(engine_f, caplog):
+    engine = engine_f("data MIXER CROSSFADER position=0.2\n")
+    # Messages the commands reject, sent straight to the model.
+    bad = [
+        mes.Data(component=LEFT, element=mes.Element.BPM, data={"value": "abc"}),
+        mes.Data(component=LEFT, element=mes.Element.LOAD),
+    ]
+    for content in bad:
+        engine.source.send_message(
+            mes.Message(
+                sender=mes.Sender(
+                    source=mes.Source.COMMAND, trigger=mes.Trigger.DATA_INPUT
+                ),
+                content=content,
+            )
+        )
+    engine.run()
+    assert engine.model.mixer.crossfader.position == 0.2
+    assert "Failed to handle message" in caplog.text
+
+
+def test_open_input(tmp_path):
+    commands = tmp_path / "commands.txt"
+    commands.write_text("tap LEFT_DECK CUE\n")
+    assert isinstance(open_input("stdin"), CommandInput)
+    assert open_input(f"commands:{commands}").name == str(commands)
+    replay_input = open_input("replay:session.log", speed=0)
+    assert isinstance(replay_input, ReplayInput) and replay_input.speed == 0
+    server = open_input(f"control:unix:{tmp_path / 'control.sock'}")
+    assert isinstance(server, ControlServer)
+    assert (tmp_path / "control.sock").is_socket()
+    server.stop()
+    assert not (tmp_path / "control.sock").exists()
+    for spec in ("socket", "replay:", "session.log", "control:tcp:0.0.0.0:0"):
+        with pytest.raises(ValueError):
+            open_input(spec)
+
+
+def test_headless_does_not_import_tk(tmp_path):
+    (tmp_path / "commands.txt").write_text("data MIXER CROSSFADER position=0.5\n")
+    times, _ = run_importtime(HEADLESS, tmp_path)
+    assert "freejay.headless" in times
+    assert times.keys().isdisjoint(GUI)
+
+
+@pytest.mark.benchmark
+def test_headless_throughput(engine_f, caplog):
+    """Time commands parsed, routed and handled by the headless engine."""
+    caplog.set_level(logging.INFO)
+    count = 20000
+    engine = engine_f(
+        "".join(
+            f"data MIXER CROSSFADER position={i % 101 / 100}\n" for i in range(count)
+        )
+    )
+    start = time.perf_counter()
+    engine.run()
+    elapsed = time.perf_counter() - start
+    logging.info(
+        "Headless engine: %d commands in %.2f s (%.0f/s)",
+        count,
+        elapsed,
+        count / elapsed,
+    )
+    assert engine.source.stats.messages == count
+    assert engine.model.mixer.crossfader.position == (count - 1) % 101 / 100
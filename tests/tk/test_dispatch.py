@@ -0,0 +1,187 @@
+import time
+import heapq
+import logging
+import threading
+import tkinter
+import pytest
+from freejay.tk.dispatch import TkDispatcher
+
+
+@pytest.fixture
+def root_f():
+    class FakeRoot:
+        """Stand-in for a Tk main loop, running `after()` calls on one thread."""
+
+        def __init__(self):
+            self.calls = []
+            self.count = 0
+            self.cancelled = set()
+            self.longest_call = 0.0
+
+        def after(self, ms, func):
+            self.count += 1
+            heapq.heappush(
+                self.calls, (time.perf_counter() + ms / 1000, self.count, func)
+            )
+            return str(self.count)
+
+        def after_cancel(self, id):
+            self.cancelled.add(id)
+
+        def run(self, until):
+            self.thread = threading.get_ident()
+            while self.calls and not until():
+                due, count, func = heapq.heappop(self.calls)
+                time.sleep(max(0.0, due - time.perf_counter()))
+                if str(count) not in self.cancelled:
+                    start = time.perf_counter()
+                    func()
+                    self.longest_call = max(
+                        self.longest_call, time.perf_counter() - start
+                    )
+
+    return FakeRoot()
+
+
+@pytest.fixture
+def dispatcher_f(root_f):
+    return TkDispatcher(root_f, interval=5, max_batch=50)
+
+
+def test_post_runs_on_main_loop(root_f, dispatcher_f):
+    calls = []
+
+    def update(*args):
+        calls.append((threading.get_ident(), args))
+
+    dispatcher_f.start()
+    assert dispatcher_f.running
+    thread = threading.Thread(target=dispatcher_f.wrap(update), args=(1, 2))
+    thread.start()
+    thread.join()
+    assert calls == [] and len(dispatcher_f) == 1
+    root_f.run(until=lambda: calls)
+    assert calls == [(root_f.thread, (1, 2))]
+    assert len(dispatcher_f) == 0
+
+
+def test_bounded_batches(root_f, dispatcher_f):
+    calls = []
+    for i in range(120):
+        dispatcher_f.post(calls.append, i)
+    assert dispatcher_f.drain() == 50
+    assert calls == list(range(50))
+    # The backlog is drained on the following ticks, in order.
+    dispatcher_f.start()
+    root_f.run(until=lambda: len(calls) == 120)
+    assert calls == list(range(120))
+    stats = dispatcher_f.stats
+    assert (stats.dispatched, stats.batches, stats.largest_batch) == (120, 3, 50)
+    assert stats.max_pending == 120
+
+
+def test_update_exception_logged(dispatcher_f, caplog):
+    calls = []
+
+    def fail():
+        raise RuntimeError
+
+    dispatcher_f.post(fail)
+    dispatcher_f.post(calls.append, 1)
+    assert dispatcher_f.drain() == 2
+    assert calls == [1]
+    assert dispatcher_f.stats.errors == 1
+    assert "View update failed" in caplog.text
+
+
+def test_stop(root_f, dispatcher_f):
+    dispatcher_f.start()
+    dispatcher_f.stop()
+    assert not dispatcher_f.running
+    dispatcher_f.post(dispatcher_f.stop)
+    root_f.run(until=lambda: False)
+    assert dispatcher_f.stats.dispatched == 0
+    # Stopping from an update does not schedule another tick.
+    dispatcher_f.start()
+    root_f.run(until=lambda: False)
+    assert dispatcher_f.stats.dispatched == 1
+    assert not dispatcher_f.running and not root_f.calls
+
+
+def test_tk_main_loop():
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError:
+        pytest.skip("No display.")
+    dispatcher = TkDispatcher(root)
+    label_var = tkinter.StringVar(master=root)
+    threads = []
+    dispatcher.post(label_var.set, "posted")
+    dispatcher.post(lambda: threads.append(threading.get_ident()))
+    dispatcher.post(root.quit)
+    dispatcher.start()
+    root.mainloop()
+    assert label_var.get() == "posted"
+    assert threads == [threading.get_ident()]
+    root.destroy()
+
+
+@pytest.mark.benchmark
+def test_stress(root_f, caplog):
+    """Post 20k updates a second from four threads for half a second."""
+    caplog.set_level(logging.INFO)
+    dispatcher = TkDispatcher(root_f)
+    producers, per_producer, seconds = 4, 2500, 0.5
+    applied = {producer: [] for producer in range(producers)}
+    latencies = []
+    wrong_thread = []
+
+    def update(producer, sequence, posted):
+        if threading.get_ident() != root_f.thread:
+            wrong_thread.append(producer)
+        applied[producer].append(sequence)
+        latencies.append(time.perf_counter() - posted)
+
+    def produce(producer):
+        post = dispatcher.wrap(update)
+        start = time.perf_counter()
+        for sequence in range(per_producer):
+            post(producer, sequence, time.perf_counter())
+            # Post in bursts of 50, spread over the run.
+            if sequence % 50 == 49:
+                delay = start + seconds * (sequence + 1) / per_producer
+                time.sleep(max(0.0, delay - time.perf_counter()))
+
+    threads = [
+        threading.Thread(target=produce, args=(producer,), daemon=True)
+        for producer in range(producers)
+    ]
+    total = producers * per_producer
+    dispatcher.start()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    root_f.run(until=lambda: dispatcher.stats.dispatched == total)
+    elapsed = time.perf_counter() - start
+    for thread in threads:
+        thread.join()
+
+    stats = dispatcher.stats
+    latencies.sort()
+    logging.info(
+        "%d view updates in %.2f s (%.0f/s): %d batches, largest %d, "
+        "max backlog %d, latency p50 %.1f ms p99 %.1f ms, longest tick %.1f ms",
+        stats.dispatched,
+        elapsed,
+        stats.dispatched / elapsed,
+        stats.batches,
+        stats.largest_batch,
+        stats.max_pending,
+        latencies[len(latencies) // 2] * 1000,
+        latencies[int(len(latencies) * 0.99)] * 1000,
+        root_f.longest_call * 1000,
+    )
+    assert wrong_thread == []
+    assert all(applied[p] == list(range(per_producer)) for p in applied)
+    assert stats.largest_batch <= dispatcher.max_batch
+    assert elapsed < seconds * 2
@@ -0,0 +1,166 @@
+import os
+import glob
+import json
+import time
+import shutil
+import logging
+import tkinter
+import pytest
+from PIL import Image, ImageChops
+from freejay.tk import icons
+
+ICON_PATHS = sorted(glob.glob(os.path.join("assets", "icons", "*.png")))
+# Icons loaded by each deck in the view.
+DECK_ICONS = [
+    os.path.join("assets", "icons", name)
+    for name in (
+        "icons8-play-96.png",
+        "icons8-rewind-96.png",
+        "icons8-resume-button-96-rotated.png",
+        "icons8-resume-button-96.png",
+        "icons8-fast-forward-96.png",
+        "icons8-stop-96.png",
+        "icons8-resume-button-96-rotated.png",
+        "icons8-resume-button-96.png",
+        "icons8-insert-96.png",
+    )
+]
+
+
+@pytest.fixture
+def icons_f(tmp_path):
+    """Copy of the icons, (icon cache, icon paths)."""
+    paths = []
+    for path in ICON_PATHS:
+        paths.append(str(tmp_path / os.path.basename(path)))
+        shutil.copy(path, paths[-1])
+    return icons.IconCache(), paths
+
+
+def same(a, b):
+    return a.size == b.size and ImageChops.difference(a, b).getbbox() is None
+
+
+def test_cached(icons_f):
+    cache, paths = icons_f
+    image = cache.get(paths[0])
+    assert image.size == icons.ICON_SIZE
+    # Same path, normalised.
+    directory, name = os.path.split(paths[0])
+    assert cache.get(os.path.join(directory, ".", name)) is image
+    assert cache.get(paths[0], (40, 40)).size == (40, 40)
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+    with Image.open(paths[0]) as file:
+        assert same(image, file.resize(icons.ICON_SIZE, Image.LANCZOS))
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+
+
+def test_missing_icon(icons_f):
+    cache, _ = icons_f
+    with pytest.raises(OSError):
+        cache.get("missing.png")
+
+
+def test_atlas(icons_f, tmp_path):
+    cache, paths = icons_f
+    atlas_path = str(tmp_path / "atlas.png")
+    assert icons.pack_atlas(atlas_path, paths[:-1], sizes=[(20, 20), (32, 32)]) == 2 * (
+        len(paths) - 1
+    )
+    expected = {}
+    for path in paths:
+        with Image.open(path) as file:
+            expected[path] = file.resize((32, 32), Image.LANCZOS)
+    assert cache.load_atlas(atlas_path) == 2 * (len(paths) - 1)
+    # Icons come from the atlas, not their files.
+    for path in paths[:-1]:
+        os.remove(path)
+    for path in paths[:-1]:
+        assert same(cache.get(path, (32, 32)), expected[path])
+    # Icons missing from the atlas are loaded from their files.
+    assert same(cache.get(paths[-1], (32, 32)), expected[paths[-1]])
+
+
+def test_invalid_atlas(tmp_path):
+    atlas_path = str(tmp_path / "atlas.png")
+    icons.pack_atlas(atlas_path, ICON_PATHS[:1])
+    with open(atlas_path + ".json", "w") as file:
+        json.dump({"version": icons.ATLAS_VERSION, "icons": [{"path": "x"}]}, file)
+    with pytest.raises(ValueError, match="Invalid icon atlas"):
+        icons.IconCache().load_atlas(atlas_path)
+    with open(atlas_path + ".json", "w") as file:
+        json.dump({"version": 99, "icons": []}, file)
+    with pytest.raises(ValueError, match="version"):
+        icons.IconCache().load_atlas(atlas_path)
+    with pytest.raises(OSError):
+        icons.IconCache().load_atlas(str(tmp_path / "missing.png"))
+
+
+def test_main(tmp_path, capsys):
+    atlas_path = str(tmp_path / "atlas.png")
+    icons.main([atlas_path, *ICON_PATHS, "--size", "20", "--size", "40"])
+    assert f"Packed {2 * len(ICON_PATHS)} icons" in capsys.readouterr().out
+    assert icons.IconCache().load_atlas(atlas_path) == 2 * len(ICON_PATHS)
+
+
+@pytest.mark.benchmark
+def test_icon_load_time(tmp_path, caplog):
+    """Time loading the icons for five decks, as the view does."""
+    caplog.set_level(logging.INFO)
+    loads = DECK_ICONS * 5
+
+    start = time.perf_counter()
+    for path in loads:
+        Image.open(path).resize(icons.ICON_SIZE, Image.LANCZOS)
+    uncached = time.perf_counter() - start
+
+    cache = icons.IconCache()
+    start = time.perf_counter()
+    for path in loads:
+        cache.get(path)
+    cached = time.perf_counter() - start
+
+    atlas_path = str(tmp_path / "atlas.png")
+    icons.pack_atlas(atlas_path, sorted(set(DECK_ICONS)))
+    cache = icons.IconCache()
+    start = time.perf_counter()
+    cache.load_atlas(atlas_path)
+    for path in loads:
+        cache.get(path)
+    atlas = time.perf_counter() - start
+
+    logging.info(
+        "%d icon loads: uncached %.2f ms, cached %.2f ms, atlas %.2f ms",
+        len(loads),
+        uncached * 1000,
+        cached * 1000,
+        atlas * 1000,
+    )
+    assert cached < uncached
+    assert atlas < uncached
+
+
+@pytest.mark.benchmark
+def test_make_view_time(caplog):
+    """Time building the view, with cold and warm icon caches."""
+    try:
+        tkinter.Tk().destroy()
+    except tkinter.TclError:
+        pytest.skip("No display.")
+    from freejay.view import make_view
+
+    caplog.set_level(logging.INFO)
+    times = []
+    icons.ICONS.clear()
+    for _ in range(2):
+        start = time.perf_counter()
+        view = make_view()
+        times.append(time.perf_counter() - start)
+        view.tkroot.destroy()
+    logging.info(
+        "make_view: cold icons %.1f ms, cached icons %.1f ms",
+        times[0] * 1000,
+        times[1] * 1000,
+    )
+    assert icons.ICONS.misses == len(set(DECK_ICONS))
@@ -0,0 +1,78 @@
+from unittest import mock
+import pytest
+from freejay.tk import tk_player
+from freejay.messages import messages as mes
+
+
+@pytest.fixture
+def status_f(mocker):
+    class FakeStringVar:
+        """Stand-in for a Tk string variable, counting sets."""
+
+        def __init__(self, master=None, value=""):
+            self.value = value
+            self.sets = 0
+
+        def get(self):
+            return self.value
+
+        def set(self, value):
+            self.value = value
+            self.sets += 1
+
+    ctk = mocker.patch("freejay.tk.tk_player.ctk")
+    ctk.StringVar = FakeStringVar
+    return tk_player.TkDeckStatus(
+        tkroot=mock.Mock(),
+        parent=mock.Mock(),
+        source=mes.Source.PLAYER_VIEW,
+        component=mes.Component.LEFT_DECK,
+    )
+
+
+def texts(status):
+    return {name: var.get() for name, var in status.label_vars.items()}
+
+
+def test_format_time():
+    assert tk_player.format_time(0) == "0:00.0"
+    assert tk_player.format_time(65.25) == "1:05.2"
+    assert tk_player.format_time(-185.06) == "-3:05.1"
+    assert tk_player.format_time(59.96) == "1:00.0"
+
+
+def test_format_pitch():
+    assert tk_player.format_pitch(1.0, None) == "+0.00%"
+    assert tk_player.format_pitch(0.975, None) == "-2.50%"
+    assert tk_player.format_pitch(1.02, 125.0) == "+2.00% 127.5 BPM"
+
+
+def test_status_initial(status_f):
+    assert texts(status_f) == {
+        "track": "No track loaded",
+        "time": "0:00.0  0:00.0",
+        "pitch": "+0.00%",
+        "level": "LVL 0%",
+    }
+
+
+def test_status_updates_changed_labels(status_f):
+    status_f.update_state(
+        loaded=True, filename="/music/track.mp3", position=10.0, duration=70.0
+    )
+    assert texts(status_f)["track"] == "track.mp3"
+    assert texts(status_f)["time"] == "0:10.0  -1:00.0"
+    sets = {name: var.sets for name, var in status_f.label_vars.items()}
+    assert sets == {"track": 1, "time": 1, "pitch": 0, "level": 0}
+
+    # Only the time label is formatted from the position.
+    status_f.update_state(position=11.0)
+    assert status_f.label_vars["time"].sets == 2
+    assert status_f.label_vars["track"].sets == 1
+    # Changes too small to show are not set.
+    status_f.update_state(position=11.01)
+    assert status_f.label_vars["time"].sets == 2
+
+    status_f.update_state(speed=1.05, bpm=120.0, level=0.5)
+    assert texts(status_f)["pitch"] == "+5.00% 126.0 BPM"
+    assert texts(status_f)["level"] == "LVL 50%"